@@ -0,0 +1,243 @@
+"""Token budgeting for the per-step state message.
+
+The state message used to be bounded only by character caps (max_clickable_elements_length, 60k characters of read
+state), which ignore the screenshot and the model's context window. ContextBudget estimates the tokens of every
+section with a fast local approximation of a BPE tokenizer and, when the step doesn't fit, trims the lowest-value
+content first: interactive elements outside the viewport, then old history items, then the read state, and only then
+the elements inside the viewport.
+"""
+
+import base64
+import math
+import re
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+	from browser_use.browser.views import PageInfo
+	from browser_use.dom.views import DOMSelectorMap
+
+CHARS_PER_TOKEN = 4  # BPE tokenizers average ~4 characters per token on English text and markup
+LOW_DETAIL_IMAGE_TOKENS = 85
+MAX_IMAGE_EDGE = 1568  # providers downscale larger images before tokenizing them
+PIXELS_PER_IMAGE_TOKEN = 750
+DEFAULT_IMAGE_SIZE = (1280, 1100)
+
+DEFAULT_CONTEXT_WINDOW = 128_000
+OUTPUT_TOKEN_RESERVE = 16_000  # left free for the model's thinking and actions
+
+# Input context windows, matched in order against the lowercased model name
+MODEL_CONTEXT_WINDOWS: tuple[tuple[str, int], ...] = (
+	('gpt-4.1', 1_047_576),
+	('gpt-5', 272_000),
+	('gpt-4o', 128_000),
+	('o3', 200_000),
+	('o4', 200_000),
+	('claude', 200_000),
+	('gemini', 1_048_576),
+	('grok', 131_072),
+	('deepseek', 128_000),
+	('llama', 128_000),
+)
+
+HISTORY_OMITTED_MARKER = '<sys>[... {count} previous history items omitted to fit the context budget...]</sys>'
+
+# Interactive element lines of DOMTreeSerializer.serialize_tree: '\t\t[12]<button ...', '*[12]<a ...', '|SCROLL+12]<div ...'
+_ELEMENT_LINE_RE = re.compile(r'^(\t*)(?:\|SHADOW\((?:open|closed)\)\|)?\*?(?:\[|\|SCROLL\+)(\d+)\]<')
+
+
+def estimate_tokens(text: str | None) -> int:
+	"""Approximate token count: ~4 ASCII characters per token, one token per non-ASCII character."""
+	if not text:
+		return 0
+	if text.isascii():
+		return math.ceil(len(text) / CHARS_PER_TOKEN)
+	ascii_chars = len(text.encode('ascii', 'ignore'))
+	return math.ceil(ascii_chars / CHARS_PER_TOKEN) + len(text) - ascii_chars
+
+
+def get_image_size(image: str) -> tuple[int, int] | None:
+	"""Width and height of a base64 (or base64 data URL) PNG, read from its header without decoding the image."""
+	if image.startswith('data:'):
+		image = image.partition(',')[2]
+	try:
+		header = base64.b64decode(image[:32])
+	except ValueError:
+		return None
+	if header[:8] != b'\x89PNG\r\n\x1a\n':
+		return None
+	return int.from_bytes(header[16:20], 'big'), int.from_bytes(header[20:24], 'big')
+
+
+def estimate_image_tokens(width: int, height: int, detail: str = 'auto') -> int:
+	if detail == 'low':
+		return LOW_DETAIL_IMAGE_TOKENS
+	scale = min(1.0, MAX_IMAGE_EDGE / max(width, height, 1))
+	return math.ceil((width * scale) * (height * scale) / PIXELS_PER_IMAGE_TOKEN)
+
+
+def get_model_context_budget(model: str) -> int:
+	"""Input tokens a step may use for a model: its context window minus room for the output."""
+	model = model.lower()
+	context_window = next((window for name, window in MODEL_CONTEXT_WINDOWS if name in model), DEFAULT_CONTEXT_WINDOW)
+	return context_window - OUTPUT_TOKEN_RESERVE
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+	"""Cut text at a line boundary so that it is estimated at no more than max_tokens."""
+	tokens = estimate_tokens(text)
+	if tokens <= max_tokens:
+		return text
+	cut = text[: max(0, len(text) * max_tokens // tokens)]
+	newline = cut.rfind('\n')
+	return cut[:newline] if newline > 0 else cut
+
+
+def drop_off_viewport_elements(elements_text: str, selector_map: 'DOMSelectorMap', page_info: 'PageInfo | None') -> str:
+	"""Remove interactive elements (with their serialized subtree) that are entirely above or below the viewport.
+
+	Elements without a known position, and elements containing an element inside the viewport, are kept.
+	"""
+	if page_info is None or page_info.viewport_height <= 0:
+		return elements_text
+	viewport_top, viewport_bottom = page_info.scroll_y, page_info.scroll_y + page_info.viewport_height
+
+	lines = elements_text.split('\n')
+	# For every line: its depth and whether it is an element outside the viewport (None for non-element lines)
+	parsed: list[tuple[int, bool | None]] = []
+	for line in lines:
+		match = _ELEMENT_LINE_RE.match(line)
+		if not match:
+			parsed.append((len(line) - len(line.lstrip('\t')), None))
+			continue
+		node = selector_map.get(int(match.group(2)))
+		position = node.absolute_position if node else None
+		off_viewport = position is not None and (position.y + position.height <= viewport_top or position.y >= viewport_bottom)
+		parsed.append((len(match.group(1)), off_viewport))
+
+	kept: list[str] = []
+	i = 0
+	while i < len(lines):
+		depth, off_viewport = parsed[i]
+		end = i + 1
+		if off_viewport:
+			while end < len(lines) and parsed[end][0] > depth:
+				end += 1
+			if not any(parsed[j][1] is False for j in range(i + 1, end)):
+				i = end
+				continue
+		kept.append(lines[i])
+		i += 1
+	return '\n'.join(kept)
+
+
+@dataclass
+class ContextBudgetReport:
+	"""Estimated tokens per section of a step, after trimming, and how many tokens were trimmed from each."""
+
+	max_tokens: int
+	sections: dict[str, int] = field(default_factory=dict)
+	trimmed: dict[str, int] = field(default_factory=dict)
+
+	@property
+	def total_tokens(self) -> int:
+		return sum(self.sections.values())
+
+	@property
+	def over_budget(self) -> bool:
+		return self.total_tokens > self.max_tokens
+
+	def __str__(self) -> str:
+		sections = ', '.join(f'{name}={tokens}' for name, tokens in self.sections.items())
+		trimmed = ', '.join(f'{name}=-{tokens}' for name, tokens in self.trimmed.items() if tokens)
+		return f'{self.total_tokens}/{self.max_tokens} tokens ({sections})' + (f', trimmed {trimmed}' if trimmed else '')
+
+
+@dataclass
+class BudgetedContext:
+	history_items: list[str]
+	elements_text: str
+	read_state: str
+	report: ContextBudgetReport
+
+
+class ContextBudget:
+	"""Fits the trimmable sections of a step (history, elements, read state) into a token budget."""
+
+	def __init__(
+		self,
+		max_tokens: int,
+		reserved_tokens: dict[str, int] | None = None,
+		min_history_items: int = 3,
+		min_elements_tokens: int = 2_000,
+	):
+		self.max_tokens = max_tokens
+		self.reserved_tokens = reserved_tokens or {}  # e.g. the system prompt, sent with every step
+		self.min_history_items = min_history_items  # most recent history items that are never dropped
+		self.min_elements_tokens = min_elements_tokens
+
+	def fit(
+		self,
+		history_items: list[str],
+		elements_text: str,
+		read_state: str,
+		fixed_tokens: dict[str, int],
+		selector_map: 'DOMSelectorMap',
+		page_info: 'PageInfo | None',
+		max_elements_chars: int | None = None,
+	) -> BudgetedContext:
+		"""Trim the sections, lowest value first, until the whole step fits max_tokens (or nothing more can go)."""
+		original = {
+			'history': estimate_tokens('\n'.join(history_items)),
+			'elements': estimate_tokens(elements_text),
+			'read_state': estimate_tokens(read_state),
+		}
+		available = self.max_tokens - sum(self.reserved_tokens.values()) - sum(fixed_tokens.values())
+
+		def tokens() -> int:
+			return estimate_tokens('\n'.join(history_items)) + estimate_tokens(elements_text) + estimate_tokens(read_state)
+
+		# 1. Elements outside the viewport, also whenever the character cap would otherwise cut elements inside it
+		too_long = max_elements_chars is not None and len(elements_text) > max_elements_chars
+		if too_long or tokens() > available:
+			elements_text = drop_off_viewport_elements(elements_text, selector_map, page_info)
+		if max_elements_chars is not None and len(elements_text) > max_elements_chars:
+			elements_text = elements_text[:max_elements_chars]
+
+		# 2. Old history items: keep the first (the task setup) and the most recent ones
+		if tokens() > available and len(history_items) > self.min_history_items + 1:
+			first, older, recent = (
+				history_items[0],
+				history_items[1 : -self.min_history_items],
+				history_items[-self.min_history_items :],
+			)
+			overflow = tokens() - available + estimate_tokens(HISTORY_OMITTED_MARKER.format(count=len(older))) + 1
+			dropped = 0
+			while dropped < len(older) and overflow > 0:
+				overflow -= estimate_tokens(older[dropped]) + 1
+				dropped += 1
+			history_items = [first, HISTORY_OMITTED_MARKER.format(count=dropped), *older[dropped:], *recent]
+
+		# 3. Read state, then 4. elements inside the viewport, keeping a minimum so the page stays usable
+		overflow = tokens() - available
+		if overflow > 0 and read_state:
+			read_state = truncate_to_tokens(read_state, max(0, estimate_tokens(read_state) - overflow))
+			read_state += '\n... [Content truncated to fit the context budget]'
+			overflow = tokens() - available
+		if overflow > 0:
+			elements_tokens = estimate_tokens(elements_text)
+			elements_text = truncate_to_tokens(elements_text, max(self.min_elements_tokens, elements_tokens - overflow))
+
+		sections = {
+			**self.reserved_tokens,
+			**fixed_tokens,
+			'history': estimate_tokens('\n'.join(history_items)),
+			'elements': estimate_tokens(elements_text),
+			'read_state': estimate_tokens(read_state),
+		}
+		report = ContextBudgetReport(
+			max_tokens=self.max_tokens,
+			sections=sections,
+			trimmed={name: max(0, tokens - sections[name]) for name, tokens in original.items()},
+		)
+		return BudgetedContext(history_items=history_items, elements_text=elements_text, read_state=read_state, report=report)
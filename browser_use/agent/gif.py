@@ -1,21 +1,24 @@
 from __future__ import annotations
 
 import base64
-import io
 import logging
 import os
 import platform
+from pathlib import Path
 from typing import TYPE_CHECKING
 
 from browser_use.agent.views import AgentHistoryList
 from browser_use.browser.views import PLACEHOLDER_4PX_SCREENSHOT
 from browser_use.config import CONFIG
+from browser_use.screenshots.views import ScreenshotRef
 
 if TYPE_CHECKING:
 	from PIL import Image, ImageFont
 
 logger = logging.getLogger(__name__)
 
+_PLACEHOLDER_BYTES = base64.b64decode(PLACEHOLDER_4PX_SCREENSHOT)
+
 
 def decode_unicode_escapes_to_utf8(text: str) -> str:
 	"""Handle decoding any unicode escape sequences embedded in a string (needed to render non-ASCII languages like chinese or arabic in the GIF overlay text)"""
@@ -61,10 +64,10 @@ def create_history_gif(
 		logger.warning('No history to create GIF from')
 		return
 
-	# Get all screenshots from history (including None placeholders)
-	screenshots = history.screenshots(return_none_if_not_screenshot=True)
+	# Lazy handles to all screenshots from history (including None placeholders), each frame is read when it is drawn
+	screenshots = history.screenshot_refs(return_none_if_not_screenshot=True)
 
-	if not screenshots:
+	if not any(screenshots):
 		logger.warning('No screenshots found in history')
 		return
 
@@ -72,11 +75,7 @@ def create_history_gif(
 	# A screenshot is considered a placeholder if:
 	# 1. It's the exact 4px placeholder for about:blank pages, OR
 	# 2. It comes from a new tab page (chrome://newtab/, about:blank, etc.)
-	first_real_screenshot = None
-	for screenshot in screenshots:
-		if screenshot and screenshot != PLACEHOLDER_4PX_SCREENSHOT:
-			first_real_screenshot = screenshot
-			break
+	first_real_screenshot = next((screenshot for screenshot in screenshots if _is_real_screenshot(screenshot)), None)
 
 	if not first_real_screenshot:
 		logger.warning('No valid screenshots found (all are placeholders or from new tab pages)')
@@ -136,37 +135,29 @@ def create_history_gif(
 		except Exception as e:
 			logger.warning(f'Could not load logo: {e}')
 
-	# Create task frame if requested
+	# Create task frame if requested, sized like the first non-placeholder screenshot
 	if show_task and task:
-		# Find the first non-placeholder screenshot for the task frame
-		first_real_screenshot = None
-		for item in history.history:
-			screenshot_b64 = item.state.get_screenshot()
-			if screenshot_b64 and screenshot_b64 != PLACEHOLDER_4PX_SCREENSHOT:
-				first_real_screenshot = screenshot_b64
-				break
+		task_frame = _create_task_frame(
+			task,
+			first_real_screenshot,
+			title_font,  # type: ignore
+			regular_font,  # type: ignore
+			logo,
+			line_spacing,
+		)
+		images.append(task_frame)
 
-		if first_real_screenshot:
-			task_frame = _create_task_frame(
-				task,
-				first_real_screenshot,
-				title_font,  # type: ignore
-				regular_font,  # type: ignore
-				logo,
-				line_spacing,
-			)
-			images.append(task_frame)
-		else:
-			logger.warning('No real screenshots found for task frame, skipping task frame')
+	# Steps that sat on the same page share one stored file, decode it once
+	decoded: dict[Path, Image.Image | None] = {}
 
 	# Process each history item with its corresponding screenshot
 	for i, (item, screenshot) in enumerate(zip(history.history, screenshots), 1):
-		if not screenshot:
+		if not screenshot or not screenshot.exists():
 			continue
 
 		# Skip placeholder screenshots from about:blank pages
 		# These are 4x4 white PNGs encoded as a specific base64 string
-		if screenshot == PLACEHOLDER_4PX_SCREENSHOT:
+		if not _is_real_screenshot(screenshot):
 			logger.debug(f'Skipping placeholder screenshot from about:blank page at step {i}')
 			continue
 
@@ -177,9 +168,11 @@ def create_history_gif(
 			logger.debug(f'Skipping screenshot from new tab page ({item.state.url}) at step {i}')
 			continue
 
-		# Convert base64 screenshot to PIL Image
-		img_data = base64.b64decode(screenshot)
-		image = Image.open(io.BytesIO(img_data))
+		if screenshot.path not in decoded:
+			decoded[screenshot.path] = screenshot.open_image()
+		image = decoded[screenshot.path]
+		if image is None:
+			continue
 
 		if show_goals and item.model_output:
 			image = _add_overlay_to_image(
@@ -209,9 +202,21 @@ def create_history_gif(
 		logger.warning('No images found in history to create GIF')
 
 
+def _is_real_screenshot(screenshot: ScreenshotRef | None) -> bool:
+	"""Whether the screenshot exists and isn't the 4px about:blank placeholder (checked by size first, without reading it)."""
+	if screenshot is None:
+		return False
+	try:
+		if screenshot.path.stat().st_size != len(_PLACEHOLDER_BYTES):
+			return True
+	except OSError:
+		return False
+	return screenshot.read_bytes() != _PLACEHOLDER_BYTES
+
+
 def _create_task_frame(
 	task: str,
-	first_screenshot: str,
+	first_screenshot: ScreenshotRef,
 	title_font: ImageFont.FreeTypeFont,
 	regular_font: ImageFont.FreeTypeFont,
 	logo: Image.Image | None = None,
@@ -220,9 +225,9 @@ def _create_task_frame(
 	"""Create initial frame showing the task."""
 	from PIL import Image, ImageDraw, ImageFont
 
-	img_data = base64.b64decode(first_screenshot)
-	template = Image.open(io.BytesIO(img_data))
-	image = Image.new('RGB', template.size, (0, 0, 0))
+	with Image.open(first_screenshot.path) as template:
+		size = template.size
+	image = Image.new('RGB', size, (0, 0, 0))
 	draw = ImageDraw.Draw(image)
 
 	# Calculate vertical center of image
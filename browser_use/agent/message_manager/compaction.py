@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+
+from browser_use.agent.message_manager.views import HistorySummary, MessageManagerState
+from browser_use.llm.base import BaseChatModel
+from browser_use.llm.messages import SystemMessage, UserMessage
+
+logger = logging.getLogger(__name__)
+
+COMPACTION_SYSTEM_PROMPT = """
+You compress the step history of a browser automation agent.
+Summarize the steps you are given in at most 120 words: what was tried, what worked, what failed, and every concrete fact
+the agent may still need later (URLs, values, names, counts, file names). Only use information from the steps.
+Output only the summary.
+""".strip()
+
+
+class HistoryCompactor:
+	"""Folds old agent history items into summaries written by a (cheap) LLM, in the background.
+
+	The history is split into fixed spans of `chunk_size` items (the first item, the agent initialization, always stays
+	verbatim). A span is summarized as soon as it is complete, while its items are still among the `keep_recent` most
+	recent ones shown verbatim, so the summary is usually ready by the time the span ages out and the step never waits
+	for it. Until then, or if the call fails, the items are simply shown verbatim. Summaries are stored in
+	MessageManagerState.history_summaries.
+	"""
+
+	def __init__(self, llm: BaseChatModel, keep_recent: int = 10, chunk_size: int = 10, timeout: float = 60.0):
+		assert keep_recent > 0 and chunk_size > 0, 'keep_recent and chunk_size must be positive'
+		self.llm = llm
+		self.keep_recent = keep_recent
+		self.chunk_size = chunk_size
+		self.timeout = timeout
+		self._task: asyncio.Task[None] | None = None
+
+	def get_next_span(self, state: MessageManagerState) -> tuple[int, int] | None:
+		"""Index range of the next complete span of history items without a summary"""
+		start = state.history_summaries[-1].end_index if state.history_summaries else 1
+		end = start + self.chunk_size
+		return (start, end) if end <= len(state.agent_history_items) else None
+
+	def schedule(self, state: MessageManagerState) -> None:
+		"""Start summarizing the next complete span, unless a summary is already being written"""
+		if self._task is not None and not self._task.done():
+			return
+		span = self.get_next_span(state)
+		if span is None:
+			return
+		try:
+			asyncio.get_running_loop()
+		except RuntimeError:
+			return
+		self._task = asyncio.create_task(self._summarize(state, *span), name='history_compaction')
+
+	async def wait(self) -> None:
+		"""Wait for the summary being written, if any"""
+		if self._task is not None:
+			await asyncio.shield(self._task)
+
+	async def aclose(self) -> None:
+		if self._task is not None and not self._task.done():
+			self._task.cancel()
+			try:
+				await self._task
+			except asyncio.CancelledError:
+				pass
+		self._task = None
+
+	async def _summarize(self, state: MessageManagerState, start: int, end: int) -> None:
+		items = state.agent_history_items[start:end]
+		steps = '\n'.join(item.to_string() for item in items)
+		try:
+			response = await asyncio.wait_for(
+				self.llm.ainvoke([SystemMessage(content=COMPACTION_SYSTEM_PROMPT), UserMessage(content=steps)]),
+				timeout=self.timeout,
+			)
+		except Exception as e:
+			logger.warning(
+				f'⚠️ Failed to summarize history items {start}-{end - 1}, keeping them verbatim: {type(e).__name__}: {e}'
+			)
+			return
+
+		step_numbers = [item.step_number for item in items if item.step_number is not None]
+		state.history_summaries.append(
+			HistorySummary(
+				start_index=start,
+				end_index=end,
+				first_step=min(step_numbers) if step_numbers else None,
+				last_step=max(step_numbers) if step_numbers else None,
+				summary=response.completion.strip(),
+			)
+		)
+		logger.debug(f'🗜️ Summarized history items {start}-{end - 1} into {len(response.completion)} characters')
@@ -3,6 +3,8 @@ from __future__ import annotations
 import logging
 from typing import Literal
 
+from browser_use.agent.context_budget import ContextBudget, ContextBudgetReport, estimate_tokens
+from browser_use.agent.message_manager.compaction import HistoryCompactor
 from browser_use.agent.message_manager.views import (
 	HistoryItem,
 )
@@ -110,6 +112,9 @@ class MessageManager:
 		include_tool_call_examples: bool = False,
 		include_recent_events: bool = False,
 		sample_images: list[ContentPartTextParam | ContentPartImageParam] | None = None,
+		message_layout: Literal['single', 'stable_prefix'] = 'single',
+		max_context_tokens: int | None = None,
+		history_compactor: HistoryCompactor | None = None,
 	):
 		self.task = task
 		self.state = state
@@ -122,6 +127,15 @@ class MessageManager:
 		self.include_tool_call_examples = include_tool_call_examples
 		self.include_recent_events = include_recent_events
 		self.sample_images = sample_images
+		self.message_layout = message_layout
+		# Token budget for a whole step, the system prompt is sent with every step
+		self.context_budget = (
+			ContextBudget(max_context_tokens, reserved_tokens={'system': estimate_tokens(system_message.text)})
+			if max_context_tokens is not None
+			else None
+		)
+		self.last_context_budget_report: ContextBudgetReport | None = None
+		self.history_compactor = history_compactor
 
 		assert max_history_items is None or max_history_items > 5, 'max_history_items must be None or greater than 5'
 
@@ -136,15 +150,20 @@ class MessageManager:
 	@property
 	def agent_history_description(self) -> str:
 		"""Build agent history description from list of items, respecting max_history_items limit"""
+		return '\n'.join(self._get_agent_history_item_strings())
+
+	def _get_agent_history_item_strings(self) -> list[str]:
+		"""History items to show the model, respecting max_history_items limit"""
+		history_items = self._get_compacted_history_item_strings()
 		if self.max_history_items is None:
 			# Include all items
-			return '\n'.join(item.to_string() for item in self.state.agent_history_items)
+			return history_items
 
-		total_items = len(self.state.agent_history_items)
+		total_items = len(history_items)
 
 		# If we have fewer items than the limit, just return all items
 		if total_items <= self.max_history_items:
-			return '\n'.join(item.to_string() for item in self.state.agent_history_items)
+			return history_items
 
 		# We have more items than the limit, so we need to omit some
 		omitted_count = total_items - self.max_history_items
@@ -154,13 +173,33 @@ class MessageManager:
 		recent_items_count = self.max_history_items - 1  # -1 for first item
 
 		items_to_include = [
-			self.state.agent_history_items[0].to_string(),  # Keep first item (initialization)
+			history_items[0],  # Keep first item (initialization)
 			f'<sys>[... {omitted_count} previous steps omitted...]</sys>',
 		]
 		# Add most recent items
-		items_to_include.extend([item.to_string() for item in self.state.agent_history_items[-recent_items_count:]])
-
-		return '\n'.join(items_to_include)
+		items_to_include.extend(history_items[-recent_items_count:])
+
+		return items_to_include
+
+	def _get_compacted_history_item_strings(self) -> list[str]:
+		"""History items as strings, with spans older than the recent ones replaced by their summaries"""
+		items = self.state.agent_history_items
+		if self.history_compactor is None or not self.state.history_summaries:
+			return [item.to_string() for item in items]
+
+		verbatim_from = len(items) - self.history_compactor.keep_recent
+		summaries = {summary.start_index: summary for summary in self.state.history_summaries}
+		history_items: list[str] = []
+		index = 0
+		while index < len(items):
+			summary = summaries.get(index)
+			if summary is not None and summary.end_index <= verbatim_from:
+				history_items.append(summary.to_string())
+				index = summary.end_index
+			else:
+				history_items.append(items[index].to_string())
+				index += 1
+		return history_items
 
 	def add_new_task(self, new_task: str) -> None:
 		new_task = '<follow_up_user_request> ' + new_task.strip() + ' </follow_up_user_request>'
@@ -297,6 +336,9 @@ class MessageManager:
 
 		# First, update the agent history items with the latest step results
 		self._update_agent_history_description(model_output, result, step_info)
+		if self.history_compactor is not None:
+			# Summarize the next complete span in the background, before it ages out of the recent items
+			self.history_compactor.schedule(self.state)
 
 		# Use the passed sensitive_data parameter, falling back to instance variable
 		effective_sensitive_data = sensitive_data if sensitive_data is not None else self.sensitive_data
@@ -312,10 +354,12 @@ class MessageManager:
 
 		# Create single state message with all content
 		assert browser_state_summary
-		state_message = AgentMessagePrompt(
+		agent_history_items = self._get_agent_history_item_strings()
+		agent_message_prompt = AgentMessagePrompt(
 			browser_state_summary=browser_state_summary,
 			file_system=self.file_system,
-			agent_history_description=self.agent_history_description,
+			agent_history_description='\n'.join(agent_history_items),
+			agent_history_items=agent_history_items,
 			read_state_description=self.state.read_state_description,
 			task=self.task,
 			include_attributes=self.include_attributes,
@@ -327,11 +371,28 @@ class MessageManager:
 			vision_detail_level=self.vision_detail_level,
 			include_recent_events=self.include_recent_events,
 			sample_images=self.sample_images,
-		).get_user_message(use_vision)
+			context_budget=self.context_budget,
+		)
+
+		if self.message_layout == 'stable_prefix':
+			# Append-only history in its own cached message ahead of the volatile state, so its prefix can be reused
+			*history_messages, state_message = agent_message_prompt.get_user_messages(use_vision)
+			self.state.history.history_message = history_messages[0] if history_messages else None
+		else:
+			state_message = agent_message_prompt.get_user_message(use_vision)
+			self.state.history.history_message = None
 
 		# Set the state message with caching enabled
 		self._set_message_with_type(state_message, 'state')
 
+		report = agent_message_prompt.context_budget_report
+		if report is not None:
+			self.last_context_budget_report = report
+			if report.over_budget:
+				logger.warning(f'⚠️ Step does not fit the context budget even after trimming: {report}')
+			else:
+				logger.debug(f'📏 Context budget: {report}')
+
 	def _log_history_lines(self) -> str:
 		"""Generate a formatted log string of message history for debugging / printing to terminal"""
 		# TODO: fix logging
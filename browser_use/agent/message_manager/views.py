@@ -65,19 +65,38 @@ class HistoryItem(BaseModel):
 </{step_str}>"""
 
 
+class HistorySummary(BaseModel):
+	"""LLM-written summary that replaces agent_history_items[start_index:end_index] in the prompt"""
+
+	start_index: int
+	end_index: int
+	first_step: int | None = None
+	last_step: int | None = None
+	summary: str
+
+	def to_string(self) -> str:
+		"""Get string representation of the summary"""
+		if self.first_step is not None and self.last_step is not None:
+			return f'<summary steps="{self.first_step}-{self.last_step}">\n{self.summary}\n</summary>'
+		return f'<summary>\n{self.summary}\n</summary>'
+
+
 class MessageHistory(BaseModel):
 	"""History of messages"""
 
 	system_message: BaseMessage | None = None
+	history_message: BaseMessage | None = None  # only used by the 'stable_prefix' message layout
 	state_message: BaseMessage | None = None
 	context_messages: list[BaseMessage] = Field(default_factory=list)
 	model_config = ConfigDict(arbitrary_types_allowed=True)
 
 	def get_messages(self) -> list[BaseMessage]:
-		"""Get all messages in the correct order: system -> state -> contextual"""
+		"""Get all messages in the correct order: system -> history -> state -> contextual"""
 		messages = []
 		if self.system_message:
 			messages.append(self.system_message)
+		if self.history_message:
+			messages.append(self.history_message)
 		if self.state_message:
 			messages.append(self.state_message)
 		messages.extend(self.context_messages)
@@ -94,5 +113,7 @@ class MessageManagerState(BaseModel):
 		default_factory=lambda: [HistoryItem(step_number=0, system_message='Agent initialized')]
 	)
 	read_state_description: str = ''
+	# Summaries of older history spans, cached so a resumed agent doesn't recompute them
+	history_summaries: list[HistorySummary] = Field(default_factory=list)
 
 	model_config = ConfigDict(arbitrary_types_allowed=True)
@@ -2,10 +2,18 @@ import importlib.resources
 from datetime import datetime
 from typing import TYPE_CHECKING, Literal, Optional
 
+from browser_use.agent.context_budget import (
+	DEFAULT_IMAGE_SIZE,
+	ContextBudget,
+	ContextBudgetReport,
+	estimate_image_tokens,
+	estimate_tokens,
+	get_image_size,
+)
 from browser_use.dom.views import NodeType, SimplifiedNode
 from browser_use.llm.messages import ContentPartImageParam, ContentPartTextParam, ImageURL, SystemMessage, UserMessage
 from browser_use.observability import observe_debug
-from browser_use.utils import is_new_tab_page
+from browser_use.utils import get_base64_image_media_type, is_new_tab_page
 
 if TYPE_CHECKING:
 	from browser_use.agent.views import AgentStepInfo
@@ -83,6 +91,7 @@ class AgentMessagePrompt:
 		browser_state_summary: 'BrowserStateSummary',
 		file_system: 'FileSystem',
 		agent_history_description: str | None = None,
+		agent_history_items: list[str] | None = None,
 		read_state_description: str | None = None,
 		task: str | None = None,
 		include_attributes: list[str] | None = None,
@@ -95,10 +104,12 @@ class AgentMessagePrompt:
 		vision_detail_level: Literal['auto', 'low', 'high'] = 'auto',
 		include_recent_events: bool = False,
 		sample_images: list[ContentPartTextParam | ContentPartImageParam] | None = None,
+		context_budget: ContextBudget | None = None,
 	):
 		self.browser_state: 'BrowserStateSummary' = browser_state_summary
 		self.file_system: 'FileSystem | None' = file_system
 		self.agent_history_description: str | None = agent_history_description
+		self.agent_history_items: list[str] = agent_history_items or []
 		self.read_state_description: str | None = read_state_description
 		self.task: str | None = task
 		self.include_attributes = include_attributes
@@ -111,6 +122,9 @@ class AgentMessagePrompt:
 		self.vision_detail_level = vision_detail_level
 		self.include_recent_events = include_recent_events
 		self.sample_images = sample_images or []
+		self.context_budget = context_budget
+		self.context_budget_report: ContextBudgetReport | None = None
+		self._budgeted_elements_text: str | None = None
 		assert self.browser_state
 
 	def _extract_page_statistics(self) -> dict[str, int]:
@@ -200,13 +214,19 @@ class AgentMessagePrompt:
 		stats_text += f', {page_stats["total_elements"]} total elements'
 		stats_text += '</page_stats>\n\n'
 
-		elements_text = self.browser_state.dom_state.llm_representation(include_attributes=self.include_attributes)
-
-		if len(elements_text) > self.max_clickable_elements_length:
-			elements_text = elements_text[: self.max_clickable_elements_length]
-			truncated_text = f' (truncated to {self.max_clickable_elements_length} characters)'
+		if self._budgeted_elements_text is not None:
+			# Already fitted by the context budget, which also applies max_clickable_elements_length
+			elements_text = self._budgeted_elements_text
+			report = self.context_budget_report
+			truncated_text = ' (trimmed to fit the context budget)' if report and report.trimmed.get('elements') else ''
 		else:
-			truncated_text = ''
+			elements_text = self.browser_state.dom_state.llm_representation(include_attributes=self.include_attributes)
+
+			if len(elements_text) > self.max_clickable_elements_length:
+				elements_text = elements_text[: self.max_clickable_elements_length]
+				truncated_text = f' (truncated to {self.max_clickable_elements_length} characters)'
+			else:
+				truncated_text = ''
 
 		has_content_above = False
 		has_content_below = False
@@ -315,9 +335,7 @@ Available tabs:
 			agent_state += f'<available_file_paths>\n{available_file_paths_text}\nUse absolute full paths when referencing these files.\n</available_file_paths>\n'
 		return agent_state
 
-	@observe_debug(ignore_input=True, ignore_output=True, name='get_user_message')
-	def get_user_message(self, use_vision: bool = True) -> UserMessage:
-		"""Get complete state as a single cached message"""
+	def _should_use_vision(self, use_vision: bool) -> bool:
 		# Don't pass screenshot to model if page is a new tab page, step is 0, and there's only one tab
 		if (
 			is_new_tab_page(self.browser_state.url)
@@ -325,15 +343,50 @@ Available tabs:
 			and self.step_info.step_number == 0
 			and len(self.browser_state.tabs) == 1
 		):
-			use_vision = False
-
-		# Build complete state description
-		state_description = (
-			'<agent_history>\n'
-			+ (self.agent_history_description.strip('\n') if self.agent_history_description else '')
-			+ '\n</agent_history>\n\n'
+			return False
+		return use_vision
+
+	def _estimate_image_tokens(self, use_vision: bool) -> int:
+		if not (use_vision and self.screenshots):
+			return 0
+		page_info = self.browser_state.page_info
+		default_size = (page_info.viewport_width, page_info.viewport_height) if page_info else DEFAULT_IMAGE_SIZE
+		images = self.screenshots + [part.image_url.url for part in self.sample_images if isinstance(part, ContentPartImageParam)]
+		return sum(estimate_image_tokens(*(get_image_size(image) or default_size), self.vision_detail_level) for image in images)
+
+	def _apply_context_budget(self, use_vision: bool) -> None:
+		"""Fit the history, elements and read state into the context budget, once, before the message is built."""
+		if self.context_budget is None or self.context_budget_report is not None:
+			return
+
+		self._budgeted_elements_text = ''  # measure the browser state without its elements
+		fixed_tokens = {
+			'state': estimate_tokens(self._get_agent_state_description())
+			+ estimate_tokens(self._get_browser_state_description())
+			+ estimate_tokens(self.page_filtered_actions),
+			'images': self._estimate_image_tokens(use_vision),
+		}
+		history_items = self.agent_history_items or ([self.agent_history_description] if self.agent_history_description else [])
+		budgeted = self.context_budget.fit(
+			history_items=history_items,
+			elements_text=self.browser_state.dom_state.llm_representation(include_attributes=self.include_attributes),
+			read_state=self.read_state_description or '',
+			fixed_tokens=fixed_tokens,
+			selector_map=self.browser_state.dom_state.selector_map,
+			page_info=self.browser_state.page_info,
+			max_elements_chars=self.max_clickable_elements_length,
 		)
-		state_description += '<agent_state>\n' + self._get_agent_state_description().strip('\n') + '\n</agent_state>\n'
+		if budgeted.history_items != history_items:
+			self.agent_history_description = '\n'.join(budgeted.history_items)
+			if self.agent_history_items:
+				self.agent_history_items = budgeted.history_items
+		self.read_state_description = budgeted.read_state
+		self._budgeted_elements_text = budgeted.elements_text
+		self.context_budget_report = budgeted.report
+
+	def _get_state_description(self) -> str:
+		"""Everything after the agent history: agent state, browser state, read state and page specific actions."""
+		state_description = '<agent_state>\n' + self._get_agent_state_description().strip('\n') + '\n</agent_state>\n'
 		state_description += '<browser_state>\n' + self._get_browser_state_description().strip('\n') + '\n</browser_state>\n'
 		# Only add read_state if it has content
 		read_state_description = self.read_state_description.strip('\n').strip() if self.read_state_description else ''
@@ -344,36 +397,82 @@ Available tabs:
 			state_description += '<page_specific_actions>\n'
 			state_description += self.page_filtered_actions + '\n'
 			state_description += '</page_specific_actions>\n'
+		return state_description
 
-		if use_vision is True and self.screenshots:
-			# Start with text description
-			content_parts: list[ContentPartTextParam | ContentPartImageParam] = [ContentPartTextParam(text=state_description)]
-
-			# Add sample images
-			content_parts.extend(self.sample_images)
-
-			# Add screenshots with labels
-			for i, screenshot in enumerate(self.screenshots):
-				if i == len(self.screenshots) - 1:
-					label = 'Current screenshot:'
-				else:
-					# Use simple, accurate labeling since we don't have actual step timing info
-					label = 'Previous screenshot:'
-
-				# Add label as text content
-				content_parts.append(ContentPartTextParam(text=label))
-
-				# Add the screenshot
-				content_parts.append(
-					ContentPartImageParam(
-						image_url=ImageURL(
-							url=f'data:image/png;base64,{screenshot}',
-							media_type='image/png',
-							detail=self.vision_detail_level,
-						),
-					)
+	def _get_content_with_screenshots(
+		self, text_parts: list[ContentPartTextParam], use_vision: bool
+	) -> str | list[ContentPartTextParam | ContentPartImageParam]:
+		if not (use_vision is True and self.screenshots):
+			return ''.join(part.text for part in text_parts)
+
+		# Start with text description
+		content_parts: list[ContentPartTextParam | ContentPartImageParam] = list(text_parts)
+
+		# Add sample images
+		content_parts.extend(self.sample_images)
+
+		# Add screenshots with labels
+		for i, screenshot in enumerate(self.screenshots):
+			if i == len(self.screenshots) - 1:
+				label = 'Current screenshot:'
+			else:
+				# Use simple, accurate labeling since we don't have actual step timing info
+				label = 'Previous screenshot:'
+
+			# Add label as text content
+			content_parts.append(ContentPartTextParam(text=label))
+
+			# Add the screenshot
+			media_type = get_base64_image_media_type(screenshot)
+			content_parts.append(
+				ContentPartImageParam(
+					image_url=ImageURL(
+						url=f'data:{media_type};base64,{screenshot}',
+						media_type=media_type,
+						detail=self.vision_detail_level,
+					),
 				)
+			)
+		return content_parts
+
+	@observe_debug(ignore_input=True, ignore_output=True, name='get_user_message')
+	def get_user_message(self, use_vision: bool = True) -> UserMessage:
+		"""Get complete state as a single cached message"""
+		use_vision = self._should_use_vision(use_vision)
+		self._apply_context_budget(use_vision)
+
+		# Build complete state description
+		state_description = (
+			'<agent_history>\n'
+			+ (self.agent_history_description.strip('\n') if self.agent_history_description else '')
+			+ '\n</agent_history>\n\n'
+		)
+		state_description += self._get_state_description()
 
-			return UserMessage(content=content_parts, cache=True)
+		return UserMessage(
+			content=self._get_content_with_screenshots([ContentPartTextParam(text=state_description)], use_vision), cache=True
+		)
+
+	@observe_debug(ignore_input=True, ignore_output=True, name='get_user_messages')
+	def get_user_messages(self, use_vision: bool = True) -> list[UserMessage]:
+		"""Get the same state as get_user_message(), split so provider prompt caching can reuse the agent history.
 
-		return UserMessage(content=state_description, cache=True)
+		The agent history is append-only, so it is sent first as its own message with one text part per history item:
+		every step's history message starts with the exact bytes of the previous one. It carries the cache breakpoint,
+		the volatile agent and browser state follows in an uncached message. Concatenated, the text is identical to
+		get_user_message().
+		"""
+		if not self.agent_history_items:
+			return [self.get_user_message(use_vision)]
+		use_vision = self._should_use_vision(use_vision)
+		self._apply_context_budget(use_vision)
+
+		history_parts = [ContentPartTextParam(text='<agent_history>\n' + self.agent_history_items[0])]
+		history_parts += [ContentPartTextParam(text='\n' + item) for item in self.agent_history_items[1:]]
+		history_message = UserMessage(content=history_parts, cache=True)
+
+		state_description = '\n</agent_history>\n\n' + self._get_state_description()
+		state_message = UserMessage(
+			content=self._get_content_with_screenshots([ContentPartTextParam(text=state_description)], use_vision)
+		)
+		return [history_message, state_message]
@@ -21,6 +21,7 @@ from browser_use.agent.cloud_events import (
 	CreateAgentTaskEvent,
 	UpdateAgentTaskEvent,
 )
+from browser_use.agent.context_budget import get_model_context_budget
 from browser_use.agent.message_manager.utils import save_conversation
 from browser_use.llm.base import BaseChatModel
 from browser_use.llm.messages import BaseMessage, ContentPartImageParam, ContentPartTextParam, UserMessage
@@ -37,6 +38,7 @@ from browser_use import Browser, BrowserProfile, BrowserSession
 
 # Lazy import for gif to avoid heavy agent.views import at startup
 # from browser_use.agent.gif import create_history_gif
+from browser_use.agent.message_manager.compaction import HistoryCompactor
 from browser_use.agent.message_manager.service import (
 	MessageManager,
 )
@@ -176,6 +178,13 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		display_files_in_done_text: bool = True,
 		include_tool_call_examples: bool = False,
 		vision_detail_level: Literal['auto', 'low', 'high'] = 'auto',
+		message_layout: Literal['single', 'stable_prefix'] = 'single',
+		max_context_tokens: int | Literal['auto'] | None = None,
+		history_compaction_keep_recent: int | None = None,
+		history_compaction_chunk_size: int = 10,
+		history_compaction_llm: BaseChatModel | None = None,
+		speculative_prefetch: bool = False,
+		screenshot_thumbnail_size: tuple[int, int] | None = None,
 		llm_timeout: int | None = None,
 		step_timeout: int = 120,
 		directly_open_url: bool = True,
@@ -204,6 +213,8 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 
 		if page_extraction_llm is None:
 			page_extraction_llm = llm
+		if history_compaction_llm is None:
+			history_compaction_llm = page_extraction_llm
 		if available_file_paths is None:
 			available_file_paths = []
 
@@ -224,6 +235,9 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 
 			llm_timeout = _get_model_timeout(llm)
 
+		if max_context_tokens == 'auto':
+			max_context_tokens = get_model_context_budget(llm.model)
+
 		self.id = task_id or uuid7str()
 		self.task_id: str = self.id
 		self.session_id: str = uuid7str()
@@ -282,6 +296,13 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			page_extraction_llm=page_extraction_llm,
 			calculate_cost=calculate_cost,
 			include_tool_call_examples=include_tool_call_examples,
+			message_layout=message_layout,
+			max_context_tokens=max_context_tokens,
+			history_compaction_keep_recent=history_compaction_keep_recent,
+			history_compaction_chunk_size=history_compaction_chunk_size,
+			history_compaction_llm=history_compaction_llm,
+			speculative_prefetch=speculative_prefetch,
+			screenshot_thumbnail_size=screenshot_thumbnail_size,
 			llm_timeout=llm_timeout,
 			step_timeout=step_timeout,
 			final_response_after_failure=final_response_after_failure,
@@ -291,6 +312,7 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		self.token_cost_service = TokenCost(include_cost=calculate_cost)
 		self.token_cost_service.register_llm(llm)
 		self.token_cost_service.register_llm(page_extraction_llm)
+		self.token_cost_service.register_llm(history_compaction_llm)
 
 		# Initialize state
 		self.state = injected_agent_state or AgentState()
@@ -372,6 +394,15 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			include_tool_call_examples=self.settings.include_tool_call_examples,
 			include_recent_events=self.include_recent_events,
 			sample_images=self.sample_images,
+			message_layout=self.settings.message_layout,
+			max_context_tokens=self.settings.max_context_tokens,
+			history_compactor=HistoryCompactor(
+				llm=history_compaction_llm,
+				keep_recent=self.settings.history_compaction_keep_recent,
+				chunk_size=self.settings.history_compaction_chunk_size,
+			)
+			if self.settings.history_compaction_keep_recent is not None
+			else None,
 		)
 
 		if self.sensitive_data:
@@ -460,6 +491,14 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		self._external_pause_event = asyncio.Event()
 		self._external_pause_event.set()
 
+		# Speculative work overlapping post-processing and the LLM call (speculative_prefetch=True)
+		self._state_prefetch: asyncio.Task[tuple[BrowserStateSummary, str | None, float, float] | None] | None = None
+		self._markdown_warmup: asyncio.Task[tuple[float, float] | None] | None = None
+		# extract_links of the warmup conversion, markdown is cached per extract_links value. The tool tells the model to
+		# only set it when the query needs links, so warming up without links matches most extractions
+		self._markdown_warmup_extract_links = False
+		self._step_overlap_seconds = 0.0
+
 	@property
 	def logger(self) -> logging.Logger:
 		"""Get instance-specific logger with task ID in the name"""
@@ -558,7 +597,9 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		try:
 			from browser_use.screenshots.service import ScreenshotService
 
-			self.screenshot_service = ScreenshotService(self.agent_directory)
+			self.screenshot_service = ScreenshotService(
+				self.agent_directory, thumbnail_size=self.settings.screenshot_thumbnail_size
+			)
 			logger.debug(f'📸 Screenshot service initialized in: {self.agent_directory}/screenshots')
 		except Exception as e:
 			logger.error(f'📸 Failed to initialize screenshot service: {e}.')
@@ -597,24 +638,30 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 
 	def _setup_action_models(self) -> None:
 		"""Setup dynamic action models from tools registry"""
+		# AgentOutput models per action model, the registry returns the same action model for the same set of actions
+		self._agent_output_models: dict[type[ActionModel], type[AgentOutput]] = {}
+
 		# Initially only include actions with no filters
 		self.ActionModel = self.tools.registry.create_action_model()
 		# Create output model with the dynamic actions
-		if self.settings.flash_mode:
-			self.AgentOutput = AgentOutput.type_with_custom_actions_flash_mode(self.ActionModel)
-		elif self.settings.use_thinking:
-			self.AgentOutput = AgentOutput.type_with_custom_actions(self.ActionModel)
-		else:
-			self.AgentOutput = AgentOutput.type_with_custom_actions_no_thinking(self.ActionModel)
+		self.AgentOutput = self._get_agent_output_model(self.ActionModel)
 
 		# used to force the done action when max_steps is reached
 		self.DoneActionModel = self.tools.registry.create_action_model(include_actions=['done'])
-		if self.settings.flash_mode:
-			self.DoneAgentOutput = AgentOutput.type_with_custom_actions_flash_mode(self.DoneActionModel)
-		elif self.settings.use_thinking:
-			self.DoneAgentOutput = AgentOutput.type_with_custom_actions(self.DoneActionModel)
-		else:
-			self.DoneAgentOutput = AgentOutput.type_with_custom_actions_no_thinking(self.DoneActionModel)
+		self.DoneAgentOutput = self._get_agent_output_model(self.DoneActionModel)
+
+	def _get_agent_output_model(self, action_model: type[ActionModel]) -> type[AgentOutput]:
+		"""Get the AgentOutput model for the given action model, reusing the class built for it on earlier steps"""
+		agent_output = self._agent_output_models.get(action_model)
+		if agent_output is None:
+			if self.settings.flash_mode:
+				agent_output = AgentOutput.type_with_custom_actions_flash_mode(action_model)
+			elif self.settings.use_thinking:
+				agent_output = AgentOutput.type_with_custom_actions(action_model)
+			else:
+				agent_output = AgentOutput.type_with_custom_actions_no_thinking(action_model)
+			self._agent_output_models[action_model] = agent_output
+		return agent_output
 
 	def add_new_task(self, new_task: str) -> None:
 		"""Add a new task to the agent, keeping the same task_id as tasks are continuous"""
@@ -653,6 +700,7 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		# Initialize timing first, before any exceptions can occur
 
 		self.step_start_time = time.time()
+		self._step_overlap_seconds = 0.0
 
 		browser_state_summary = None
 
@@ -683,10 +731,12 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		self.logger.debug(f'🌐 Step {self.state.n_steps}: Getting browser state...')
 		# Always take screenshots for all steps
 		self.logger.debug('📸 Requesting browser state with include_screenshot=True')
-		browser_state_summary = await self.browser_session.get_browser_state_summary(
-			include_screenshot=True,  # always capture even if use_vision=False so that cloud sync is useful (it's fast now anyway)
-			include_recent_events=self.include_recent_events,
-		)
+		browser_state_summary = await self._get_prefetched_browser_state()
+		if browser_state_summary is None:
+			browser_state_summary = await self.browser_session.get_browser_state_summary(
+				include_screenshot=True,  # always capture even if use_vision=False so that cloud sync is useful (it's fast now anyway)
+				include_recent_events=self.include_recent_events,
+			)
 		if browser_state_summary.screenshot:
 			self.logger.debug(f'📸 Got browser state WITH screenshot, length: {len(browser_state_summary.screenshot)}')
 		else:
@@ -729,6 +779,7 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		self.logger.debug(
 			f'🤖 Step {self.state.n_steps}: Calling LLM with {len(input_messages)} messages (model: {self.llm.model})...'
 		)
+		self._start_markdown_warmup(browser_state_summary)
 
 		try:
 			model_output = await asyncio.wait_for(
@@ -748,6 +799,7 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			)
 
 		self.state.last_model_output = model_output
+		await self._finish_markdown_warmup(model_output.action)
 
 		# Check again for paused/stopped state after getting model output
 		await self._raise_if_stopped_or_paused()
@@ -768,6 +820,92 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		self.logger.debug(f'✅ Step {self.state.n_steps}: Actions completed')
 
 		self.state.last_result = result
+		if not (result and result[-1].is_done):
+			self._start_state_prefetch()
+
+	def _start_state_prefetch(self) -> None:
+		"""Start building the next step's browser state right after the actions, overlapping post-processing"""
+		if not self.settings.speculative_prefetch or self._state_prefetch is not None:
+			return
+
+		async def prefetch() -> tuple[BrowserStateSummary, str | None, float, float] | None:
+			started_at = time.time()
+			try:
+				browser_state_summary = await self.browser_session.get_browser_state_summary(
+					include_screenshot=True, include_recent_events=self.include_recent_events
+				)
+			except Exception as e:
+				self.logger.debug(f'Speculative browser state fetch failed: {type(e).__name__}: {e}')
+				return None
+			target_id = self.browser_session.agent_focus.target_id if self.browser_session.agent_focus else None
+			return browser_state_summary, target_id, started_at, time.time()
+
+		self._state_prefetch = asyncio.create_task(prefetch(), name='browser_state_prefetch')
+
+	async def _get_prefetched_browser_state(self) -> BrowserStateSummary | None:
+		"""The browser state prefetched after the previous step's actions, if the agent is still on that page"""
+		task, self._state_prefetch = self._state_prefetch, None
+		if task is None:
+			return None
+		requested_at = time.time()
+		prefetched = await task
+		if prefetched is None:
+			return None
+		browser_state_summary, target_id, started_at, finished_at = prefetched
+
+		# on_step_end / on_step_start hooks may have navigated or switched tabs in the meantime
+		focus_target_id = self.browser_session.agent_focus.target_id if self.browser_session.agent_focus else None
+		if focus_target_id != target_id or await self.browser_session.get_current_page_url() != browser_state_summary.url:
+			self.logger.debug('🔮 Prefetched browser state is outdated, fetching it again')
+			return None
+
+		self._step_overlap_seconds += max(0.0, min(finished_at, requested_at) - started_at)
+		self.logger.debug(f'🔮 Using prefetched browser state ({max(0.0, finished_at - requested_at):.2f}s left to wait)')
+		return browser_state_summary
+
+	def _start_markdown_warmup(self, browser_state_summary: BrowserStateSummary) -> None:
+		"""Convert the current page to markdown while the LLM is thinking, in case it asks to extract from it"""
+		if not self.settings.speculative_prefetch or self._markdown_warmup is not None:
+			return
+		if browser_state_summary.url.lower().split(':', 1)[0] not in ('http', 'https'):
+			return
+
+		async def warm_up() -> tuple[float, float] | None:
+			started_at = time.time()
+			try:
+				await self.tools.extract_clean_markdown(self.browser_session, extract_links=self._markdown_warmup_extract_links)
+			except Exception as e:
+				self.logger.debug(f'Markdown warmup failed: {type(e).__name__}: {e}')
+				return None
+			return started_at, time.time()
+
+		self._markdown_warmup = asyncio.create_task(warm_up(), name='markdown_warmup')
+
+	async def _finish_markdown_warmup(self, actions: list[ActionModel] | None) -> None:
+		"""Let the warmup finish if the model asked to extract from the page with the same extract_links, cancel it otherwise
+
+		The markdown is cached per extract_links value, an extraction with the other value can't use the warmup's conversion.
+		"""
+		task, self._markdown_warmup = self._markdown_warmup, None
+		if task is None:
+			return
+		dumped_actions = [action.model_dump(exclude_unset=True) for action in actions or []]
+		extractions = [params['extract_structured_data'] for params in dumped_actions if 'extract_structured_data' in params]
+		if not any(params.get('extract_links') == self._markdown_warmup_extract_links for params in extractions):
+			task.cancel()
+			return
+		returned_at = time.time()
+		warmed_up = await task
+		if warmed_up is not None:
+			started_at, finished_at = warmed_up
+			self._step_overlap_seconds += max(0.0, min(finished_at, returned_at) - started_at)
+
+	async def _cancel_speculative_tasks(self) -> None:
+		tasks = [task for task in (self._state_prefetch, self._markdown_warmup) if task is not None]
+		self._state_prefetch = self._markdown_warmup = None
+		for task in tasks:
+			task.cancel()
+		await asyncio.gather(*tasks, return_exceptions=True)
 
 	async def _post_process(self) -> None:
 		"""Handle post-action processing like download tracking and result logging"""
@@ -828,6 +966,7 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 
 	async def _finalize(self, browser_state_summary: BrowserStateSummary | None) -> None:
 		"""Finalize the step with history, logging, and events"""
+		await self._finish_markdown_warmup(None)
 		step_end_time = time.time()
 		if not self.state.last_result:
 			return
@@ -837,6 +976,9 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 				step_number=self.state.n_steps,
 				step_start_time=self.step_start_time,
 				step_end_time=step_end_time,
+				prefetch_overlap_seconds=self._step_overlap_seconds if self.settings.speculative_prefetch else None,
+				page_load_wait_seconds=browser_state_summary.page_load_wait,
+				page_load_wait_reason=browser_state_summary.page_load_wait_reason,
 			)
 
 			# Use _make_history_item like main branch
@@ -1284,8 +1426,9 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		status_parts = [part for part in [success_indicator, failure_indicator] if part]
 		status_str = ' | '.join(status_parts) if status_parts else '✅ 0'
 
+		overlap_str = f' (⚡ {self._step_overlap_seconds:.2f}s overlapped)' if self._step_overlap_seconds else ''
 		self.logger.debug(
-			f'📍 Step {self.state.n_steps}: Ran {action_count} action{"" if action_count == 1 else "s"} in {step_duration:.2f}s: {status_str}'
+			f'📍 Step {self.state.n_steps}: Ran {action_count} action{"" if action_count == 1 else "s"} in {step_duration:.2f}s{overlap_str}: {status_str}'
 		)
 
 	def _log_agent_event(self, max_steps: int, agent_run_error: str | None = None) -> None:
@@ -1474,6 +1617,8 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 					self.logger.debug(f'⏸️ Step {step}: Agent paused, waiting to resume...')
 					await self._external_pause_event.wait()
 					signal_handler.reset()
+					# The page may have been used while paused, don't trust a state fetched before
+					await self._cancel_speculative_tasks()
 
 				# Check if we should stop due to too many failures, if final_response_after_failure is True, we try one last time
 				if (self.state.consecutive_failures) >= self.settings.max_failures + int(
@@ -1550,6 +1695,14 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			if self.history._output_model_schema is None and self.output_model_schema is not None:
 				self.history._output_model_schema = self.output_model_schema
 
+			# Let a history summary still being written land in the final AgentState (synced when the run ends, and what
+			# a resumed run is started from). Only briefly: if it takes longer, close() cancels it and a resumed run redoes it
+			if self._message_manager.history_compactor is not None:
+				try:
+					await asyncio.wait_for(self._message_manager.history_compactor.wait(), timeout=5.0)
+				except TimeoutError:
+					self.logger.debug('History summary not ready when the run ended, leaving it to the next run')
+
 			self.logger.debug('🏁 Agent.run() completed successfully')
 			return self.history
 
@@ -1638,19 +1791,32 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 
 		assert self.browser_session is not None, 'BrowserSession is not set up'
 		try:
-			if (
-				self.browser_session._cached_browser_state_summary is not None
-				and self.browser_session._cached_browser_state_summary.dom_state is not None
-			):
-				cached_selector_map = dict(self.browser_session._cached_browser_state_summary.dom_state.selector_map)
+			cached_state = self.browser_session._cached_browser_state_summary
+			if cached_state is not None and cached_state.dom_state is not None:
+				cached_selector_map = dict(cached_state.dom_state.selector_map)
 				cached_element_hashes = {e.parent_branch_hash() for e in cached_selector_map.values()}
+				cached_dom_change_counter = cached_state.dom_change_counter
 			else:
 				cached_selector_map = {}
 				cached_element_hashes = set()
+				cached_dom_change_counter = None
 		except Exception as e:
 			self.logger.error(f'Error getting cached selector map: {e}')
 			cached_selector_map = {}
 			cached_element_hashes = set()
+			cached_dom_change_counter = None
+
+		# Page-wide DOM change counter, lets index revalidation skip full DOM rebuilds while the page doesn't change.
+		# The baseline is the value read when the cached DOM was built, so changes while the LLM was thinking count too.
+		# Changes inside cross-origin iframes and closed shadow roots can't be counted: always rebuild if any element is there
+		current_selector_map = cached_selector_map
+		dom_change_counter = None
+		if (
+			cached_selector_map
+			and any(action.get_index() is not None for action in actions[1:])
+			and all(self.browser_session.is_observed_by_dom_change_counter(node) for node in cached_selector_map.values())
+		):
+			dom_change_counter = cached_dom_change_counter
 
 		for i, action in enumerate(actions):
 			if i > 0:
@@ -1663,10 +1829,25 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			# DOM synchronization check - verify element indexes are still valid AFTER first action
 			# This prevents stale element detection but doesn't refresh before execution
 			if action.get_index() is not None and i != 0:
-				new_browser_state_summary = await self.browser_session.get_browser_state_summary(
-					include_screenshot=False,
-				)
-				new_selector_map = new_browser_state_summary.dom_state.selector_map
+				# Cheap probe first: while the DOM change counter doesn't move and the target element is still attached,
+				# the selector map of the last DOM build is still accurate and rebuilding the whole DOM can be skipped
+				current_target = current_selector_map.get(action.get_index())  # type: ignore
+				if (
+					dom_change_counter is not None
+					and current_target is not None
+					and await self.browser_session.get_dom_change_counter() == dom_change_counter
+					and await self.browser_session.is_element_attached(current_target)
+				):
+					new_selector_map = current_selector_map
+				else:
+					new_browser_state_summary = await self.browser_session.get_browser_state_summary(
+						include_screenshot=False,
+					)
+					new_selector_map = new_browser_state_summary.dom_state.selector_map
+					current_selector_map = new_selector_map
+					# The rebuilt DOM carries the counter read when its build started, probe against that from now on
+					if dom_change_counter is not None:
+						dom_change_counter = new_browser_state_summary.dom_change_counter
 
 				# Detect index change after previous action
 				orig_target = cached_selector_map.get(action.get_index())
@@ -2026,6 +2207,13 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 	async def close(self):
 		"""Close all resources"""
 		try:
+			await self._cancel_speculative_tasks()
+			if self._message_manager.history_compactor is not None:
+				await self._message_manager.history_compactor.aclose()
+			if hasattr(self, 'cloud_sync') and self.cloud_sync is not None:
+				# Final flush of the background uploader, events were only queued until now
+				await self.cloud_sync.close()
+
 			# Only close browser if keep_alive is False (or not set)
 			if self.browser_session is not None:
 				if not self.browser_session.browser_profile.keep_alive:
@@ -2061,21 +2249,11 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		# Create new action model with current page's filtered actions
 		self.ActionModel = self.tools.registry.create_action_model(page_url=page_url)
 		# Update output model with the new actions
-		if self.settings.flash_mode:
-			self.AgentOutput = AgentOutput.type_with_custom_actions_flash_mode(self.ActionModel)
-		elif self.settings.use_thinking:
-			self.AgentOutput = AgentOutput.type_with_custom_actions(self.ActionModel)
-		else:
-			self.AgentOutput = AgentOutput.type_with_custom_actions_no_thinking(self.ActionModel)
+		self.AgentOutput = self._get_agent_output_model(self.ActionModel)
 
 		# Update done action model too
 		self.DoneActionModel = self.tools.registry.create_action_model(include_actions=['done'], page_url=page_url)
-		if self.settings.flash_mode:
-			self.DoneAgentOutput = AgentOutput.type_with_custom_actions_flash_mode(self.DoneActionModel)
-		elif self.settings.use_thinking:
-			self.DoneAgentOutput = AgentOutput.type_with_custom_actions(self.DoneActionModel)
-		else:
-			self.DoneAgentOutput = AgentOutput.type_with_custom_actions_no_thinking(self.DoneActionModel)
+		self.DoneAgentOutput = self._get_agent_output_model(self.DoneActionModel)
 
 	def get_trace_object(self) -> dict[str, Any]:
 		"""Get the trace and trace_details objects for the agent"""
@@ -24,6 +24,7 @@ from browser_use.dom.views import DEFAULT_INCLUDE_ATTRIBUTES, DOMInteractedEleme
 # from browser_use.dom.views import SelectorMap
 from browser_use.filesystem.file_system import FileSystemState
 from browser_use.llm.base import BaseChatModel
+from browser_use.screenshots.views import ScreenshotRef
 from browser_use.tokens.views import UsageSummary
 from browser_use.tools.registry.views import ActionModel
 
@@ -50,6 +51,15 @@ class AgentSettings(BaseModel):
 	page_extraction_llm: BaseChatModel | None = None
 	calculate_cost: bool = False
 	include_tool_call_examples: bool = False
+	message_layout: Literal['single', 'stable_prefix'] = (
+		'single'  # 'stable_prefix' sends the agent history as its own cached message
+	)
+	history_compaction_keep_recent: int | None = None  # If set, older history is folded into LLM summaries
+	history_compaction_chunk_size: int = 10
+	history_compaction_llm: BaseChatModel | None = None
+	speculative_prefetch: bool = False  # Overlap the next browser state fetch and markdown conversion with other work
+	max_context_tokens: int | None = None  # Token budget per step, trims off-viewport elements and old history to fit
+	screenshot_thumbnail_size: tuple[int, int] | None = None  # If set, also keep (width, height)-bounded screenshot thumbnails
 	llm_timeout: int = 60  # Timeout in seconds for LLM calls (auto-detected: 30s for gemini, 90s for o3, 60s default)
 	step_timeout: int = 180  # Timeout in seconds for each step
 	final_response_after_failure: bool = True  # If True, attempt one final recovery call after max_failures
@@ -132,6 +142,9 @@ class StepMetadata(BaseModel):
 	step_start_time: float
 	step_end_time: float
 	step_number: int
+	prefetch_overlap_seconds: float | None = None  # Browser state / markdown work that ran while the agent did other work
+	page_load_wait_seconds: float | None = None  # Page stability wait before this step's browser state was captured
+	page_load_wait_reason: str | None = None
 
 	@property
 	def duration_seconds(self) -> float:
@@ -522,16 +535,29 @@ class AgentHistoryList(BaseModel, Generic[AgentStructuredOutput]):
 			else:
 				return [h.state.screenshot_path for h in self.history[-n_last:] if h.state.screenshot_path is not None]
 
-	def screenshots(self, n_last: int | None = None, return_none_if_not_screenshot: bool = True) -> list[str | None]:
-		"""Get all screenshots from history as base64 strings"""
+	def screenshot_refs(
+		self, n_last: int | None = None, return_none_if_not_screenshot: bool = True
+	) -> list[ScreenshotRef | None]:
+		"""Get lazy handles to all screenshots from history, without reading any of them from disk"""
 		if n_last == 0:
 			return []
 
 		history_items = self.history if n_last is None else self.history[-n_last:]
+		refs = [item.state.get_screenshot_ref() for item in history_items]
+		return refs if return_none_if_not_screenshot else [ref for ref in refs if ref is not None]
+
+	def screenshots(self, n_last: int | None = None, return_none_if_not_screenshot: bool = True) -> list[str | None]:
+		"""Get all screenshots from history as base64 strings (prefer screenshot_refs() to avoid loading them all)"""
+		if n_last == 0:
+			return []
+
 		screenshots = []
+		encoded: dict[Path, str | None] = {}  # steps with identical frames share one stored file, encode it once
 
-		for item in history_items:
-			screenshot_b64 = item.state.get_screenshot()
+		for ref in self.screenshot_refs(n_last):
+			if ref is not None and ref.path not in encoded:
+				encoded[ref.path] = ref.to_base64()
+			screenshot_b64 = encoded[ref.path] if ref is not None else None
 			if screenshot_b64:
 				screenshots.append(screenshot_b64)
 			else:
@@ -0,0 +1,61 @@
+"""Fan-out registration for CDP events.
+
+cdp-use keeps a single callback per event method on each CDPClient, so a second
+``cdp_client.register.Domain.event(...)`` call silently replaces the first one.
+Components that only want to observe events (mutation trackers, stability monitors, ...)
+register through these helpers instead so they can coexist on the same client.
+This matters most with flat CDP sessions, where every target shares the root client.
+"""
+
+import asyncio
+import inspect
+import logging
+import weakref
+from collections.abc import Callable
+from typing import Any
+
+from cdp_use import CDPClient
+
+logger = logging.getLogger(__name__)
+
+CDPEventHandler = Callable[[Any, str | None], Any]
+
+# cdp_client -> {'Domain.event': [handlers...]}
+_HANDLERS: 'weakref.WeakKeyDictionary[CDPClient, dict[str, list[CDPEventHandler]]]' = weakref.WeakKeyDictionary()
+# strong references to the tasks of async handlers, so they aren't garbage collected mid-flight
+_PENDING_TASKS: set[asyncio.Task] = set()
+
+
+def add_cdp_event_handler(cdp_client: CDPClient, method: str, handler: CDPEventHandler) -> None:
+	"""Add a handler for a CDP event (e.g. 'Network.loadingFinished') without replacing existing ones.
+
+	Async handlers are scheduled as tasks, the dispatcher itself never awaits.
+	"""
+	client_handlers = _HANDLERS.setdefault(cdp_client, {})
+	handlers = client_handlers.get(method)
+	if handlers is None:
+		handlers = client_handlers[method] = []
+
+		def dispatch(event: Any, session_id: str | None = None) -> None:
+			for callback in list(handlers):
+				try:
+					result = callback(event, session_id)
+					if inspect.isawaitable(result):
+						task = asyncio.ensure_future(result)
+						_PENDING_TASKS.add(task)
+						task.add_done_callback(_PENDING_TASKS.discard)
+				except Exception as e:
+					logger.debug(f'CDP event handler for {method} failed: {type(e).__name__}: {e}')
+
+		domain, event_name = method.split('.', 1)
+		getattr(getattr(cdp_client.register, domain), event_name)(dispatch)
+
+	if handler not in handlers:
+		handlers.append(handler)
+
+
+def remove_cdp_event_handler(cdp_client: CDPClient, method: str, handler: CDPEventHandler) -> None:
+	"""Remove a handler previously added with add_cdp_event_handler (no-op if it isn't registered)."""
+	handlers = _HANDLERS.get(cdp_client, {}).get(method)
+	if handlers and handler in handlers:
+		handlers.remove(handler)
@@ -0,0 +1,232 @@
+"""Event-driven page stability detection.
+
+Replaces fixed "sleep and hope" waits before capturing browser state: a PageStabilityMonitor
+listens to Network request events, Page lifecycle events and DOM mutation events on one target
+session and resolves as soon as the page has gone quiet, using the configured wait times only
+as an upper bound.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from browser_use.browser.cdp_events import add_cdp_event_handler, remove_cdp_event_handler
+
+if TYPE_CHECKING:
+	from browser_use.browser.session import CDPSession
+
+# Only these resource types hold up stability, everything else (media streams, websockets,
+# EventSource, pings, prefetches, ...) can legitimately stay open forever
+RELEVANT_RESOURCE_TYPES = {'Document', 'Stylesheet', 'Image', 'Font', 'Script', 'XHR', 'Fetch'}
+
+# Background traffic that never affects what the agent sees on the page
+IGNORED_URL_PATTERNS = (
+	'analytics',
+	'telemetry',
+	'beacon',
+	'metrics',
+	'doubleclick',
+	'adsystem',
+	'adserver',
+	'advertising',
+	'facebook.com/plugins',
+	'platform.twitter',
+	'linkedin.com/embed',
+	'livechat',
+	'zendesk',
+	'intercom',
+	'crisp.chat',
+	'hotjar',
+	'push-notifications',
+	'onesignal',
+	'pushwoosh',
+	'heartbeat',
+)
+
+DOM_MUTATION_EVENTS = (
+	'DOM.childNodeInserted',
+	'DOM.childNodeRemoved',
+	'DOM.attributeModified',
+	'DOM.attributeRemoved',
+	'DOM.characterDataModified',
+	'DOM.documentUpdated',
+)
+
+
+@dataclass
+class PageStabilityResult:
+	"""Outcome of a single stability wait."""
+
+	waited: float
+	stable: bool
+	reason: str
+	pending_requests: int = 0
+	dom_mutations: int = 0
+
+	def __str__(self) -> str:
+		return f'{self.waited:.2f}s ({self.reason}, {self.pending_requests} pending requests, {self.dom_mutations} DOM mutations)'
+
+
+class PageStabilityMonitor:
+	"""Tracks in-flight requests, lifecycle and DOM mutations of one target session to detect when its page settles.
+
+	A page is considered stable once its main frame reached DOMContentLoaded, no relevant request is in flight
+	and neither the network nor the DOM changed for `quiet_period` seconds.
+	"""
+
+	def __init__(
+		self,
+		cdp_session: 'CDPSession',
+		logger: logging.Logger | None = None,
+		long_running_request_timeout: float = 2.0,
+	):
+		self.cdp_session = cdp_session
+		self.logger = logger or logging.getLogger(__name__)
+		# requests that have been open for longer than this are treated as long-polling and ignored
+		self.long_running_request_timeout = long_running_request_timeout
+
+		self.is_started = False
+		self.is_loaded = True
+		self.dom_mutation_count = 0
+		self.inflight_requests: dict[str, float] = {}  # requestId -> start time (monotonic)
+		self.last_activity = time.monotonic()
+
+		self._activity = asyncio.Event()
+		self._handlers: dict[str, Any] = {
+			'Network.requestWillBeSent': self._on_request_will_be_sent,
+			'Network.loadingFinished': self._on_request_done,
+			'Network.loadingFailed': self._on_request_done,
+			'Page.lifecycleEvent': self._on_lifecycle_event,
+			**{method: self._on_dom_mutation for method in DOM_MUTATION_EVENTS},
+		}
+
+	@property
+	def session_id(self) -> str:
+		return self.cdp_session.session_id
+
+	async def start(self) -> None:
+		"""Subscribe to the events we need and enable the Network domain + lifecycle events on the session."""
+		if self.is_started:
+			return
+
+		cdp_client = self.cdp_session.cdp_client
+		for method, handler in self._handlers.items():
+			add_cdp_event_handler(cdp_client, method, handler)
+		self.is_started = True
+
+		try:
+			await asyncio.gather(
+				cdp_client.send.Network.enable(session_id=self.session_id),
+				cdp_client.send.Page.setLifecycleEventsEnabled(params={'enabled': True}, session_id=self.session_id),
+			)
+			# requests that started before we were listening are invisible to us, so rely on readyState for the first wait
+			ready_state = await cdp_client.send.Runtime.evaluate(
+				params={'expression': 'document.readyState', 'returnByValue': True}, session_id=self.session_id
+			)
+			self.is_loaded = ready_state.get('result', {}).get('value') != 'loading'
+		except Exception:
+			self.stop()
+			raise
+
+	def stop(self) -> None:
+		"""Unsubscribe from all events (the Network domain is left enabled, other consumers may rely on it)."""
+		if not self.is_started:
+			return
+		for method, handler in self._handlers.items():
+			remove_cdp_event_handler(self.cdp_session.cdp_client, method, handler)
+		self.is_started = False
+
+	# ========== Event handlers ==========
+
+	def _mark_activity(self) -> None:
+		self.last_activity = time.monotonic()
+		self._activity.set()
+
+	def _on_request_will_be_sent(self, event: Any, session_id: str | None = None) -> None:
+		if session_id != self.session_id:
+			return
+		request_id = event.get('requestId')
+		url = event.get('request', {}).get('url', '').lower()
+		if not request_id or event.get('type') not in RELEVANT_RESOURCE_TYPES or url.startswith(('data:', 'blob:')):
+			return
+		if any(pattern in url for pattern in IGNORED_URL_PATTERNS):
+			return
+		self.inflight_requests[request_id] = time.monotonic()
+		self._mark_activity()
+
+	def _on_request_done(self, event: Any, session_id: str | None = None) -> None:
+		if session_id != self.session_id:
+			return
+		if self.inflight_requests.pop(event.get('requestId', ''), None) is not None:
+			self._mark_activity()
+
+	def _on_lifecycle_event(self, event: Any, session_id: str | None = None) -> None:
+		# the main frame of a page target shares its id with the target
+		if session_id != self.session_id or event.get('frameId') != self.cdp_session.target_id:
+			return
+		name = event.get('name')
+		if name == 'init':
+			self.is_loaded = False
+			self._mark_activity()
+		elif name in ('DOMContentLoaded', 'load'):
+			self.is_loaded = True
+			self._mark_activity()
+
+	def _on_dom_mutation(self, event: Any, session_id: str | None = None) -> None:
+		if session_id != self.session_id:
+			return
+		self.dom_mutation_count += 1
+		self._mark_activity()
+
+	# ========== Waiting ==========
+
+	def _pending_requests(self, now: float) -> list[float]:
+		"""Start times of the in-flight requests that still count (long-running ones are ignored)."""
+		return [started for started in self.inflight_requests.values() if now - started < self.long_running_request_timeout]
+
+	async def wait_until_stable(self, max_wait: float, quiet_period: float = 0.1) -> PageStabilityResult:
+		"""Wait until the page is stable, or at most `max_wait` seconds.
+
+		The quiet period is measured from the later of the last observed activity and the start of the wait,
+		so the wait always gives freshly triggered requests (e.g. after a click) a chance to show up.
+		"""
+		start = time.monotonic()
+		deadline = start + max_wait
+		mutations_at_start = self.dom_mutation_count
+
+		while True:
+			now = time.monotonic()
+			pending = self._pending_requests(now)
+			quiet_since = max(self.last_activity, start)
+
+			if self.is_loaded and not pending and now - quiet_since >= quiet_period:
+				return PageStabilityResult(
+					waited=now - start,
+					stable=True,
+					reason='stable',
+					dom_mutations=self.dom_mutation_count - mutations_at_start,
+				)
+			if now >= deadline:
+				reason = 'still loading' if not self.is_loaded else 'network busy' if pending else 'DOM busy'
+				return PageStabilityResult(
+					waited=now - start,
+					stable=False,
+					reason=f'timeout, {reason}',
+					pending_requests=len(pending),
+					dom_mutations=self.dom_mutation_count - mutations_at_start,
+				)
+
+			# sleep until something happens, the quiet period could be over, or the oldest request ages out
+			if not self.is_loaded:
+				wake_at = deadline
+			elif pending:
+				wake_at = min(min(pending) + self.long_running_request_timeout, deadline)
+			else:
+				wake_at = min(quiet_since + quiet_period, deadline)
+			self._activity.clear()
+			try:
+				await asyncio.wait_for(self._activity.wait(), timeout=max(wake_at - now, 0.001))
+			except TimeoutError:
+				pass
@@ -0,0 +1,240 @@
+"""Pool of pre-launched local browsers for short-lived sessions.
+
+Cold-starting Chrome (free port search, process launch, polling /json/version until CDP answers) costs 1-3s per
+BrowserSession. A BrowserPool keeps `size` idle browsers running, each with its own fresh temporary profile, and hands
+them to new local sessions whose launch args match the pool's profile. A browser that was used is never handed out
+again: when its session is done it is killed with its profile and a fresh one is launched in the background, so
+sessions can't see each other's cookies, storage or tabs.
+
+```python
+pool = BrowserPool(size=4, browser_profile=BrowserProfile(headless=True))
+await pool.start()
+session = BrowserSession(browser_profile=BrowserProfile(headless=True), browser_pool=pool)
+...
+await pool.close()
+```
+"""
+
+import asyncio
+import logging
+import shutil
+import tempfile
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from functools import cached_property
+from pathlib import Path
+
+import psutil
+
+from browser_use.browser.profile import BrowserProfile
+
+logger = logging.getLogger(__name__)
+
+POOL_TEMP_DIR_PREFIX = 'browseruse-tmp-pool-'
+DEFAULT_USER_DATA_DIR_PREFIX = 'browser-use-user-data-dir-'  # temporary profile BrowserProfile creates when none is set
+PER_BROWSER_ARGS = ('--user-data-dir=', '--remote-debugging-port=')
+
+
+def get_launch_key(profile: BrowserProfile) -> tuple[str, ...]:
+	"""What makes two local browsers interchangeable: the executable and every launch arg except the profile dir."""
+	if profile.user_data_dir is None:  # a bare BrowserProfile(), only sessions fill in a temporary dir
+		profile = profile.model_copy(update={'user_data_dir': Path(tempfile.gettempdir()) / DEFAULT_USER_DATA_DIR_PREFIX})
+	args = tuple(arg for arg in profile.get_args() if not arg.startswith(PER_BROWSER_ARGS))
+	return (str(profile.executable_path or ''), *args)
+
+
+def uses_temporary_profile(profile: BrowserProfile) -> bool:
+	"""Whether the profile's user_data_dir is a throwaway one, i.e. the session doesn't need a specific profile on disk."""
+	return profile.user_data_dir is None or Path(profile.user_data_dir).name.startswith(
+		(DEFAULT_USER_DATA_DIR_PREFIX, POOL_TEMP_DIR_PREFIX)
+	)
+
+
+@dataclass
+class PooledBrowser:
+	"""An idle (or checked out) browser process launched by the pool."""
+
+	process: psutil.Process
+	cdp_url: str
+	user_data_dir: Path
+	launch_key: tuple[str, ...]
+	launched_at: float = field(default_factory=time.monotonic)
+
+	def is_alive(self) -> bool:
+		try:
+			return self.process.is_running() and self.process.status() != psutil.STATUS_ZOMBIE
+		except psutil.Error:
+			return False
+
+
+@dataclass
+class BrowserPoolStats:
+	"""Hit rate and launch latencies of a pool, for tuning its size."""
+
+	hits: int = 0
+	misses: int = 0
+	incompatible: int = 0  # sessions the pool could not serve: other launch args or a persistent user_data_dir
+	launches: int = 0
+	launch_failures: int = 0
+	launch_seconds: deque[float] = field(default_factory=lambda: deque(maxlen=100))  # background launches by the pool
+	session_start_seconds: deque[float] = field(default_factory=lambda: deque(maxlen=100))  # what sessions waited
+
+	@property
+	def hit_rate(self) -> float:
+		requests = self.hits + self.misses
+		return self.hits / requests if requests else 0.0
+
+	@property
+	def avg_launch_seconds(self) -> float:
+		return sum(self.launch_seconds) / len(self.launch_seconds) if self.launch_seconds else 0.0
+
+	@property
+	def avg_session_start_seconds(self) -> float:
+		return sum(self.session_start_seconds) / len(self.session_start_seconds) if self.session_start_seconds else 0.0
+
+	def __str__(self) -> str:
+		return (
+			f'hit rate {self.hit_rate:.0%} ({self.hits} hits, {self.misses} misses, {self.incompatible} incompatible), '
+			f'avg launch {self.avg_launch_seconds:.2f}s, avg session start {self.avg_session_start_seconds:.2f}s, '
+			f'{self.launch_failures} failed launches'
+		)
+
+
+class BrowserPool:
+	"""Keeps `size` pre-launched local browsers ready for BrowserSession(browser_pool=...)."""
+
+	def __init__(self, size: int = 2, browser_profile: BrowserProfile | None = None, launch_timeout: float = 30.0):
+		assert size > 0, 'BrowserPool size must be positive'
+		self.size = size
+		self.browser_profile = browser_profile or BrowserProfile()
+		self.launch_timeout = launch_timeout
+		self.stats = BrowserPoolStats()
+
+		self._idle: deque[PooledBrowser] = deque()
+		self._launching: set[asyncio.Task[None]] = set()
+		self._closed = False
+
+	@property
+	def idle_count(self) -> int:
+		return len(self._idle)
+
+	@cached_property
+	def launch_key(self) -> tuple[str, ...]:
+		# Lazy: building the launch args may download the default extensions
+		return get_launch_key(self.browser_profile)
+
+	async def start(self, wait: bool = True) -> None:
+		"""Launch browsers until the pool is full, waiting for them to be ready unless wait=False."""
+		self._closed = False
+		self._fill()
+		if wait and self._launching:
+			await asyncio.wait(self._launching)
+
+	async def acquire(self, profile: BrowserProfile) -> PooledBrowser | None:
+		"""Take an idle browser matching the profile, or None (without waiting) if the caller should launch its own."""
+		if self._closed:
+			return None
+		if not uses_temporary_profile(profile) or get_launch_key(profile) != self.launch_key:
+			self.stats.incompatible += 1
+			return None
+
+		while self._idle:
+			browser = self._idle.popleft()
+			if browser.is_alive():
+				self.stats.hits += 1
+				self._fill()
+				return browser
+			logger.debug(f'Dropping pooled browser pid={browser.process.pid}, it exited while idle')
+			await self._discard(browser)
+
+		self.stats.misses += 1
+		self._fill()
+		return None
+
+	async def release(self, browser: PooledBrowser) -> None:
+		"""Give back a browser after its session: it is killed with its profile and replaced by a fresh one."""
+		await self._discard(browser)
+		self._fill()
+
+	async def close(self) -> None:
+		"""Stop launching and kill every idle browser. Checked out browsers are killed when they are released."""
+		self._closed = True
+		for task in list(self._launching):
+			task.cancel()
+		if self._launching:
+			await asyncio.gather(*self._launching, return_exceptions=True)
+		while self._idle:
+			await self._discard(self._idle.popleft())
+		logger.debug(f'Closed browser pool: {self.stats}')
+
+	async def __aenter__(self) -> 'BrowserPool':
+		await self.start()
+		return self
+
+	async def __aexit__(self, *args) -> None:
+		await self.close()
+
+	def _fill(self) -> None:
+		"""Launch browsers in the background until idle + launching reaches the pool size."""
+		if self._closed:
+			return
+		for _ in range(self.size - len(self._idle) - len(self._launching)):
+			task = asyncio.create_task(self._launch_into_pool(), name='browser_pool_launch')
+			self._launching.add(task)
+			task.add_done_callback(self._launching.discard)
+
+	async def _launch_into_pool(self) -> None:
+		try:
+			browser = await self._launch()
+		except asyncio.CancelledError:
+			raise
+		except Exception as e:
+			self.stats.launch_failures += 1
+			logger.warning(f'⚠️ Failed to pre-launch a browser for the pool: {type(e).__name__}: {e}')
+			return
+		if self._closed:
+			await self._discard(browser)
+			return
+		self._idle.append(browser)
+
+	async def _launch(self) -> PooledBrowser:
+		from browser_use.browser.watchdogs.local_browser_watchdog import LocalBrowserWatchdog
+
+		browser_path = self.browser_profile.executable_path or LocalBrowserWatchdog._find_installed_browser_path()
+		if not browser_path:
+			raise RuntimeError('No local Chrome/Chromium install found to pre-launch')
+
+		user_data_dir = Path(tempfile.mkdtemp(prefix=POOL_TEMP_DIR_PREFIX))
+		launch_args = self.browser_profile.model_copy(update={'user_data_dir': user_data_dir}).get_args()
+		debug_port = LocalBrowserWatchdog._find_free_port()
+
+		started = time.monotonic()
+		process = None
+		try:
+			subprocess = await asyncio.create_subprocess_exec(
+				str(browser_path),
+				*launch_args,
+				f'--remote-debugging-port={debug_port}',
+				stdout=asyncio.subprocess.DEVNULL,  # idle browsers must not block on full, unread pipes
+				stderr=asyncio.subprocess.DEVNULL,
+			)
+			process = psutil.Process(subprocess.pid)
+			cdp_url = await LocalBrowserWatchdog._wait_for_cdp_url(debug_port, timeout=self.launch_timeout)
+		except BaseException:
+			if process is not None:
+				await LocalBrowserWatchdog._cleanup_process(process)
+			shutil.rmtree(user_data_dir, ignore_errors=True)
+			raise
+
+		elapsed = time.monotonic() - started
+		self.stats.launches += 1
+		self.stats.launch_seconds.append(elapsed)
+		logger.debug(f'🏊 Pre-launched browser pid={process.pid} on {cdp_url} in {elapsed:.2f}s')
+		return PooledBrowser(process=process, cdp_url=cdp_url, user_data_dir=user_data_dir, launch_key=self.launch_key)
+
+	async def _discard(self, browser: PooledBrowser) -> None:
+		from browser_use.browser.watchdogs.local_browser_watchdog import LocalBrowserWatchdog
+
+		await LocalBrowserWatchdog._cleanup_process(browser.process)
+		shutil.rmtree(browser.user_data_dir, ignore_errors=True)
@@ -612,6 +612,23 @@ class BrowserProfile(BrowserConnectArgs, BrowserLaunchPersistentContextArgs, Bro
 		description='Maximum depth for cross-origin iframe recursion (default: 5 levels deep).',
 	)
 
+	# --- CDP connection ---
+
+	cdp_flat_sessions: bool = Field(
+		default=False,
+		description='Multiplex the CDP sessions of all tabs and cross-origin iframes over the root WebSocket (routed by sessionId) instead of opening a dedicated WebSocket per target.',
+	)
+	cdp_session_pool_limit: int | None = Field(
+		default=None,
+		gt=0,
+		description='Maximum number of cached per-target CDP sessions, the least recently used ones are closed when a new session is created. Sessions still in use (the focused tab, targets of a DOM build in progress, or used within the last few seconds) are kept, so the pool can briefly exceed this. None means unlimited.',
+	)
+	cdp_session_idle_timeout: float | None = Field(
+		default=None,
+		gt=0,
+		description='Close cached per-target CDP sessions that have not been used for this many seconds (checked when a new session is created). None keeps them open.',
+	)
+
 	# --- Page load/wait timings ---
 
 	minimum_wait_page_load_time: float = Field(default=0.25, description='Minimum time to wait before capturing page state.')
@@ -625,7 +642,37 @@ class BrowserProfile(BrowserConnectArgs, BrowserLaunchPersistentContextArgs, Bro
 	filter_highlight_ids: bool = Field(
 		default=True, description='Only show element IDs in highlights if llm_representation is less than 10 characters.'
 	)
+	highlight_image_format: Literal['png', 'jpeg', 'webp'] = Field(
+		default='png',
+		description='Image format of the highlighted screenshot sent to the LLM. jpeg/webp are several times smaller and faster to encode than png.',
+	)
+	highlight_image_quality: int = Field(
+		default=80, ge=1, le=100, description='Encoder quality of the highlighted screenshot when using jpeg or webp.'
+	)
+	screenshot_format: Literal['png', 'jpeg', 'webp'] = Field(
+		default='png', description='Image format requested from Page.captureScreenshot for the per-step screenshot.'
+	)
+	screenshot_quality: int = Field(
+		default=80, ge=1, le=100, description='Encoder quality when screenshot_format is jpeg or webp.'
+	)
+	screenshot_max_dimension: int | None = Field(
+		default=None,
+		gt=0,
+		description='Downscale screenshots (via the CDP clip scale) so their longest side is at most this many pixels. None keeps the native device pixel size.',
+	)
+	screenshot_reuse_unchanged: bool = Field(
+		default=False,
+		description='Reuse the previous screenshot when the page did not change: no interaction since, same DOM change counter and same perceptual hash of a small thumbnail.',
+	)
 	paint_order_filtering: bool = Field(default=True, description='Enable paint order filtering. Slightly experimental.')
+	paint_order_spatial_index: bool = Field(
+		default=True,
+		description='Use a grid index for paint order occlusion checks instead of scanning every painted rect. Same results, much faster on dense pages.',
+	)
+	incremental_dom: bool = Field(
+		default=False,
+		description='Keep a persistent DOM tree per tab and patch it from CDP DOM mutation events instead of refetching the whole document every step. Falls back to a full rebuild when the mutation log overflows. Experimental.',
+	)
 
 	# --- Downloads ---
 	auto_download_pdfs: bool = Field(default=True, description='Automatically download PDFs when navigating to PDF viewer pages.')
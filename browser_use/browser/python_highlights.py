@@ -9,6 +9,10 @@ import base64
 import io
 import logging
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Literal, NamedTuple
 
 from PIL import Image, ImageDraw, ImageFont
 
@@ -63,10 +67,56 @@ def get_cross_platform_font(font_size: int) -> ImageFont.FreeTypeFont | None:
 	return font
 
 
+# Pre-rendered index labels (colored box + white number), keyed by (font, text, color, padding)
+# Pages mostly show the same few hundred indices in a handful of colors, so rendering each label once and pasting it
+# is much cheaper than measuring and drawing the text again for every element on every step.
+_LABEL_CACHE: dict[tuple[int, str, str, int], tuple[Image.Image, int, int, int, int, int]] = {}
+_LABEL_CACHE_MAX_SIZE = 4096
+_LABEL_CACHE_LOCK = threading.Lock()
+
+
 def cleanup_font_cache() -> None:
 	"""Clean up the font cache to prevent memory leaks in long-running applications."""
 	global _FONT_CACHE
 	_FONT_CACHE.clear()
+	with _LABEL_CACHE_LOCK:
+		_LABEL_CACHE.clear()
+
+
+def get_index_label(
+	text: str, color: str, font: ImageFont.FreeTypeFont | None, padding: int
+) -> tuple[Image.Image, int, int, int, int, int]:
+	"""Get the pre-rendered label image for an element index.
+
+	Returns:
+	    Tuple of (label_image, container_width, container_height, text_width, text_height, text_top_offset)
+	"""
+	cache_key = (id(font), text, color, padding)
+	with _LABEL_CACHE_LOCK:
+		cached = _LABEL_CACHE.get(cache_key)
+		if cached is not None:
+			return cached
+
+		# Measure and draw exactly like the box would be drawn in place: background with white border, centered text
+		measure = ImageDraw.Draw(Image.new('RGBA', (1, 1)))
+		bbox_text = measure.textbbox((0, 0), text, font=font)
+		text_width = bbox_text[2] - bbox_text[0]
+		text_height = bbox_text[3] - bbox_text[1]
+		container_width = text_width + padding * 2
+		container_height = text_height + padding * 2
+
+		label = Image.new('RGBA', (container_width + 1, container_height + 1))
+		draw = ImageDraw.Draw(label)
+		draw.rectangle([0, 0, container_width, container_height], fill=color, outline='white', width=2)
+		text_x = (container_width - text_width) // 2
+		text_y = (container_height - text_height) // 2 - bbox_text[1]  # Subtract top offset
+		draw.text((text_x, text_y), text, fill='white', font=font)
+
+		if len(_LABEL_CACHE) >= _LABEL_CACHE_MAX_SIZE:
+			_LABEL_CACHE.clear()
+		cached = (label, container_width, container_height, text_width, text_height, bbox_text[1])
+		_LABEL_CACHE[cache_key] = cached
+		return cached
 
 
 # Color scheme for different element types
@@ -114,8 +164,13 @@ def draw_enhanced_bounding_box_with_text(
 	element_type: str = 'div',
 	image_size: tuple[int, int] = (2000, 1500),
 	device_pixel_ratio: float = 1.0,
+	image: Image.Image | None = None,
 ) -> None:
-	"""Draw an enhanced bounding box with much bigger index containers and dashed borders."""
+	"""Draw an enhanced bounding box with much bigger index containers and dashed borders.
+
+	If the `image` being drawn on is passed, the index label is pasted from the pre-rendered label cache
+	instead of being measured and drawn from scratch.
+	"""
 	x1, y1, x2, y2 = bbox
 
 	# Draw dashed bounding box with pattern: 1 line, 2 spaces, 1 line, 2 spaces...
@@ -158,6 +213,15 @@ def draw_enhanced_bounding_box_with_text(
 			if big_font is None:
 				big_font = font  # Fallback to original font if no system fonts found
 
+			# Scale padding appropriately for different resolutions
+			padding = max(4, min(10, int(css_width * 0.005)))  # 0.3% of CSS width, max 4px
+
+			if image is not None:
+				label, container_width, container_height, _, _, _ = get_index_label(text, color, big_font, padding)
+				bg_x1, bg_y1 = _get_index_label_position(bbox, container_width, container_height, image_size)
+				image.paste(label, (bg_x1, bg_y1))
+				return
+
 			# Get text size with bigger font
 			if big_font:
 				bbox_text = draw.textbbox((0, 0), text, font=big_font)
@@ -169,8 +233,6 @@ def draw_enhanced_bounding_box_with_text(
 				text_width = bbox_text[2] - bbox_text[0]
 				text_height = bbox_text[3] - bbox_text[1]
 
-			# Scale padding appropriately for different resolutions
-			padding = max(4, min(10, int(css_width * 0.005)))  # 0.3% of CSS width, max 4px
 			element_width = x2 - x1
 			element_height = y2 - y1
 
@@ -231,6 +293,34 @@ def draw_enhanced_bounding_box_with_text(
 			logger.debug(f'Failed to draw enhanced text overlay: {e}')
 
 
+def _get_index_label_position(
+	bbox: tuple[int, int, int, int], container_width: int, container_height: int, image_size: tuple[int, int]
+) -> tuple[int, int]:
+	"""Top-left corner of the index label, same placement rules as draw_enhanced_bounding_box_with_text."""
+	x1, y1, x2, y2 = bbox
+	element_width = x2 - x1
+	element_height = y2 - y1
+
+	# Center horizontally within the element, small elements get the label above them to avoid blocking content
+	bg_x1 = x1 + (element_width - container_width) // 2
+	if element_width < 60 or element_height < 30:
+		bg_y1 = max(0, y1 - container_height - 5)
+	else:
+		bg_y1 = y1 + 2
+
+	# Ensure container stays within image bounds
+	img_width, img_height = image_size
+	if bg_x1 < 0:
+		bg_x1 = 0
+	if bg_y1 < 0:
+		bg_y1 = 0
+	if bg_x1 + container_width > img_width:
+		bg_x1 = img_width - container_width
+	if bg_y1 + container_height > img_height:
+		bg_y1 = img_height - container_height
+	return bg_x1, bg_y1
+
+
 def draw_bounding_box_with_text(
 	draw,  # ImageDraw.Draw - avoiding type annotation due to PIL typing issues
 	bbox: tuple[int, int, int, int],
@@ -337,41 +427,44 @@ def draw_bounding_box_with_text(
 			logger.debug(f'Failed to draw text overlay: {e}')
 
 
-def process_element_highlight(
-	element_id: int,
-	element: EnhancedDOMTreeNode,
-	draw,
-	device_pixel_ratio: float,
-	font,
-	filter_highlight_ids: bool,
-	image_size: tuple[int, int],
-) -> None:
-	"""Process a single element for highlighting."""
+HighlightImageFormat = Literal['png', 'jpeg', 'webp']
+
+# Decoding, drawing and encoding a full-resolution screenshot takes tens to hundreds of milliseconds of pure CPU work,
+# so it runs in a small dedicated pool instead of blocking the event loop (PIL releases the GIL while coding images)
+_HIGHLIGHT_EXECUTOR: ThreadPoolExecutor | None = None
+_HIGHLIGHT_EXECUTOR_LOCK = threading.Lock()
+
+
+def _get_highlight_executor() -> ThreadPoolExecutor:
+	global _HIGHLIGHT_EXECUTOR
+	with _HIGHLIGHT_EXECUTOR_LOCK:
+		if _HIGHLIGHT_EXECUTOR is None:
+			_HIGHLIGHT_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix='highlight')
+		return _HIGHLIGHT_EXECUTOR
+
+
+class HighlightBox(NamedTuple):
+	"""Everything needed to draw one element highlight, detached from the DOM tree so it can be drawn off the event loop."""
+
+	element_id: int
+	x: float
+	y: float
+	width: float
+	height: float
+	color: str
+	tag_name: str
+	index_text: str | None
+
+
+def get_highlight_box(element_id: int, element: EnhancedDOMTreeNode, filter_highlight_ids: bool) -> HighlightBox | None:
+	"""Collect the position, color and index label of a single element, in CSS pixels."""
 	try:
 		# Use absolute_position coordinates directly
 		if not element.absolute_position:
-			return
+			return None
 
 		bounds = element.absolute_position
 
-		# Scale coordinates from CSS pixels to device pixels for screenshot
-		# The screenshot is captured at device pixel resolution, but coordinates are in CSS pixels
-		x1 = int(bounds.x * device_pixel_ratio)
-		y1 = int(bounds.y * device_pixel_ratio)
-		x2 = int((bounds.x + bounds.width) * device_pixel_ratio)
-		y2 = int((bounds.y + bounds.height) * device_pixel_ratio)
-
-		# Ensure coordinates are within image bounds
-		img_width, img_height = image_size
-		x1 = max(0, min(x1, img_width))
-		y1 = max(0, min(y1, img_height))
-		x2 = max(x1, min(x2, img_width))
-		y2 = max(y1, min(y2, img_height))
-
-		# Skip if bounding box is too small or invalid
-		if x2 - x1 < 2 or y2 - y1 < 2:
-			return
-
 		# Get element color based on type
 		tag_name = element.tag_name if hasattr(element, 'tag_name') else 'div'
 		element_type = None
@@ -395,42 +488,75 @@ def process_element_highlight(
 				# Always show ID when filter is disabled
 				index_text = str(element_index)
 
+		return HighlightBox(element_id, bounds.x, bounds.y, bounds.width, bounds.height, color, tag_name, index_text)
+
+	except Exception as e:
+		logger.debug(f'Failed to collect highlight for element {element_id}: {e}')
+		return None
+
+
+def draw_highlight_box(
+	box: HighlightBox,
+	image: Image.Image,
+	draw,
+	device_pixel_ratio: float,
+	font,
+) -> None:
+	"""Draw a single collected element highlight."""
+	try:
+		# Scale coordinates from CSS pixels to device pixels for screenshot
+		# The screenshot is captured at device pixel resolution, but coordinates are in CSS pixels
+		x1 = int(box.x * device_pixel_ratio)
+		y1 = int(box.y * device_pixel_ratio)
+		x2 = int((box.x + box.width) * device_pixel_ratio)
+		y2 = int((box.y + box.height) * device_pixel_ratio)
+
+		# Ensure coordinates are within image bounds
+		img_width, img_height = image.size
+		x1 = max(0, min(x1, img_width))
+		y1 = max(0, min(y1, img_height))
+		x2 = max(x1, min(x2, img_width))
+		y2 = max(y1, min(y2, img_height))
+
+		# Skip if bounding box is too small or invalid
+		if x2 - x1 < 2 or y2 - y1 < 2:
+			return
+
 		# Draw enhanced bounding box with bigger index
 		draw_enhanced_bounding_box_with_text(
-			draw, (x1, y1, x2, y2), color, index_text, font, tag_name, image_size, device_pixel_ratio
+			draw, (x1, y1, x2, y2), box.color, box.index_text, font, box.tag_name, image.size, device_pixel_ratio, image
 		)
 
 	except Exception as e:
-		logger.debug(f'Failed to draw highlight for element {element_id}: {e}')
+		logger.debug(f'Failed to draw highlight for element {box.element_id}: {e}')
 
 
-@observe_debug(ignore_input=True, ignore_output=True, name='create_highlighted_screenshot')
-@time_execution_async('create_highlighted_screenshot')
-async def create_highlighted_screenshot(
+def render_highlighted_screenshot(
 	screenshot_b64: str,
-	selector_map: DOMSelectorMap,
+	boxes: list[HighlightBox],
 	device_pixel_ratio: float = 1.0,
-	viewport_offset_x: int = 0,
-	viewport_offset_y: int = 0,
-	filter_highlight_ids: bool = True,
+	image_format: HighlightImageFormat = 'png',
+	image_quality: int = 80,
 ) -> str:
-	"""Create a highlighted screenshot with bounding boxes around interactive elements.
+	"""Decode the screenshot, draw the collected highlights and encode the result. Blocking, runs in a worker thread.
 
 	Args:
 	    screenshot_b64: Base64 encoded screenshot
-	    selector_map: Map of interactive elements with their positions
+	    boxes: Highlights collected with get_highlight_box
 	    device_pixel_ratio: Device pixel ratio for scaling coordinates
-	    viewport_offset_x: X offset for viewport positioning
-	    viewport_offset_y: Y offset for viewport positioning
+	    image_format: Output format, 'jpeg' and 'webp' are several times smaller than 'png'
+	    image_quality: Encoder quality for 'jpeg' and 'webp' (1-100)
 
 	Returns:
 	    Base64 encoded highlighted screenshot
 	"""
-	try:
-		# Decode screenshot
-		screenshot_data = base64.b64decode(screenshot_b64)
-		image = Image.open(io.BytesIO(screenshot_data)).convert('RGBA')
+	start = time.perf_counter()
+	screenshot_data = base64.b64decode(screenshot_b64)
+	with Image.open(io.BytesIO(screenshot_data)) as source:
+		image = source.convert('RGBA')
+	decoded = time.perf_counter()
 
+	try:
 		# Create drawing context
 		draw = ImageDraw.Draw(image)
 
@@ -438,31 +564,86 @@ async def create_highlighted_screenshot(
 		font = get_cross_platform_font(12)
 		# If no system fonts found, font remains None and will use default font
 
-		# Process elements sequentially to avoid ImageDraw thread safety issues
-		# PIL ImageDraw is not thread-safe, so we process elements one by one
-		for element_id, element in selector_map.items():
-			process_element_highlight(element_id, element, draw, device_pixel_ratio, font, filter_highlight_ids, image.size)
+		# PIL ImageDraw is not thread-safe, so all boxes of one screenshot are drawn sequentially in this worker
+		for box in boxes:
+			draw_highlight_box(box, image, draw, device_pixel_ratio, font)
+		drawn = time.perf_counter()
 
 		# Convert back to base64
 		output_buffer = io.BytesIO()
 		try:
-			image.save(output_buffer, format='PNG')
-			output_buffer.seek(0)
+			if image_format == 'jpeg':
+				image.convert('RGB').save(output_buffer, format='JPEG', quality=image_quality)
+			elif image_format == 'webp':
+				image.save(output_buffer, format='WEBP', quality=image_quality)
+			else:
+				image.save(output_buffer, format='PNG')
 			highlighted_b64 = base64.b64encode(output_buffer.getvalue()).decode('utf-8')
-
-			logger.debug(f'Successfully created highlighted screenshot with {len(selector_map)} elements')
-			return highlighted_b64
 		finally:
-			# Explicit cleanup to prevent memory leaks
 			output_buffer.close()
-			if 'image' in locals():
-				image.close()
+	finally:
+		# Explicit cleanup to prevent memory leaks
+		image.close()
+	encoded = time.perf_counter()
+
+	logger.debug(
+		f'Highlighted {len(boxes)} elements: decode {(decoded - start) * 1000:.0f}ms, draw {(drawn - decoded) * 1000:.0f}ms, '
+		f'encode {image_format} {(encoded - drawn) * 1000:.0f}ms, {len(screenshot_b64) // 1024}kB -> {len(highlighted_b64) // 1024}kB'
+	)
+	return highlighted_b64
+
+
+@observe_debug(ignore_input=True, ignore_output=True, name='create_highlighted_screenshot')
+@time_execution_async('create_highlighted_screenshot')
+async def create_highlighted_screenshot(
+	screenshot_b64: str,
+	selector_map: DOMSelectorMap,
+	device_pixel_ratio: float = 1.0,
+	viewport_offset_x: int = 0,
+	viewport_offset_y: int = 0,
+	filter_highlight_ids: bool = True,
+	image_format: HighlightImageFormat = 'png',
+	image_quality: int = 80,
+) -> str:
+	"""Create a highlighted screenshot with bounding boxes around interactive elements.
+
+	Element data is collected on the event loop, the image work happens in the highlight worker pool.
+
+	Args:
+	    screenshot_b64: Base64 encoded screenshot
+	    selector_map: Map of interactive elements with their positions
+	    device_pixel_ratio: Device pixel ratio for scaling coordinates
+	    viewport_offset_x: X offset for viewport positioning
+	    viewport_offset_y: Y offset for viewport positioning
+	    image_format: Output image format ('png', 'jpeg' or 'webp')
+	    image_quality: Encoder quality for 'jpeg' and 'webp'
+
+	Returns:
+	    Base64 encoded highlighted screenshot
+	"""
+	try:
+		boxes = [
+			box
+			for element_id, element in selector_map.items()
+			if (box := get_highlight_box(element_id, element, filter_highlight_ids)) is not None
+		]
+
+		loop = asyncio.get_running_loop()
+		highlighted_b64 = await loop.run_in_executor(
+			_get_highlight_executor(),
+			render_highlighted_screenshot,
+			screenshot_b64,
+			boxes,
+			device_pixel_ratio,
+			image_format,
+			image_quality,
+		)
+
+		logger.debug(f'Successfully created highlighted screenshot with {len(selector_map)} elements')
+		return highlighted_b64
 
 	except Exception as e:
 		logger.error(f'Failed to create highlighted screenshot: {e}')
-		# Clean up on error as well
-		if 'image' in locals():
-			image.close()
 		# Return original screenshot on error
 		return screenshot_b64
 
@@ -500,7 +681,13 @@ async def get_viewport_info_from_cdp(cdp_session) -> tuple[float, int, int]:
 
 @time_execution_async('create_highlighted_screenshot_async')
 async def create_highlighted_screenshot_async(
-	screenshot_b64: str, selector_map: DOMSelectorMap, cdp_session=None, filter_highlight_ids: bool = True
+	screenshot_b64: str,
+	selector_map: DOMSelectorMap,
+	cdp_session=None,
+	filter_highlight_ids: bool = True,
+	image_format: HighlightImageFormat = 'png',
+	image_quality: int = 80,
+	screenshot_scale: float = 1.0,
 ) -> str:
 	"""Async wrapper for creating highlighted screenshots.
 
@@ -509,6 +696,9 @@ async def create_highlighted_screenshot_async(
 	    selector_map: Map of interactive elements
 	    cdp_session: CDP session for getting viewport info
 	    filter_highlight_ids: Whether to filter element IDs based on meaningful text
+	    image_format: Output image format ('png', 'jpeg' or 'webp')
+	    image_quality: Encoder quality for 'jpeg' and 'webp'
+	    screenshot_scale: Scale the screenshot was captured at relative to device pixels
 
 	Returns:
 	    Base64 encoded highlighted screenshot
@@ -523,10 +713,18 @@ async def create_highlighted_screenshot_async(
 			device_pixel_ratio, viewport_offset_x, viewport_offset_y = await get_viewport_info_from_cdp(cdp_session)
 		except Exception as e:
 			logger.debug(f'Failed to get viewport info from CDP: {e}')
+	device_pixel_ratio *= screenshot_scale
 
 	# Create highlighted screenshot with async processing
 	final_screenshot = await create_highlighted_screenshot(
-		screenshot_b64, selector_map, device_pixel_ratio, viewport_offset_x, viewport_offset_y, filter_highlight_ids
+		screenshot_b64,
+		selector_map,
+		device_pixel_ratio,
+		viewport_offset_x,
+		viewport_offset_y,
+		filter_highlight_ids,
+		image_format,
+		image_quality,
 	)
 
 	filename = os.getenv('BROWSER_USE_SCREENSHOT_FILE')
@@ -2,6 +2,9 @@
 
 import asyncio
 import logging
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
 from functools import cached_property
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Literal, Self, Union, cast
@@ -15,6 +18,7 @@ from cdp_use.cdp.target import AttachedToTargetEvent, SessionID, TargetID
 from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
 from uuid_extensions import uuid7str
 
+from browser_use.browser.cdp_events import add_cdp_event_handler
 from browser_use.browser.cloud import CloudBrowserAuthError, CloudBrowserError, get_cloud_browser_cdp_url
 
 # CDP logging is now handled by setup_logging() in logging_config.py
@@ -38,7 +42,9 @@ from browser_use.browser.events import (
 	TabClosedEvent,
 	TabCreatedEvent,
 )
+from browser_use.browser.pool import BrowserPool
 from browser_use.browser.profile import BrowserProfile, ProxySettings
+from browser_use.browser.target_registry import TargetRegistry
 from browser_use.browser.views import BrowserStateSummary, TabInfo
 from browser_use.dom.views import EnhancedDOMTreeNode, TargetInfo
 from browser_use.observability import observe_debug
@@ -54,6 +60,101 @@ red = '\033[91m'
 reset = '\033[0m'
 
 
+# Cached CDP sessions used within this many seconds are never evicted, a caller may still be sending commands on them
+CDP_SESSION_EVICTION_GRACE_PERIOD = 5.0
+
+DOM_CHANGE_TRACKER_WORLD = 'browser_use_dom_change_tracker'
+
+# Runs in an isolated world of the focused page (see BrowserSession.get_dom_change_counter), returns [token, count]
+DOM_CHANGE_TRACKER_JS = """
+(function() {
+	let tracker = globalThis.__browserUseDomChanges;
+	if (!tracker) {
+		const OBSERVE_OPTIONS = {
+			childList: true,
+			subtree: true,
+			attributes: true,
+			attributeFilter: ['class', 'style', 'hidden', 'disabled', 'open', 'aria-hidden', 'aria-expanded', 'aria-disabled'],
+		};
+		const REVEAL_EVENTS = ['pointerover', 'pointerout', 'focusin', 'focusout', 'transitionend', 'animationend'];
+		const roots = [];
+		const watched = new WeakSet();
+		tracker = globalThis.__browserUseDomChanges = {
+			token: Math.random().toString(36).slice(2),
+			count: 0,
+			mayHaveRevealed: false,
+			visibility: 0,
+		};
+
+		const observer = new MutationObserver(records => {
+			tracker.count += records.length;
+			for (const record of records) record.addedNodes.forEach(watchTree);
+		});
+		const markMayHaveRevealed = () => { tracker.mayHaveRevealed = true; };
+
+		// Observe a document or open shadow root, plus everything observable inside it
+		function watchRoot(root) {
+			if (watched.has(root)) return;
+			watched.add(root);
+			roots.push(root);
+			observer.observe(root, OBSERVE_OPTIONS);
+			if (root.nodeType === Node.DOCUMENT_NODE) {
+				for (const type of REVEAL_EVENTS) root.addEventListener(type, markMayHaveRevealed, { capture: true, passive: true });
+			}
+			watchTree(root);
+		}
+		function watchFrame(frame) {
+			if (!watched.has(frame)) {
+				watched.add(frame);
+				frame.addEventListener('load', () => {
+					tracker.count++;
+					watchFrame(frame);
+				});
+			}
+			let doc = null;
+			try { doc = frame.contentDocument; } catch (e) {}  // null for cross-origin frames
+			if (doc) watchRoot(doc);
+		}
+		function watchElement(element) {
+			if (element.shadowRoot) watchRoot(element.shadowRoot);  // open shadow roots only
+			if (element.tagName === 'IFRAME' || element.tagName === 'FRAME') watchFrame(element);
+		}
+		function watchTree(node) {
+			if (node.nodeType === Node.ELEMENT_NODE) watchElement(node);
+			if (node.querySelectorAll) node.querySelectorAll('*').forEach(watchElement);
+		}
+		// Fingerprint of which elements are rendered, to catch CSS-only reveals that don't mutate the DOM
+		tracker.visibilityHash = function() {
+			let hash = 0;
+			let i = 0;
+			for (const root of roots) {
+				for (const element of root.querySelectorAll('*')) {
+					i++;
+					const visible = element.checkVisibility
+						? element.checkVisibility({ checkOpacity: true, checkVisibilityCSS: true })
+						: element.getClientRects().length > 0;
+					if (visible) hash = (Math.imul(hash, 31) + i) | 0;
+				}
+			}
+			return hash;
+		};
+
+		watchRoot(document);
+		tracker.visibility = tracker.visibilityHash();
+	}
+	if (tracker.mayHaveRevealed) {
+		tracker.mayHaveRevealed = false;
+		const visibility = tracker.visibilityHash();
+		if (visibility !== tracker.visibility) {
+			tracker.visibility = visibility;
+			tracker.count++;
+		}
+	}
+	return [tracker.token, tracker.count];
+})();
+"""
+
+
 class CDPSession(BaseModel):
 	"""Info about a single CDP session bound to a specific target.
 
@@ -270,6 +371,12 @@ class BrowserSession(BaseModel):
 		wait_for_network_idle_page_load_time: float | None = None,
 		wait_between_actions: float | None = None,
 		filter_highlight_ids: bool | None = None,
+		highlight_image_format: Literal['png', 'jpeg', 'webp'] | None = None,
+		highlight_image_quality: int | None = None,
+		screenshot_format: Literal['png', 'jpeg', 'webp'] | None = None,
+		screenshot_quality: int | None = None,
+		screenshot_max_dimension: int | None = None,
+		screenshot_reuse_unchanged: bool | None = None,
 		auto_download_pdfs: bool | None = None,
 		profile_directory: str | None = None,
 		cookie_whitelist_domains: list[str] | None = None,
@@ -277,13 +384,23 @@ class BrowserSession(BaseModel):
 		cross_origin_iframes: bool | None = None,
 		highlight_elements: bool | None = None,
 		paint_order_filtering: bool | None = None,
+		paint_order_spatial_index: bool | None = None,
+		incremental_dom: bool | None = None,
 		# Iframe processing limits
 		max_iframes: int | None = None,
 		max_iframe_depth: int | None = None,
+		# CDP connection
+		cdp_flat_sessions: bool | None = None,
+		cdp_session_pool_limit: int | None = None,
+		cdp_session_idle_timeout: float | None = None,
+		# Pre-launched local browsers to start from (session identity, not part of the profile)
+		browser_pool: BrowserPool | None = None,
 	):
 		# Following the same pattern as AgentSettings in service.py
 		# Only pass non-None values to avoid validation errors
-		profile_kwargs = {k: v for k, v in locals().items() if k not in ['self', 'browser_profile', 'id'] and v is not None}
+		profile_kwargs = {
+			k: v for k, v in locals().items() if k not in ['self', 'browser_profile', 'id', 'browser_pool'] and v is not None
+		}
 
 		# Handle backward compatibility: map cloud_browser to use_cloud
 		if 'cloud_browser' in profile_kwargs:
@@ -308,6 +425,7 @@ class BrowserSession(BaseModel):
 			id=id or str(uuid7str()),
 			browser_profile=resolved_browser_profile,
 		)
+		self._browser_pool = browser_pool
 
 	# Session configuration (session identity only)
 	id: str = Field(default_factory=lambda: str(uuid7str()), description='Unique identifier for this browser session')
@@ -343,6 +461,11 @@ class BrowserSession(BaseModel):
 	# Mutable private state shared between watchdogs
 	_cdp_client_root: CDPClient | None = PrivateAttr(default=None)
 	_cdp_session_pool: dict[str, CDPSession] = PrivateAttr(default_factory=dict)
+	_cdp_session_last_used: dict[str, float] = PrivateAttr(default_factory=dict)  # target_id -> time.monotonic()
+	_cdp_session_leases: dict[str, int] = PrivateAttr(default_factory=dict)  # target_id -> number of holders
+	_dom_change_contexts: dict[str, int] = PrivateAttr(default_factory=dict)  # target_id -> DOM change tracker context id
+	_target_registry: TargetRegistry | None = PrivateAttr(default=None)
+	_browser_pool: BrowserPool | None = PrivateAttr(default=None)
 	_cached_browser_state_summary: Any = PrivateAttr(default=None)
 	_cached_selector_map: dict[int, EnhancedDOMTreeNode] = PrivateAttr(default_factory=dict)
 	_downloaded_files: list[str] = PrivateAttr(default_factory=list)  # Track files downloaded during this session
@@ -405,8 +528,11 @@ class BrowserSession(BaseModel):
 			if hasattr(session, 'disconnect'):
 				await session.disconnect()
 		self._cdp_session_pool.clear()
+		self._cdp_session_last_used.clear()
+		self._cdp_session_leases.clear()
 
 		self._cdp_client_root = None  # type: ignore
+		self._target_registry = None
 		self._cached_browser_state_summary = None
 		self._cached_selector_map.clear()
 		self._downloaded_files.clear()
@@ -743,6 +869,7 @@ class BrowserSession(BaseModel):
 		try:
 			# Remove from session pool first to prevent further use
 			stale_session = self._cdp_session_pool.pop(event.target_id, None)
+			self._cdp_session_last_used.pop(event.target_id, None)
 			if stale_session and stale_session.owns_cdp_client:
 				try:
 					await stale_session.disconnect()
@@ -994,7 +1121,8 @@ class BrowserSession(BaseModel):
 		Args:
 				target_id: Target ID to get session for. If None, uses current agent focus.
 				focus: If True, switches agent focus to this target. If False, just returns session without changing focus.
-				new_socket: If True, create a dedicated WebSocket connection. If None (default), creates new socket for new targets only.
+				new_socket: If True, create a dedicated WebSocket connection. If None (default), creates new socket for new targets only,
+					unless BrowserProfile.cdp_flat_sessions is set, then new targets are attached over the root WebSocket.
 
 		Returns:
 				CDPSession for the specified target.
@@ -1010,6 +1138,7 @@ class BrowserSession(BaseModel):
 		# Check if we already have a session for this target in the pool
 		if target_id in self._cdp_session_pool:
 			session = self._cdp_session_pool[target_id]
+			self._cdp_session_last_used[target_id] = time.monotonic()
 			if focus and self.agent_focus.target_id != target_id:
 				self.logger.debug(
 					f'[get_or_create_cdp_session] Switching agent focus from {self.agent_focus.target_id} to {target_id}'
@@ -1025,11 +1154,12 @@ class BrowserSession(BaseModel):
 		# If it's the current focus target, return that session
 		if self.agent_focus.target_id == target_id:
 			self._cdp_session_pool[target_id] = self.agent_focus
+			self._cdp_session_last_used[target_id] = time.monotonic()
 			return self.agent_focus
 
 		# Create new session for this target
-		# Default to True for new sessions (each new target gets its own WebSocket)
-		should_use_new_socket = True if new_socket is None else new_socket
+		# By default each new target gets its own WebSocket, in flat session mode it shares the root one (routed by sessionId)
+		should_use_new_socket = (not self.browser_profile.cdp_flat_sessions) if new_socket is None else new_socket
 		self.logger.debug(
 			f'[get_or_create_cdp_session] Creating new CDP session for target {target_id} (new_socket={should_use_new_socket})'
 		)
@@ -1040,6 +1170,8 @@ class BrowserSession(BaseModel):
 			cdp_url=self.cdp_url if should_use_new_socket else None,
 		)
 		self._cdp_session_pool[target_id] = session
+		self._cdp_session_last_used[target_id] = time.monotonic()
+		await self._evict_cdp_sessions(keep_target_id=target_id)
 		# log length of _cdp_session_pool
 		self.logger.debug(f'[get_or_create_cdp_session] new _cdp_session_pool length: {len(self._cdp_session_pool)}')
 
@@ -1058,6 +1190,75 @@ class BrowserSession(BaseModel):
 
 		return session
 
+	@contextmanager
+	def lease_cdp_sessions(self, target_ids: Iterable[TargetID]) -> Iterator[None]:
+		"""Keep the CDP sessions of these targets out of eviction while the block runs.
+
+		The sessions don't have to exist yet, a session created for a leased target during the block is protected too.
+		Used for work that fetches several targets concurrently (e.g. the cross-origin iframes of a DOM build),
+		where creating one session must not close another that is still in use.
+		"""
+		target_ids = list(target_ids)
+		for target_id in target_ids:
+			self._cdp_session_leases[target_id] = self._cdp_session_leases.get(target_id, 0) + 1
+		try:
+			yield
+		finally:
+			for target_id in target_ids:
+				remaining = self._cdp_session_leases.get(target_id, 0) - 1
+				if remaining > 0:
+					self._cdp_session_leases[target_id] = remaining
+				else:
+					self._cdp_session_leases.pop(target_id, None)
+
+	async def _evict_cdp_sessions(self, keep_target_id: TargetID | None = None) -> None:
+		"""Close cached CDP sessions that are idle for longer than cdp_session_idle_timeout or exceed cdp_session_pool_limit.
+
+		The least recently used sessions go first. Sessions that may still be in use are never evicted: the agent focus,
+		keep_target_id, leased targets (see lease_cdp_sessions) and sessions used within CDP_SESSION_EVICTION_GRACE_PERIOD,
+		so the pool can temporarily exceed its limit. Evicted targets simply get a fresh session the next time
+		get_or_create_cdp_session is called for them.
+		"""
+		idle_timeout = self.browser_profile.cdp_session_idle_timeout
+		pool_limit = self.browser_profile.cdp_session_pool_limit
+		if idle_timeout is None and pool_limit is None:
+			return
+
+		now = time.monotonic()
+		protected = {keep_target_id, self.agent_focus.target_id if self.agent_focus else None, *self._cdp_session_leases}
+		# least recently used first
+		candidates = sorted(
+			(
+				target_id
+				for target_id in self._cdp_session_pool
+				if target_id not in protected
+				and now - self._cdp_session_last_used.get(target_id, 0.0) > CDP_SESSION_EVICTION_GRACE_PERIOD
+			),
+			key=lambda target_id: self._cdp_session_last_used.get(target_id, 0.0),
+		)
+
+		evict: list[str] = []
+		if idle_timeout is not None:
+			evict = [
+				target_id for target_id in candidates if now - self._cdp_session_last_used.get(target_id, 0.0) > idle_timeout
+			]
+		if pool_limit is not None:
+			overflow = len(self._cdp_session_pool) - len(evict) - pool_limit
+			evict += [target_id for target_id in candidates if target_id not in evict][: max(overflow, 0)]
+
+		for target_id in evict:
+			session = self._cdp_session_pool.pop(target_id)
+			self._cdp_session_last_used.pop(target_id, None)
+			self.logger.debug(f'[get_or_create_cdp_session] Evicting CDP session for target {target_id}')
+			try:
+				if session.owns_cdp_client:
+					await session.disconnect()
+				elif self._cdp_client_root is not None:
+					# Flat session on the shared root WebSocket, only detach it
+					await self._cdp_client_root.send.Target.detachFromTarget(params={'sessionId': session.session_id})
+			except Exception as e:
+				self.logger.debug(f'Failed to close evicted CDP session for target {target_id}: {type(e).__name__}: {e}')
+
 	@property
 	def current_target_id(self) -> str | None:
 		return self.agent_focus.target_id if self.agent_focus else None
@@ -1286,6 +1487,15 @@ class BrowserSession(BaseModel):
 			)
 			self.logger.debug('CDP client connected successfully')
 
+			# Keep targets and frame trees in memory, updated from CDP events
+			try:
+				target_registry = TargetRegistry(logger=self.logger)
+				await target_registry.start(self._cdp_client_root)
+				self._target_registry = target_registry
+			except Exception as e:
+				self.logger.debug(f'Failed to start target registry, falling back to Target.getTargets: {type(e).__name__}: {e}')
+				self._target_registry = None
+
 			# Get browser targets to find available contexts/pages
 			targets = await self._cdp_client_root.send.Target.getTargets()
 
@@ -1385,6 +1595,7 @@ class BrowserSession(BaseModel):
 			self.logger.error('❌ Browser cannot continue without CDP connection')
 			# Clean up any partial state
 			self._cdp_client_root = None
+			self._target_registry = None
 			self.agent_focus = None
 			# Re-raise as a fatal error
 			raise RuntimeError(f'Failed to establish CDP connection to browser: {e}') from e
@@ -1491,11 +1702,11 @@ class BrowserSession(BaseModel):
 
 			# Register event handler on root client
 			try:
-				self._cdp_client_root.register.Fetch.authRequired(_on_auth_required)
-				self._cdp_client_root.register.Fetch.requestPaused(_on_request_paused)
-				if self.agent_focus:
-					self.agent_focus.cdp_client.register.Fetch.authRequired(_on_auth_required)
-					self.agent_focus.cdp_client.register.Fetch.requestPaused(_on_request_paused)
+				# (with flat CDP sessions the focus session shares the root client, the handlers are then only added once)
+				for cdp_client in (self._cdp_client_root, self.agent_focus.cdp_client if self.agent_focus else None):
+					if cdp_client is not None:
+						add_cdp_event_handler(cdp_client, 'Fetch.authRequired', _on_auth_required)
+						add_cdp_event_handler(cdp_client, 'Fetch.requestPaused', _on_request_paused)
 				self.logger.debug('Registered Fetch.authRequired handlers')
 			except Exception as e:
 				self.logger.debug(f'Failed to register authRequired handlers: {type(e).__name__}: {e}')
@@ -1520,7 +1731,7 @@ class BrowserSession(BaseModel):
 				asyncio.create_task(_enable())
 
 			try:
-				self._cdp_client_root.register.Target.attachedToTarget(_on_attached)
+				add_cdp_event_handler(self._cdp_client_root, 'Target.attachedToTarget', _on_attached)
 				self.logger.debug('Registered Target.attachedToTarget handler for Fetch.enable')
 			except Exception as e:
 				self.logger.debug(f'Failed to register attachedToTarget handler: {type(e).__name__}: {e}')
@@ -1545,8 +1756,9 @@ class BrowserSession(BaseModel):
 		if not self._cdp_client_root:
 			return tabs
 
-		# Get all page targets using CDP
-		pages = await self._cdp_get_all_pages()
+		# Get all page targets, the live target registry keeps their titles current from Target.targetInfoChanged
+		use_registry = self._target_registry is not None and self._target_registry.started
+		pages = await self._cdp_get_all_pages(cached=use_registry)
 
 		for i, page_target in enumerate(pages):
 			target_id = page_target['targetId']
@@ -1555,9 +1767,12 @@ class BrowserSession(BaseModel):
 			# Try to get the title directly from Target.getTargetInfo - much faster!
 			# The initial getTargets() doesn't include title, but getTargetInfo does
 			try:
-				target_info = await self.cdp_client.send.Target.getTargetInfo(params={'targetId': target_id})
-				# The title is directly available in targetInfo
-				title = target_info.get('targetInfo', {}).get('title', '')
+				if use_registry:
+					title = page_target.get('title', '')
+				else:
+					target_info = await self.cdp_client.send.Target.getTargetInfo(params={'targetId': target_id})
+					# The title is directly available in targetInfo
+					title = target_info.get('targetInfo', {}).get('title', '')
 
 				# Skip JS execution for chrome:// pages and new tab pages
 				if is_new_tab_page(url) or url.startswith('chrome://'):
@@ -1604,11 +1819,27 @@ class BrowserSession(BaseModel):
 	# endregion - ========== Helper Methods ==========
 
 	# region - ========== ID Lookup Methods ==========
+	def get_cached_current_target_info(self) -> TargetInfo | None:
+		"""Get info about the current active target from the live target registry, without a CDP round-trip.
+
+		The registry follows Target.targetInfoChanged, which Chrome sends whenever a target navigates or changes its title.
+		Returns None if the registry isn't running or doesn't know the target yet, use get_current_target_info() then.
+		"""
+		if not self.agent_focus or not self.agent_focus.target_id:
+			return None
+		registry = self._target_registry
+		if registry is None or not registry.started:
+			return None
+		return registry.get_target(self.agent_focus.target_id)
+
 	async def get_current_target_info(self) -> TargetInfo | None:
 		"""Get info about the current active target using CDP."""
 		if not self.agent_focus or not self.agent_focus.target_id:
 			return None
 
+		if target_info := self.get_cached_current_target_info():
+			return target_info
+
 		targets = await self.cdp_client.send.Target.getTargets()
 		for target in targets.get('targetInfos', []):
 			if target.get('targetId') == self.agent_focus.target_id:
@@ -1814,6 +2045,85 @@ class BrowserSession(BaseModel):
 		except Exception as e:
 			self.logger.warning(f'Failed to remove highlights: {e}')
 
+	async def get_dom_change_counter(self) -> tuple[str, int] | None:
+		"""Get a cheap page-wide DOM change counter for the focused page.
+
+		Installs a tracker on first use, in an isolated world so page scripts can't see or touch it. It counts changes able
+		to add, remove or reveal elements:
+		- child list changes and visibility/state related attribute changes, via one MutationObserver on the document,
+		  every open shadow root and every same-origin iframe document (including ones added later)
+		- iframe (re)loads
+		- CSS-only reveals (:hover, :focus-within menus): after pointer, focus, transition or animation events, the
+		  visibility of every element is fingerprinted and a changed fingerprint counts as a change
+
+		Closed shadow roots and cross-origin iframes are not observed, see is_observed_by_dom_change_counter().
+		The counter lives in the document's isolated world, so the token changes when the page navigates or the focused
+		tab changes.
+
+		Returns:
+			(token, change_count), or None if the counter could not be read
+		"""
+		try:
+			cdp_session = await self.get_or_create_cdp_session()
+			for attempt in range(2):
+				context_id = self._dom_change_contexts.get(cdp_session.target_id)
+				if context_id is None:
+					frame_tree = await cdp_session.cdp_client.send.Page.getFrameTree(session_id=cdp_session.session_id)
+					world = await cdp_session.cdp_client.send.Page.createIsolatedWorld(
+						params={'frameId': frame_tree['frameTree']['frame']['id'], 'worldName': DOM_CHANGE_TRACKER_WORLD},
+						session_id=cdp_session.session_id,
+					)
+					context_id = self._dom_change_contexts[cdp_session.target_id] = world['executionContextId']
+				try:
+					result = await cdp_session.cdp_client.send.Runtime.evaluate(
+						params={'expression': DOM_CHANGE_TRACKER_JS, 'returnByValue': True, 'contextId': context_id},
+						session_id=cdp_session.session_id,
+					)
+				except Exception:
+					# The isolated world went away with its document (navigation), create one in the new document
+					del self._dom_change_contexts[cdp_session.target_id]
+					if attempt:
+						raise
+					continue
+				if 'exceptionDetails' in result:
+					raise RuntimeError(result['exceptionDetails'].get('text', 'DOM change tracker failed'))
+				token, count = result['result']['value']
+				return f'{cdp_session.target_id}:{token}', int(count)
+		except Exception as e:
+			self.logger.debug(f'Failed to read DOM change counter: {e}')
+		return None
+
+	def is_observed_by_dom_change_counter(self, node: EnhancedDOMTreeNode) -> bool:
+		"""Whether changes around an element show up in get_dom_change_counter().
+
+		Elements in cross-origin iframes (other targets) or in closed shadow roots are out of the tracker's reach, so
+		index revalidation must rebuild the DOM for them.
+		"""
+		focused_target_id = self.agent_focus.target_id if self.agent_focus else None
+		return node.target_id == focused_target_id and not node.is_in_closed_shadow_root
+
+	async def is_element_attached(self, node: EnhancedDOMTreeNode) -> bool:
+		"""Check that an element from the cached selector map is still connected to its document."""
+		try:
+			cdp_session = await self.cdp_client_for_node(node)
+			resolved = await cdp_session.cdp_client.send.DOM.resolveNode(
+				params={'backendNodeId': node.backend_node_id}, session_id=cdp_session.session_id
+			)
+			object_id = resolved.get('object', {}).get('objectId')
+			if not object_id:
+				return False
+			result = await cdp_session.cdp_client.send.Runtime.callFunctionOn(
+				params={
+					'functionDeclaration': 'function() { return this.isConnected; }',
+					'objectId': object_id,
+					'returnByValue': True,
+				},
+				session_id=cdp_session.session_id,
+			)
+			return result.get('result', {}).get('value') is True
+		except Exception:
+			return False
+
 	async def _close_extension_options_pages(self) -> None:
 		"""Close any extension options/welcome pages that have opened."""
 		try:
@@ -1860,16 +2170,20 @@ class BrowserSession(BaseModel):
 		include_chrome: bool = False,
 		include_chrome_extensions: bool = False,
 		include_chrome_error: bool = False,
+		cached: bool = False,
 	) -> list[TargetInfo]:
-		"""Get all browser pages/tabs using CDP Target.getTargets."""
+		"""Get all browser pages/tabs using CDP Target.getTargets.
+
+		With cached=True the targets come from the live target registry instead of a Target.getTargets round-trip.
+		"""
 		# Safety check - return empty list if browser not connected yet
 		if not self._cdp_client_root:
 			return []
-		targets = await self.cdp_client.send.Target.getTargets()
+		target_infos = await self.get_all_targets() if cached else (await self.cdp_client.send.Target.getTargets())['targetInfos']
 		# Filter for valid page/tab targets only
 		return [
 			t
-			for t in targets.get('targetInfos', [])
+			for t in target_infos
 			if self._is_valid_target(
 				t,
 				include_http=include_http,
@@ -1883,6 +2197,22 @@ class BrowserSession(BaseModel):
 			)
 		]
 
+	async def get_all_targets(self) -> list[TargetInfo]:
+		"""Get the infos of all browser targets (pages, iframes, workers, ...), from memory when possible.
+
+		Answered by the live target registry, which is kept up to date from Target.* events. Falls back to
+		Target.getTargets if the registry isn't running, or doesn't know the focused target yet (its targetCreated
+		event can arrive after the Target.createTarget response).
+		"""
+		if not self._cdp_client_root:
+			return []
+		registry = self._target_registry
+		if registry is None or not registry.started:
+			return (await self.cdp_client.send.Target.getTargets())['targetInfos']
+		if self.agent_focus and self.agent_focus.target_id not in registry.targets:
+			await registry.refresh(self._cdp_client_root)
+		return registry.get_targets()
+
 	async def _cdp_create_new_page(self, url: str = 'about:blank', background: bool = False, new_window: bool = False) -> str:
 		"""Create a new page/tab using CDP Target.createTarget. Returns target ID."""
 		# Use the root CDP client to create tabs at the browser level
@@ -2181,6 +2511,7 @@ class BrowserSession(BaseModel):
 			include_chrome=False,
 			include_chrome_extensions=False,
 			include_chrome_error=include_cross_origin,  # Only include error pages if cross-origin is enabled
+			cached=True,
 		)
 		all_targets = targets
 
@@ -2208,7 +2539,12 @@ class BrowserSession(BaseModel):
 
 				try:
 					# Try to get frame tree (not all target types support this)
-					frame_tree_result = await cdp_session.cdp_client.send.Page.getFrameTree(session_id=cdp_session.session_id)
+					if self._target_registry is not None:
+						frame_tree = await self._target_registry.get_frame_tree(cdp_session)
+					else:
+						frame_tree = (await cdp_session.cdp_client.send.Page.getFrameTree(session_id=cdp_session.session_id)).get(
+							'frameTree', {}
+						)
 
 					# Process the frame tree recursively
 					def process_frame_tree(node, parent_frame_id=None):
@@ -2279,7 +2615,7 @@ class BrowserSession(BaseModel):
 									process_frame_tree(child, current_frame_id)
 
 					# Process the entire frame tree
-					process_frame_tree(frame_tree_result.get('frameTree', {}))
+					process_frame_tree(frame_tree)
 
 				except Exception as e:
 					# Target doesn't support Page domain or has no frames
@@ -2314,13 +2650,17 @@ class BrowserSession(BaseModel):
 					assert parent_target_id is not None
 					parent_session_id = target_sessions[parent_target_id]
 					try:
-						# Enable DOM domain
-						await self.cdp_client.send.DOM.enable(session_id=parent_session_id)
-
 						# Get frame owner info to find backend node ID
-						frame_owner = await self.cdp_client.send.DOM.getFrameOwner(
-							params={'frameId': frame_id_iter}, session_id=parent_session_id
-						)
+						if self._target_registry is not None:
+							frame_owner = await self._target_registry.get_frame_owner(
+								self.cdp_client, parent_target_id, parent_session_id, frame_id_iter
+							)
+						else:
+							# Enable DOM domain
+							await self.cdp_client.send.DOM.enable(session_id=parent_session_id)
+							frame_owner = await self.cdp_client.send.DOM.getFrameOwner(
+								params={'frameId': frame_id_iter}, session_id=parent_session_id
+							)
 
 						if frame_owner:
 							frame_info['backendNodeId'] = frame_owner.get('backendNodeId')
@@ -0,0 +1,143 @@
+"""Live registry of browser targets and their frame trees.
+
+Building the frame hierarchy (BrowserSession.get_all_frames) used to cost a Target.getTargets call plus a
+Page.getFrameTree and a DOM.getFrameOwner per frame on every call, and DomService asks for it once per cross-origin
+iframe on every step. The registry keeps the target list up to date from Target.targetCreated / targetInfoChanged /
+targetDestroyed (via Target.setDiscoverTargets) and caches each target's frame tree and frame owners until a
+Page.frameAttached / frameDetached / frameNavigated event for that target invalidates them, so between page changes
+all of these are answered from memory.
+"""
+
+import logging
+import weakref
+from typing import TYPE_CHECKING, Any
+
+from cdp_use import CDPClient
+from cdp_use.cdp.target import TargetID, TargetInfo
+
+from browser_use.browser.cdp_events import add_cdp_event_handler
+
+if TYPE_CHECKING:
+	from browser_use.browser.session import CDPSession
+
+FRAME_EVENTS = ('Page.frameAttached', 'Page.frameDetached', 'Page.frameNavigated')
+
+
+class TargetRegistry:
+	"""Target infos and per-target frame trees, kept current from CDP events."""
+
+	def __init__(self, logger: logging.Logger | None = None):
+		self.logger = logger or logging.getLogger(__name__)
+		self.targets: dict[TargetID, TargetInfo] = {}
+		self.started = False
+
+		self._frame_trees: dict[TargetID, dict[str, Any]] = {}
+		self._frame_owners: dict[TargetID, dict[str, dict[str, Any]]] = {}  # parent target -> frame_id -> owner
+		# Bumped on every invalidation so a fetch that raced with a frame event doesn't store a stale tree
+		self._frame_generations: dict[TargetID, int] = {}
+		self._session_targets: dict[str, TargetID] = {}  # session_id -> target_id of watched sessions
+		self._watched_clients: 'weakref.WeakSet[CDPClient]' = weakref.WeakSet()
+
+		# Round-trips answered from memory / sent to the browser, for debugging and benchmarks
+		self.hits = 0
+		self.misses = 0
+
+	async def start(self, cdp_client: CDPClient) -> None:
+		"""Subscribe to target lifecycle events on the root client and load the current targets."""
+		add_cdp_event_handler(cdp_client, 'Target.targetCreated', self._on_target_created)
+		add_cdp_event_handler(cdp_client, 'Target.targetInfoChanged', self._on_target_created)
+		add_cdp_event_handler(cdp_client, 'Target.targetDestroyed', self._on_target_destroyed)
+		await cdp_client.send.Target.setDiscoverTargets(params={'discover': True})
+		await self.refresh(cdp_client)
+		self.started = True
+
+	async def refresh(self, cdp_client: CDPClient) -> None:
+		"""Reload the full target list, e.g. when a target was created before its event arrived."""
+		self.misses += 1
+		result = await cdp_client.send.Target.getTargets()
+		target_infos = result.get('targetInfos', [])
+		known = {target_info['targetId'] for target_info in target_infos}
+		for target_id in [target_id for target_id in self.targets if target_id not in known]:
+			self._forget_target(target_id)
+		for target_info in target_infos:
+			self.targets[target_info['targetId']] = target_info
+
+	def get_targets(self) -> list[TargetInfo]:
+		self.hits += 1
+		return list(self.targets.values())
+
+	def get_target(self, target_id: TargetID) -> TargetInfo | None:
+		target_info = self.targets.get(target_id)
+		if target_info is not None:
+			self.hits += 1
+		return target_info
+
+	def watch_session(self, cdp_session: 'CDPSession') -> None:
+		"""Invalidate the cached frame tree of the session's target whenever its frames change."""
+		self._session_targets[cdp_session.session_id] = cdp_session.target_id
+		if cdp_session.cdp_client in self._watched_clients:
+			return
+		self._watched_clients.add(cdp_session.cdp_client)
+		for method in FRAME_EVENTS:
+			add_cdp_event_handler(cdp_session.cdp_client, method, self._on_frame_event)
+
+	async def get_frame_tree(self, cdp_session: 'CDPSession') -> dict[str, Any]:
+		"""Page.getFrameTree()['frameTree'] of the session's target, from memory unless its frames changed."""
+		target_id = cdp_session.target_id
+		frame_tree = self._frame_trees.get(target_id)
+		if frame_tree is not None and self._session_targets.get(cdp_session.session_id) == target_id:
+			self.hits += 1
+			return frame_tree
+
+		self.watch_session(cdp_session)
+		generation = self._frame_generations.get(target_id, 0)
+		self.misses += 1
+		result = await cdp_session.cdp_client.send.Page.getFrameTree(session_id=cdp_session.session_id)
+		frame_tree = result.get('frameTree', {})
+		if self._frame_generations.get(target_id, 0) == generation:
+			self._frame_trees[target_id] = frame_tree
+		return frame_tree
+
+	async def get_frame_owner(
+		self, cdp_client: CDPClient, parent_target_id: TargetID, parent_session_id: str, frame_id: str
+	) -> dict[str, Any] | None:
+		"""DOM.getFrameOwner for a frame, evaluated in its parent target and cached with the parent's frame tree."""
+		owners = self._frame_owners.setdefault(parent_target_id, {})
+		if frame_id in owners:
+			self.hits += 1
+			return owners[frame_id]
+
+		generation = self._frame_generations.get(parent_target_id, 0)
+		self.misses += 1
+		await cdp_client.send.DOM.enable(session_id=parent_session_id)
+		frame_owner = await cdp_client.send.DOM.getFrameOwner(params={'frameId': frame_id}, session_id=parent_session_id)
+		if self._frame_generations.get(parent_target_id, 0) == generation:
+			owners[frame_id] = frame_owner  # type: ignore[assignment]
+		return frame_owner  # type: ignore[return-value]
+
+	def invalidate_frames(self, target_id: TargetID) -> None:
+		self._frame_generations[target_id] = self._frame_generations.get(target_id, 0) + 1
+		self._frame_trees.pop(target_id, None)
+		self._frame_owners.pop(target_id, None)
+
+	def _forget_target(self, target_id: TargetID) -> None:
+		self.targets.pop(target_id, None)
+		self.invalidate_frames(target_id)
+		for session_id in [session_id for session_id, owner in self._session_targets.items() if owner == target_id]:
+			del self._session_targets[session_id]
+
+	def _on_target_created(self, event: Any, session_id: str | None = None) -> None:
+		target_info = event['targetInfo']
+		self.targets[target_info['targetId']] = target_info
+
+	def _on_target_destroyed(self, event: Any, session_id: str | None = None) -> None:
+		self._forget_target(event['targetId'])
+
+	def _on_frame_event(self, event: Any, session_id: str | None = None) -> None:
+		target_id = self._session_targets.get(session_id) if session_id else None
+		if target_id is not None:
+			self.invalidate_frames(target_id)
+		else:
+			# Event from a session we can't map, drop every cached tree rather than risk serving a stale one
+			for cached_target_id in list(self._frame_trees):
+				self.invalidate_frames(cached_target_id)
@@ -3,17 +3,15 @@
 import base64
 import logging
 import math
+import queue
 import subprocess
+import threading
 from pathlib import Path
-from typing import Optional
 
 from browser_use.browser.profile import ViewportSize
 
 try:
-	import imageio.v2 as iio  # type: ignore[import-not-found]
 	import imageio_ffmpeg  # type: ignore[import-not-found]
-	import numpy as np  # type: ignore[import-not-found]
-	from imageio.core.format import Format  # type: ignore[import-not-found]
 
 	IMAGEIO_AVAILABLE = True
 except ImportError:
@@ -21,6 +19,8 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+_STOP = object()  # queue sentinel: no more frames, finish the video
+
 
 def _get_padded_size(size: ViewportSize, macro_block_size: int = 16) -> ViewportSize:
 	"""Calculates the dimensions padded to the nearest multiple of macro_block_size."""
@@ -31,14 +31,15 @@ def _get_padded_size(size: ViewportSize, macro_block_size: int = 16) -> Viewport
 
 class VideoRecorderService:
 	"""
-	Handles the video encoding process for a browser session using imageio.
+	Handles the video encoding process for a browser session using a single ffmpeg process.
 
-	This service captures individual frames from the CDP screencast, decodes them,
-	and appends them to a video file using a pip-installable ffmpeg backend.
-	It automatically resizes frames to match the target video dimensions.
+	Frames from the CDP screencast are PNG images. They are piped as-is into one long-lived ffmpeg
+	process (pip-installable via imageio-ffmpeg) that decodes, resizes, pads and encodes them.
+	add_frame only enqueues the frame, so it is safe to call from the event loop: a background
+	thread feeds the encoder, and frames are dropped when the encoder falls behind.
 	"""
 
-	def __init__(self, output_path: Path, size: ViewportSize, framerate: int):
+	def __init__(self, output_path: Path, size: ViewportSize, framerate: int, max_pending_frames: int = 30):
 		"""
 		Initializes the video recorder.
 
@@ -46,17 +47,58 @@ class VideoRecorderService:
 		    output_path: The full path where the video will be saved.
 		    size: A ViewportSize object specifying the width and height of the video.
 		    framerate: The desired framerate for the output video.
+		    max_pending_frames: Frames buffered for the encoder before new frames are dropped.
 		"""
 		self.output_path = output_path
 		self.size = size
 		self.framerate = framerate
-		self._writer: Optional['Format.Writer'] = None
+		self.max_pending_frames = max_pending_frames
+		self._process: subprocess.Popen[bytes] | None = None
+		self._frames: queue.Queue[object] = queue.Queue(maxsize=max_pending_frames)
+		self._feeder: threading.Thread | None = None
 		self._is_active = False
+		self._encoder_failed = False
 		self.padded_size = _get_padded_size(self.size)
+		self.frames_written = 0
+		self.frames_dropped = 0
+
+	def _get_encoder_command(self) -> list[str]:
+		"""The ffmpeg command that reads PNG frames from stdin and encodes them into output_path."""
+		# Build a filter chain for ffmpeg:
+		# 1. scale: Resizes the frame to the user-specified dimensions.
+		# 2. pad: Adds black bars to meet codec's macro-block requirements,
+		#    centering the original content.
+		vf_chain = (
+			f'scale={self.size["width"]}:{self.size["height"]},'
+			f'pad={self.padded_size["width"]}:{self.padded_size["height"]}:(ow-iw)/2:(oh-ih)/2:color=black'
+		)
+		return [
+			imageio_ffmpeg.get_ffmpeg_exe(),
+			'-y',  # Overwrite the output file
+			'-loglevel',
+			'error',
+			'-f',
+			'image2pipe',  # Input format from a pipe
+			'-framerate',
+			str(self.framerate),
+			'-c:v',
+			'png',  # Specify input codec is PNG
+			'-i',
+			'-',  # Input from stdin
+			'-vf',
+			vf_chain,  # Video filter for resizing and padding
+			'-c:v',
+			'libx264',
+			'-crf',
+			'10',  # Same quality as the previous imageio writer (quality=8)
+			'-pix_fmt',
+			'yuv420p',  # Ensures compatibility with most players
+			str(self.output_path),
+		]
 
 	def start(self) -> None:
 		"""
-		Prepares and starts the video writer.
+		Starts the encoder process and the thread feeding it.
 
 		If the required optional dependencies are not installed, this method will
 		log an error and do nothing.
@@ -69,94 +111,78 @@ class VideoRecorderService:
 
 		try:
 			self.output_path.parent.mkdir(parents=True, exist_ok=True)
-			# The macro_block_size is set to None because we handle padding ourselves
-			self._writer = iio.get_writer(
-				str(self.output_path),
-				fps=self.framerate,
-				codec='libx264',
-				quality=8,  # A good balance of quality and file size (1-10 scale)
-				pixelformat='yuv420p',  # Ensures compatibility with most players
-				macro_block_size=None,
+			self._process = subprocess.Popen(
+				self._get_encoder_command(), stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
 			)
+			self._feeder = threading.Thread(target=self._feed_encoder, name='video_recorder_feeder', daemon=True)
+			self._feeder.start()
 			self._is_active = True
 			logger.debug(f'Video recorder started. Output will be saved to {self.output_path}')
 		except Exception as e:
-			logger.error(f'Failed to initialize video writer: {e}')
+			logger.error(f'Failed to initialize video encoder: {e}')
 			self._is_active = False
 
-	def add_frame(self, frame_data_b64: str) -> None:
+	def add_frame(self, frame_data_b64: str) -> bool:
 		"""
-		Decodes a base64-encoded PNG frame, resizes it, pads it to be codec-compatible,
-		and appends it to the video.
+		Queues a base64-encoded PNG frame for the encoder, without blocking.
 
 		Args:
 		    frame_data_b64: A base64-encoded string of the PNG frame data.
+
+		Returns:
+		    False if the frame was dropped because the recorder is stopped or the encoder is behind.
 		"""
-		if not self._is_active or not self._writer:
-			return
+		if not self._is_active or self._encoder_failed:
+			return False
 
 		try:
-			frame_bytes = base64.b64decode(frame_data_b64)
-
-			# Build a filter chain for ffmpeg:
-			# 1. scale: Resizes the frame to the user-specified dimensions.
-			# 2. pad: Adds black bars to meet codec's macro-block requirements,
-			#    centering the original content.
-			vf_chain = (
-				f'scale={self.size["width"]}:{self.size["height"]},'
-				f'pad={self.padded_size["width"]}:{self.padded_size["height"]}:(ow-iw)/2:(oh-ih)/2:color=black'
-			)
-
-			output_pix_fmt = 'rgb24'
-			command = [
-				imageio_ffmpeg.get_ffmpeg_exe(),
-				'-f',
-				'image2pipe',  # Input format from a pipe
-				'-c:v',
-				'png',  # Specify input codec is PNG
-				'-i',
-				'-',  # Input from stdin
-				'-vf',
-				vf_chain,  # Video filter for resizing and padding
-				'-f',
-				'rawvideo',  # Output format is raw video
-				'-pix_fmt',
-				output_pix_fmt,  # Output pixel format
-				'-',  # Output to stdout
-			]
-
-			# Execute ffmpeg as a subprocess
-			proc = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-			out, err = proc.communicate(input=frame_bytes)
-
-			if proc.returncode != 0:
-				err_msg = err.decode(errors='ignore').strip()
-				if 'deprecated pixel format used' not in err_msg.lower():
-					raise OSError(f'ffmpeg error during resizing/padding: {err_msg}')
-				else:
-					logger.debug(f'ffmpeg warning during resizing/padding: {err_msg}')
-
-			# Convert the raw output bytes to a numpy array with the padded dimensions
-			img_array = np.frombuffer(out, dtype=np.uint8).reshape((self.padded_size['height'], self.padded_size['width'], 3))
-
-			self._writer.append_data(img_array)
-		except Exception as e:
-			logger.warning(f'Could not process and add video frame: {e}')
+			self._frames.put_nowait(frame_data_b64)
+			return True
+		except queue.Full:
+			self.frames_dropped += 1
+			return False
+
+	def _feed_encoder(self) -> None:
+		"""Background thread: decodes queued frames and writes them to the encoder's stdin until stopped."""
+		assert self._process is not None and self._process.stdin is not None
+		while True:
+			frame = self._frames.get()
+			if frame is _STOP:
+				return
+			if self._encoder_failed:
+				continue  # keep draining so stop_and_save never blocks on a full queue
+			try:
+				self._process.stdin.write(base64.b64decode(frame))  # type: ignore[arg-type]
+				self.frames_written += 1
+			except (OSError, ValueError) as e:
+				logger.warning(f'Could not write video frame to the encoder, dropping the remaining frames: {e}')
+				self._encoder_failed = True
 
 	def stop_and_save(self) -> None:
 		"""
-		Finalizes the video file by closing the writer.
+		Finalizes the video file by flushing the queued frames and closing the encoder.
 
-		This method should be called when the recording session is complete.
+		This method blocks until the file is written and should be called when the recording
+		session is complete, off the event loop.
 		"""
-		if not self._is_active or not self._writer:
+		if not self._is_active or not self._process:
 			return
 
+		process = self._process
 		try:
-			self._writer.close()
-			logger.info(f'📹 Video recording saved successfully to: {self.output_path}')
+			self._frames.put(_STOP)
+			if self._feeder is not None:
+				self._feeder.join()
+			_, err = process.communicate(timeout=60)  # closes stdin, ffmpeg then writes the file trailer
+			if process.returncode != 0:
+				raise OSError(f'ffmpeg exited with code {process.returncode}: {err.decode(errors="ignore").strip()}')
+			dropped = f', {self.frames_dropped} dropped' if self.frames_dropped else ''
+			logger.info(f'📹 Video recording saved successfully to: {self.output_path} ({self.frames_written} frames{dropped})')
 		except Exception as e:
 			logger.error(f'Failed to finalize and save video: {e}')
+			if process.poll() is None:
+				process.kill()
 		finally:
 			self._is_active = False
-			self._writer = None
+			self._process = None
+			self._feeder = None
@@ -1,4 +1,5 @@
 from dataclasses import dataclass, field
+from pathlib import Path
 from typing import Any
 
 from bubus import BaseEvent
@@ -6,6 +7,7 @@ from cdp_use.cdp.target import TargetID
 from pydantic import AliasChoices, BaseModel, ConfigDict, Field, field_serializer
 
 from browser_use.dom.views import DOMInteractedElement, SerializedDOMState
+from browser_use.screenshots.views import ScreenshotRef
 
 # Known placeholder image data for about:blank pages - a 4x4 white PNG
 PLACEHOLDER_4PX_SCREENSHOT = (
@@ -84,6 +86,9 @@ class BrowserStateSummary:
 	browser_errors: list[str] = field(default_factory=list)
 	is_pdf_viewer: bool = False  # Whether the current page is a PDF viewer
 	recent_events: str | None = None  # Text summary of recent browser events
+	dom_change_counter: tuple[str, int] | None = None  # BrowserSession.get_dom_change_counter() when the DOM build started
+	page_load_wait: float | None = None  # Seconds spent waiting for the page to settle before capturing this state
+	page_load_wait_reason: str | None = None  # How that wait ended: 'stable', 'timeout, ...' or 'fixed wait'
 
 
 @dataclass
@@ -98,22 +103,12 @@ class BrowserStateHistory:
 
 	def get_screenshot(self) -> str | None:
 		"""Load screenshot from disk and return as base64 string"""
-		if not self.screenshot_path:
-			return None
-
-		import base64
-		from pathlib import Path
-
-		path_obj = Path(self.screenshot_path)
-		if not path_obj.exists():
-			return None
-
-		try:
-			with open(path_obj, 'rb') as f:
-				screenshot_data = f.read()
-			return base64.b64encode(screenshot_data).decode('utf-8')
-		except Exception:
-			return None
+		screenshot = self.get_screenshot_ref()
+		return screenshot.to_base64() if screenshot else None
+
+	def get_screenshot_ref(self) -> ScreenshotRef | None:
+		"""Lazy handle to the screenshot on disk, nothing is read until its bytes are asked for"""
+		return ScreenshotRef(Path(self.screenshot_path)) if self.screenshot_path else None
 
 	def to_dict(self) -> dict[str, Any]:
 		data = {}
@@ -10,6 +10,7 @@ from cdp_use.cdp.target import SessionID, TargetID
 from cdp_use.cdp.target.events import TargetCrashedEvent
 from pydantic import Field, PrivateAttr
 
+from browser_use.browser.cdp_events import add_cdp_event_handler
 from browser_use.browser.events import (
 	BrowserConnectedEvent,
 	BrowserErrorEvent,
@@ -108,13 +109,16 @@ class CrashWatchdog(BaseWatchdog):
 			# cdp_client.on('Network.loadingFinished', on_loading_finished, session_id=session_id)
 
 			def on_target_crashed(event: TargetCrashedEvent, session_id: SessionID | None = None):
+				# With flat CDP sessions every target shares the root client, only react to crashes of our own target
+				if event.get('targetId', target_id) != target_id:
+					return
 				# Create and track the task
 				task = asyncio.create_task(self._on_target_crash_cdp(target_id))
 				self._cdp_event_tasks.add(task)
 				# Remove from set when done
 				task.add_done_callback(lambda t: self._cdp_event_tasks.discard(t))
 
-			cdp_session.cdp_client.register.Target.targetCrashed(on_target_crashed)
+			add_cdp_event_handler(cdp_session.cdp_client, 'Target.targetCrashed', on_target_crashed)  # type: ignore[arg-type]
 
 			# Track that we've added listeners to this session
 			self._sessions_with_listeners.add(cdp_session.session_id)
@@ -4,12 +4,15 @@ import asyncio
 import time
 from typing import TYPE_CHECKING
 
+from pydantic import PrivateAttr
+
 from browser_use.browser.events import (
 	BrowserErrorEvent,
 	BrowserStateRequestEvent,
 	ScreenshotEvent,
 	TabCreatedEvent,
 )
+from browser_use.browser.page_stability import PageStabilityMonitor, PageStabilityResult
 from browser_use.browser.watchdog_base import BaseWatchdog
 from browser_use.dom.service import DomService
 from browser_use.dom.views import (
@@ -41,6 +44,8 @@ class DOMWatchdog(BaseWatchdog):
 
 	# Internal DOM service
 	_dom_service: DomService | None = None
+	# Page stability monitors by CDP session id
+	_stability_monitors: dict[str, PageStabilityMonitor] = PrivateAttr(default_factory=dict)
 
 	async def on_TabCreatedEvent(self, event: TabCreatedEvent) -> None:
 		# self.logger.debug('Setting up init scripts in browser')
@@ -113,10 +118,11 @@ class DOMWatchdog(BaseWatchdog):
 		not_a_meaningful_website = page_url.lower().split(':', 1)[0] not in ('http', 'https')
 
 		# Wait for page stability using browser profile settings (main branch pattern)
+		page_stability = None
 		if not not_a_meaningful_website:
 			self.logger.debug('🔍 DOMWatchdog.on_BrowserStateRequestEvent: ⏳ Waiting for page stability...')
 			try:
-				await self._wait_for_stable_network()
+				page_stability = await self._wait_for_stable_network(page_url)
 				self.logger.debug('🔍 DOMWatchdog.on_BrowserStateRequestEvent: ✅ Page stability complete')
 			except Exception as e:
 				self.logger.warning(
@@ -188,9 +194,13 @@ class DOMWatchdog(BaseWatchdog):
 			screenshot_task = None
 
 			# Start DOM building task if requested
+			dom_change_counter = None
 			if event.include_dom:
 				self.logger.debug('🔍 DOMWatchdog.on_BrowserStateRequestEvent: 🌳 Starting DOM tree build task...')
 
+				# Read before the build starts, so any change from now on shows up when multi_act compares against it
+				dom_change_counter = await self.browser_session.get_dom_change_counter()
+
 				previous_state = (
 					self.browser_session._cached_browser_state_summary.dom_state
 					if self.browser_session._cached_browser_state_summary
@@ -240,6 +250,11 @@ class DOMWatchdog(BaseWatchdog):
 						content.selector_map,
 						cdp_session,
 						self.browser_session.browser_profile.filter_highlight_ids,
+						self.browser_session.browser_profile.highlight_image_format,
+						self.browser_session.browser_profile.highlight_image_quality,
+						self.browser_session._screenshot_watchdog.capture_scale
+						if self.browser_session._screenshot_watchdog
+						else 1.0,
 					)
 					self.logger.debug(
 						f'🔍 DOMWatchdog.on_BrowserStateRequestEvent: ✅ Applied highlights to {len(content.selector_map)} elements in {time.time() - start:.2f}s'
@@ -311,6 +326,9 @@ class DOMWatchdog(BaseWatchdog):
 				browser_errors=[],
 				is_pdf_viewer=is_pdf_viewer,
 				recent_events=self._get_recent_events_str() if event.include_recent_events else None,
+				dom_change_counter=dom_change_counter,
+				page_load_wait=page_stability.waited if page_stability else None,
+				page_load_wait_reason=page_stability.reason if page_stability else None,
 			)
 
 			# Cache the state
@@ -362,8 +380,10 @@ class DOMWatchdog(BaseWatchdog):
 					logger=self.logger,
 					cross_origin_iframes=self.browser_session.browser_profile.cross_origin_iframes,
 					paint_order_filtering=self.browser_session.browser_profile.paint_order_filtering,
+					paint_order_spatial_index=self.browser_session.browser_profile.paint_order_spatial_index,
 					max_iframes=self.browser_session.browser_profile.max_iframes,
 					max_iframe_depth=self.browser_session.browser_profile.max_iframe_depth,
+					incremental_dom=self.browser_session.browser_profile.incremental_dom,
 				)
 
 			# Get serialized DOM tree using the service
@@ -440,24 +460,55 @@ class DOMWatchdog(BaseWatchdog):
 			self.logger.warning(f'📸 Clean screenshot failed: {type(e).__name__}: {e}')
 			raise
 
-	async def _wait_for_stable_network(self):
-		"""Wait for page stability - simplified for CDP-only branch."""
+	async def _wait_for_stable_network(self, page_url: str) -> PageStabilityResult | None:
+		"""Wait for page stability, returning as soon as the network and DOM have settled.
+
+		The profile's minimum_wait_page_load_time + wait_for_network_idle_page_load_time are only an upper bound,
+		falls back to plain sleeps if network/lifecycle events can't be monitored on the focused target.
+		"""
 		start_time = time.time()
+		profile = self.browser_session.browser_profile
+		max_wait = max(profile.minimum_wait_page_load_time, 0) + max(profile.wait_for_network_idle_page_load_time, 0)
+		if max_wait <= 0:
+			return None
+
+		monitor = None
+		try:
+			monitor = await self._get_stability_monitor()
+		except Exception as e:
+			self.logger.debug(f'Page stability monitoring unavailable, falling back to fixed wait: {type(e).__name__}: {e}')
+
+		if monitor is None:
+			self.logger.debug(f'⏳ Fixed page load wait: {max_wait}s')
+			await asyncio.sleep(max_wait)
+			result = PageStabilityResult(waited=time.time() - start_time, stable=False, reason='fixed wait')
+		else:
+			result = await monitor.wait_until_stable(max_wait=max_wait)
+
+		self.logger.debug(f'✅ Page stability wait for {page_url} completed in {result} (upper bound {max_wait:.2f}s)')
+		return result
+
+	async def _get_stability_monitor(self) -> PageStabilityMonitor | None:
+		"""Get (or start) the stability monitor for the currently focused target session."""
+		cdp_session = self.browser_session.agent_focus
+		if cdp_session is None:
+			return None
 
-		# Apply minimum wait time first (let page settle)
-		min_wait = self.browser_session.browser_profile.minimum_wait_page_load_time
-		if min_wait > 0:
-			self.logger.debug(f'⏳ Minimum wait: {min_wait}s')
-			await asyncio.sleep(min_wait)
+		monitor = self._stability_monitors.get(cdp_session.session_id)
+		if monitor is not None and monitor.cdp_session is cdp_session:
+			return monitor
 
-		# Apply network idle wait time (for dynamic content like iframes)
-		network_idle_wait = self.browser_session.browser_profile.wait_for_network_idle_page_load_time
-		if network_idle_wait > 0:
-			self.logger.debug(f'⏳ Network idle wait: {network_idle_wait}s')
-			await asyncio.sleep(network_idle_wait)
+		# Forget monitors of sessions that have been closed or replaced in the meantime
+		live_sessions = {session.session_id for session in self.browser_session._cdp_session_pool.values()}
+		for session_id, stale_monitor in list(self._stability_monitors.items()):
+			if session_id not in live_sessions or session_id == cdp_session.session_id:
+				stale_monitor.stop()
+				del self._stability_monitors[session_id]
 
-		elapsed = time.time() - start_time
-		self.logger.debug(f'✅ Page stability wait completed in {elapsed:.2f}s')
+		monitor = PageStabilityMonitor(cdp_session, logger=self.logger)
+		await monitor.start()
+		self._stability_monitors[cdp_session.session_id] = monitor
+		return monitor
 
 	async def _get_page_info(self) -> 'PageInfo':
 		"""Get comprehensive page information using a single CDP call.
@@ -571,6 +622,9 @@ class DOMWatchdog(BaseWatchdog):
 
 	async def __aexit__(self, exc_type, exc_value, traceback):
 		"""Clean up DOM service on exit."""
+		for monitor in self._stability_monitors.values():
+			monitor.stop()
+		self._stability_monitors.clear()
 		if self._dom_service:
 			await self._dom_service.__aexit__(exc_type, exc_value, traceback)
 			self._dom_service = None
@@ -14,6 +14,7 @@ from cdp_use.cdp.browser import DownloadProgressEvent, DownloadWillBeginEvent
 from cdp_use.cdp.target import SessionID, TargetID
 from pydantic import PrivateAttr
 
+from browser_use.browser.cdp_events import add_cdp_event_handler
 from browser_use.browser.events import (
 	BrowserLaunchEvent,
 	BrowserStateRequestEvent,
@@ -260,8 +261,8 @@ class DownloadsWatchdog(BaseWatchdog):
 				)
 
 				# Register the handlers with CDP
-				cdp_client.register.Browser.downloadWillBegin(download_will_begin_handler)  # type: ignore[arg-type]
-				cdp_client.register.Browser.downloadProgress(download_progress_handler)  # type: ignore[arg-type]
+				add_cdp_event_handler(cdp_client, 'Browser.downloadWillBegin', download_will_begin_handler)
+				add_cdp_event_handler(cdp_client, 'Browser.downloadProgress', download_progress_handler)
 
 				self._download_cdp_session_setup = True
 				self.logger.debug('[DownloadsWatchdog] Set up CDP download listeners')
@@ -4,6 +4,7 @@ import asyncio
 import os
 import shutil
 import tempfile
+import time
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, ClassVar
 
@@ -17,6 +18,7 @@ from browser_use.browser.events import (
 	BrowserLaunchResult,
 	BrowserStopEvent,
 )
+from browser_use.browser.pool import PooledBrowser
 from browser_use.browser.watchdog_base import BaseWatchdog
 from browser_use.observability import observe_debug
 
@@ -42,6 +44,7 @@ class LocalBrowserWatchdog(BaseWatchdog):
 	_owns_browser_resources: bool = PrivateAttr(default=True)
 	_temp_dirs_to_cleanup: list[Path] = PrivateAttr(default_factory=list)
 	_original_user_data_dir: str | None = PrivateAttr(default=None)
+	_pooled_browser: PooledBrowser | None = PrivateAttr(default=None)
 
 	@observe_debug(ignore_input=True, ignore_output=True, name='browser_launch_event')
 	async def on_BrowserLaunchEvent(self, event: BrowserLaunchEvent) -> BrowserLaunchResult:
@@ -50,10 +53,23 @@ class LocalBrowserWatchdog(BaseWatchdog):
 		try:
 			self.logger.debug('[LocalBrowserWatchdog] Received BrowserLaunchEvent, launching local browser...')
 
-			# self.logger.debug('[LocalBrowserWatchdog] Calling _launch_browser...')
-			process, cdp_url = await self._launch_browser()
-			self._subprocess = process
-			# self.logger.debug(f'[LocalBrowserWatchdog] _launch_browser returned: process={process}, cdp_url={cdp_url}')
+			started = time.monotonic()
+			pool = self.browser_session._browser_pool
+			pooled_browser = await pool.acquire(self.browser_session.browser_profile) if pool else None
+			if pooled_browser:
+				self._use_pooled_browser(pooled_browser)
+				cdp_url = pooled_browser.cdp_url
+			else:
+				# self.logger.debug('[LocalBrowserWatchdog] Calling _launch_browser...')
+				process, cdp_url = await self._launch_browser()
+				self._subprocess = process
+				# self.logger.debug(f'[LocalBrowserWatchdog] _launch_browser returned: process={process}, cdp_url={cdp_url}')
+
+			if pool:
+				elapsed = time.monotonic() - started
+				pool.stats.session_start_seconds.append(elapsed)
+				source = 'pre-launched by the pool' if pooled_browser else 'launched, no idle pooled browser'
+				self.logger.debug(f'[LocalBrowserWatchdog] Browser ready in {elapsed:.2f}s ({source}), pool {pool.stats}')
 
 			return BrowserLaunchResult(cdp_url=cdp_url)
 		except Exception as e:
@@ -64,9 +80,15 @@ class LocalBrowserWatchdog(BaseWatchdog):
 		"""Kill the local browser subprocess."""
 		self.logger.debug('[LocalBrowserWatchdog] Killing local browser process')
 
-		if self._subprocess:
+		pool = self.browser_session._browser_pool
+		if self._pooled_browser and pool:
+			# The pool kills it with its profile and launches a fresh one in its place
+			await pool.release(self._pooled_browser)
+			self._subprocess = None
+		elif self._subprocess:
 			await self._cleanup_process(self._subprocess)
 			self._subprocess = None
+		self._pooled_browser = None
 
 		# Clean up temp directories if any were created
 		for temp_dir in self._temp_dirs_to_cleanup:
@@ -87,6 +109,17 @@ class LocalBrowserWatchdog(BaseWatchdog):
 			# Dispatch BrowserKillEvent without awaiting so it gets processed after all BrowserStopEvent handlers
 			self.event_bus.dispatch(BrowserKillEvent())
 
+	def _use_pooled_browser(self, pooled_browser: PooledBrowser) -> None:
+		"""Adopt a pre-launched browser from the session's pool instead of launching one."""
+		profile = self.browser_session.browser_profile
+		self._original_user_data_dir = str(profile.user_data_dir) if profile.user_data_dir else None
+		profile.user_data_dir = pooled_browser.user_data_dir
+		self._pooled_browser = pooled_browser
+		self._subprocess = pooled_browser.process
+		self.logger.debug(
+			f'[LocalBrowserWatchdog] 🏊 Using pre-launched browser_pid= {pooled_browser.process.pid} from the pool 🔗 {pooled_browser.cdp_url}'
+		)
+
 	@observe_debug(ignore_input=True, ignore_output=True, name='launch_browser_process')
 	async def _launch_browser(self, max_retries: int = 3) -> tuple[psutil.Process, str]:
 		"""Launch browser process and return (process, cdp_url).
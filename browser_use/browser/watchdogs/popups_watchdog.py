@@ -6,6 +6,7 @@ from typing import ClassVar
 from bubus import BaseEvent
 from pydantic import PrivateAttr
 
+from browser_use.browser.cdp_events import add_cdp_event_handler
 from browser_use.browser.events import TabCreatedEvent
 from browser_use.browser.watchdog_base import BaseWatchdog
 
@@ -45,52 +46,9 @@ class PopupsWatchdog(BaseWatchdog):
 			if self.browser_session._cdp_client_root:
 				self.logger.debug('📌 Also registering handler on root CDP client')
 
-			# Set up async handler for JavaScript dialogs - accept immediately without event dispatch
-			async def handle_dialog(event_data, session_id: str | None = None):
-				"""Handle JavaScript dialog events - accept immediately."""
-				try:
-					dialog_type = event_data.get('type', 'alert')
-					message = event_data.get('message', '')
-
-					self.logger.info(f"🔔 JavaScript {dialog_type} dialog: '{message[:100]}' - attempting to accept...")
-
-					self.logger.debug('Trying all approaches to accept dialog...')
-
-					# Approach 1: Use the session that detected the dialog
-					if self.browser_session._cdp_client_root and session_id:
-						try:
-							self.logger.debug(f'🔄 Approach 1: Using session {session_id}')
-							await asyncio.wait_for(
-								self.browser_session._cdp_client_root.send.Page.handleJavaScriptDialog(
-									params={'accept': True},
-									session_id=session_id,
-								),
-								timeout=0.25,
-							)
-						except (TimeoutError, Exception) as e:
-							pass
-
-					# Approach 2: Try with current agent focus session
-					if self.browser_session._cdp_client_root and self.browser_session.agent_focus:
-						try:
-							self.logger.debug(
-								f'🔄 Approach 2: Using agent focus session {self.browser_session.agent_focus.session_id}'
-							)
-							await asyncio.wait_for(
-								self.browser_session._cdp_client_root.send.Page.handleJavaScriptDialog(
-									params={'accept': True},
-									session_id=self.browser_session.agent_focus.session_id,
-								),
-								timeout=0.25,
-							)
-						except (TimeoutError, Exception) as e:
-							pass
-
-				except Exception as e:
-					self.logger.error(f'❌ Critical error in dialog handler: {type(e).__name__}: {e}')
-
 			# Register handler on the specific session
-			cdp_session.cdp_client.register.Page.javascriptDialogOpening(handle_dialog)  # type: ignore[arg-type]
+			# (one shared handler, so registering it for every tab on a shared client doesn't accept each dialog several times)
+			add_cdp_event_handler(cdp_session.cdp_client, 'Page.javascriptDialogOpening', self._handle_dialog)
 			self.logger.debug(
 				f'Successfully registered Page.javascriptDialogOpening handler for session {cdp_session.session_id}'
 			)
@@ -98,7 +56,11 @@ class PopupsWatchdog(BaseWatchdog):
 			# Also register on root CDP client to catch dialogs from any frame
 			if hasattr(self.browser_session._cdp_client_root, 'register'):
 				try:
-					self.browser_session._cdp_client_root.register.Page.javascriptDialogOpening(handle_dialog)  # type: ignore[arg-type]
+					add_cdp_event_handler(
+						self.browser_session._cdp_client_root,  # type: ignore[arg-type]
+						'Page.javascriptDialogOpening',
+						self._handle_dialog,
+					)
 					self.logger.debug('Successfully registered dialog handler on root CDP client for all frames')
 				except Exception as root_error:
 					self.logger.warning(f'Failed to register on root CDP client: {root_error}')
@@ -110,3 +72,44 @@ class PopupsWatchdog(BaseWatchdog):
 
 		except Exception as e:
 			self.logger.warning(f'Failed to set up popup handling for tab {target_id}: {e}')
+
+	async def _handle_dialog(self, event_data, session_id: str | None = None) -> None:
+		"""Handle JavaScript dialog events - accept immediately."""
+		try:
+			dialog_type = event_data.get('type', 'alert')
+			message = event_data.get('message', '')
+
+			self.logger.info(f"🔔 JavaScript {dialog_type} dialog: '{message[:100]}' - attempting to accept...")
+
+			self.logger.debug('Trying all approaches to accept dialog...')
+
+			# Approach 1: Use the session that detected the dialog
+			if self.browser_session._cdp_client_root and session_id:
+				try:
+					self.logger.debug(f'🔄 Approach 1: Using session {session_id}')
+					await asyncio.wait_for(
+						self.browser_session._cdp_client_root.send.Page.handleJavaScriptDialog(
+							params={'accept': True},
+							session_id=session_id,
+						),
+						timeout=0.25,
+					)
+				except (TimeoutError, Exception) as e:
+					pass
+
+			# Approach 2: Try with current agent focus session
+			if self.browser_session._cdp_client_root and self.browser_session.agent_focus:
+				try:
+					self.logger.debug(f'🔄 Approach 2: Using agent focus session {self.browser_session.agent_focus.session_id}')
+					await asyncio.wait_for(
+						self.browser_session._cdp_client_root.send.Page.handleJavaScriptDialog(
+							params={'accept': True},
+							session_id=self.browser_session.agent_focus.session_id,
+						),
+						timeout=0.25,
+					)
+				except (TimeoutError, Exception) as e:
+					pass
+
+		except Exception as e:
+			self.logger.error(f'❌ Critical error in dialog handler: {type(e).__name__}: {e}')
@@ -8,6 +8,7 @@ from bubus import BaseEvent
 from cdp_use.cdp.page.events import ScreencastFrameEvent
 from uuid_extensions import uuid7str
 
+from browser_use.browser.cdp_events import add_cdp_event_handler
 from browser_use.browser.events import BrowserConnectedEvent, BrowserStopEvent
 from browser_use.browser.profile import ViewportSize
 from browser_use.browser.video_recorder import VideoRecorderService
@@ -53,7 +54,7 @@ class RecordingWatchdog(BaseWatchdog):
 			self._recorder = None
 			return
 
-		self.browser_session.cdp_client.register.Page.screencastFrame(self.on_screencastFrame)
+		add_cdp_event_handler(self.browser_session.cdp_client, 'Page.screencastFrame', self.on_screencastFrame)
 
 		try:
 			cdp_session = await self.browser_session.get_or_create_cdp_session()
@@ -96,6 +97,10 @@ class RecordingWatchdog(BaseWatchdog):
 	def on_screencastFrame(self, event: ScreencastFrameEvent, session_id: str | None) -> None:
 		"""
 		Synchronous handler for incoming screencast frames.
+
+		Only queues the frame for the recorder's encoder thread, so the event loop is never blocked
+		by decoding or encoding. The frame is acknowledged even if the recorder dropped it, otherwise
+		the browser would stop sending frames.
 		"""
 		if not self._recorder:
 			return
@@ -1,11 +1,24 @@
 """Screenshot watchdog for handling screenshot requests using CDP."""
 
+import base64
+import hashlib
+import io
 from typing import TYPE_CHECKING, Any, ClassVar
 
 from bubus import BaseEvent
 from cdp_use.cdp.page import CaptureScreenshotParameters
+from pydantic import PrivateAttr
 
-from browser_use.browser.events import ScreenshotEvent
+from browser_use.browser.events import (
+	ClickElementEvent,
+	ScreenshotEvent,
+	ScrollEvent,
+	ScrollToTextEvent,
+	SelectDropdownOptionEvent,
+	SendKeysEvent,
+	TypeTextEvent,
+	UploadFileEvent,
+)
 from browser_use.browser.views import BrowserError
 from browser_use.browser.watchdog_base import BaseWatchdog
 from browser_use.observability import observe_debug
@@ -13,16 +26,88 @@ from browser_use.observability import observe_debug
 if TYPE_CHECKING:
 	pass
 
+# Longest side of the thumbnail captured to decide whether the page changed since the last screenshot
+CHANGE_DETECTION_THUMBNAIL_SIZE = 320
+
+
+def get_screenshot_scale(css_width: float, css_height: float, device_pixel_ratio: float, max_dimension: int | None) -> float:
+	"""Scale factor (<= 1) that keeps the longest side of a viewport screenshot within max_dimension device pixels."""
+	longest_side = max(css_width, css_height) * device_pixel_ratio
+	if not max_dimension or longest_side <= max_dimension:
+		return 1.0
+	return max_dimension / longest_side
+
+
+def get_perceptual_hash(image_data: bytes) -> str:
+	"""Hash of a coarse grayscale version of the image.
+
+	Quantizing to 32 gray levels absorbs encoder noise and sub-pixel anti-aliasing differences. Changes smaller than
+	a thumbnail pixel or a gray level (a typed character, a caret, a focus ring) can be lost, so this is only one of
+	the signals used to decide that the page is unchanged.
+	"""
+	from PIL import Image
+
+	with Image.open(io.BytesIO(image_data)) as image:
+		pixels = image.convert('L').point(lambda value: value >> 3).tobytes()
+	return hashlib.blake2b(pixels, digest_size=16).hexdigest()
+
 
 class ScreenshotWatchdog(BaseWatchdog):
 	"""Handles screenshot requests using CDP."""
 
 	# Events this watchdog listens to
-	LISTENS_TO: ClassVar[list[type[BaseEvent[Any]]]] = [ScreenshotEvent]
+	LISTENS_TO: ClassVar[list[type[BaseEvent[Any]]]] = [
+		ScreenshotEvent,
+		# interactions, after which the next screenshot is always captured fresh
+		ClickElementEvent,
+		TypeTextEvent,
+		SendKeysEvent,
+		ScrollEvent,
+		ScrollToTextEvent,
+		SelectDropdownOptionEvent,
+		UploadFileEvent,
+	]
 
 	# Events this watchdog emits
 	EMITS: ClassVar[list[type[BaseEvent[Any]]]] = []
 
+	# Scale of the last captured screenshot relative to device pixels (< 1 when downscaled to screenshot_max_dimension)
+	_capture_scale: float = PrivateAttr(default=1.0)
+	# (target_id, url, viewport, DOM change counter, perceptual hash of the thumbnail) -> last full screenshot,
+	# for screenshot_reuse_unchanged. Cleared by any interaction with the page.
+	_last_frame_key: tuple[str, str, tuple[float, ...], tuple[str, int], str] | None = PrivateAttr(default=None)
+	_last_frame: str | None = PrivateAttr(default=None)
+
+	@property
+	def capture_scale(self) -> float:
+		return self._capture_scale
+
+	def _forget_last_frame(self) -> None:
+		"""An interaction may have changed the page below what the thumbnail hash can see, don't reuse the last frame"""
+		self._last_frame_key = None
+		self._last_frame = None
+
+	async def on_ClickElementEvent(self, event: ClickElementEvent) -> None:
+		self._forget_last_frame()
+
+	async def on_TypeTextEvent(self, event: TypeTextEvent) -> None:
+		self._forget_last_frame()
+
+	async def on_SendKeysEvent(self, event: SendKeysEvent) -> None:
+		self._forget_last_frame()
+
+	async def on_ScrollEvent(self, event: ScrollEvent) -> None:
+		self._forget_last_frame()
+
+	async def on_ScrollToTextEvent(self, event: ScrollToTextEvent) -> None:
+		self._forget_last_frame()
+
+	async def on_SelectDropdownOptionEvent(self, event: SelectDropdownOptionEvent) -> None:
+		self._forget_last_frame()
+
+	async def on_UploadFileEvent(self, event: UploadFileEvent) -> None:
+		self._forget_last_frame()
+
 	@observe_debug(ignore_input=True, ignore_output=True, name='screenshot_event_handler')
 	async def on_ScreenshotEvent(self, event: ScreenshotEvent) -> str:
 		"""Handle screenshot request using CDP.
@@ -37,9 +122,51 @@ class ScreenshotWatchdog(BaseWatchdog):
 		try:
 			# Get CDP client and session for current target
 			cdp_session = await self.browser_session.get_or_create_cdp_session()
+			profile = self.browser_session.browser_profile
 
 			# Prepare screenshot parameters
-			params = CaptureScreenshotParameters(format='png', captureBeyondViewport=False)
+			params = CaptureScreenshotParameters(format=profile.screenshot_format, captureBeyondViewport=False)
+			if profile.screenshot_format != 'png':
+				params['quality'] = profile.screenshot_quality
+
+			scale = 1.0
+			frame_key = None
+			if profile.screenshot_max_dimension or profile.screenshot_reuse_unchanged:
+				metrics = await cdp_session.cdp_client.send.Page.getLayoutMetrics(session_id=cdp_session.session_id)
+				css_viewport = metrics['cssVisualViewport']
+				css_width, css_height = css_viewport['clientWidth'], css_viewport['clientHeight']
+				device_pixel_ratio = metrics['visualViewport']['clientWidth'] / css_width if css_width else 1.0
+				clip = {'x': css_viewport['pageX'], 'y': css_viewport['pageY'], 'width': css_width, 'height': css_height}
+
+				scale = get_screenshot_scale(css_width, css_height, device_pixel_ratio, profile.screenshot_max_dimension)
+				if scale < 1.0:
+					params['clip'] = {**clip, 'scale': scale}  # type: ignore[typeddict-item]
+
+				# Without a DOM change counter (e.g. the page script failed) there is nothing to vouch for the thumbnail hash
+				dom_change_counter = (
+					await self.browser_session.get_dom_change_counter() if profile.screenshot_reuse_unchanged else None
+				)
+				if dom_change_counter is not None:
+					# A small PNG thumbnail is several times cheaper to capture than the full frame
+					thumbnail_scale = min(
+						1.0, CHANGE_DETECTION_THUMBNAIL_SIZE / (max(css_width, css_height) * device_pixel_ratio)
+					)
+					thumbnail = await cdp_session.cdp_client.send.Page.captureScreenshot(
+						params=CaptureScreenshotParameters(
+							format='png', captureBeyondViewport=False, clip={**clip, 'scale': thumbnail_scale}
+						),
+						session_id=cdp_session.session_id,
+					)
+					frame_key = (
+						cdp_session.target_id,
+						cdp_session.url,
+						(css_width, css_height, device_pixel_ratio, scale),
+						dom_change_counter,
+						get_perceptual_hash(base64.b64decode(thumbnail['data'])),
+					)
+					if frame_key == self._last_frame_key and self._last_frame is not None:
+						self.logger.debug('[ScreenshotWatchdog] Page unchanged since last screenshot, reusing previous frame')
+						return self._last_frame
 
 			# Take screenshot using CDP
 			self.logger.debug(f'[ScreenshotWatchdog] Taking screenshot with params: {params}')
@@ -48,6 +175,9 @@ class ScreenshotWatchdog(BaseWatchdog):
 			# Return base64-encoded screenshot data
 			if result and 'data' in result:
 				self.logger.debug('[ScreenshotWatchdog] Screenshot captured successfully')
+				self._capture_scale = scale
+				self._last_frame_key = frame_key
+				self._last_frame = result['data'] if frame_key else None
 				return result['data']
 
 			raise BrowserError('[ScreenshotWatchdog] Screenshot result missing data')
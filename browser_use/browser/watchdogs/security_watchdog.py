@@ -3,6 +3,7 @@
 from typing import TYPE_CHECKING, ClassVar
 
 from bubus import BaseEvent
+from pydantic import PrivateAttr
 
 from browser_use.browser.events import (
 	BrowserErrorEvent,
@@ -11,6 +12,7 @@ from browser_use.browser.events import (
 	TabCreatedEvent,
 )
 from browser_use.browser.watchdog_base import BaseWatchdog
+from browser_use.domain_matcher import PLAIN_DOMAIN_RE, SCHEME_RE, DomainMatcher
 
 if TYPE_CHECKING:
 	pass
@@ -32,6 +34,9 @@ class SecurityWatchdog(BaseWatchdog):
 		BrowserErrorEvent,
 	]
 
+	# allowed_domains / prohibited_domains compiled once, with a copy of the list they were compiled from
+	_domain_matchers: dict[str, tuple[list[str], DomainMatcher]] = PrivateAttr(default_factory=dict)
+
 	async def on_NavigateToUrlEvent(self, event: NavigateToUrlEvent) -> None:
 		"""Check if navigation URL is allowed before navigation starts."""
 		# Security check BEFORE navigation
@@ -153,24 +158,60 @@ class SecurityWatchdog(BaseWatchdog):
 		if not host:
 			return False
 
-		# Check each allowed domain pattern
+		# Check the allowed domain patterns
 		if self.browser_session.browser_profile.allowed_domains:
-			for pattern in self.browser_session.browser_profile.allowed_domains:
-				if self._is_url_match(url, host, parsed.scheme, pattern):
-					return True
+			matcher = self._get_domain_matcher('allowed', self.browser_session.browser_profile.allowed_domains)
+			return matcher.match_parsed(url, host, parsed.scheme)
 
-			return False
-
-		# Check each prohibited domain pattern
+		# Check the prohibited domain patterns
 		if self.browser_session.browser_profile.prohibited_domains:
-			for pattern in self.browser_session.browser_profile.prohibited_domains:
-				if self._is_url_match(url, host, parsed.scheme, pattern):
-					return False
-
-			return True
+			matcher = self._get_domain_matcher('prohibited', self.browser_session.browser_profile.prohibited_domains)
+			return not matcher.match_parsed(url, host, parsed.scheme)
 
 		return True
 
+	def _get_domain_matcher(self, name: str, patterns: list[str]) -> DomainMatcher:
+		"""Compiled form of a domain list, recompiled only when the list changed (compared by value)."""
+		cached = self._domain_matchers.get(name)
+		if cached is None or cached[0] != patterns:
+			cached = (list(patterns), self._compile_domain_patterns(patterns))
+			self._domain_matchers[name] = cached
+		return cached[1]
+
+	def _compile_domain_patterns(self, patterns: list[str]) -> DomainMatcher:
+		"""Compile patterns with the semantics of _is_url_match, which still decides the ones that don't compile."""
+		matcher = DomainMatcher(self._is_url_match)
+		for pattern in patterns:
+			matcher.pattern_count += 1
+			scheme, _, domain = pattern.rpartition('://')
+			if '*' not in pattern and '://' not in pattern:
+				# Domain-only pattern: any scheme, case-insensitive, www. added to root domains
+				matcher.add_host(pattern.lower())
+				if self._is_root_domain(pattern):
+					matcher.add_host(f'www.{pattern.lower()}')
+			elif pattern.startswith('*.'):
+				if not PLAIN_DOMAIN_RE.match(pattern[2:]):
+					matcher.add_fallback(pattern)
+					continue
+				# *.example.com: the domain and its subdomains, http(s) only
+				self._log_glob_warning()
+				matcher.add_domain_and_subdomains(pattern[2:], 'http')
+				matcher.add_domain_and_subdomains(pattern[2:], 'https')
+			elif '*' not in pattern:
+				# Full URL pattern: a literal prefix of the URL
+				matcher.add_url_prefix(pattern)
+			elif pattern.endswith('/*'):
+				# brave://*: any URL starting with brave://
+				self._log_glob_warning()
+				matcher.add_url_prefix(pattern[:-1])
+			elif SCHEME_RE.match(scheme) and PLAIN_DOMAIN_RE.match(domain):
+				# http*://example.com: fnmatch on scheme://host, only the scheme is globbed
+				self._log_glob_warning()
+				matcher.add_host(domain, scheme)
+			else:
+				matcher.add_fallback(pattern)
+		return matcher
+
 	def _is_url_match(self, url: str, host: str, scheme: str, pattern: str) -> bool:
 		"""Check if a URL matches a pattern."""
 
@@ -1823,6 +1823,8 @@ async def run_auth_command():
 			print('❌ Authentication failed.')
 			print('   Please try again or check your internet connection.')
 
+		await sync_service.close()
+
 	except Exception as e:
 		print(f'❌ Authentication error: {e}')
 		# Still try to complete the task in UI with error message
@@ -1840,6 +1842,7 @@ async def run_auth_command():
 					gif_url=None,
 				)
 				await sync_service.handle_event(completion_event)
+				await sync_service.close()
 			except Exception:
 				pass  # Don't fail if we can't send the error event
 		sys.exit(1)
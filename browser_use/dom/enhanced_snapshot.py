@@ -5,11 +5,13 @@ This module provides stateless functions for parsing Chrome DevTools Protocol (C
 to extract visibility, clickability, cursor styles, and other layout information.
 """
 
+from array import array
+from collections.abc import Iterator, Mapping
+
 from cdp_use.cdp.domsnapshot.commands import CaptureSnapshotReturns
 from cdp_use.cdp.domsnapshot.types import (
 	LayoutTreeSnapshot,
 	NodeTreeSnapshot,
-	RareBooleanData,
 )
 
 from browser_use.dom.views import DOMRect, EnhancedSnapshotNode
@@ -30,11 +32,6 @@ REQUIRED_COMPUTED_STYLES = [
 ]
 
 
-def _parse_rare_boolean_data(rare_data: RareBooleanData, index: int) -> bool | None:
-	"""Parse rare boolean data from snapshot - returns True if index is in the rare data."""
-	return index in rare_data['index']
-
-
 def _parse_computed_styles(strings: list[str], style_indices: list[int]) -> dict[str, str]:
 	"""Parse computed styles from layout tree using string indices."""
 	styles = {}
@@ -44,118 +41,170 @@ def _parse_computed_styles(strings: list[str], style_indices: list[int]) -> dict
 	return styles
 
 
-def build_snapshot_lookup(
-	snapshot: CaptureSnapshotReturns,
-	device_pixel_ratio: float = 1.0,
-) -> dict[int, EnhancedSnapshotNode]:
-	"""Build a lookup table of backend node ID to enhanced snapshot data with everything calculated upfront."""
-	snapshot_lookup: dict[int, EnhancedSnapshotNode] = {}
-
-	if not snapshot['documents']:
-		return snapshot_lookup
-
-	strings = snapshot['strings']
-
-	for document in snapshot['documents']:
-		nodes: NodeTreeSnapshot = document['nodes']
-		layout: LayoutTreeSnapshot = document['layout']
-
-		# Build backend node id to snapshot index lookup
-		backend_node_to_snapshot_index = {}
+class SnapshotLookup(Mapping[int, EnhancedSnapshotNode]):
+	"""Backend node id -> EnhancedSnapshotNode, backed by index columns into the raw snapshot and decoded lazily.
+
+	DOMSnapshot.captureSnapshot is already columnar (one list per field, indexed by snapshot/layout index), so
+	instead of decoding every node into its own EnhancedSnapshotNode/DOMRect/styles dict upfront we only record,
+	per backend node id, which document, snapshot index and layout index it lives at (compact `array` columns).
+	The EnhancedSnapshotNode is built from the raw columns the first time a node is looked up and then cached,
+	so callers that mutate it (e.g. bounds adjusted during visibility checks) keep seeing their changes.
+	"""
+
+	__slots__ = (
+		'_strings',
+		'_device_pixel_ratio',
+		'_documents',
+		'_rows',
+		'_document_indexes',
+		'_layout_indexes',
+		'_clickable',
+		'_views',
+	)
+
+	def __init__(self, strings: list[str], device_pixel_ratio: float = 1.0):
+		self._strings = strings
+		self._device_pixel_ratio = device_pixel_ratio
+		self._documents: list[LayoutTreeSnapshot] = []
+		self._rows: dict[int, int] = {}
+		self._document_indexes = array('H')
+		self._layout_indexes = array('l')  # -1 if the node has no (usable) layout
+		self._clickable = array('b')  # -1: unknown, 0: no, 1: yes
+		self._views: dict[int, EnhancedSnapshotNode] = {}
+
+	def _add_document(self, nodes: NodeTreeSnapshot, layout: LayoutTreeSnapshot) -> None:
+		document_index = len(self._documents)
+		self._documents.append(layout)
+
+		# Build backend node id to snapshot index lookup (last occurrence wins for duplicates)
+		backend_node_to_snapshot_index: dict[int, int] = {}
 		if 'backendNodeId' in nodes:
-			for i, backend_node_id in enumerate(nodes['backendNodeId']):
-				backend_node_to_snapshot_index[backend_node_id] = i
+			backend_node_to_snapshot_index = {backend_node_id: i for i, backend_node_id in enumerate(nodes['backendNodeId'])}
 
 		# PERFORMANCE: Pre-build layout index map to eliminate O(n²) double lookups
 		# Preserve original behavior: use FIRST occurrence for duplicates
-		layout_index_map = {}
+		layout_index_map: dict[int, int] = {}
 		if layout and 'nodeIndex' in layout:
+			layout_bounds_count = len(layout.get('bounds', []))
 			for layout_idx, node_index in enumerate(layout['nodeIndex']):
 				if node_index not in layout_index_map:  # Only store first occurrence
-					layout_index_map[node_index] = layout_idx
-
-		# Build snapshot lookup for each backend node id
-		for backend_node_id, snapshot_index in backend_node_to_snapshot_index.items():
-			is_clickable = None
-			if 'isClickable' in nodes:
-				is_clickable = _parse_rare_boolean_data(nodes['isClickable'], snapshot_index)
-
-			# Find corresponding layout node
-			cursor_style = None
-			is_visible = None
-			bounding_box = None
-			computed_styles = {}
-
-			# Look for layout tree node that corresponds to this snapshot node
-			paint_order = None
-			client_rects = None
-			scroll_rects = None
-			stacking_contexts = None
-			if snapshot_index in layout_index_map:
-				layout_idx = layout_index_map[snapshot_index]
-				if layout_idx < len(layout.get('bounds', [])):
-					# Parse bounding box
-					bounds = layout['bounds'][layout_idx]
-					if len(bounds) >= 4:
-						# IMPORTANT: CDP coordinates are in device pixels, convert to CSS pixels
-						# by dividing by the device pixel ratio
-						raw_x, raw_y, raw_width, raw_height = bounds[0], bounds[1], bounds[2], bounds[3]
-
-						# Apply device pixel ratio scaling to convert device pixels to CSS pixels
-						bounding_box = DOMRect(
-							x=raw_x / device_pixel_ratio,
-							y=raw_y / device_pixel_ratio,
-							width=raw_width / device_pixel_ratio,
-							height=raw_height / device_pixel_ratio,
-						)
-
-					# Parse computed styles for this layout node
-					if layout_idx < len(layout.get('styles', [])):
-						style_indices = layout['styles'][layout_idx]
-						computed_styles = _parse_computed_styles(strings, style_indices)
-						cursor_style = computed_styles.get('cursor')
-
-					# Extract paint order if available
-					if layout_idx < len(layout.get('paintOrders', [])):
-						paint_order = layout.get('paintOrders', [])[layout_idx]
-
-					# Extract client rects if available
-					client_rects_data = layout.get('clientRects', [])
-					if layout_idx < len(client_rects_data):
-						client_rect_data = client_rects_data[layout_idx]
-						if client_rect_data and len(client_rect_data) >= 4:
-							client_rects = DOMRect(
-								x=client_rect_data[0],
-								y=client_rect_data[1],
-								width=client_rect_data[2],
-								height=client_rect_data[3],
-							)
-
-					# Extract scroll rects if available
-					scroll_rects_data = layout.get('scrollRects', [])
-					if layout_idx < len(scroll_rects_data):
-						scroll_rect_data = scroll_rects_data[layout_idx]
-						if scroll_rect_data and len(scroll_rect_data) >= 4:
-							scroll_rects = DOMRect(
-								x=scroll_rect_data[0],
-								y=scroll_rect_data[1],
-								width=scroll_rect_data[2],
-								height=scroll_rect_data[3],
-							)
-
-					# Extract stacking contexts if available
-					if layout_idx < len(layout.get('stackingContexts', [])):
-						stacking_contexts = layout.get('stackingContexts', {}).get('index', [])[layout_idx]
-
-			snapshot_lookup[backend_node_id] = EnhancedSnapshotNode(
-				is_clickable=is_clickable,
-				cursor_style=cursor_style,
-				bounds=bounding_box,
-				clientRects=client_rects,
-				scrollRects=scroll_rects,
-				computed_styles=computed_styles if computed_styles else None,
-				paint_order=paint_order,
-				stacking_contexts=stacking_contexts,
+					# layout rows without bounds are ignored entirely
+					layout_index_map[node_index] = layout_idx if layout_idx < layout_bounds_count else -1
+
+		# PERFORMANCE: isClickable is rare boolean data (a list of snapshot indexes), test membership in a set not the list
+		clickable_indexes = set(nodes['isClickable']['index']) if 'isClickable' in nodes else None
+
+		rows = self._rows
+		views = self._views
+		row = len(self._layout_indexes)
+		for backend_node_id in backend_node_to_snapshot_index:
+			if backend_node_id in views:  # same backend node in a later document replaces the earlier entry
+				del views[backend_node_id]
+			rows[backend_node_id] = row
+			row += 1
+
+		snapshot_indexes = backend_node_to_snapshot_index.values()
+		self._document_indexes.extend([document_index] * len(backend_node_to_snapshot_index))
+		self._layout_indexes.extend([layout_index_map.get(snapshot_index, -1) for snapshot_index in snapshot_indexes])
+		if clickable_indexes is None:
+			self._clickable.extend([-1] * len(backend_node_to_snapshot_index))
+		else:
+			self._clickable.extend([snapshot_index in clickable_indexes for snapshot_index in snapshot_indexes])
+
+	def _materialize(self, row: int) -> EnhancedSnapshotNode:
+		clickable = self._clickable[row]
+		layout_idx = self._layout_indexes[row]
+		if layout_idx < 0:
+			return EnhancedSnapshotNode(
+				is_clickable=None if clickable < 0 else bool(clickable),
+				cursor_style=None,
+				bounds=None,
+				clientRects=None,
+				scrollRects=None,
+				computed_styles=None,
+				paint_order=None,
+				stacking_contexts=None,
 			)
 
+		layout = self._documents[self._document_indexes[row]]
+
+		# IMPORTANT: CDP coordinates are in device pixels, convert to CSS pixels by dividing by the device pixel ratio
+		bounding_box = None
+		bounds = layout['bounds'][layout_idx]
+		if len(bounds) >= 4:
+			device_pixel_ratio = self._device_pixel_ratio
+			bounding_box = DOMRect(
+				x=bounds[0] / device_pixel_ratio,
+				y=bounds[1] / device_pixel_ratio,
+				width=bounds[2] / device_pixel_ratio,
+				height=bounds[3] / device_pixel_ratio,
+			)
+
+		computed_styles = {}
+		styles = layout.get('styles', [])
+		if layout_idx < len(styles):
+			computed_styles = _parse_computed_styles(self._strings, styles[layout_idx])
+
+		paint_orders = layout.get('paintOrders', [])
+		paint_order = paint_orders[layout_idx] if layout_idx < len(paint_orders) else None
+
+		client_rects = None
+		client_rects_data = layout.get('clientRects', [])
+		if layout_idx < len(client_rects_data):
+			client_rect_data = client_rects_data[layout_idx]
+			if client_rect_data and len(client_rect_data) >= 4:
+				client_rects = DOMRect(
+					x=client_rect_data[0], y=client_rect_data[1], width=client_rect_data[2], height=client_rect_data[3]
+				)
+
+		scroll_rects = None
+		scroll_rects_data = layout.get('scrollRects', [])
+		if layout_idx < len(scroll_rects_data):
+			scroll_rect_data = scroll_rects_data[layout_idx]
+			if scroll_rect_data and len(scroll_rect_data) >= 4:
+				scroll_rects = DOMRect(
+					x=scroll_rect_data[0], y=scroll_rect_data[1], width=scroll_rect_data[2], height=scroll_rect_data[3]
+				)
+
+		stacking_contexts = None
+		if layout_idx < len(layout.get('stackingContexts', [])):
+			stacking_contexts = layout.get('stackingContexts', {}).get('index', [])[layout_idx]
+
+		return EnhancedSnapshotNode(
+			is_clickable=None if clickable < 0 else bool(clickable),
+			cursor_style=computed_styles.get('cursor'),
+			bounds=bounding_box,
+			clientRects=client_rects,
+			scrollRects=scroll_rects,
+			computed_styles=computed_styles if computed_styles else None,
+			paint_order=paint_order,
+			stacking_contexts=stacking_contexts,
+		)
+
+	def __getitem__(self, backend_node_id: int) -> EnhancedSnapshotNode:
+		view = self._views.get(backend_node_id)
+		if view is None:
+			view = self._views[backend_node_id] = self._materialize(self._rows[backend_node_id])
+		return view
+
+	def __contains__(self, backend_node_id: object) -> bool:
+		return backend_node_id in self._rows
+
+	def __iter__(self) -> Iterator[int]:
+		return iter(self._rows)
+
+	def __len__(self) -> int:
+		return len(self._rows)
+
+
+def build_snapshot_lookup(
+	snapshot: CaptureSnapshotReturns,
+	device_pixel_ratio: float = 1.0,
+) -> SnapshotLookup:
+	"""Build a lookup table of backend node ID to enhanced snapshot data, decoded lazily on first access."""
+	snapshot_lookup = SnapshotLookup(snapshot['strings'] if snapshot['documents'] else [], device_pixel_ratio)
+
+	for document in snapshot['documents']:
+		snapshot_lookup._add_document(document['nodes'], document['layout'])
+
 	return snapshot_lookup
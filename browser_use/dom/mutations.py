@@ -0,0 +1,359 @@
+"""
+Incremental DOM tracking for browser-use DOM tree extraction.
+
+Keeps a persistent copy of the CDP `DOM.getDocument` tree (and the AX nodes fetched alongside it) for a single
+target session and patches it from `DOM.*` mutation events, so `DomService` doesn't have to refetch the whole
+document on every step. Anything the tracker can't patch confidently (unknown node ids, document updates,
+iframe insertions, too many queued mutations) marks it invalid and the caller falls back to a full rebuild.
+"""
+
+import logging
+from typing import Any
+
+from cdp_use.cdp.accessibility.types import AXNode
+from cdp_use.cdp.dom.types import Node
+from cdp_use.cdp.target import SessionID, TargetID
+
+# Mutation events the tracker knows how to apply (or at least how to invalidate on)
+TRACKED_DOM_EVENTS = [
+	'childNodeInserted',
+	'childNodeRemoved',
+	'childNodeCountUpdated',
+	'setChildNodes',
+	'attributeModified',
+	'attributeRemoved',
+	'characterDataModified',
+	'shadowRootPushed',
+	'shadowRootPopped',
+	'scrollableFlagUpdated',
+	'documentUpdated',
+]
+
+DEFAULT_MAX_PENDING_MUTATIONS = 5000
+DEFAULT_MAX_DIRTY_AX_NODES = 300
+DEFAULT_MAX_INCOMPLETE_NODES = 50
+
+
+class DOMMutationTracker:
+	"""Persistent CDP DOM tree for one target session, patched from DOM mutation events.
+
+	Events are only queued while they arrive (cheap, runs inside the CDP message loop) and applied in
+	`apply_pending_mutations()` right before the tree is needed. When the queue overflows `max_pending_mutations`
+	the queued events are dropped and the tracker is invalidated, so a full rebuild is done instead.
+	"""
+
+	def __init__(
+		self,
+		target_id: TargetID,
+		session_id: SessionID,
+		logger: logging.Logger | None = None,
+		max_pending_mutations: int = DEFAULT_MAX_PENDING_MUTATIONS,
+		max_dirty_ax_nodes: int = DEFAULT_MAX_DIRTY_AX_NODES,
+		max_incomplete_nodes: int = DEFAULT_MAX_INCOMPLETE_NODES,
+	):
+		self.target_id = target_id
+		self.session_id = session_id
+		self.logger = logger or logging.getLogger(__name__)
+		self.max_pending_mutations = max_pending_mutations
+		self.max_dirty_ax_nodes = max_dirty_ax_nodes
+		self.max_incomplete_nodes = max_incomplete_nodes
+
+		self.root: Node | None = None
+		self.ax_lookup: dict[int, AXNode] = {}
+		"""backendNodeId -> AX node, kept in sync for dirty nodes only"""
+
+		self.is_valid = False
+		self.is_loading = False
+		self.invalid_reason: str | None = 'not loaded yet'
+
+		self.dirty_backend_node_ids: set[int] = set()
+		"""Backend node ids whose AX data needs to be refetched"""
+		self.incomplete_node_ids: set[int] = set()
+		"""Node ids whose children are unknown to us and need to be requested"""
+
+		self.total_mutations_applied = 0
+
+		self._nodes: dict[int, Node] = {}
+		"""nodeId -> raw CDP node"""
+		self._parents: dict[int, int] = {}
+		"""nodeId -> parent nodeId (including content documents -> iframe and shadow roots -> host)"""
+		self._pending: list[tuple[str, Any]] = []
+
+	# region - loading
+
+	def reset(self) -> None:
+		"""Forget everything and start queueing events, called right before a full `DOM.getDocument` is requested."""
+		self.root = None
+		self.ax_lookup = {}
+		self.dirty_backend_node_ids.clear()
+		self.incomplete_node_ids.clear()
+		self._nodes.clear()
+		self._parents.clear()
+		self._pending.clear()
+		self.is_valid = False
+		self.is_loading = True
+		self.invalid_reason = 'loading'
+
+	def load(self, root: Node, ax_nodes: list[AXNode]) -> None:
+		"""Load a freshly fetched full document + AX tree as the new baseline.
+
+		Events that were queued while the document was being fetched are kept, they refer to the new node ids
+		(or to ids we don't know, which invalidates the tracker once they are applied).
+		"""
+		self.root = root
+		self._nodes.clear()
+		self._parents.clear()
+		self.dirty_backend_node_ids.clear()
+		self.incomplete_node_ids.clear()
+		self._index_subtree(root, parent_id=None)
+		self.ax_lookup = {ax_node['backendDOMNodeId']: ax_node for ax_node in ax_nodes if 'backendDOMNodeId' in ax_node}
+		if self.is_loading:
+			# stays invalid if something (e.g. a document update) invalidated it while the document was being fetched
+			self.is_valid = True
+			self.invalid_reason = None
+		self.is_loading = False
+
+	def invalidate(self, reason: str) -> None:
+		if self.is_valid:
+			self.logger.debug(f'🧬 DOM mutation tracker for target {self.target_id[-4:]} invalidated: {reason}')
+		self.is_valid = False
+		self.is_loading = False
+		self.invalid_reason = reason
+		self._pending.clear()
+
+	@property
+	def root_node_id(self) -> int | None:
+		return self.root['nodeId'] if self.root else None
+
+	@property
+	def pending_mutation_count(self) -> int:
+		return len(self._pending)
+
+	# endregion - loading
+
+	# region - event queue
+
+	def record(self, method: str, event: Any) -> None:
+		"""Queue a raw `DOM.*` event (without the `DOM.` prefix), called from the CDP event handlers."""
+		if not (self.is_valid or self.is_loading):
+			return
+		if method == 'documentUpdated':
+			self.invalidate('document updated')
+			return
+		if len(self._pending) >= self.max_pending_mutations:
+			self.invalidate(f'mutation log overflowed ({self.max_pending_mutations} pending mutations)')
+			return
+		self._pending.append((method, event))
+
+	def apply_pending_mutations(self) -> bool:
+		"""Apply all queued mutation events to the persistent tree.
+
+		Returns:
+			True if the tree is still trustworthy, False if a full rebuild is needed.
+		"""
+		if not self.is_valid:
+			return False
+
+		pending, self._pending = self._pending, []
+		for method, event in pending:
+			try:
+				getattr(self, f'_on_{method}')(event)
+			except KeyError as e:
+				self.invalidate(f'{method} referenced unknown node {e}')
+			except Exception as e:
+				self.invalidate(f'failed to apply {method}: {type(e).__name__}: {e}')
+			if not self.is_valid:
+				return False
+			self.total_mutations_applied += 1
+
+		if len(self.incomplete_node_ids) > self.max_incomplete_nodes:
+			self.invalidate(f'{len(self.incomplete_node_ids)} subtrees with unknown children')
+		elif len(self.dirty_backend_node_ids) > self.max_dirty_ax_nodes:
+			# AX refresh per node would be slower than refetching the whole tree
+			self.invalidate(f'{len(self.dirty_backend_node_ids)} dirty AX nodes')
+
+		return self.is_valid
+
+	def take_dirty_backend_node_ids(self) -> set[int]:
+		dirty, self.dirty_backend_node_ids = self.dirty_backend_node_ids, set()
+		return dirty
+
+	def update_ax_nodes(self, ax_nodes: list[AXNode]) -> None:
+		for ax_node in ax_nodes:
+			if 'backendDOMNodeId' in ax_node:
+				self.ax_lookup[ax_node['backendDOMNodeId']] = ax_node
+
+	# endregion - event queue
+
+	# region - tree bookkeeping
+
+	def _index_subtree(self, node: Node, parent_id: int | None) -> None:
+		stack: list[tuple[Node, int | None]] = [(node, parent_id)]
+		while stack:
+			current, current_parent_id = stack.pop()
+			node_id = current['nodeId']
+			self._nodes[node_id] = current
+			if current_parent_id is not None:
+				self._parents[node_id] = current_parent_id
+
+			children = current.get('children')
+			if current.get('childNodeCount', 0) > len(children or []):
+				self.incomplete_node_ids.add(node_id)
+
+			for child in children or []:
+				stack.append((child, node_id))
+			for shadow_root in current.get('shadowRoots') or []:
+				stack.append((shadow_root, node_id))
+			if current.get('contentDocument'):
+				stack.append((current['contentDocument'], node_id))
+
+	def _unindex_subtree(self, node: Node) -> None:
+		stack = [node]
+		while stack:
+			current = stack.pop()
+			node_id = current['nodeId']
+			self._nodes.pop(node_id, None)
+			self._parents.pop(node_id, None)
+			self.incomplete_node_ids.discard(node_id)
+			self.ax_lookup.pop(current['backendNodeId'], None)
+			self.dirty_backend_node_ids.discard(current['backendNodeId'])
+
+			stack.extend(current.get('children') or [])
+			stack.extend(current.get('shadowRoots') or [])
+			if current.get('contentDocument'):
+				stack.append(current['contentDocument'])
+
+	def _mark_dirty(self, node_id: int, include_subtree: bool = False) -> None:
+		"""Mark a node and all its ancestors as needing fresh AX data (accessible names bubble up from text)."""
+		if include_subtree:
+			stack = [self._nodes[node_id]]
+			while stack:
+				current = stack.pop()
+				self.dirty_backend_node_ids.add(current['backendNodeId'])
+				stack.extend(current.get('children') or [])
+				stack.extend(current.get('shadowRoots') or [])
+
+		current_id: int | None = node_id
+		while current_id is not None:
+			self.dirty_backend_node_ids.add(self._nodes[current_id]['backendNodeId'])
+			current_id = self._parents.get(current_id)
+
+	@staticmethod
+	def _contains_frame_owner(node: Node) -> bool:
+		stack = [node]
+		while stack:
+			current = stack.pop()
+			if current.get('nodeName', '').upper() in ('IFRAME', 'FRAME'):
+				return True
+			stack.extend(current.get('children') or [])
+			stack.extend(current.get('shadowRoots') or [])
+		return False
+
+	def _adopt_child(self, parent: Node, child: Node) -> None:
+		if self._contains_frame_owner(child):
+			# frame owners need their (possibly cross-origin) content documents resolved, leave that to a full rebuild
+			raise ValueError('inserted subtree contains a frame owner')
+		child['parentId'] = parent['nodeId']
+		self._index_subtree(child, parent['nodeId'])
+
+	# endregion - tree bookkeeping
+
+	# region - event handlers
+
+	def _on_childNodeInserted(self, event: Any) -> None:
+		parent = self._nodes[event['parentNodeId']]
+		node: Node = event['node']
+		self._adopt_child(parent, node)
+
+		children = parent.setdefault('children', [])
+		previous_node_id = event['previousNodeId']
+		if not previous_node_id:
+			children.insert(0, node)
+		else:
+			position = next((i for i, child in enumerate(children) if child['nodeId'] == previous_node_id), None)
+			if position is None:
+				raise ValueError(f'previous sibling {previous_node_id} not found')
+			children.insert(position + 1, node)
+		if parent['nodeId'] not in self.incomplete_node_ids:
+			parent['childNodeCount'] = len(children)
+
+		self._mark_dirty(node['nodeId'], include_subtree=True)
+
+	def _on_childNodeRemoved(self, event: Any) -> None:
+		parent = self._nodes[event['parentNodeId']]
+		node_id = event['nodeId']
+		children = parent.get('children') or []
+		position = next((i for i, child in enumerate(children) if child['nodeId'] == node_id), None)
+		if position is None:
+			raise ValueError(f'removed node {node_id} not found under {parent["nodeId"]}')
+		removed = children.pop(position)
+		if parent['nodeId'] not in self.incomplete_node_ids:
+			parent['childNodeCount'] = len(children)
+		self._unindex_subtree(removed)
+		self._mark_dirty(parent['nodeId'])
+
+	def _on_childNodeCountUpdated(self, event: Any) -> None:
+		node = self._nodes[event['nodeId']]
+		node['childNodeCount'] = event['childNodeCount']
+		if event['childNodeCount'] != len(node.get('children') or []):
+			self.incomplete_node_ids.add(node['nodeId'])
+
+	def _on_setChildNodes(self, event: Any) -> None:
+		parent = self._nodes[event['parentId']]
+		for old_child in parent.get('children') or []:
+			self._unindex_subtree(old_child)
+		for child in event['nodes']:
+			self._adopt_child(parent, child)
+		parent['children'] = event['nodes']
+		parent['childNodeCount'] = len(event['nodes'])
+		self.incomplete_node_ids.discard(parent['nodeId'])
+		self._mark_dirty(parent['nodeId'], include_subtree=True)
+
+	def _on_attributeModified(self, event: Any) -> None:
+		node = self._nodes[event['nodeId']]
+		attributes = node.setdefault('attributes', [])
+		for i in range(0, len(attributes), 2):
+			if attributes[i] == event['name']:
+				attributes[i + 1] = event['value']
+				break
+		else:
+			attributes.extend((event['name'], event['value']))
+		self._mark_dirty(node['nodeId'])
+
+	def _on_attributeRemoved(self, event: Any) -> None:
+		node = self._nodes[event['nodeId']]
+		attributes = node.get('attributes') or []
+		for i in range(0, len(attributes), 2):
+			if attributes[i] == event['name']:
+				del attributes[i : i + 2]
+				break
+		self._mark_dirty(node['nodeId'])
+
+	def _on_characterDataModified(self, event: Any) -> None:
+		node = self._nodes[event['nodeId']]
+		node['nodeValue'] = event['characterData']
+		self._mark_dirty(node['nodeId'])
+
+	def _on_shadowRootPushed(self, event: Any) -> None:
+		host = self._nodes[event['hostId']]
+		root: Node = event['root']
+		if self._contains_frame_owner(root):
+			raise ValueError('pushed shadow root contains a frame owner')
+		root['parentId'] = host['nodeId']
+		host.setdefault('shadowRoots', []).append(root)
+		self._index_subtree(root, host['nodeId'])
+		self._mark_dirty(root['nodeId'], include_subtree=True)
+
+	def _on_shadowRootPopped(self, event: Any) -> None:
+		host = self._nodes[event['hostId']]
+		shadow_roots = host.get('shadowRoots') or []
+		position = next((i for i, root in enumerate(shadow_roots) if root['nodeId'] == event['rootId']), None)
+		if position is None:
+			raise ValueError(f'shadow root {event["rootId"]} not found')
+		self._unindex_subtree(shadow_roots.pop(position))
+		self._mark_dirty(host['nodeId'])
+
+	def _on_scrollableFlagUpdated(self, event: Any) -> None:
+		self._nodes[event['nodeId']]['isScrollable'] = event['isScrollable']
+
+	# endregion - event handlers
@@ -0,0 +1,100 @@
+"""Cross-step cache for per-element DOMTreeSerializer results.
+
+The enhanced DOM tree is rebuilt from scratch on every step, so node identity (or node_id, which Chrome reassigns
+after navigations) can't be used to carry results over. Instead every cached result is keyed by a fingerprint of
+exactly the node data the cached computation reads: tag, attributes, AX role/properties and the snapshot size and
+cursor. On a page that barely changed between two steps almost every element hits the cache.
+"""
+
+from collections.abc import Callable, Hashable
+from typing import TYPE_CHECKING, TypeVar
+
+if TYPE_CHECKING:
+	from browser_use.dom.views import EnhancedDOMTreeNode
+
+T = TypeVar('T')
+
+ElementFingerprint = tuple
+
+
+def element_fingerprint(node: 'EnhancedDOMTreeNode') -> ElementFingerprint | None:
+	"""Everything ClickableElementDetector.is_interactive and the attribute serialization look at, as a hashable tuple.
+
+	Positions are deliberately left out (scrolling moves every element), sizes are kept because small icon-sized
+	elements and large iframes are treated differently. Returns None if the node can't be fingerprinted, e.g.
+	because an AX property carries an unhashable value, in which case callers just compute the result directly.
+	"""
+	ax_fingerprint = None
+	if node.ax_node:
+		properties = node.ax_node.properties
+		ax_fingerprint = (
+			node.ax_node.role,
+			tuple((prop.name, prop.value) for prop in properties) if properties else None,
+		)
+
+	snapshot_fingerprint = None
+	snapshot_node = node.snapshot_node
+	if snapshot_node:
+		bounds = snapshot_node.bounds
+		snapshot_fingerprint = (
+			snapshot_node.cursor_style,
+			(bounds.width, bounds.height) if bounds else None,
+		)
+
+	fingerprint = (
+		node.node_type,
+		node.node_name,
+		tuple(node.attributes.items()) if node.attributes else None,
+		ax_fingerprint,
+		snapshot_fingerprint,
+	)
+	try:
+		hash(fingerprint)
+	except TypeError:
+		return None
+	return fingerprint
+
+
+class SerializationCache:
+	"""Results of DOMTreeSerializer's per-element work, kept across steps.
+
+	Entries are generational: `start_step()` is called at the start of every serialization, results looked up
+	during the previous step are carried over and everything else is dropped, so the cache never holds more than
+	(roughly) two pages worth of elements and stale entries of elements that disappeared go away on their own.
+	"""
+
+	def __init__(self):
+		self._current: dict[Hashable, object] = {}
+		self._previous: dict[Hashable, object] = {}
+		self.hits = 0
+		self.misses = 0
+
+	def start_step(self) -> None:
+		"""Start a new serialization: keep what was used last step, drop the rest."""
+		self._previous = self._current
+		self._current = {}
+		self.hits = 0
+		self.misses = 0
+
+	def get_or_compute(self, key: Hashable, compute: Callable[[], T]) -> T:
+		try:
+			result = self._current[key]
+		except KeyError:
+			pass
+		else:
+			self.hits += 1
+			return result  # type: ignore[return-value]
+
+		try:
+			result = self._previous.pop(key)
+		except KeyError:
+			self.misses += 1
+			result = compute()
+		else:
+			self.hits += 1
+
+		self._current[key] = result
+		return result  # type: ignore[return-value]
+
+	def __len__(self) -> int:
+		return len(self._current) + len(self._previous)
@@ -128,13 +128,110 @@ class RectUnionPure:
 		return True
 
 
+class RectUnionGrid(RectUnionPure):
+	"""
+	RectUnionPure with a uniform grid index over the stored rectangles.
+
+	contains/add only look at stored rectangles whose cells overlap the query, in insertion order, so every
+	decision (and the stored disjoint pieces themselves) is identical to RectUnionPure. Rectangles that touch
+	nothing the query touches can neither cover nor split any part of it.
+	"""
+
+	__slots__ = ('_cell_size', '_cells', '_large', '_max_cells_per_rect')
+
+	def __init__(self, cell_size: float = 256.0, max_cells_per_rect: int = 64):
+		super().__init__()
+		self._cell_size = cell_size
+		# cell -> indexes into self._rects (ascending, rects are only ever appended)
+		self._cells: defaultdict[tuple[int, int], list[int]] = defaultdict(list)
+		# rects spanning too many cells (page backgrounds, full-screen overlays) are checked against every query
+		self._large: list[int] = []
+		self._max_cells_per_rect = max_cells_per_rect
+
+	def _cell_range(self, r: Rect) -> tuple[int, int, int, int]:
+		size = self._cell_size
+		return int(r.x1 // size), int(r.y1 // size), int(r.x2 // size), int(r.y2 // size)
+
+	def _candidates(self, r: Rect) -> list[Rect]:
+		"""Stored rectangles that could cover or split r (closed bounds touching), in insertion order."""
+		cx1, cy1, cx2, cy2 = self._cell_range(r)
+		indexes: set[int] = set(self._large)
+		if (cx2 - cx1 + 1) * (cy2 - cy1 + 1) > len(self._cells):
+			# query is bigger than the populated part of the grid, walking the populated cells is cheaper
+			for (cx, cy), cell in self._cells.items():
+				if cx1 <= cx <= cx2 and cy1 <= cy <= cy2:
+					indexes.update(cell)
+		else:
+			cells = self._cells
+			for cx in range(cx1, cx2 + 1):
+				for cy in range(cy1, cy2 + 1):
+					cell = cells.get((cx, cy))
+					if cell:
+						indexes.update(cell)
+
+		rects = self._rects
+		return [s for s in (rects[i] for i in sorted(indexes)) if s.x1 <= r.x2 and r.x1 <= s.x2 and s.y1 <= r.y2 and r.y1 <= s.y2]
+
+	def _index(self, start: int) -> None:
+		"""Add rects[start:] to the grid."""
+		for i in range(start, len(self._rects)):
+			cx1, cy1, cx2, cy2 = self._cell_range(self._rects[i])
+			if (cx2 - cx1 + 1) * (cy2 - cy1 + 1) > self._max_cells_per_rect:
+				self._large.append(i)
+				continue
+			for cx in range(cx1, cx2 + 1):
+				for cy in range(cy1, cy2 + 1):
+					self._cells[(cx, cy)].append(i)
+
+	# -----------------------------------------------------------------
+	def contains(self, r: Rect) -> bool:
+		if not self._rects:
+			return False
+
+		stack = [r]
+		for s in self._candidates(r):
+			new_stack = []
+			for piece in stack:
+				if s.contains(piece):
+					continue
+				if piece.intersects(s):
+					new_stack.extend(self._split_diff(piece, s))
+				else:
+					new_stack.append(piece)
+			if not new_stack:
+				return True
+			stack = new_stack
+		return False
+
+	# -----------------------------------------------------------------
+	def add(self, r: Rect) -> bool:
+		if self.contains(r):
+			return False
+
+		pending = [r]
+		for s in self._candidates(r):
+			new_pending = []
+			for piece in pending:
+				if piece.intersects(s):
+					new_pending.extend(self._split_diff(piece, s))
+				else:
+					new_pending.append(piece)
+			pending = new_pending
+
+		start = len(self._rects)
+		self._rects.extend(pending)
+		self._index(start)
+		return True
+
+
 class PaintOrderRemover:
 	"""
 	Calculates which elements should be removed based on the paint order parameter.
 	"""
 
-	def __init__(self, root: SimplifiedNode):
+	def __init__(self, root: SimplifiedNode, use_spatial_index: bool = True):
 		self.root = root
+		self.use_spatial_index = use_spatial_index
 
 	def calculate_paint_order(self) -> None:
 		all_simplified_nodes_with_paint_order: list[SimplifiedNode] = []
@@ -158,7 +255,7 @@ class PaintOrderRemover:
 			if node.original_node.snapshot_node and node.original_node.snapshot_node.paint_order is not None:
 				grouped_by_paint_order[node.original_node.snapshot_node.paint_order].append(node)
 
-		rect_union = RectUnionPure()
+		rect_union = RectUnionGrid() if self.use_spatial_index else RectUnionPure()
 
 		for paint_order, nodes in sorted(grouped_by_paint_order.items(), key=lambda x: -x[0]):
 			rects_to_add = []
@@ -2,6 +2,7 @@
 
 from typing import Any
 
+from browser_use.dom.serializer.cache import SerializationCache, element_fingerprint
 from browser_use.dom.serializer.clickable_elements import ClickableElementDetector
 from browser_use.dom.serializer.paint_order import PaintOrderRemover
 from browser_use.dom.utils import cap_text_length
@@ -43,6 +44,8 @@ class DOMTreeSerializer:
 		enable_bbox_filtering: bool = True,
 		containment_threshold: float | None = None,
 		paint_order_filtering: bool = True,
+		paint_order_spatial_index: bool = True,
+		cache: SerializationCache | None = None,
 	):
 		self.root_node = root_node
 		self._interactive_counter = 1
@@ -57,6 +60,9 @@ class DOMTreeSerializer:
 		self.containment_threshold = containment_threshold or self.DEFAULT_CONTAINMENT_THRESHOLD
 		# Paint order filtering configuration
 		self.paint_order_filtering = paint_order_filtering
+		self.paint_order_spatial_index = paint_order_spatial_index
+		# Per-element results reused across steps (owned by the caller, e.g. DomService)
+		self.cache = cache
 
 	def _safe_parse_number(self, value_str: str, default: float) -> float:
 		"""Parse string to float, handling negatives and decimals."""
@@ -84,6 +90,8 @@ class DOMTreeSerializer:
 		self._selector_map = {}
 		self._semantic_groups = []
 		self._clickable_cache = {}  # Clear cache for new serialization
+		if self.cache is not None:
+			self.cache.start_step()
 
 		# Step 1: Create simplified tree (includes clickable element detection)
 		start_step1 = time.time()
@@ -94,7 +102,7 @@ class DOMTreeSerializer:
 		# Step 2: Remove elements based on paint order
 		start_step3 = time.time()
 		if self.paint_order_filtering and simplified_tree:
-			PaintOrderRemover(simplified_tree).calculate_paint_order()
+			PaintOrderRemover(simplified_tree, use_spatial_index=self.paint_order_spatial_index).calculate_paint_order()
 		end_step3 = time.time()
 		self.timing_info['calculate_paint_order'] = end_step3 - start_step3
 
@@ -122,7 +130,9 @@ class DOMTreeSerializer:
 		end_total = time.time()
 		self.timing_info['serialize_accessible_elements_total'] = end_total - start_total
 
-		return SerializedDOMState(_root=filtered_tree, selector_map=self._selector_map), self.timing_info
+		return SerializedDOMState(
+			_root=filtered_tree, selector_map=self._selector_map, _serialization_cache=self.cache
+		), self.timing_info
 
 	def _add_compound_components(self, simplified: SimplifiedNode, node: EnhancedDOMTreeNode) -> None:
 		"""Enhance compound controls with information from their child components."""
@@ -410,7 +420,13 @@ class DOMTreeSerializer:
 			import time
 
 			start_time = time.time()
-			result = ClickableElementDetector.is_interactive(node)
+			fingerprint = element_fingerprint(node) if self.cache is not None else None
+			if self.cache is not None and fingerprint is not None:
+				result = self.cache.get_or_compute(
+					('interactive', fingerprint), lambda: ClickableElementDetector.is_interactive(node)
+				)
+			else:
+				result = ClickableElementDetector.is_interactive(node)
 			end_time = time.time()
 
 			if 'clickable_detection_time' not in self.timing_info:
@@ -716,6 +732,14 @@ class DOMTreeSerializer:
 		Check if an element should propagate bounds based on attributes.
 		If the element satisfies one of the patterns, it propagates bounds to all its children.
 		"""
+		if self.cache is not None:
+			return self.cache.get_or_compute(
+				('propagating', attributes.get('tag'), attributes.get('role')),
+				lambda: self._matches_propagating_pattern(attributes),
+			)
+		return self._matches_propagating_pattern(attributes)
+
+	def _matches_propagating_pattern(self, attributes: dict[str, str | None]) -> bool:
 		keys_to_check = ['tag', 'role']
 		for pattern in self.PROPAGATING_ELEMENTS:
 			# Check if the element satisfies the pattern
@@ -726,8 +750,17 @@ class DOMTreeSerializer:
 		return False
 
 	@staticmethod
-	def serialize_tree(node: SimplifiedNode | None, include_attributes: list[str], depth: int = 0) -> str:
-		"""Serialize the optimized tree to string format."""
+	def serialize_tree(
+		node: SimplifiedNode | None,
+		include_attributes: list[str],
+		depth: int = 0,
+		cache: SerializationCache | None = None,
+	) -> str:
+		"""Serialize the optimized tree to string format.
+
+		With a `cache`, the attribute strings of elements that were already serialized in a previous step (same
+		fingerprint, same include_attributes) are reused instead of being rebuilt.
+		"""
 		if not node:
 			return ''
 
@@ -735,7 +768,7 @@ class DOMTreeSerializer:
 		if hasattr(node, 'excluded_by_parent') and node.excluded_by_parent:
 			formatted_text = []
 			for child in node.children:
-				child_text = DOMTreeSerializer.serialize_tree(child, include_attributes, depth)
+				child_text = DOMTreeSerializer.serialize_tree(child, include_attributes, depth, cache)
 				if child_text:
 					formatted_text.append(child_text)
 			return '\n'.join(formatted_text)
@@ -748,7 +781,7 @@ class DOMTreeSerializer:
 			# Skip displaying nodes marked as should_display=False
 			if not node.should_display:
 				for child in node.children:
-					child_text = DOMTreeSerializer.serialize_tree(child, include_attributes, depth)
+					child_text = DOMTreeSerializer.serialize_tree(child, include_attributes, depth, cache)
 					if child_text:
 						formatted_text.append(child_text)
 				return '\n'.join(formatted_text)
@@ -766,9 +799,17 @@ class DOMTreeSerializer:
 
 				# Build attributes string with compound component info
 				text_content = ''
-				attributes_html_str = DOMTreeSerializer._build_attributes_string(
-					node.original_node, include_attributes, text_content
-				)
+				fingerprint = element_fingerprint(node.original_node) if cache is not None else None
+				if cache is not None and fingerprint is not None:
+					original_node = node.original_node
+					attributes_html_str = cache.get_or_compute(
+						('attributes', fingerprint, tuple(include_attributes)),
+						lambda: DOMTreeSerializer._build_attributes_string(original_node, include_attributes, text_content),
+					)
+				else:
+					attributes_html_str = DOMTreeSerializer._build_attributes_string(
+						node.original_node, include_attributes, text_content
+					)
 
 				# Add compound component information to attributes if present
 				if node.original_node._compound_children:
@@ -858,7 +899,7 @@ class DOMTreeSerializer:
 
 			# Process shadow DOM children
 			for child in node.children:
-				child_text = DOMTreeSerializer.serialize_tree(child, include_attributes, next_depth)
+				child_text = DOMTreeSerializer.serialize_tree(child, include_attributes, next_depth, cache)
 				if child_text:
 					formatted_text.append(child_text)
 
@@ -881,7 +922,7 @@ class DOMTreeSerializer:
 		# Process children (for non-shadow elements)
 		if node.original_node.node_type != NodeType.DOCUMENT_FRAGMENT_NODE:
 			for child in node.children:
-				child_text = DOMTreeSerializer.serialize_tree(child, include_attributes, next_depth)
+				child_text = DOMTreeSerializer.serialize_tree(child, include_attributes, next_depth, cache)
 				if child_text:
 					formatted_text.append(child_text)
 
@@ -1,17 +1,23 @@
 import asyncio
+import gc
 import logging
 import time
-from typing import TYPE_CHECKING
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Any
 
 from cdp_use.cdp.accessibility.commands import GetFullAXTreeReturns
 from cdp_use.cdp.accessibility.types import AXNode
+from cdp_use.cdp.dom.commands import GetDocumentReturns
 from cdp_use.cdp.dom.types import Node
 from cdp_use.cdp.target import TargetID
 
+from browser_use.browser.cdp_events import add_cdp_event_handler
 from browser_use.dom.enhanced_snapshot import (
 	REQUIRED_COMPUTED_STYLES,
 	build_snapshot_lookup,
 )
+from browser_use.dom.mutations import TRACKED_DOM_EVENTS, DOMMutationTracker
+from browser_use.dom.serializer.cache import SerializationCache
 from browser_use.dom.serializer.serializer import DOMTreeSerializer
 from browser_use.dom.views import (
 	CurrentPageTargets,
@@ -19,6 +25,7 @@ from browser_use.dom.views import (
 	EnhancedAXNode,
 	EnhancedAXProperty,
 	EnhancedDOMTreeNode,
+	EnhancedSnapshotNode,
 	NodeType,
 	SerializedDOMState,
 	TargetAllTrees,
@@ -26,10 +33,16 @@ from browser_use.dom.views import (
 from browser_use.observability import observe_debug
 
 if TYPE_CHECKING:
-	from browser_use.browser.session import BrowserSession
+	from browser_use.browser.session import BrowserSession, CDPSession
 
 # Note: iframe limits are now configurable via BrowserProfile.max_iframes and BrowserProfile.max_iframe_depth
 
+# Cross-origin iframe targets whose trees are fetched at the same time, each one is a DOMSnapshot + DOM + AX round-trip
+MAX_CONCURRENT_IFRAME_FETCHES = 4
+
+# NodeType(value) goes through the Enum machinery, a plain dict lookup is much cheaper when building 10k+ nodes
+_NODE_TYPES: dict[int, NodeType] = {node_type.value: node_type for node_type in NodeType}
+
 
 class DomService:
 	"""
@@ -48,15 +61,29 @@ class DomService:
 		logger: logging.Logger | None = None,
 		cross_origin_iframes: bool = False,
 		paint_order_filtering: bool = True,
+		paint_order_spatial_index: bool = True,
 		max_iframes: int = 100,
 		max_iframe_depth: int = 5,
+		incremental_dom: bool = False,
+		max_concurrent_iframe_fetches: int = MAX_CONCURRENT_IFRAME_FETCHES,
 	):
 		self.browser_session = browser_session
 		self.logger = logger or browser_session.logger
 		self.cross_origin_iframes = cross_origin_iframes
 		self.paint_order_filtering = paint_order_filtering
+		self.paint_order_spatial_index = paint_order_spatial_index
 		self.max_iframes = max_iframes
 		self.max_iframe_depth = max_iframe_depth
+		self.incremental_dom = incremental_dom
+		self._iframe_fetch_semaphore = asyncio.Semaphore(max_concurrent_iframe_fetches)
+
+		# Incremental mode: one persistent DOM tree per target, patched from DOM.* mutation events
+		self._mutation_trackers: dict[TargetID, DOMMutationTracker] = {}
+		self._mutation_trackers_by_session: dict[str, DOMMutationTracker] = {}
+		self._mutation_listening_clients: set[int] = set()
+
+		# Per-element serializer results (interactivity, attribute strings) reused across steps
+		self._serialization_cache = SerializationCache()
 
 	async def __aenter__(self):
 		return self
@@ -70,7 +97,7 @@ class DomService:
 		Args:
 			target_id: The target ID to get info for. If None, uses current_target_id.
 		"""
-		targets = await self.browser_session.cdp_client.send.Target.getTargets()
+		target_infos = await self.browser_session.get_all_targets()
 
 		# Use provided target_id or fall back to current_target_id
 		if target_id is None:
@@ -79,7 +106,7 @@ class DomService:
 				raise ValueError('No current target ID set in browser session')
 
 		# Find main page target by ID
-		main_target = next((t for t in targets['targetInfos'] if t['targetId'] == target_id), None)
+		main_target = next((t for t in target_infos if t['targetId'] == target_id), None)
 
 		if not main_target:
 			raise ValueError(f'No target found for target ID: {target_id}')
@@ -96,9 +123,7 @@ class DomService:
 				parent_target = frame_info.get('parentTargetId', frame_info.get('frameTargetId'))
 				if parent_target == target_id:
 					# Find the target info for this iframe
-					iframe_target = next(
-						(t for t in targets['targetInfos'] if t['targetId'] == frame_info['frameTargetId']), None
-					)
+					iframe_target = next((t for t in target_infos if t['targetId'] == frame_info['frameTargetId']), None)
 					if iframe_target:
 						iframe_targets.append(iframe_target)
 
@@ -288,6 +313,103 @@ class DomService:
 
 		return {'nodes': merged_nodes}
 
+	def _ensure_mutation_listeners(self, cdp_client) -> None:
+		"""Register DOM mutation event handlers once per CDP client, routing events to trackers by session id."""
+		if id(cdp_client) in self._mutation_listening_clients:
+			return
+
+		def make_handler(method: str):
+			def handler(event, session_id: str | None = None):
+				tracker = self._mutation_trackers_by_session.get(session_id or '')
+				if tracker:
+					tracker.record(method, event)
+
+			return handler
+
+		for method in TRACKED_DOM_EVENTS:
+			add_cdp_event_handler(cdp_client, f'DOM.{method}', make_handler(method))
+		self._mutation_listening_clients.add(id(cdp_client))
+
+	def _prepare_mutation_tracker(self, target_id: TargetID, cdp_session: 'CDPSession') -> DOMMutationTracker:
+		"""Get (or create) the tracker for a target and reset it right before a full DOM.getDocument."""
+		tracker = self._mutation_trackers.get(target_id)
+		if tracker is None or tracker.session_id != cdp_session.session_id:
+			if tracker is not None:
+				self._mutation_trackers_by_session.pop(tracker.session_id, None)
+			tracker = DOMMutationTracker(target_id=target_id, session_id=cdp_session.session_id, logger=self.logger)
+			self._mutation_trackers[target_id] = tracker
+			self._mutation_trackers_by_session[cdp_session.session_id] = tracker
+		self._ensure_mutation_listeners(cdp_session.cdp_client)
+		tracker.reset()
+		return tracker
+
+	async def _get_incremental_trees(
+		self, target_id: TargetID, cdp_session: 'CDPSession'
+	) -> tuple[GetDocumentReturns, GetFullAXTreeReturns] | None:
+		"""Bring the persistent DOM tree up to date from queued mutations, refetching AX data only for dirty nodes.
+
+		Returns None when the tracker can't be trusted and a full rebuild is needed.
+		"""
+		tracker = self._mutation_trackers.get(target_id)
+		if tracker is None or not tracker.is_valid or tracker.session_id != cdp_session.session_id or tracker.root is None:
+			return None
+
+		# Anyone else calling DOM.getDocument on this session silently rebinds all node ids, make sure ours are still valid
+		try:
+			await cdp_session.cdp_client.send.DOM.describeNode(
+				params={'nodeId': tracker.root['nodeId'], 'depth': 0}, session_id=cdp_session.session_id
+			)
+		except Exception:
+			tracker.invalidate('document node ids were rebound')
+			return None
+
+		if not tracker.apply_pending_mutations():
+			return None
+
+		# Subtrees that were inserted without their children (or only reported a new child count)
+		for _ in range(3):
+			if not tracker.incomplete_node_ids:
+				break
+			incomplete_node_ids = list(tracker.incomplete_node_ids)
+			await asyncio.gather(
+				*[
+					cdp_session.cdp_client.send.DOM.requestChildNodes(
+						params={'nodeId': node_id, 'depth': -1, 'pierce': True}, session_id=cdp_session.session_id
+					)
+					for node_id in incomplete_node_ids
+				]
+			)
+			# DOM.setChildNodes events arrive before the responses and are queued on the tracker
+			if not tracker.apply_pending_mutations():
+				return None
+		if tracker.incomplete_node_ids:
+			tracker.invalidate('could not resolve children of inserted subtrees')
+			return None
+
+		dirty_backend_node_ids = tracker.take_dirty_backend_node_ids()
+		if dirty_backend_node_ids:
+			partial_ax_trees = await asyncio.gather(
+				*[
+					cdp_session.cdp_client.send.Accessibility.getPartialAXTree(
+						params={'backendNodeId': backend_node_id, 'fetchRelatives': False}, session_id=cdp_session.session_id
+					)
+					for backend_node_id in dirty_backend_node_ids
+				],
+				return_exceptions=True,
+			)
+			for backend_node_id, partial_ax_tree in zip(dirty_backend_node_ids, partial_ax_trees):
+				if isinstance(partial_ax_tree, BaseException):
+					# node was removed again in the meantime or has no AX representation
+					tracker.ax_lookup.pop(backend_node_id, None)
+					continue
+				tracker.update_ax_nodes(partial_ax_tree['nodes'])
+
+		self.logger.debug(
+			f'🧬 Incremental DOM update for target {target_id[-4:]}: {len(dirty_backend_node_ids)} dirty AX nodes, '
+			f'{tracker.total_mutations_applied} mutations applied since last full rebuild'
+		)
+		return {'root': tracker.root}, {'nodes': list(tracker.ax_lookup.values())}
+
 	async def _get_all_trees(self, target_id: TargetID) -> TargetAllTrees:
 		cdp_session = await self.browser_session.get_or_create_cdp_session(target_id=target_id, focus=False)
 
@@ -359,13 +481,29 @@ class DomService:
 
 		start = time.time()
 
-		# Create initial tasks
-		tasks = {
-			'snapshot': asyncio.create_task(create_snapshot_request()),
-			'dom_tree': asyncio.create_task(create_dom_tree_request()),
-			'ax_tree': asyncio.create_task(self._get_ax_tree_for_all_frames(target_id)),
-			'device_pixel_ratio': asyncio.create_task(self._get_viewport_ratio(target_id)),
+		# Request factories for every tree we need to fetch (also used for retries)
+		request_factories = {
+			'snapshot': create_snapshot_request,
+			'device_pixel_ratio': lambda: self._get_viewport_ratio(target_id),
 		}
+		tasks = {key: asyncio.create_task(factory()) for key, factory in request_factories.items()}
+
+		# In incremental mode, patch the persistent tree from queued mutations (while the snapshot is captured) instead of refetching it
+		incremental_trees = None
+		if self.incremental_dom:
+			try:
+				incremental_trees = await self._get_incremental_trees(target_id, cdp_session)
+			except Exception as e:
+				self.logger.debug(f'Incremental DOM update failed, falling back to a full rebuild: {type(e).__name__}: {e}')
+		mutation_tracker = None
+		if incremental_trees is None:
+			if self.incremental_dom:
+				# full rebuild: start queueing mutations BEFORE the document is fetched so none are missed
+				mutation_tracker = self._prepare_mutation_tracker(target_id, cdp_session)
+			request_factories['dom_tree'] = create_dom_tree_request
+			request_factories['ax_tree'] = lambda: self._get_ax_tree_for_all_frames(target_id)
+			tasks['dom_tree'] = asyncio.create_task(create_dom_tree_request())
+			tasks['ax_tree'] = asyncio.create_task(self._get_ax_tree_for_all_frames(target_id))
 
 		# Wait for all tasks with timeout
 		done, pending = await asyncio.wait(tasks.values(), timeout=10.0)
@@ -375,18 +513,10 @@ class DomService:
 			for task in pending:
 				task.cancel()
 
-			# Retry mapping for pending tasks
-			retry_map = {
-				tasks['snapshot']: lambda: asyncio.create_task(create_snapshot_request()),
-				tasks['dom_tree']: lambda: asyncio.create_task(create_dom_tree_request()),
-				tasks['ax_tree']: lambda: asyncio.create_task(self._get_ax_tree_for_all_frames(target_id)),
-				tasks['device_pixel_ratio']: lambda: asyncio.create_task(self._get_viewport_ratio(target_id)),
-			}
-
 			# Create new tasks only for the ones that didn't complete
 			for key, task in tasks.items():
-				if task in pending and task in retry_map:
-					tasks[key] = retry_map[task]()
+				if task in pending:
+					tasks[key] = asyncio.create_task(request_factories[key]())
 
 			# Wait again with shorter timeout
 			done2, pending2 = await asyncio.wait([t for t in tasks.values() if not t.done()], timeout=2.0)
@@ -413,6 +543,11 @@ class DomService:
 		if failed:
 			raise TimeoutError(f'CDP requests failed or timed out: {", ".join(failed)}')
 
+		if incremental_trees is not None:
+			results['dom_tree'], results['ax_tree'] = incremental_trees
+		elif mutation_tracker is not None:
+			mutation_tracker.load(results['dom_tree']['root'], results['ax_tree']['nodes'])
+
 		snapshot = results['snapshot']
 		dom_tree = results['dom_tree']
 		ax_tree = results['ax_tree']
@@ -464,7 +599,12 @@ class DomService:
 			iframe_depth: Current depth of iframe nesting to prevent infinite recursion
 		"""
 
-		trees = await self._get_all_trees(target_id)
+		if iframe_depth > 0:
+			# Cross-origin iframes are fetched concurrently, bound how many hit the browser at once
+			async with self._iframe_fetch_semaphore:
+				trees = await self._get_all_trees(target_id)
+		else:
+			trees = await self._get_all_trees(target_id)
 
 		dom_tree = trees.dom_tree
 		ax_tree = trees.ax_tree
@@ -475,243 +615,325 @@ class DomService:
 			ax_node['backendDOMNodeId']: ax_node for ax_node in ax_tree['nodes'] if 'backendDOMNodeId' in ax_node
 		}
 
-		enhanced_dom_tree_node_lookup: dict[int, EnhancedDOMTreeNode] = {}
-		""" NodeId (NOT backend node id) -> enhanced dom tree node"""  # way to get the parent/content node
-
 		# Parse snapshot data with everything calculated upfront
 		snapshot_lookup = build_snapshot_lookup(snapshot, device_pixel_ratio)
 
-		async def _construct_enhanced_node(
-			node: Node, html_frames: list[EnhancedDOMTreeNode] | None, total_frame_offset: DOMRect | None
-		) -> EnhancedDOMTreeNode:
-			"""
-			Recursively construct enhanced DOM tree nodes.
-
-			Args:
-				node: The DOM node to construct
-				html_frames: List of HTML frame nodes encountered so far
-				accumulated_iframe_offset: Accumulated coordinate translation from parent iframes (includes scroll corrections)
-			"""
-
-			# Initialize lists if not provided
-			if html_frames is None:
-				html_frames = []
-
-			# to get rid of the pointer references
-			if total_frame_offset is None:
-				total_frame_offset = DOMRect(x=0.0, y=0.0, width=0.0, height=0.0)
-			else:
-				total_frame_offset = DOMRect(
-					total_frame_offset.x, total_frame_offset.y, total_frame_offset.width, total_frame_offset.height
-				)
+		enhanced_dom_tree_node, cross_origin_iframes = self._build_enhanced_tree(
+			dom_tree['root'],
+			target_id,
+			ax_tree_lookup,
+			snapshot_lookup,
+			initial_html_frames,
+			initial_total_frame_offset,
+			iframe_depth,
+		)
 
-			# memoize the mf (I don't know if some nodes are duplicated)
-			if node['nodeId'] in enhanced_dom_tree_node_lookup:
-				return enhanced_dom_tree_node_lookup[node['nodeId']]
+		# Only hopping into another target needs to await, everything on this target was built synchronously above
+		if cross_origin_iframes:
+			await self._attach_cross_origin_iframe_trees(cross_origin_iframes, iframe_depth)
 
-			ax_node = ax_tree_lookup.get(node['backendNodeId'])
-			if ax_node:
-				enhanced_ax_node = self._build_enhanced_ax_node(ax_node)
-			else:
-				enhanced_ax_node = None
+		return enhanced_dom_tree_node
 
-			# To make attributes more readable
-			attributes: dict[str, str] | None = None
-			if 'attributes' in node and node['attributes']:
-				attributes = {}
-				for i in range(0, len(node['attributes']), 2):
-					attributes[node['attributes'][i]] = node['attributes'][i + 1]
+	def _build_enhanced_tree(
+		self,
+		root: Node,
+		target_id: TargetID,
+		ax_tree_lookup: dict[int, AXNode],
+		snapshot_lookup: Mapping[int, EnhancedSnapshotNode],
+		html_frames: list[EnhancedDOMTreeNode] | None = None,
+		total_frame_offset: DOMRect | None = None,
+		iframe_depth: int = 0,
+	) -> tuple[EnhancedDOMTreeNode, list[tuple[EnhancedDOMTreeNode, DOMRect]]]:
+		"""Construct the enhanced DOM tree of a single target with an explicit stack instead of one coroutine per node.
 
-			shadow_root_type = None
-			if 'shadowRootType' in node and node['shadowRootType']:
-				try:
-					shadow_root_type = node['shadowRootType']
-				except ValueError:
-					pass
+		The frame context (list of HTML frames + accumulated frame offset) is shared by every node of a frame and
+		only replaced when entering a new frame, it is never mutated in place.
+		Visibility is computed once all descendants are built (post-order), same as before, because
+		`is_element_visible_according_to_all_parents` shifts the node's snapshot bounds in place.
 
-			# Get snapshot data and calculate absolute position
-			snapshot_data = snapshot_lookup.get(node['backendNodeId'], None)
-			absolute_position = None
-			if snapshot_data and snapshot_data.bounds:
-				absolute_position = DOMRect(
-					x=snapshot_data.bounds.x + total_frame_offset.x,
-					y=snapshot_data.bounds.y + total_frame_offset.y,
-					width=snapshot_data.bounds.width,
-					height=snapshot_data.bounds.height,
-				)
+		Returns:
+			The root node and the visible cross-origin iframes whose documents still have to be fetched from
+			their own target, in document order, with the frame offset to use for them.
+		"""
+		session_id = self.browser_session.agent_focus.session_id if self.browser_session.agent_focus else None
+		log_debug = self.logger.isEnabledFor(logging.DEBUG)
 
-			dom_tree_node = EnhancedDOMTreeNode(
-				node_id=node['nodeId'],
-				backend_node_id=node['backendNodeId'],
-				node_type=NodeType(node['nodeType']),
-				node_name=node['nodeName'],
-				node_value=node['nodeValue'],
-				attributes=attributes or {},
-				is_scrollable=node.get('isScrollable', None),
-				frame_id=node.get('frameId', None),
-				session_id=self.browser_session.agent_focus.session_id if self.browser_session.agent_focus else None,
-				target_id=target_id,
-				content_document=None,
-				shadow_root_type=shadow_root_type,
-				shadow_roots=None,
-				parent_node=None,
-				children_nodes=None,
-				ax_node=enhanced_ax_node,
-				snapshot_node=snapshot_data,
-				is_visible=None,
-				absolute_position=absolute_position,
-				element_index=None,
+		enhanced_dom_tree_node_lookup: dict[int, EnhancedDOMTreeNode] = {}
+		""" NodeId (NOT backend node id) -> enhanced dom tree node"""  # way to get the parent/content node
+		cross_origin_iframes: list[tuple[EnhancedDOMTreeNode, DOMRect]] = []
+
+		# to get rid of the pointer references
+		if total_frame_offset is None:
+			total_frame_offset = DOMRect(x=0.0, y=0.0, width=0.0, height=0.0)
+		else:
+			total_frame_offset = DOMRect(
+				total_frame_offset.x, total_frame_offset.y, total_frame_offset.width, total_frame_offset.height
 			)
 
-			enhanced_dom_tree_node_lookup[node['nodeId']] = dom_tree_node
+		# Stack entries are (leaving, node, parent_or_raw_node, relation, html_frames, total_frame_offset):
+		# - entering: node is the raw CDP node, parent is the enhanced parent and relation says where to attach it
+		# - leaving: node is the enhanced node and the raw node is kept around for the post-order checks
+		stack: list[tuple[bool, Any, Any, str, list[EnhancedDOMTreeNode], DOMRect]] = [
+			(False, root, None, 'root', html_frames or [], total_frame_offset)
+		]
+		root_node: EnhancedDOMTreeNode | None = None
+
+		# The tree is full of parent <-> child reference cycles, so the cyclic GC keeps scanning the whole (growing)
+		# young graph while we allocate 10k+ nodes without ever freeing anything; pause it for the synchronous build.
+		gc_was_enabled = gc.isenabled()
+		gc.disable()
+		try:
+			while stack:
+				leaving, node, parent, relation, frames, frame_offset = stack.pop()
+
+				if leaving:
+					dom_tree_node: EnhancedDOMTreeNode = node
+					# Set visibility using the collected HTML frames
+					dom_tree_node.is_visible = self.is_element_visible_according_to_all_parents(dom_tree_node, frames)
+
+					if log_debug:
+						self._log_form_element_visibility(dom_tree_node)
+
+					# handle cross origin iframe (fetched from its own target once this target is done)
+					# only do this if the iframe is visible (otherwise it's not worth it)
+					if (
+						# TODO: hacky way to disable cross origin iframes for now
+						self.cross_origin_iframes
+						and dom_tree_node.node_name.upper() == 'IFRAME'
+						and parent.get('contentDocument', None) is None
+					):  # None meaning there is no content
+						if self._should_process_cross_origin_iframe(dom_tree_node, iframe_depth):
+							cross_origin_iframes.append((dom_tree_node, frame_offset))
+					continue
+
+				# memoize the mf (I don't know if some nodes are duplicated)
+				dom_tree_node = enhanced_dom_tree_node_lookup.get(node['nodeId'])  # type: ignore[assignment]
+				is_new_node = dom_tree_node is None
+
+				if is_new_node:
+					backend_node_id = node['backendNodeId']
+
+					ax_node = ax_tree_lookup.get(backend_node_id)
+					enhanced_ax_node = self._build_enhanced_ax_node(ax_node) if ax_node else None
+
+					# To make attributes more readable
+					raw_attributes = node.get('attributes')
+					attributes = dict(zip(raw_attributes[::2], raw_attributes[1::2])) if raw_attributes else {}
+
+					# Get snapshot data and calculate absolute position
+					snapshot_data = snapshot_lookup.get(backend_node_id, None)
+					absolute_position = None
+					if snapshot_data and snapshot_data.bounds:
+						absolute_position = DOMRect(
+							x=snapshot_data.bounds.x + frame_offset.x,
+							y=snapshot_data.bounds.y + frame_offset.y,
+							width=snapshot_data.bounds.width,
+							height=snapshot_data.bounds.height,
+						)
 
-			if 'parentId' in node and node['parentId']:
-				dom_tree_node.parent_node = enhanced_dom_tree_node_lookup[
-					node['parentId']
-				]  # parents should always be in the lookup
+					dom_tree_node = EnhancedDOMTreeNode(
+						node_id=node['nodeId'],
+						backend_node_id=backend_node_id,
+						node_type=_NODE_TYPES[node['nodeType']],
+						node_name=node['nodeName'],
+						node_value=node['nodeValue'],
+						attributes=attributes,
+						is_scrollable=node.get('isScrollable', None),
+						frame_id=node.get('frameId', None),
+						session_id=session_id,
+						target_id=target_id,
+						content_document=None,
+						shadow_root_type=node.get('shadowRootType') or None,
+						shadow_roots=None,
+						parent_node=None,
+						children_nodes=None,
+						ax_node=enhanced_ax_node,
+						snapshot_node=snapshot_data,
+						is_visible=None,
+						absolute_position=absolute_position,
+						element_index=None,
+					)
 
-			# Check if this is an HTML frame node and add it to the list
-			updated_html_frames = html_frames.copy()
-			if node['nodeType'] == NodeType.ELEMENT_NODE.value and node['nodeName'] == 'HTML' and node.get('frameId') is not None:
-				updated_html_frames.append(dom_tree_node)
+					enhanced_dom_tree_node_lookup[node['nodeId']] = dom_tree_node
+
+					if 'parentId' in node and node['parentId']:
+						dom_tree_node.parent_node = enhanced_dom_tree_node_lookup[
+							node['parentId']
+						]  # parents should always be in the lookup
+
+				# Attach to the parent (content documents and shadow roots get their parent forcefully set, helps traverse the tree)
+				if relation == 'children':
+					parent.children_nodes.append(dom_tree_node)
+				elif relation == 'shadow_roots':
+					dom_tree_node.parent_node = parent
+					parent.shadow_roots.append(dom_tree_node)
+				elif relation == 'content_document':
+					parent.content_document = dom_tree_node
+					dom_tree_node.parent_node = parent
+				else:
+					root_node = dom_tree_node
+
+				if not is_new_node:
+					continue
+
+				# Check if this is an HTML frame node and start a new frame context for its subtree
+				node_name = node['nodeName']
+				if node_name == 'HTML' and node['nodeType'] == NodeType.ELEMENT_NODE.value and node.get('frameId') is not None:
+					frames = [*frames, dom_tree_node]
+
+					# and adjust the total frame offset by scroll
+					if snapshot_data and snapshot_data.scrollRects:
+						frame_offset = DOMRect(
+							frame_offset.x - snapshot_data.scrollRects.x,
+							frame_offset.y - snapshot_data.scrollRects.y,
+							frame_offset.width,
+							frame_offset.height,
+						)
+						# DEBUG: Log iframe scroll information
+						self.logger.debug(
+							f'🔍 DEBUG: HTML frame scroll - scrollY={snapshot_data.scrollRects.y}, scrollX={snapshot_data.scrollRects.x}, frameId={node.get("frameId")}, nodeId={node["nodeId"]}'
+						)
 
-				# and adjust the total frame offset by scroll
-				if snapshot_data and snapshot_data.scrollRects:
-					total_frame_offset.x -= snapshot_data.scrollRects.x
-					total_frame_offset.y -= snapshot_data.scrollRects.y
-					# DEBUG: Log iframe scroll information
-					self.logger.debug(
-						f'🔍 DEBUG: HTML frame scroll - scrollY={snapshot_data.scrollRects.y}, scrollX={snapshot_data.scrollRects.x}, frameId={node.get("frameId")}, nodeId={node["nodeId"]}'
+				# Calculate new iframe offset for content documents, accounting for iframe scroll
+				if snapshot_data and snapshot_data.bounds and node_name.upper() in ('IFRAME', 'FRAME'):
+					frames = [*frames, dom_tree_node]
+					frame_offset = DOMRect(
+						frame_offset.x + snapshot_data.bounds.x,
+						frame_offset.y + snapshot_data.bounds.y,
+						frame_offset.width,
+						frame_offset.height,
 					)
 
-			# Calculate new iframe offset for content documents, accounting for iframe scroll
+				# Leave the node after all of its descendants, then visit content document -> shadow roots -> children
+				stack.append((True, dom_tree_node, node, '', frames, frame_offset))
+
+				if 'children' in node and node['children']:
+					dom_tree_node.children_nodes = []
+					for child in reversed(node['children']):
+						stack.append((False, child, dom_tree_node, 'children', frames, frame_offset))
+
+				if 'shadowRoots' in node and node['shadowRoots']:
+					dom_tree_node.shadow_roots = []
+					for shadow_root in reversed(node['shadowRoots']):
+						stack.append((False, shadow_root, dom_tree_node, 'shadow_roots', frames, frame_offset))
+
+				if 'contentDocument' in node and node['contentDocument']:
+					stack.append((False, node['contentDocument'], dom_tree_node, 'content_document', frames, frame_offset))
+
+		finally:
+			if gc_was_enabled:
+				gc.enable()
+
+		assert root_node is not None
+		return root_node, cross_origin_iframes
+
+	def _log_form_element_visibility(self, dom_tree_node: EnhancedDOMTreeNode) -> None:
+		"""DEBUG: Log visibility info for form elements in iframes."""
+		if dom_tree_node.tag_name and dom_tree_node.tag_name.upper() in ['INPUT', 'SELECT', 'TEXTAREA', 'LABEL']:
+			attrs = dom_tree_node.attributes or {}
+			elem_id = attrs.get('id', '')
+			elem_name = attrs.get('name', '')
 			if (
-				(node['nodeName'].upper() == 'IFRAME' or node['nodeName'].upper() == 'FRAME')
-				and snapshot_data
-				and snapshot_data.bounds
+				'city' in elem_id.lower()
+				or 'city' in elem_name.lower()
+				or 'state' in elem_id.lower()
+				or 'state' in elem_name.lower()
+				or 'zip' in elem_id.lower()
+				or 'zip' in elem_name.lower()
 			):
-				if snapshot_data.bounds:
-					updated_html_frames.append(dom_tree_node)
+				self.logger.debug(
+					f"🔍 DEBUG: Form element {dom_tree_node.tag_name} id='{elem_id}' name='{elem_name}' - visible={dom_tree_node.is_visible}, bounds={dom_tree_node.snapshot_node.bounds if dom_tree_node.snapshot_node else 'NO_SNAPSHOT'}"
+				)
 
-					total_frame_offset.x += snapshot_data.bounds.x
-					total_frame_offset.y += snapshot_data.bounds.y
+	def _should_process_cross_origin_iframe(self, dom_tree_node: EnhancedDOMTreeNode, iframe_depth: int) -> bool:
+		"""Check iframe depth, visibility and size (>= 200px in both dimensions) before fetching a cross-origin iframe."""
+		# Check iframe depth to prevent infinite recursion
+		if iframe_depth >= self.max_iframe_depth:
+			self.logger.debug(
+				f'Skipping iframe at depth {iframe_depth} to prevent infinite recursion (max depth: {self.max_iframe_depth})'
+			)
+			return False
 
-			if 'contentDocument' in node and node['contentDocument']:
-				dom_tree_node.content_document = await _construct_enhanced_node(
-					node['contentDocument'], updated_html_frames, total_frame_offset
-				)
-				dom_tree_node.content_document.parent_node = dom_tree_node
-				# forcefully set the parent node to the content document node (helps traverse the tree)
-
-			if 'shadowRoots' in node and node['shadowRoots']:
-				dom_tree_node.shadow_roots = []
-				for shadow_root in node['shadowRoots']:
-					shadow_root_node = await _construct_enhanced_node(shadow_root, updated_html_frames, total_frame_offset)
-					# forcefully set the parent node to the shadow root node (helps traverse the tree)
-					shadow_root_node.parent_node = dom_tree_node
-					dom_tree_node.shadow_roots.append(shadow_root_node)
-
-			if 'children' in node and node['children']:
-				dom_tree_node.children_nodes = []
-				for child in node['children']:
-					dom_tree_node.children_nodes.append(
-						await _construct_enhanced_node(child, updated_html_frames, total_frame_offset)
-					)
+		# First check if the iframe element itself is visible
+		if not dom_tree_node.is_visible:
+			self.logger.debug('Skipping invisible cross-origin iframe')
+			return False
 
-			# Set visibility using the collected HTML frames
-			dom_tree_node.is_visible = self.is_element_visible_according_to_all_parents(dom_tree_node, updated_html_frames)
-
-			# DEBUG: Log visibility info for form elements in iframes
-			if dom_tree_node.tag_name and dom_tree_node.tag_name.upper() in ['INPUT', 'SELECT', 'TEXTAREA', 'LABEL']:
-				attrs = dom_tree_node.attributes or {}
-				elem_id = attrs.get('id', '')
-				elem_name = attrs.get('name', '')
-				if (
-					'city' in elem_id.lower()
-					or 'city' in elem_name.lower()
-					or 'state' in elem_id.lower()
-					or 'state' in elem_name.lower()
-					or 'zip' in elem_id.lower()
-					or 'zip' in elem_name.lower()
-				):
-					self.logger.debug(
-						f"🔍 DEBUG: Form element {dom_tree_node.tag_name} id='{elem_id}' name='{elem_name}' - visible={dom_tree_node.is_visible}, bounds={dom_tree_node.snapshot_node.bounds if dom_tree_node.snapshot_node else 'NO_SNAPSHOT'}"
-					)
+		# Check iframe dimensions
+		if not (dom_tree_node.snapshot_node and dom_tree_node.snapshot_node.bounds):
+			self.logger.debug('Skipping cross-origin iframe: no bounds available')
+			return False
 
-			# handle cross origin iframe (just recursively call the main function with the proper target if it exists in iframes)
-			# only do this if the iframe is visible (otherwise it's not worth it)
+		bounds = dom_tree_node.snapshot_node.bounds
+		width = bounds.width
+		height = bounds.height
 
-			if (
-				# TODO: hacky way to disable cross origin iframes for now
-				self.cross_origin_iframes and node['nodeName'].upper() == 'IFRAME' and node.get('contentDocument', None) is None
-			):  # None meaning there is no content
-				# Check iframe depth to prevent infinite recursion
-				if iframe_depth >= self.max_iframe_depth:
-					self.logger.debug(
-						f'Skipping iframe at depth {iframe_depth} to prevent infinite recursion (max depth: {self.max_iframe_depth})'
-					)
-				else:
-					# Check if iframe is visible and large enough (>= 200px in both dimensions)
-					should_process_iframe = False
-
-					# First check if the iframe element itself is visible
-					if dom_tree_node.is_visible:
-						# Check iframe dimensions
-						if dom_tree_node.snapshot_node and dom_tree_node.snapshot_node.bounds:
-							bounds = dom_tree_node.snapshot_node.bounds
-							width = bounds.width
-							height = bounds.height
-
-							# Only process if iframe is at least 200px in both dimensions
-							if width >= 200 and height >= 200:
-								should_process_iframe = True
-								self.logger.debug(f'Processing cross-origin iframe: visible=True, width={width}, height={height}')
-							else:
-								self.logger.debug(
-									f'Skipping small cross-origin iframe: width={width}, height={height} (needs >= 200px)'
-								)
-						else:
-							self.logger.debug('Skipping cross-origin iframe: no bounds available')
-					else:
-						self.logger.debug('Skipping invisible cross-origin iframe')
-
-					if should_process_iframe:
-						# Use get_all_frames to find the iframe's target
-						frame_id = node.get('frameId', None)
-						if frame_id:
-							all_frames, _ = await self.browser_session.get_all_frames()
-							frame_info = all_frames.get(frame_id)
-							iframe_document_target = None
-							if frame_info and frame_info.get('frameTargetId'):
-								# Get the target info for this iframe
-								targets = await self.browser_session.cdp_client.send.Target.getTargets()
-								iframe_document_target = next(
-									(t for t in targets['targetInfos'] if t['targetId'] == frame_info['frameTargetId']), None
-								)
-						else:
-							iframe_document_target = None
-						# if target actually exists in one of the frames, just recursively build the dom tree for it
-						if iframe_document_target:
-							self.logger.debug(
-								f'Getting content document for iframe {node.get("frameId", None)} at depth {iframe_depth + 1}'
-							)
-							content_document = await self.get_dom_tree(
-								target_id=iframe_document_target.get('targetId'),
-								# TODO: experiment with this values -> not sure whether the whole cross origin iframe should be ALWAYS included as soon as some part of it is visible or not.
-								# Current config: if the cross origin iframe is AT ALL visible, then just include everything inside of it!
-								# initial_html_frames=updated_html_frames,
-								initial_total_frame_offset=total_frame_offset,
-								iframe_depth=iframe_depth + 1,
-							)
-
-							dom_tree_node.content_document = content_document
-							dom_tree_node.content_document.parent_node = dom_tree_node
-
-			return dom_tree_node
-
-		enhanced_dom_tree_node = await _construct_enhanced_node(dom_tree['root'], initial_html_frames, initial_total_frame_offset)
+		# Only process if iframe is at least 200px in both dimensions
+		if width >= 200 and height >= 200:
+			self.logger.debug(f'Processing cross-origin iframe: visible=True, width={width}, height={height}')
+			return True
 
-		return enhanced_dom_tree_node
+		self.logger.debug(f'Skipping small cross-origin iframe: width={width}, height={height} (needs >= 200px)')
+		return False
+
+	async def _get_cross_origin_iframe_targets(self, iframe_nodes: list[EnhancedDOMTreeNode]) -> list[TargetID | None]:
+		"""Find the target of each cross-origin iframe, with a single frame hierarchy and target list lookup."""
+		if not any(iframe_node.frame_id for iframe_node in iframe_nodes):
+			return [None] * len(iframe_nodes)
+
+		all_frames, _ = await self.browser_session.get_all_frames()
+		target_ids = {target['targetId'] for target in await self.browser_session.get_all_targets()}
+
+		iframe_targets: list[TargetID | None] = []
+		for iframe_node in iframe_nodes:
+			frame_info = all_frames.get(iframe_node.frame_id) if iframe_node.frame_id else None
+			frame_target_id = frame_info.get('frameTargetId') if frame_info else None
+			iframe_targets.append(frame_target_id if frame_target_id in target_ids else None)
+		return iframe_targets
+
+	async def _attach_cross_origin_iframe_trees(
+		self, cross_origin_iframes: list[tuple[EnhancedDOMTreeNode, DOMRect]], iframe_depth: int
+	) -> None:
+		"""Build the DOM trees of cross-origin iframes from their own targets concurrently and graft them in.
+
+		Each iframe target is a full _get_all_trees round-trip, so fetching them in parallel makes an iframe-heavy page
+		cost as much as its slowest iframe instead of the sum of all of them. The fetches themselves are bounded by
+		`max_concurrent_iframe_fetches`. An iframe that fails to load is left without content instead of failing the page.
+		"""
+		iframe_targets = await self._get_cross_origin_iframe_targets([iframe_node for iframe_node, _ in cross_origin_iframes])
+
+		fetches = []
+		fetched_iframes = []
+		for (iframe_node, total_frame_offset), iframe_target_id in zip(cross_origin_iframes, iframe_targets):
+			# if target actually exists in one of the frames, just recursively build the dom tree for it
+			if iframe_target_id is None:
+				continue
+			self.logger.debug(f'Getting content document for iframe {iframe_node.frame_id} at depth {iframe_depth + 1}')
+			fetches.append(
+				self.get_dom_tree(
+					target_id=iframe_target_id,
+					# TODO: experiment with this values -> not sure whether the whole cross origin iframe should be ALWAYS included as soon as some part of it is visible or not.
+					# Current config: if the cross origin iframe is AT ALL visible, then just include everything inside of it!
+					# initial_html_frames=updated_html_frames,
+					initial_total_frame_offset=total_frame_offset,
+					iframe_depth=iframe_depth + 1,
+				)
+			)
+			fetched_iframes.append(iframe_node)
+
+		# Creating the session of one iframe target must not evict the session of another that is still being fetched
+		with self.browser_session.lease_cdp_sessions(target_id for target_id in iframe_targets if target_id is not None):
+			content_documents = await asyncio.gather(*fetches, return_exceptions=True)
+
+		# Graft in document order once everything is fetched
+		for iframe_node, content_document in zip(fetched_iframes, content_documents):
+			if isinstance(content_document, BaseException):
+				self.logger.debug(
+					f'Failed to get content document for iframe {iframe_node.frame_id}: {type(content_document).__name__}: {content_document}'
+				)
+				continue
+			iframe_node.content_document = content_document
+			iframe_node.content_document.parent_node = iframe_node
 
 	@observe_debug(ignore_input=True, ignore_output=True, name='get_serialized_dom_tree')
 	async def get_serialized_dom_tree(
@@ -729,7 +951,11 @@ class DomService:
 
 		start = time.time()
 		serialized_dom_state, serializer_timing = DOMTreeSerializer(
-			enhanced_dom_tree, previous_cached_state, paint_order_filtering=self.paint_order_filtering
+			enhanced_dom_tree,
+			previous_cached_state,
+			paint_order_filtering=self.paint_order_filtering,
+			paint_order_spatial_index=self.paint_order_spatial_index,
+			cache=self._serialization_cache,
 		).serialize_accessible_elements()
 
 		end = time.time()
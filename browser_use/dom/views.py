@@ -11,6 +11,7 @@ from cdp_use.cdp.domsnapshot.commands import CaptureSnapshotReturns
 from cdp_use.cdp.target.types import SessionID, TargetID, TargetInfo
 from uuid_extensions import uuid7str
 
+from browser_use.dom.serializer.cache import SerializationCache
 from browser_use.dom.utils import cap_text_length
 from browser_use.observability import observe_debug
 
@@ -401,6 +402,16 @@ class EnhancedDOMTreeNode:
 			children.extend(self.shadow_roots)
 		return children
 
+	@property
+	def is_in_closed_shadow_root(self) -> bool:
+		"""Whether the node or one of its ancestors is a closed shadow root, which page scripts can't reach"""
+		current: EnhancedDOMTreeNode | None = self
+		while current is not None:
+			if current.shadow_root_type == 'closed':
+				return True
+			current = current.parent_node
+		return False
+
 	@property
 	def tag_name(self) -> str:
 		return self.node_name.lower()
@@ -803,6 +814,9 @@ class SerializedDOMState:
 
 	selector_map: DOMSelectorMap
 
+	_serialization_cache: SerializationCache | None = None
+	"""Cross-step cache of the serializer that produced this state, reused when rendering it"""
+
 	@observe_debug(ignore_input=True, ignore_output=True, name='llm_representation')
 	def llm_representation(
 		self,
@@ -816,7 +830,7 @@ class SerializedDOMState:
 
 		include_attributes = include_attributes or DEFAULT_INCLUDE_ATTRIBUTES
 
-		return DOMTreeSerializer.serialize_tree(self._root, include_attributes)
+		return DOMTreeSerializer.serialize_tree(self._root, include_attributes, cache=self._serialization_cache)
 
 
 @dataclass
@@ -0,0 +1,149 @@
+"""Domain pattern lists compiled for fast URL matching.
+
+allowed_domains / prohibited_domains and the `domains` of registered actions used to be checked by trying every
+pattern in turn against the URL (with fnmatch for globs), so a 50k-entry block list cost 50k string matches on every
+navigation, new tab and action model build. A DomainMatcher splits the patterns once into:
+
+- an exact-host set: `example.com`
+- a suffix trie over reversed host labels for "this domain and all its subdomains": `*.example.com` is stored at
+  com -> example, and a host matches if walking its labels from the right passes a marked node
+- a set of literal URL prefixes (`https://example.com/docs`), looked up once per distinct prefix length
+- a fallback bucket for everything else (embedded or scheme globs), checked pattern by pattern with
+  the original matching function, so the semantics stay exactly those of the uncompiled check.
+
+Every exact host and trie node records which URL schemes it applies to, as names or globs (`http*`).
+"""
+
+import re
+from collections.abc import Callable, Iterable
+from fnmatch import fnmatch
+from functools import lru_cache
+from typing import Any
+from urllib.parse import urlparse
+
+from browser_use.utils import is_new_tab_page, match_url_with_domain_pattern
+
+ANY_SCHEME = '*'
+
+# Labels that can be stored in the trie / exact set as-is; anything else (glob characters, ports, paths) is a fallback
+PLAIN_DOMAIN_RE = re.compile(r'^[a-z0-9_-]+(\.[a-z0-9_-]+)*$')
+SCHEME_RE = re.compile(r'^[a-z*][a-z0-9+.*-]*$')  # scheme names, optionally globbed with *
+_SCHEMES = None  # trie node key for the schemes of the patterns ending at that node, never a host label
+
+
+class DomainMatcher:
+	"""A compiled list of domain patterns: matching costs O(host labels + prefix lengths + fallback patterns)."""
+
+	def __init__(self, fallback_match: Callable[[str, str, str, str], bool], match_new_tab_pages: bool = True):
+		"""
+		Args:
+			fallback_match: fallback_match(url, host, scheme, pattern) decides the patterns that could not be compiled.
+			match_new_tab_pages: Whether about:blank / chrome://newtab etc. can match at all.
+		"""
+		self.fallback_match = fallback_match
+		self.match_new_tab_pages = match_new_tab_pages
+		self.exact_hosts: dict[str, set[str]] = {}
+		self.suffix_trie: dict[str | None, Any] = {}
+		self.url_prefixes: set[str] = set()
+		self.url_prefix_lengths: set[int] = set()
+		self.fallback_patterns: list[str] = []
+		self.pattern_count = 0
+
+	def add_host(self, host: str, scheme: str = ANY_SCHEME) -> None:
+		"""Match URLs whose host is exactly `host` (lowercase)."""
+		self.exact_hosts.setdefault(host, set()).add(scheme)
+
+	def add_domain_and_subdomains(self, domain: str, scheme: str = ANY_SCHEME) -> None:
+		"""Match URLs whose host is `domain` or ends with `.domain`; an empty domain matches every host."""
+		node = self.suffix_trie
+		for label in reversed(domain.split('.')) if domain else ():
+			node = node.setdefault(label, {})
+		node.setdefault(_SCHEMES, set()).add(scheme)
+
+	def add_url_prefix(self, prefix: str) -> None:
+		"""Match URLs that literally start with `prefix`, checked with one set lookup per distinct prefix length."""
+		self.url_prefixes.add(prefix)
+		self.url_prefix_lengths.add(len(prefix))
+
+	def add_fallback(self, pattern: str) -> None:
+		self.fallback_patterns.append(pattern)
+
+	def match_host(self, host: str, scheme: str) -> bool:
+		"""Check a lowercase host against the exact hosts and the suffix trie (not the fallback patterns)."""
+		schemes = self.exact_hosts.get(host)
+		if schemes and self._match_scheme(schemes, scheme):
+			return True
+
+		node = self.suffix_trie
+		for label in reversed(host.split('.')):
+			schemes = node.get(_SCHEMES)
+			if schemes and self._match_scheme(schemes, scheme):
+				return True
+			node = node.get(label)
+			if node is None:
+				return False
+		schemes = node.get(_SCHEMES)
+		return bool(schemes and self._match_scheme(schemes, scheme))
+
+	@staticmethod
+	def _match_scheme(schemes: set[str], scheme: str) -> bool:
+		if ANY_SCHEME in schemes or scheme in schemes:
+			return True
+		return any('*' in pattern and fnmatch(scheme, pattern) for pattern in schemes)
+
+	def match_parsed(self, url: str, host: str, scheme: str) -> bool:
+		"""Whether any of the patterns matches the URL, given its already parsed lowercase host and scheme."""
+		if self.match_host(host, scheme):
+			return True
+		if self.url_prefixes and any(url[:length] in self.url_prefixes for length in self.url_prefix_lengths):
+			return True
+		return any(self.fallback_match(url, host, scheme, pattern) for pattern in self.fallback_patterns)
+
+	def match(self, url: str) -> bool:
+		"""Whether any of the patterns matches the URL. URLs without a host never match."""
+		if not self.match_new_tab_pages and is_new_tab_page(url):
+			return False
+		try:
+			parsed = urlparse(url)
+			host = parsed.hostname
+		except ValueError:
+			return False
+		if not host or not parsed.scheme:
+			return False
+		return self.match_parsed(url, host, parsed.scheme.lower())
+
+
+def compile_domain_patterns(patterns: Iterable[str]) -> DomainMatcher:
+	"""Compile patterns with the semantics of utils.match_url_with_domain_pattern (action `domains` filters)."""
+
+	def fallback_match(url: str, host: str, scheme: str, pattern: str) -> bool:
+		return match_url_with_domain_pattern(url, pattern)
+
+	matcher = DomainMatcher(fallback_match, match_new_tab_pages=False)
+	for pattern in patterns:
+		matcher.pattern_count += 1
+		normalized = pattern.lower()
+		if '://' in normalized:
+			scheme, domain = normalized.split('://', 1)
+		else:
+			scheme, domain = 'https', normalized  # no scheme means https only
+		if ':' in domain and not domain.startswith(':'):
+			domain = domain.split(':', 1)[0]  # ports are ignored
+
+		if not SCHEME_RE.match(scheme):
+			matcher.add_fallback(pattern)
+		elif domain == '*':
+			matcher.add_domain_and_subdomains('', scheme)
+		elif PLAIN_DOMAIN_RE.match(domain):
+			matcher.add_host(domain, scheme)
+		elif domain.startswith('*.') and PLAIN_DOMAIN_RE.match(domain[2:]):
+			matcher.add_domain_and_subdomains(domain[2:], scheme)
+		else:
+			matcher.add_fallback(pattern)
+	return matcher
+
+
+@lru_cache(maxsize=256)
+def get_domain_matcher(patterns: tuple[str, ...]) -> DomainMatcher:
+	"""Cached compile_domain_patterns, for lists that are checked over and over (e.g. every action on every step)."""
+	return compile_domain_patterns(patterns)
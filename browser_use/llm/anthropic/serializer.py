@@ -1,4 +1,5 @@
 import json
+from collections.abc import Sequence
 from typing import overload
 
 from anthropic.types import (
@@ -84,6 +85,15 @@ class AnthropicMessageSerializer:
 			# Handle URL images
 			return ImageBlockParam(source=URLImageSourceParam(url=url, type='url'), type='image')
 
+	@staticmethod
+	def _last_text_part_index(content: Sequence[ContentPartTextParam | ContentPartImageParam]) -> int:
+		"""Index of the last text part of a message.
+
+		A cache breakpoint caches everything before it, so a cached message only needs one on its last text part.
+		Anthropic allows at most 4 breakpoints per request, marking every part would fail for messages with many parts.
+		"""
+		return max((i for i, part in enumerate(content) if part.type == 'text'), default=-1)
+
 	@staticmethod
 	def _serialize_content_to_str(
 		content: str | list[ContentPartTextParam], use_cache: bool = False
@@ -98,9 +108,12 @@ class AnthropicMessageSerializer:
 				return content
 
 		serialized_blocks: list[TextBlockParam] = []
-		for part in content:
+		last_text_index = AnthropicMessageSerializer._last_text_part_index(content)
+		for i, part in enumerate(content):
 			if part.type == 'text':
-				serialized_blocks.append(AnthropicMessageSerializer._serialize_content_part_text(part, use_cache))
+				serialized_blocks.append(
+					AnthropicMessageSerializer._serialize_content_part_text(part, use_cache and i == last_text_index)
+				)
 
 		return serialized_blocks
 
@@ -117,9 +130,12 @@ class AnthropicMessageSerializer:
 				return content
 
 		serialized_blocks: list[TextBlockParam | ImageBlockParam] = []
-		for part in content:
+		last_text_index = AnthropicMessageSerializer._last_text_part_index(content)
+		for i, part in enumerate(content):
 			if part.type == 'text':
-				serialized_blocks.append(AnthropicMessageSerializer._serialize_content_part_text(part, use_cache))
+				serialized_blocks.append(
+					AnthropicMessageSerializer._serialize_content_part_text(part, use_cache and i == last_text_index)
+				)
 			elif part.type == 'image_url':
 				serialized_blocks.append(AnthropicMessageSerializer._serialize_content_part_image(part))
 
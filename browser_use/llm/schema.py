@@ -3,9 +3,24 @@ Utilities for creating optimized Pydantic schemas for LLM usage.
 """
 
 from typing import Any
+from weakref import WeakKeyDictionary
 
 from pydantic import BaseModel
 
+# Optimized schemas per model class. The agent reuses the same output model classes across steps (see
+# Registry.create_action_model), so the schema is generated once per action set instead of on every LLM call.
+# Weak keys let dynamically created models be garbage collected together with their schema.
+_OPTIMIZED_SCHEMA_CACHE: 'WeakKeyDictionary[type[BaseModel], dict[str, Any]]' = WeakKeyDictionary()
+
+
+def _copy_schema(obj: Any) -> Any:
+	"""Copy the dicts and lists of a JSON schema, much cheaper than copy.deepcopy for plain JSON data."""
+	if isinstance(obj, dict):
+		return {key: _copy_schema(value) for key, value in obj.items()}
+	if isinstance(obj, list):
+		return [_copy_schema(item) for item in obj]
+	return obj
+
 
 class SchemaOptimizer:
 	@staticmethod
@@ -14,12 +29,22 @@ class SchemaOptimizer:
 		Create the most optimized schema by flattening all $ref/$defs while preserving
 		FULL descriptions and ALL action definitions. Also ensures OpenAI strict mode compatibility.
 
+		The result is cached per model class, every call returns a fresh copy that callers are free to modify.
+
 		Args:
 			model: The Pydantic model to optimize
 
 		Returns:
 			Optimized schema with all $refs resolved and strict mode compatibility
 		"""
+		cached_schema = _OPTIMIZED_SCHEMA_CACHE.get(model)
+		if cached_schema is None:
+			cached_schema = SchemaOptimizer._build_optimized_json_schema(model)
+			_OPTIMIZED_SCHEMA_CACHE[model] = cached_schema
+		return _copy_schema(cached_schema)
+
+	@staticmethod
+	def _build_optimized_json_schema(model: type[BaseModel]) -> dict[str, Any]:
 		# Generate original schema
 		original_schema = model.model_json_schema()
 
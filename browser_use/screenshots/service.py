@@ -2,39 +2,72 @@
 Screenshot storage service for browser-use agents.
 """
 
+import asyncio
 import base64
+import hashlib
+import os
 from pathlib import Path
 
 import anyio
 
 from browser_use.observability import observe_debug
+from browser_use.screenshots.views import THUMBNAILS_DIRNAME
+from browser_use.utils import get_base64_image_media_type
 
 
 class ScreenshotService:
-	"""Simple screenshot storage service that saves screenshots to disk"""
+	"""Content-addressed screenshot store: each distinct image is saved once, as screenshots/<sha256>.<ext>.
 
-	def __init__(self, agent_directory: str | Path):
-		"""Initialize with agent directory path"""
+	Long runs that sit on the same page produce many identical frames; those steps all point to the same file.
+	With `thumbnail_size`, a downscaled copy of every distinct image is kept in screenshots/thumbnails/ as well.
+	"""
+
+	def __init__(self, agent_directory: str | Path, thumbnail_size: tuple[int, int] | None = None):
+		"""Initialize with agent directory path and optional thumbnail bounding box (width, height)"""
 		self.agent_directory = Path(agent_directory) if isinstance(agent_directory, str) else agent_directory
+		self.thumbnail_size = thumbnail_size
 
 		# Create screenshots subdirectory
 		self.screenshots_dir = self.agent_directory / 'screenshots'
 		self.screenshots_dir.mkdir(parents=True, exist_ok=True)
+		self.thumbnails_dir = self.screenshots_dir / THUMBNAILS_DIRNAME
+
+		self.stored_count = 0
+		self.deduplicated_count = 0
 
 	@observe_debug(ignore_input=True, ignore_output=True, name='store_screenshot')
 	async def store_screenshot(self, screenshot_b64: str, step_number: int) -> str:
-		"""Store screenshot to disk and return the full path as string"""
-		screenshot_filename = f'step_{step_number}.png'
-		screenshot_path = self.screenshots_dir / screenshot_filename
-
-		# Decode base64 and save to disk
+		"""Store screenshot to disk (unless an identical one already is) and return the full path as string"""
+		extension = get_base64_image_media_type(screenshot_b64).split('/')[-1].replace('jpeg', 'jpg')
 		screenshot_data = base64.b64decode(screenshot_b64)
+		digest = hashlib.sha256(screenshot_data).hexdigest()
+		screenshot_path = self.screenshots_dir / f'{digest}.{extension}'
+
+		if screenshot_path.exists():
+			self.deduplicated_count += 1
+			return str(screenshot_path)
 
-		async with await anyio.open_file(screenshot_path, 'wb') as f:
+		# Write to a temp file and rename, so a half-written file is never mistaken for the stored image
+		temp_path = screenshot_path.with_name(f'.{screenshot_path.name}.{step_number}.tmp')
+		async with await anyio.open_file(temp_path, 'wb') as f:
 			await f.write(screenshot_data)
+		os.replace(temp_path, screenshot_path)
+		self.stored_count += 1
+
+		if self.thumbnail_size:
+			await asyncio.to_thread(self._save_thumbnail, screenshot_path)
 
 		return str(screenshot_path)
 
+	def _save_thumbnail(self, screenshot_path: Path) -> None:
+		from PIL import Image
+
+		assert self.thumbnail_size
+		self.thumbnails_dir.mkdir(exist_ok=True)
+		with Image.open(screenshot_path) as image:
+			image.thumbnail(self.thumbnail_size)
+			image.save(self.thumbnails_dir / screenshot_path.name)
+
 	@observe_debug(ignore_input=True, ignore_output=True, name='get_screenshot_from_disk')
 	async def get_screenshot(self, screenshot_path: str) -> str | None:
 		"""Load screenshot from disk path and return as base64"""
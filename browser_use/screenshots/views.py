@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import base64
+import mmap
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+	from PIL import Image
+
+THUMBNAILS_DIRNAME = 'thumbnails'
+
+
+@dataclass(frozen=True, slots=True)
+class ScreenshotRef:
+	"""Lazy handle to a screenshot stored on disk: nothing is read until the bytes are asked for.
+
+	Screenshots stored by ScreenshotService are content-addressed, so steps that saw identical frames share one file and
+	compare equal by `digest`.
+	"""
+
+	path: Path
+
+	@property
+	def digest(self) -> str:
+		"""Content hash of the image (the file name stem; step_N for screenshots stored before content addressing)."""
+		return self.path.stem
+
+	@property
+	def thumbnail_path(self) -> Path | None:
+		"""Downscaled copy, if ScreenshotService was asked to keep thumbnails."""
+		path = self.path.parent / THUMBNAILS_DIRNAME / self.path.name
+		return path if path.exists() else None
+
+	def exists(self) -> bool:
+		return self.path.exists()
+
+	def read_bytes(self) -> bytes | None:
+		"""Image file contents, or None if the file is gone."""
+		try:
+			return self.path.read_bytes()
+		except OSError:
+			return None
+
+	def memoryview(self) -> memoryview | None:
+		"""Read-only, memory-mapped view of the image file: pages are only loaded as they are read, nothing is copied."""
+		try:
+			with open(self.path, 'rb') as f:
+				return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+		except (OSError, ValueError):  # ValueError: empty file, which can't be mapped
+			return None
+
+	def to_base64(self) -> str | None:
+		"""Base64 string of the image, as accepted by LLM messages and the cloud API."""
+		data = self.read_bytes()
+		return base64.b64encode(data).decode('utf-8') if data is not None else None
+
+	def open_image(self) -> Image.Image | None:
+		"""Decode into a PIL image, or None if the file is gone."""
+		from PIL import Image
+
+		try:
+			image = Image.open(self.path)
+			image.load()  # also closes the file, so many open frames don't hold many file descriptors
+		except OSError:
+			return None
+		return image
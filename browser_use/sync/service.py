@@ -6,11 +6,11 @@ import asyncio
 import logging
 import shutil
 
-import httpx
 from bubus import BaseEvent
 
 from browser_use.config import CONFIG
 from browser_use.sync.auth import TEMP_USER_ID, DeviceAuthClient
+from browser_use.sync.uploader import EventUploader
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +26,8 @@ class CloudSync:
 		self.session_id: str | None = None
 		self.allow_session_events_for_auth = allow_session_events_for_auth
 		self.auth_flow_active = False  # Flag to indicate auth flow is running
+		# Events are posted in batches by a background task, off the agent's critical path
+		self.uploader = EventUploader(endpoint=f'{self.base_url.rstrip("/")}/api/v1/events', get_headers=self._get_auth_headers)
 		# Check if cloud sync is actually enabled - if not, we should remain silent
 		self.enabled = CONFIG.BROWSER_USE_CLOUD_SYNC
 
@@ -73,10 +75,8 @@ class CloudSync:
 			logger.error(f'Failed to handle {event.event_type} event: {type(e).__name__}: {e}', exc_info=True)
 
 	async def _send_event(self, event: BaseEvent) -> None:
-		"""Send event to cloud API"""
+		"""Queue event for the background uploader, which posts it to the cloud API in a batch"""
 		try:
-			headers = {}
-
 			# Override user_id only if it's not already set to a specific value
 			# This allows CLI and other code to explicitly set temp user_id when needed
 			if self.auth_client and self.auth_client.is_authenticated:
@@ -89,38 +89,26 @@ class CloudSync:
 				if not hasattr(event, 'user_id') or not getattr(event, 'user_id', None):
 					setattr(event, 'user_id', TEMP_USER_ID)
 
-			# Add auth headers if available
-			if self.auth_client:
-				headers.update(self.auth_client.get_headers())
-
-			# Send event (batch format with direct BaseEvent serialization)
-			async with httpx.AsyncClient() as client:
-				# Serialize event and add device_id to all events
-				event_data = event.model_dump(mode='json')
-				if self.auth_client and self.auth_client.device_id:
-					event_data['device_id'] = self.auth_client.device_id
-
-				response = await client.post(
-					f'{self.base_url.rstrip("/")}/api/v1/events',
-					json={'events': [event_data]},
-					headers=headers,
-					timeout=10.0,
-				)
-
-				if response.status_code >= 400:
-					# Log error but don't raise - we want to fail silently
-					logger.debug(
-						f'Failed to send sync event: POST {response.request.url} {response.status_code} - {response.text}'
-					)
-		except httpx.TimeoutException:
-			logger.debug(f'Event send timed out after 10 seconds: {event}')
-		except httpx.ConnectError as e:
-			# logger.warning(f'⚠️ Failed to connect to cloud service at {self.base_url}: {e}')
-			pass
-		except httpx.HTTPError as e:
-			logger.debug(f'HTTP error sending event {event}: {type(e).__name__}: {e}')
+			# Serialize event now (it may still change after this handler) and add device_id to all events
+			event_data = event.model_dump(mode='json')
+			if self.auth_client and self.auth_client.device_id:
+				event_data['device_id'] = self.auth_client.device_id
+
+			self.uploader.enqueue(event_data)
 		except Exception as e:
-			logger.debug(f'Unexpected error sending event {event}: {type(e).__name__}: {e}')
+			logger.debug(f'Unexpected error queueing event {event}: {type(e).__name__}: {e}')
+
+	def _get_auth_headers(self) -> dict[str, str]:
+		# Read when a batch is sent, so events queued before auth finished go out with the new token
+		return self.auth_client.get_headers() if self.auth_client else {}
+
+	async def flush(self) -> None:
+		"""Upload all queued events now"""
+		await self.uploader.flush()
+
+	async def close(self, timeout: float = 10.0) -> None:
+		"""Upload the remaining events (waiting at most `timeout` seconds) and close the connection pool"""
+		await self.uploader.close(timeout=timeout)
 
 	async def _background_auth(self, agent_session_id: str) -> None:
 		"""Run authentication in background or show cloud URL if already authenticated"""
@@ -0,0 +1,266 @@
+"""
+Background uploader that batches cloud sync events over one persistent HTTP connection pool.
+
+Events are serialized when they are queued and posted by a single background task, in order, as
+`{"events": [...]}` batches of up to `max_batch_events` events / `max_batch_bytes` bytes, at most `flush_interval`
+seconds after the first event of a batch was queued. Large bodies are gzipped. The in-memory queue is bounded: on
+overflow events are spilled to a temporary JSONL file and uploaded after the queued ones (or dropped, with
+overflow='drop'), so a slow or unreachable API never blocks the agent or grows memory without bound.
+"""
+
+import asyncio
+import gzip
+import json
+import logging
+import os
+import tempfile
+from collections import deque
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, Literal
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS_CODES = {408, 425, 429, 500, 502, 503, 504}
+
+
+class EventUploader:
+	"""Queues serialized events and posts them in batches from a background task."""
+
+	def __init__(
+		self,
+		endpoint: str,
+		get_headers: Callable[[], dict[str, str]] | None = None,
+		max_batch_events: int = 50,
+		max_batch_bytes: int = 4 * 1024 * 1024,
+		flush_interval: float = 1.0,
+		max_queue_events: int = 500,
+		max_queue_bytes: int = 64 * 1024 * 1024,
+		overflow: Literal['spill', 'drop'] = 'spill',
+		max_spill_bytes: int = 512 * 1024 * 1024,
+		gzip_min_bytes: int = 16 * 1024,
+		max_retries: int = 3,
+		timeout: float = 10.0,
+	):
+		self.endpoint = endpoint
+		self.get_headers = get_headers or dict
+		self.max_batch_events = max_batch_events
+		self.max_batch_bytes = max_batch_bytes
+		self.flush_interval = flush_interval
+		self.max_queue_events = max_queue_events
+		self.max_queue_bytes = max_queue_bytes
+		self.overflow = overflow
+		self.max_spill_bytes = max_spill_bytes
+		self.gzip_min_bytes = gzip_min_bytes
+		self.max_retries = max_retries
+		self.timeout = timeout
+
+		self.events_sent = 0
+		self.events_dropped = 0
+		self.events_spilled = 0
+		self.batches_sent = 0
+
+		self._queue: deque[bytes] = deque()
+		self._queue_bytes = 0
+		self._spill_path: Path | None = None
+		self._spill_offset = 0  # bytes of the spill file already moved back into the queue
+		self._spill_size = 0
+		self._has_events = asyncio.Event()
+		self._send_lock = asyncio.Lock()
+		self._client: httpx.AsyncClient | None = None
+		self._sender: asyncio.Task | None = None
+
+	@property
+	def pending_count(self) -> int:
+		"""Events waiting in memory (spilled events not included)."""
+		return len(self._queue)
+
+	def enqueue(self, event_data: dict[str, Any]) -> bool:
+		"""Queue one serialized event for upload without waiting. Returns False if it had to be dropped."""
+		line = json.dumps(event_data, separators=(',', ':')).encode()
+		if len(self._queue) >= self.max_queue_events or self._queue_bytes + len(line) > self.max_queue_bytes or self._spill_size:
+			# Once anything is spilled, later events go to the file too, so the upload order stays the queueing order
+			if not self._spill(line):
+				self.events_dropped += 1
+				logger.debug(f'Cloud sync queue is full, dropped {event_data.get("event_type")} event')
+				return False
+		else:
+			self._queue.append(line)
+			self._queue_bytes += len(line)
+
+		self._has_events.set()
+		if self._sender is None or self._sender.done():
+			self._sender = asyncio.create_task(self._run(), name='cloud_sync_uploader')
+		return True
+
+	async def flush(self) -> None:
+		"""Upload everything queued so far (including spilled events), retrying failed batches with backoff."""
+		await self._send_pending(retries=self.max_retries)
+
+	async def close(self, timeout: float = 10.0) -> None:
+		"""Final flush (one attempt per batch, bounded by `timeout`), then stop the sender and close the connections.
+
+		Events that could not be uploaded are dropped. The uploader can be used again afterwards.
+		"""
+		if self._sender is not None:
+			self._sender.cancel()
+			await asyncio.gather(self._sender, return_exceptions=True)
+			self._sender = None
+		try:
+			await asyncio.wait_for(self._send_pending(retries=0), timeout=timeout)
+		except TimeoutError:
+			logger.debug(f'Cloud sync final flush timed out after {timeout}s')
+		finally:
+			unsent = len(self._queue) + self._count_spilled_lines()
+			if unsent:
+				self.events_dropped += unsent
+				logger.debug(f'Cloud sync dropped {unsent} events that could not be uploaded before shutdown')
+			self._queue.clear()
+			self._queue_bytes = 0
+			self._remove_spill_file()
+			if self._client is not None:
+				await self._client.aclose()
+				self._client = None
+
+	async def _run(self) -> None:
+		"""Send a batch as soon as one is full, or flush_interval after the first event of a batch was queued."""
+		loop = asyncio.get_running_loop()
+		while True:
+			await self._has_events.wait()
+			deadline = loop.time() + self.flush_interval
+			while not self._batch_is_full():
+				self._has_events.clear()
+				remaining = deadline - loop.time()
+				if remaining <= 0:
+					break
+				try:
+					await asyncio.wait_for(self._has_events.wait(), timeout=remaining)
+				except TimeoutError:
+					break
+			self._has_events.clear()
+			await self._send_pending(retries=self.max_retries)
+
+	def _batch_is_full(self) -> bool:
+		return bool(self._spill_size) or len(self._queue) >= self.max_batch_events or self._queue_bytes >= self.max_batch_bytes
+
+	async def _send_pending(self, retries: int) -> None:
+		async with self._send_lock:
+			while self._queue or self._refill_from_spill():
+				batch = self._take_batch()
+				if not await self._post_with_retries(batch, retries):
+					return  # API unreachable: the rest stays queued (and spilled) for the next flush
+
+	def _take_batch(self) -> list[bytes]:
+		batch: list[bytes] = []
+		size = 0
+		while self._queue and len(batch) < self.max_batch_events:
+			line = self._queue[0]
+			if batch and size + len(line) > self.max_batch_bytes:
+				break
+			batch.append(self._queue.popleft())
+			size += len(line)
+		self._queue_bytes -= size
+		return batch
+
+	async def _post_with_retries(self, batch: list[bytes], retries: int) -> bool:
+		"""Post a batch; on retryable failures retry with exponential backoff. Returns False if it should be kept."""
+		try:
+			for attempt in range(retries + 1):
+				if attempt:
+					await asyncio.sleep(min(2 ** (attempt - 1), 30))
+				if await self._post(batch) is not None:
+					return True  # sent, or rejected for good
+		except BaseException:
+			self._requeue(batch)  # cancelled by close(): the final flush gets another go at it
+			raise
+		self._requeue(batch)
+		return False
+
+	def _requeue(self, batch: list[bytes]) -> None:
+		"""Put a batch that could not be sent back at the front of the queue."""
+		self._queue.extendleft(reversed(batch))
+		self._queue_bytes += sum(len(line) for line in batch)
+
+	async def _post(self, batch: list[bytes]) -> bool | None:
+		"""Post one batch. Returns True if sent, False if the API rejected it, None if it should be retried."""
+		body = b'{"events":[' + b','.join(batch) + b']}'
+		headers = {'Content-Type': 'application/json', **self.get_headers()}
+		if len(body) >= self.gzip_min_bytes:
+			# Mostly base64 screenshots: compressing a few MB takes a while, keep it off the event loop
+			body = await asyncio.to_thread(gzip.compress, body, 6)
+			headers['Content-Encoding'] = 'gzip'
+
+		if self._client is None:
+			self._client = httpx.AsyncClient(timeout=self.timeout)
+		try:
+			response = await self._client.post(self.endpoint, content=body, headers=headers)
+		except httpx.TimeoutException:
+			logger.debug(f'Cloud sync upload of {len(batch)} events timed out after {self.timeout}s')
+			return None
+		except httpx.ConnectError:
+			return None
+		except httpx.HTTPError as e:
+			logger.debug(f'HTTP error uploading {len(batch)} cloud sync events: {type(e).__name__}: {e}')
+			return None
+
+		if response.status_code in RETRYABLE_STATUS_CODES:
+			logger.debug(f'Cloud sync upload failed, will retry: POST {response.request.url} {response.status_code}')
+			return None
+		if response.status_code >= 400:
+			# Log error but don't raise - we want to fail silently
+			logger.debug(f'Failed to send sync events: POST {response.request.url} {response.status_code} - {response.text}')
+			self.events_dropped += len(batch)
+			return False
+		self.events_sent += len(batch)
+		self.batches_sent += 1
+		return True
+
+	def _spill(self, line: bytes) -> bool:
+		if self.overflow != 'spill' or self._spill_size + len(line) + 1 > self.max_spill_bytes:
+			return False
+		try:
+			if self._spill_path is None:
+				fd, path = tempfile.mkstemp(prefix='browser-use-cloud-sync-', suffix='.jsonl')
+				os.close(fd)
+				self._spill_path = Path(path)
+			with self._spill_path.open('ab') as f:
+				f.write(line + b'\n')
+		except OSError as e:
+			logger.debug(f'Failed to spill cloud sync event to disk: {type(e).__name__}: {e}')
+			return False
+		self._spill_size += len(line) + 1
+		self.events_spilled += 1
+		return True
+
+	def _refill_from_spill(self) -> bool:
+		"""Move up to one queue's worth of spilled events back into memory, in order. Returns False if there are none."""
+		if not self._spill_size or self._spill_path is None:
+			return False
+		with self._spill_path.open('rb') as f:
+			f.seek(self._spill_offset)
+			while len(self._queue) < self.max_queue_events and self._queue_bytes < self.max_queue_bytes:
+				line = f.readline()
+				if not line:
+					break
+				self._spill_offset += len(line)
+				self._queue.append(line.rstrip(b'\n'))
+				self._queue_bytes += len(line) - 1
+		if self._spill_offset >= self._spill_size:
+			self._remove_spill_file()
+		return bool(self._queue)
+
+	def _count_spilled_lines(self) -> int:
+		if not self._spill_size or self._spill_path is None:
+			return 0
+		with self._spill_path.open('rb') as f:
+			f.seek(self._spill_offset)
+			return sum(1 for _ in f)
+
+	def _remove_spill_file(self) -> None:
+		if self._spill_path is not None:
+			self._spill_path.unlink(missing_ok=True)
+		self._spill_path = None
+		self._spill_offset = 0
+		self._spill_size = 0
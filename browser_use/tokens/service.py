@@ -273,10 +273,13 @@ class TokenCost:
 
 			if usage.prompt_cached_tokens:
 				cached_tokens_fmt = self._format_tokens(usage.prompt_cached_tokens)
+				cached_ratio = usage.prompt_cached_tokens / usage.prompt_tokens if usage.prompt_tokens else 0.0
 				if self.include_cost and cost and cost.prompt_read_cached_cost:
-					parts.append(f'💾 {C_BLUE}{cached_tokens_fmt} (${cost.prompt_read_cached_cost:.4f}){C_RESET}')
+					parts.append(
+						f'💾 {C_BLUE}{cached_tokens_fmt} {cached_ratio:.0%} (${cost.prompt_read_cached_cost:.4f}){C_RESET}'
+					)
 				else:
-					parts.append(f'💾 {C_BLUE}{cached_tokens_fmt}{C_RESET}')
+					parts.append(f'💾 {C_BLUE}{cached_tokens_fmt} {cached_ratio:.0%}{C_RESET}')
 
 			if usage.prompt_cache_creation_tokens:
 				creation_tokens_fmt = self._format_tokens(usage.prompt_cache_creation_tokens)
@@ -352,6 +355,10 @@ class TokenCost:
 			total_tokens=sum(u.usage.prompt_tokens + u.usage.completion_tokens for u in filtered_usage),
 		)
 
+	def get_prompt_cached_ratios(self, model: str | None = None) -> list[float]:
+		"""Share of prompt tokens read from the provider's prompt cache, per invocation (i.e. per agent step for the main LLM)"""
+		return [entry.prompt_cached_ratio for entry in self.usage_history if model is None or entry.model == model]
+
 	async def get_usage_summary(self, model: str | None = None, since: datetime | None = None) -> UsageSummary:
 		"""Get summary of token usage and costs (costs calculated on-the-fly)"""
 		filtered_usage = self.usage_history
@@ -394,6 +401,7 @@ class TokenCost:
 
 			stats = model_stats[entry.model]
 			stats.prompt_tokens += entry.usage.prompt_tokens
+			stats.prompt_cached_tokens += entry.usage.prompt_cached_tokens or 0
 			stats.completion_tokens += entry.usage.completion_tokens
 			stats.total_tokens += entry.usage.prompt_tokens + entry.usage.completion_tokens
 			stats.invocations += 1
@@ -411,12 +419,15 @@ class TokenCost:
 		for stats in model_stats.values():
 			if stats.invocations > 0:
 				stats.average_tokens_per_invocation = stats.total_tokens / stats.invocations
+			if stats.prompt_tokens > 0:
+				stats.prompt_cached_ratio = stats.prompt_cached_tokens / stats.prompt_tokens
 
 		return UsageSummary(
 			total_prompt_tokens=total_prompt,
 			total_prompt_cost=total_prompt_cost,
 			total_prompt_cached_tokens=total_prompt_cached,
 			total_prompt_cached_cost=total_prompt_cached_cost,
+			total_prompt_cached_ratio=total_prompt_cached / total_prompt if total_prompt else 0.0,
 			total_completion_tokens=total_completion,
 			total_completion_cost=total_completion_cost,
 			total_tokens=total_tokens,
@@ -515,10 +526,12 @@ class TokenCost:
 				prompt_part = f'{C_YELLOW}{model_prompt_fmt}{C_RESET}'
 				completion_part = f'{C_GREEN}{model_completion_fmt}{C_RESET}'
 
+			cached_part = f' | 💾 {C_BLUE}{stats.prompt_cached_ratio:.0%} cached{C_RESET}' if stats.prompt_cached_tokens else ''
+
 			cost_logger.debug(
 				f'  🤖 {C_CYAN}{model}{C_RESET}: {C_BLUE}{model_total_fmt} tokens{C_RESET}{cost_part} | '
 				f'⬅️ {prompt_part} | ➡️ {completion_part} | '
-				f'📞 {stats.invocations} calls | 📈 {avg_tokens_fmt}/call'
+				f'📞 {stats.invocations} calls | 📈 {avg_tokens_fmt}/call{cached_part}'
 			)
 
 	async def get_cost_by_model(self) -> dict[str, ModelUsageStats]:
@@ -15,6 +15,13 @@ class TokenUsageEntry(BaseModel):
 	timestamp: datetime
 	usage: ChatInvokeUsage
 
+	@property
+	def prompt_cached_ratio(self) -> float:
+		"""Share of the prompt tokens that were read from the provider's prompt cache"""
+		if not self.usage.prompt_tokens:
+			return 0.0
+		return (self.usage.prompt_cached_tokens or 0) / self.usage.prompt_tokens
+
 
 class TokenCostCalculated(BaseModel):
 	"""Token cost"""
@@ -73,11 +80,13 @@ class ModelUsageStats(BaseModel):
 
 	model: str
 	prompt_tokens: int = 0
+	prompt_cached_tokens: int = 0
 	completion_tokens: int = 0
 	total_tokens: int = 0
 	cost: float = 0.0
 	invocations: int = 0
 	average_tokens_per_invocation: float = 0.0
+	prompt_cached_ratio: float = 0.0
 
 
 class ModelUsageTokens(BaseModel):
@@ -98,6 +107,7 @@ class UsageSummary(BaseModel):
 
 	total_prompt_cached_tokens: int
 	total_prompt_cached_cost: float
+	total_prompt_cached_ratio: float = 0.0
 
 	total_completion_tokens: int
 	total_completion_cost: float
@@ -0,0 +1,128 @@
+"""
+Page markdown cache for extract_structured_data.
+
+Converting a page to markdown (html2text over the full outerHTML) is by far the most expensive part of an extraction,
+and paginating through a long page with start_from_char used to redo it for every window. Converted pages are kept
+in a small LRU keyed by (target, URL, DOM version, extract_links) together with an index of paragraph boundaries, so
+follow-up windows are plain slices.
+"""
+
+import asyncio
+import re
+from bisect import bisect_right
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any
+
+DEFAULT_MAX_CACHED_PAGES = 8
+DEFAULT_SECTION_CHARS = 200_000
+"""Size of the HTML sections fed to html2text between event loop yields"""
+
+_PARAGRAPH_BREAK_RE = re.compile(r'(?=\n\n)')
+_TAG_START_RE = re.compile(r'<[a-zA-Z/!]')
+
+MarkdownCacheKey = tuple[str, str, str, bool]
+"""(target_id, url, dom_version, extract_links)"""
+
+
+@dataclass
+class MarkdownDocument:
+	"""Converted page markdown plus an index of paragraph boundaries for windowed reads."""
+
+	content: str
+	stats: dict[str, Any]
+	paragraph_breaks: list[int] = field(default_factory=list)
+
+	def __post_init__(self):
+		if not self.paragraph_breaks:
+			self.paragraph_breaks = [match.start() for match in _PARAGRAPH_BREAK_RE.finditer(self.content)]
+
+	def window(self, start: int, max_chars: int) -> tuple[str, int | None]:
+		"""Return up to max_chars of content starting at `start`, cut at a natural break point.
+
+		Prefers the last paragraph break within the final 500 chars of the window, then the last sentence end within
+		the final 200 chars. Returns (text, next_start), next_start is None when the window reaches the end.
+		"""
+		if len(self.content) - start <= max_chars:
+			return self.content[start:], None
+
+		end = start + max_chars
+		truncate_at = max_chars
+
+		# Last paragraph break that fits entirely in the last 500 chars of the window (and doesn't start it)
+		i = bisect_right(self.paragraph_breaks, end - 2) - 1
+		if i >= 0 and self.paragraph_breaks[i] >= max(end - 500, start + 1):
+			truncate_at = self.paragraph_breaks[i] - start
+		else:
+			sentence_break = self.content.rfind('.', end - 200, end)
+			if sentence_break > start:
+				truncate_at = sentence_break + 1 - start
+
+		return self.content[start : start + truncate_at], start + truncate_at
+
+
+class MarkdownCache:
+	"""LRU of converted pages, keyed by (target_id, url, dom_version, extract_links)."""
+
+	def __init__(self, max_entries: int = DEFAULT_MAX_CACHED_PAGES):
+		self.max_entries = max_entries
+		self._documents: OrderedDict[MarkdownCacheKey, MarkdownDocument] = OrderedDict()
+		self.hits = 0
+		self.misses = 0
+
+	def get(self, key: MarkdownCacheKey) -> MarkdownDocument | None:
+		document = self._documents.get(key)
+		if document is None:
+			self.misses += 1
+			return None
+		self._documents.move_to_end(key)
+		self.hits += 1
+		return document
+
+	def put(self, key: MarkdownCacheKey, document: MarkdownDocument) -> None:
+		self._documents[key] = document
+		self._documents.move_to_end(key)
+		while len(self._documents) > self.max_entries:
+			self._documents.popitem(last=False)
+
+	def clear(self) -> None:
+		self._documents.clear()
+
+	def __len__(self) -> int:
+		return len(self._documents)
+
+
+async def html_to_markdown(html: str, extract_links: bool, section_chars: int = DEFAULT_SECTION_CHARS) -> str:
+	"""Convert HTML to markdown with html2text, feeding it section by section and yielding to the event loop in between.
+
+	html2text is a streaming HTMLParser, so feeding the document in pieces produces the same output as one
+	`handle()` call. Sections are cut right before a tag so text runs are never split.
+	"""
+	import html2text
+	from html2text.utils import pad_tables_in_text
+
+	h = html2text.HTML2Text()
+	h.ignore_links = not extract_links
+	h.ignore_images = True
+	h.ignore_emphasis = False
+	h.body_width = 0  # Don't wrap lines
+	h.unicode_snob = True
+	h.skip_internal_links = True
+
+	if len(html) <= section_chars:
+		return h.handle(html)
+
+	# Same as HTML2Text.handle(), just with the feed() split up
+	h.start = True
+	position = 0
+	while position < len(html):
+		end = position + section_chars
+		if end < len(html):
+			tag_start = _TAG_START_RE.search(html, end)
+			end = tag_start.start() if tag_start else len(html)
+		h.feed(html[position:end])
+		position = end
+		await asyncio.sleep(0)
+	h.feed('')
+	markdown = h.optwrap(h.finish())
+	return pad_tables_in_text(markdown) if h.pad_tables else markdown
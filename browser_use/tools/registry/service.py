@@ -36,6 +36,9 @@ class Registry(Generic[Context]):
 		self.registry = ActionRegistry()
 		self.telemetry = ProductTelemetry()
 		self.exclude_actions = exclude_actions if exclude_actions is not None else []
+		self._action_model_cache: dict[tuple, type[ActionModel]] = {}
+		# CDP round-trips the last execute_action() answered from the browser session's target cache instead
+		self.last_action_round_trips_saved = 0
 
 	def _get_special_param_types(self) -> dict[str, type | UnionType | None]:
 		"""Get the expected types for special parameters from SpecialActionParameters"""
@@ -330,10 +333,17 @@ class Registry(Generic[Context]):
 			except Exception as e:
 				raise ValueError(f'Invalid parameters {params} for action {action_name}: {type(e)}: {e}') from e
 
+			# Current page info kept up to date from CDP target events, saves a Target.getTargets round-trip per lookup
+			self.last_action_round_trips_saved = 0
+			current_target_info = browser_session.get_cached_current_target_info() if browser_session else None
+
 			if sensitive_data:
 				# Get current URL if browser_session is provided
 				current_url = None
-				if browser_session and browser_session.current_target_id:
+				if current_target_info is not None:
+					current_url = current_target_info.get('url')
+					self.last_action_round_trips_saved += 1
+				elif browser_session and browser_session.current_target_id:
 					try:
 						# Get current page info using CDP
 						targets = await browser_session.cdp_client.send.Target.getTargets()
@@ -361,10 +371,14 @@ class Registry(Generic[Context]):
 			# Add CDP-related parameters if browser_session is available
 			if browser_session:
 				# Add page_url
-				try:
-					special_context['page_url'] = await browser_session.get_current_page_url()
-				except Exception:
-					special_context['page_url'] = None
+				if current_target_info is not None:
+					special_context['page_url'] = current_target_info.get('url', '')
+					self.last_action_round_trips_saved += 1
+				else:
+					try:
+						special_context['page_url'] = await browser_session.get_current_page_url()
+					except Exception:
+						special_context['page_url'] = None
 
 				# Add cdp_client
 				special_context['cdp_client'] = browser_session.cdp_client
@@ -482,8 +496,6 @@ class Registry(Generic[Context]):
 		Each action model contains only the specific action being used,
 		rather than all actions with most set to None.
 		"""
-		from typing import Union
-
 		# Filter actions based on page_url if provided:
 		#   if page_url is None, only include actions with no filters
 		#   if page_url is provided, only include actions that match the URL
@@ -506,6 +518,21 @@ class Registry(Generic[Context]):
 			if domain_is_allowed:
 				available_actions[name] = action
 
+		# Reuse the model built for the same set of actions, e.g. on every step on pages of the same site.
+		# Keeping the class identical also lets the LLM clients reuse the optimized JSON schema generated from it.
+		cache_key = tuple((name, action.param_model, action.description) for name, action in available_actions.items())
+		cached_model = self._action_model_cache.get(cache_key)
+		if cached_model is not None:
+			return cached_model
+
+		result_model = self._build_action_model(available_actions)
+		self._action_model_cache[cache_key] = result_model
+		return result_model
+
+	def _build_action_model(self, available_actions: dict[str, RegisteredAction]) -> type[ActionModel]:
+		"""Build the Union of individual action models for the given actions"""
+		from typing import Union
+
 		# Create individual action models for each action
 		individual_action_models: list[type[BaseModel]] = []
 
@@ -92,13 +92,10 @@ class ActionRegistry(BaseModel):
 		if domains is None or not url:
 			return True
 
-		# Use the centralized URL matching logic from utils
-		from browser_use.utils import match_url_with_domain_pattern
+		# Same semantics as utils.match_url_with_domain_pattern, compiled once per list of patterns
+		from browser_use.domain_matcher import get_domain_matcher
 
-		for domain_pattern in domains:
-			if match_url_with_domain_pattern(url, domain_pattern):
-				return True
-		return False
+		return get_domain_matcher(tuple(domains)).match(url)
 
 	def get_prompt_description(self, page_url: str | None = None) -> str:
 		"""Get a description of all actions for the prompt
@@ -32,6 +32,7 @@ from browser_use.filesystem.file_system import FileSystem
 from browser_use.llm.base import BaseChatModel
 from browser_use.llm.messages import SystemMessage, UserMessage
 from browser_use.observability import observe_debug
+from browser_use.tools.markdown_cache import MarkdownCache, MarkdownDocument, html_to_markdown
 from browser_use.tools.registry.service import Registry
 from browser_use.tools.views import (
 	ClickElementAction,
@@ -105,9 +106,18 @@ class Tools(Generic[Context]):
 		exclude_actions: list[str] = [],
 		output_model: type[T] | None = None,
 		display_files_in_done_text: bool = True,
+		parallel_extraction: bool = False,
+		extraction_concurrency: int = 4,
+		max_extraction_chunks: int = 10,
 	):
 		self.registry = Registry[Context](exclude_actions)
 		self.display_files_in_done_text = display_files_in_done_text
+		# Map-reduce extraction: read all windows of a long page concurrently in one action instead of paginating
+		self.parallel_extraction = parallel_extraction
+		self.extraction_concurrency = max(1, extraction_concurrency)
+		self.max_extraction_chunks = max(1, max_extraction_chunks)
+		# Converted page markdown, so paginating with start_from_char doesn't reconvert the page
+		self.markdown_cache = MarkdownCache()
 
 		"""Register all default browser actions"""
 
@@ -581,43 +591,29 @@ If this tool does not return the desired outcome, do not call it again, use scro
 			# Constants
 			MAX_CHAR_LIMIT = 30000
 
-			# Extract clean markdown using the new method
+			# Extract clean markdown (cached per page, so follow-up windows don't reconvert it)
 			try:
-				content, content_stats = await self.extract_clean_markdown(browser_session, extract_links)
+				document = await self._get_markdown_document(browser_session, extract_links)
 			except Exception as e:
 				raise RuntimeError(f'Could not extract clean markdown: {type(e).__name__}')
+			content_stats = dict(document.stats)
 
 			# Original content length for processing
 			final_filtered_length = content_stats['final_filtered_chars']
 
 			if start_from_char > 0:
-				if start_from_char >= len(content):
+				if start_from_char >= len(document.content):
 					return ActionResult(
-						error=f'start_from_char ({start_from_char}) exceeds content length ({len(content)}). Content has {final_filtered_length} characters after filtering.'
+						error=f'start_from_char ({start_from_char}) exceeds content length ({len(document.content)}). Content has {final_filtered_length} characters after filtering.'
 					)
-				content = content[start_from_char:]
 				content_stats['started_from_char'] = start_from_char
 
-			# Smart truncation with context preservation
-			truncated = False
-			if len(content) > MAX_CHAR_LIMIT:
-				# Try to truncate at a natural break point (paragraph, sentence)
-				truncate_at = MAX_CHAR_LIMIT
-
-				# Look for paragraph break within last 500 chars of limit
-				paragraph_break = content.rfind('\n\n', MAX_CHAR_LIMIT - 500, MAX_CHAR_LIMIT)
-				if paragraph_break > 0:
-					truncate_at = paragraph_break
-				else:
-					# Look for sentence break within last 200 chars of limit
-					sentence_break = content.rfind('.', MAX_CHAR_LIMIT - 200, MAX_CHAR_LIMIT)
-					if sentence_break > 0:
-						truncate_at = sentence_break + 1
-
-				content = content[:truncate_at]
-				truncated = True
-				next_start = (start_from_char or 0) + truncate_at
-				content_stats['truncated_at_char'] = truncate_at
+			# Smart truncation with context preservation (at a paragraph or sentence break near the limit)
+			window_start = max(start_from_char, 0)
+			content, next_start = document.window(window_start, MAX_CHAR_LIMIT)
+			truncated = next_start is not None
+			if next_start is not None:
+				content_stats['truncated_at_char'] = next_start - window_start
 				content_stats['next_start_char'] = next_start
 
 			# Add content statistics to the result
@@ -626,6 +622,7 @@ If this tool does not return the desired outcome, do not call it again, use scro
 			chars_filtered = content_stats['filtered_chars_removed']
 
 			stats_summary = f"""Content processed: {original_html_length:,} HTML chars → {initial_markdown_length:,} initial markdown → {final_filtered_length:,} filtered markdown"""
+			base_stats_summary = stats_summary
 			if start_from_char > 0:
 				stats_summary += f' (started from char {start_from_char:,})'
 			if truncated:
@@ -657,15 +654,19 @@ You will be given a query and the markdown of a webpage that has been filtered t
 			prompt = f'<query>\n{query}\n</query>\n\n<content_stats>\n{stats_summary}\n</content_stats>\n\n<webpage_content>\n{content}\n</webpage_content>'
 
 			try:
-				response = await asyncio.wait_for(
-					page_extraction_llm.ainvoke([SystemMessage(content=system_prompt), UserMessage(content=prompt)]),
-					timeout=120.0,
-				)
+				if self.parallel_extraction and truncated:
+					completion = await self._extract_map_reduce(
+						query, document, window_start, MAX_CHAR_LIMIT, system_prompt, base_stats_summary, page_extraction_llm
+					)
+				else:
+					response = await asyncio.wait_for(
+						page_extraction_llm.ainvoke([SystemMessage(content=system_prompt), UserMessage(content=prompt)]),
+						timeout=120.0,
+					)
+					completion = response.completion
 
 				current_url = await browser_session.get_current_page_url()
-				extracted_content = (
-					f'<url>\n{current_url}\n</url>\n<query>\n{query}\n</query>\n<result>\n{response.completion}\n</result>'
-				)
+				extracted_content = f'<url>\n{current_url}\n</url>\n<query>\n{query}\n</query>\n<result>\n{completion}\n</result>'
 
 				# Simple memory handling
 				MAX_MEMORY_LENGTH = 1000
@@ -1093,6 +1094,95 @@ SHADOW DOM ACCESS EXAMPLE:
 				logger.info(error_msg)
 				return ActionResult(error=error_msg)
 
+	async def _extract_map_reduce(
+		self,
+		query: str,
+		document: MarkdownDocument,
+		start: int,
+		max_chars: int,
+		system_prompt: str,
+		stats_summary: str,
+		page_extraction_llm: BaseChatModel,
+	) -> str:
+		"""Run the extraction on consecutive windows of the page concurrently, then merge the partial results."""
+		chunks: list[tuple[int, str]] = []
+		next_start: int | None = start
+		while next_start is not None and len(chunks) < self.max_extraction_chunks:
+			chunk_start = next_start
+			chunk, next_start = document.window(chunk_start, max_chars)
+			chunks.append((chunk_start, chunk))
+
+		semaphore = asyncio.Semaphore(self.extraction_concurrency)
+
+		async def extract_chunk(part: int, chunk_start: int, chunk: str) -> str:
+			chunk_stats = (
+				f'{stats_summary} → part {part}/{len(chunks)} of the page: chars {chunk_start:,}-{chunk_start + len(chunk):,}'
+			)
+			prompt = f'<query>\n{query}\n</query>\n\n<content_stats>\n{chunk_stats}\n</content_stats>\n\n<webpage_content>\n{chunk}\n</webpage_content>'
+			async with semaphore:
+				response = await asyncio.wait_for(
+					page_extraction_llm.ainvoke([SystemMessage(content=system_prompt), UserMessage(content=prompt)]),
+					timeout=120.0,
+				)
+			return response.completion
+
+		logger.debug(
+			f'📄 Extracting from {len(chunks)} parts of the page concurrently (max {self.extraction_concurrency} at a time)'
+		)
+		results = await asyncio.gather(
+			*(extract_chunk(part, chunk_start, chunk) for part, (chunk_start, chunk) in enumerate(chunks, start=1)),
+			return_exceptions=True,
+		)
+
+		partial_results: list[str] = []
+		failed_parts: list[str] = []
+		for part, ((chunk_start, chunk), result) in enumerate(zip(chunks, results), start=1):
+			if isinstance(result, BaseException):
+				logger.debug(f'Error extracting part {part}/{len(chunks)}: {type(result).__name__}: {result}')
+				failed_parts.append(f'part {part} (chars {chunk_start:,}-{chunk_start + len(chunk):,})')
+			else:
+				partial_results.append(f'<part index="{part}">\n{result}\n</part>')
+		if not partial_results:
+			first_error = results[0]
+			raise first_error if isinstance(first_error, BaseException) else RuntimeError('Extraction failed')
+		if len(chunks) == 1:
+			return str(results[0])
+
+		reduce_stats = f'{stats_summary} → read in {len(chunks)} parts'
+		if failed_parts:
+			reduce_stats += f' ({", ".join(failed_parts)} could not be processed)'
+		if next_start is not None:
+			reduce_stats += f' (page continues, use start_from_char={next_start} to extract the rest)'
+
+		reduce_system_prompt = """
+You are an expert at merging data extracted from a webpage.
+
+<input>
+You will be given a query and the partial results of extracting it from consecutive parts of the same webpage, in page order.
+</input>
+
+<instructions>
+- Merge the partial results into a single answer to the query.
+- Keep ALL relevant information from every part, remove duplicates (e.g. items repeated at part boundaries) and drop "not found" notes of parts that had nothing relevant.
+- ONLY use the information in the partial results. Do not make up information or provide guesses from your own knowledge.
+- If none of the parts contained information relevant to the query, say so.
+- If some parts could not be processed or the page continues, mention it.
+</instructions>
+
+<output>
+- Present ALL the information relevant to the query in a concise way.
+- Do not answer in conversational format - directly output the relevant information or that the information is unavailable.
+</output>
+""".strip()
+
+		partials = '\n'.join(partial_results)
+		prompt = f'<query>\n{query}\n</query>\n\n<content_stats>\n{reduce_stats}\n</content_stats>\n\n<partial_results>\n{partials}\n</partial_results>'
+		response = await asyncio.wait_for(
+			page_extraction_llm.ainvoke([SystemMessage(content=reduce_system_prompt), UserMessage(content=prompt)]),
+			timeout=120.0,
+		)
+		return response.completion
+
 	# Custom done action for structured output
 	@observe_debug(ignore_input=True, ignore_output=True, name='extract_clean_markdown')
 	async def extract_clean_markdown(
@@ -1107,6 +1197,12 @@ SHADOW DOM ACCESS EXAMPLE:
 		Returns:
 			tuple: (clean_markdown_content, content_statistics)
 		"""
+		document = await self._get_markdown_document(browser_session, extract_links)
+		return document.content, dict(document.stats)
+
+	async def _get_markdown_document(self, browser_session: BrowserSession, extract_links: bool = False) -> MarkdownDocument:
+		"""Clean markdown of the current page, converted once per (target, URL, DOM version, extract_links)."""
+		import hashlib
 		import re
 
 		# Get HTML content from current page
@@ -1121,19 +1217,18 @@ SHADOW DOM ACCESS EXAMPLE:
 		except Exception as e:
 			raise RuntimeError(f"Couldn't extract page content: {e}")
 
-		original_html_length = len(page_html)
+		# The serialized DOM itself is the DOM version: hashing it is cheap next to converting it
+		dom_version = hashlib.blake2b(page_html.encode(errors='surrogatepass'), digest_size=16).hexdigest()
+		cache_key = (cdp_session.target_id, current_url, dom_version, extract_links)
+		document = self.markdown_cache.get(cache_key)
+		if document is not None:
+			logger.debug(f'📄 Reusing converted markdown of {current_url} ({len(document.content):,} chars)')
+			return document
 
-		# Use html2text for clean markdown conversion
-		import html2text
+		original_html_length = len(page_html)
 
-		h = html2text.HTML2Text()
-		h.ignore_links = not extract_links
-		h.ignore_images = True
-		h.ignore_emphasis = False
-		h.body_width = 0  # Don't wrap lines
-		h.unicode_snob = True
-		h.skip_internal_links = True
-		content = h.handle(page_html)
+		# Use html2text for clean markdown conversion, section by section so large pages don't block the event loop
+		content = await html_to_markdown(page_html, extract_links)
 
 		initial_markdown_length = len(content)
 
@@ -1154,7 +1249,9 @@ SHADOW DOM ACCESS EXAMPLE:
 			'final_filtered_chars': final_filtered_length,
 		}
 
-		return content, stats
+		document = MarkdownDocument(content=content, stats=stats)
+		self.markdown_cache.put(cache_key, document)
+		return document
 
 	def _preprocess_markdown_content(self, content: str, max_newlines: int = 3) -> tuple[str, int]:
 		"""
@@ -1332,6 +1429,11 @@ SHADOW DOM ACCESS EXAMPLE:
 					if Laminar is not None:
 						Laminar.set_span_output(result)
 
+				if self.registry.last_action_round_trips_saved:
+					logger.debug(
+						f'{action_name}: {self.registry.last_action_round_trips_saved} page info lookups answered from the target cache'
+					)
+
 				if isinstance(result, str):
 					return ActionResult(extracted_content=result)
 				elif isinstance(result, ActionResult):
@@ -1,4 +1,5 @@
 import asyncio
+import base64
 import logging
 import os
 import platform
@@ -10,7 +11,7 @@ from fnmatch import fnmatch
 from functools import cache, wraps
 from pathlib import Path
 from sys import stderr
-from typing import Any, ParamSpec, TypeVar
+from typing import Any, Literal, ParamSpec, TypeVar
 from urllib.parse import urlparse
 
 import httpx
@@ -432,6 +433,27 @@ def is_new_tab_page(url: str) -> bool:
 	return url in ('about:blank', 'chrome://new-tab-page/', 'chrome://new-tab-page', 'chrome://newtab/', 'chrome://newtab')
 
 
+def get_base64_image_media_type(image_b64: str) -> Literal['image/png', 'image/jpeg', 'image/webp']:
+	"""
+	Detect the media type of a base64 encoded screenshot from its magic bytes.
+
+	Args:
+		image_b64: The base64 encoded image
+
+	Returns:
+		str: 'image/jpeg' or 'image/webp' if the data starts with their signature, 'image/png' otherwise
+	"""
+	try:
+		header = base64.b64decode(image_b64[:16])
+	except ValueError:
+		return 'image/png'
+	if header.startswith(b'\xff\xd8\xff'):
+		return 'image/jpeg'
+	if header.startswith(b'RIFF') and header[8:12] == b'WEBP':
+		return 'image/webp'
+	return 'image/png'
+
+
 def match_url_with_domain_pattern(url: str, domain_pattern: str, log_warnings: bool = False) -> bool:
 	"""
 	Check if a URL matches a domain pattern. SECURITY CRITICAL.
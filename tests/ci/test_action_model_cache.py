@@ -0,0 +1,68 @@
+"""
+Tests for reusing generated action models and optimized JSON schemas across agent steps.
+"""
+
+from browser_use.agent.views import AgentOutput
+from browser_use.llm.schema import SchemaOptimizer
+from browser_use.tools.service import Tools
+
+
+def _tools_with_domain_actions() -> Tools:
+	tools = Tools()
+
+	@tools.registry.action('Open the shopping cart', domains=['*.shop.com'])
+	async def open_cart():
+		pass
+
+	@tools.registry.action('Star the repository', domains=['github.com'])
+	async def star_repository():
+		pass
+
+	return tools
+
+
+def test_same_action_set_reuses_the_same_model():
+	tools = _tools_with_domain_actions()
+	registry = tools.registry
+
+	shop_model = registry.create_action_model(page_url='https://www.shop.com/cart')
+	assert registry.create_action_model(page_url='https://eu.shop.com/item/42') is shop_model
+	assert registry.create_action_model(page_url='https://github.com/org/repo') is not shop_model
+	assert registry.create_action_model(page_url='https://example.com') is registry.create_action_model()
+	assert registry.create_action_model(page_url='https://example.com') is not shop_model
+
+	# done-only models are shared between pages too
+	assert registry.create_action_model(
+		include_actions=['done'], page_url='https://www.shop.com'
+	) is registry.create_action_model(include_actions=['done'], page_url='https://github.com')
+
+
+def test_cached_model_matches_a_freshly_built_one():
+	tools = _tools_with_domain_actions()
+	cached = tools.registry.create_action_model(page_url='https://www.shop.com/cart')
+
+	fresh = tools.registry._build_action_model(
+		{
+			name: action
+			for name, action in tools.registry.registry.actions.items()
+			if tools.registry.registry._match_domains(action.domains, 'https://www.shop.com/cart')
+		}
+	)
+
+	assert cached.model_json_schema() == fresh.model_json_schema()
+	assert 'open_cart' in str(cached.model_json_schema()) and 'star_repository' not in str(cached.model_json_schema())
+
+
+def test_optimized_schema_is_cached_per_model_and_returned_as_a_copy():
+	tools = _tools_with_domain_actions()
+	agent_output = AgentOutput.type_with_custom_actions(tools.registry.create_action_model())
+
+	first = SchemaOptimizer.create_optimized_json_schema(agent_output)
+	expected = SchemaOptimizer._build_optimized_json_schema(agent_output)
+	assert first == expected
+
+	# Callers like the Anthropic and DeepSeek clients strip keys from the schema they get
+	first.pop('title', None)
+	first['properties']['action']['items'].clear()
+
+	assert SchemaOptimizer.create_optimized_json_schema(agent_output) == expected
@@ -0,0 +1,95 @@
+"""
+Tests for BrowserPool: pre-launched local browsers handed out to new sessions and replaced after use.
+
+Chrome is replaced by a tiny executable that answers /json/version on its --remote-debugging-port, so the tests only
+exercise the process and profile lifecycle.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+from browser_use.browser import BrowserPool, BrowserProfile, BrowserSession
+from browser_use.browser.events import BrowserKillEvent, BrowserLaunchEvent
+from browser_use.browser.watchdogs.local_browser_watchdog import LocalBrowserWatchdog
+
+FAKE_BROWSER = f"""#!{sys.executable}
+import http.server, sys
+port = int(next(arg for arg in sys.argv if arg.startswith('--remote-debugging-port=')).split('=')[1])
+
+class Handler(http.server.BaseHTTPRequestHandler):
+	def do_GET(self):
+		self.send_response(200)
+		self.end_headers()
+		self.wfile.write(b'{{}}')
+
+	def log_message(self, *args):
+		pass
+
+http.server.HTTPServer(('127.0.0.1', port), Handler).serve_forever()
+"""
+
+
+@pytest.fixture
+def profile(tmp_path) -> BrowserProfile:
+	executable = tmp_path / 'fake-chrome'
+	executable.write_text(FAKE_BROWSER)
+	executable.chmod(0o755)
+	return BrowserProfile(executable_path=executable, headless=True, enable_default_extensions=False)
+
+
+async def test_sessions_get_pre_launched_browsers_that_are_replaced_after_use(profile):
+	async with BrowserPool(size=2, browser_profile=profile) as pool:
+		assert pool.idle_count == 2 and pool.stats.launches == 2
+
+		browser = await pool.acquire(profile.model_copy(update={'user_data_dir': None}))
+		assert browser is not None and browser.is_alive() and browser.user_data_dir.exists()
+		assert pool.stats.hits == 1
+
+		await pool.release(browser)
+		assert not browser.is_alive() and not browser.user_data_dir.exists()
+		await asyncio.wait(pool._launching)
+		assert pool.idle_count == 2 and pool.stats.launches == 3
+		idle = list(pool._idle)
+
+	assert pool.idle_count == 0
+	assert not any(browser.is_alive() or browser.user_data_dir.exists() for browser in idle)
+
+
+async def test_incompatible_sessions_and_empty_pool_fall_back_to_a_cold_launch(profile, tmp_path):
+	pool = BrowserPool(size=1, browser_profile=profile)
+	assert await pool.acquire(profile) is None  # not started yet: a miss, which starts filling the pool
+	assert pool.stats.misses == 1
+
+	assert await pool.acquire(profile.model_copy(update={'headless': False})) is None
+	assert await pool.acquire(profile.model_copy(update={'user_data_dir': tmp_path / 'my-profile'})) is None
+	assert pool.stats.incompatible == 2
+
+	await asyncio.wait(pool._launching)
+	browser = await pool.acquire(profile)
+	assert browser is not None and pool.stats.hit_rate == 0.5
+	await pool.release(browser)
+	await pool.close()
+
+
+async def test_local_browser_watchdog_uses_and_returns_pooled_browsers(profile):
+	pool = BrowserPool(size=1, browser_profile=profile)
+	await pool.start()
+	pooled = pool._idle[0]
+
+	session = BrowserSession(browser_profile=profile, browser_pool=pool)
+	original_user_data_dir = str(session.browser_profile.user_data_dir)
+	watchdog = LocalBrowserWatchdog(event_bus=session.event_bus, browser_session=session)
+
+	result = await watchdog.on_BrowserLaunchEvent(BrowserLaunchEvent())
+	assert result.cdp_url == pooled.cdp_url
+	assert watchdog.browser_pid == pooled.process.pid
+	assert Path(session.browser_profile.user_data_dir) == pooled.user_data_dir  # type: ignore[arg-type]
+	assert len(pool.stats.session_start_seconds) == 1
+
+	await watchdog.on_BrowserKillEvent(BrowserKillEvent())
+	assert not pooled.is_alive() and watchdog.browser_pid is None
+	assert str(session.browser_profile.user_data_dir) == original_user_data_dir
+	await pool.close()
@@ -0,0 +1,154 @@
+"""
+Tests for flat CDP sessions and the limits of BrowserSession._cdp_session_pool.
+
+CDPSession.for_target and the root CDP client are faked, no browser needed.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from browser_use.browser import BrowserSession
+from browser_use.browser.session import CDP_SESSION_EVICTION_GRACE_PERIOD, CDPSession
+from browser_use.dom.service import DomService
+from browser_use.dom.views import DOMRect
+
+
+class FakeSession:
+	def __init__(self, target_id: str, owns_cdp_client: bool):
+		self.target_id = target_id
+		self.session_id = f'session-{target_id}'
+		self.owns_cdp_client = owns_cdp_client
+		self.disconnected = False
+
+	async def disconnect(self):
+		self.disconnected = True
+
+
+@pytest.fixture
+def created(monkeypatch):
+	created: list[tuple[str, bool]] = []
+
+	async def for_target(cls, cdp_client, target_id, new_socket=False, cdp_url=None, domains=None):
+		created.append((target_id, new_socket))
+		return FakeSession(target_id, owns_cdp_client=new_socket)
+
+	monkeypatch.setattr(CDPSession, 'for_target', classmethod(for_target))
+	return created
+
+
+@pytest.fixture
+def clock(monkeypatch):
+	clock = [1000.0]
+	monkeypatch.setattr('browser_use.browser.session.time.monotonic', lambda: clock[0])
+	return clock
+
+
+def _browser_session(**profile_kwargs) -> tuple[BrowserSession, list[str]]:
+	browser_session = BrowserSession(cdp_url='ws://127.0.0.1:9222/devtools/browser/fake', **profile_kwargs)
+	detached: list[str] = []
+
+	async def detach_from_target(params):
+		detached.append(params['sessionId'])
+
+	browser_session._cdp_client_root = SimpleNamespace(  # type: ignore[assignment]
+		send=SimpleNamespace(Target=SimpleNamespace(detachFromTarget=detach_from_target))
+	)
+	browser_session.agent_focus = CDPSession.model_construct(target_id='focus', session_id='session-focus')
+	return browser_session, detached
+
+
+async def test_new_targets_share_the_root_socket_in_flat_mode(created):
+	browser_session, _ = _browser_session()
+	await browser_session.get_or_create_cdp_session('tab-1', focus=False)
+
+	flat_session, _ = _browser_session(cdp_flat_sessions=True)
+	await flat_session.get_or_create_cdp_session('tab-1', focus=False)
+	await flat_session.get_or_create_cdp_session('tab-2', focus=False, new_socket=True)  # explicit request still honored
+
+	assert created == [('tab-1', True), ('tab-1', False), ('tab-2', True)]
+
+
+async def test_least_recently_used_sessions_are_evicted_over_the_limit(created, clock):
+	browser_session, detached = _browser_session(cdp_flat_sessions=True, cdp_session_pool_limit=2)
+
+	first = await browser_session.get_or_create_cdp_session('tab-1', focus=False)
+	clock[0] += 10
+	await browser_session.get_or_create_cdp_session('tab-2', focus=False)
+	clock[0] += 10
+	await browser_session.get_or_create_cdp_session('tab-1', focus=False)  # tab-2 is now the least recently used
+	clock[0] += 10
+	await browser_session.get_or_create_cdp_session('tab-3', focus=False)
+
+	assert set(browser_session._cdp_session_pool) == {'tab-1', 'tab-3'}
+	assert detached == ['session-tab-2']
+	assert browser_session._cdp_session_pool['tab-1'] is first
+
+	# evicted targets are transparently re-attached
+	await browser_session.get_or_create_cdp_session('tab-2', focus=False)
+	assert [target_id for target_id, _ in created] == ['tab-1', 'tab-2', 'tab-3', 'tab-2']
+
+
+async def test_idle_sessions_are_closed_but_focus_is_kept(created, clock):
+	browser_session, detached = _browser_session(cdp_session_idle_timeout=60)
+
+	await browser_session.get_or_create_cdp_session('focus', focus=False)
+	idle = await browser_session.get_or_create_cdp_session('tab-1', focus=False)
+	clock[0] += 120
+	await browser_session.get_or_create_cdp_session('tab-2', focus=False)
+
+	assert set(browser_session._cdp_session_pool) == {'focus', 'tab-2'}
+	assert idle.disconnected and detached == []  # dedicated sockets are closed instead of detached
+
+
+async def test_sessions_in_use_are_not_evicted(created, clock):
+	browser_session, detached = _browser_session(cdp_flat_sessions=True, cdp_session_pool_limit=1)
+
+	# Used moments ago: the pool goes over its limit rather than closing a session a caller may still be using
+	await browser_session.get_or_create_cdp_session('tab-1', focus=False)
+	await browser_session.get_or_create_cdp_session('tab-2', focus=False)
+	assert set(browser_session._cdp_session_pool) == {'tab-1', 'tab-2'}
+
+	# Leased targets are kept however long ago they were used, until the lease is released
+	clock[0] += CDP_SESSION_EVICTION_GRACE_PERIOD + 1
+	with browser_session.lease_cdp_sessions(['tab-1']):
+		await browser_session.get_or_create_cdp_session('tab-3', focus=False)
+	assert set(browser_session._cdp_session_pool) == {'tab-1', 'tab-3'}
+	assert detached == ['session-tab-2'] and browser_session._cdp_session_leases == {}
+
+	clock[0] += CDP_SESSION_EVICTION_GRACE_PERIOD + 1
+	await browser_session.get_or_create_cdp_session('tab-4', focus=False)
+	assert set(browser_session._cdp_session_pool) == {'tab-4'}
+
+
+async def test_concurrent_iframe_fetches_keep_their_sessions_over_the_pool_limit(created, clock):
+	browser_session, detached = _browser_session(cdp_flat_sessions=True, cdp_session_pool_limit=1)
+	dom_service = DomService(browser_session, cross_origin_iframes=True, max_concurrent_iframe_fetches=2)
+	iframe_targets = [f'iframe-{i}' for i in range(4)]
+	lost_sessions: list[str] = []
+
+	async def get_cross_origin_iframe_targets(iframe_nodes):
+		return iframe_targets
+
+	async def get_dom_tree(target_id, initial_total_frame_offset=None, iframe_depth=0, **kwargs):
+		async with dom_service._iframe_fetch_semaphore:
+			session = await browser_session.get_or_create_cdp_session(target_id, focus=False)
+			clock[0] += CDP_SESSION_EVICTION_GRACE_PERIOD + 1  # slow iframe, well past the grace period
+			await asyncio.sleep(0)
+			if session.session_id in detached:
+				lost_sessions.append(target_id)
+		return SimpleNamespace(parent_node=None)
+
+	dom_service._get_cross_origin_iframe_targets = get_cross_origin_iframe_targets  # type: ignore[method-assign]
+	dom_service.get_dom_tree = get_dom_tree  # type: ignore[method-assign]
+	iframes = [SimpleNamespace(frame_id=target_id, content_document=None) for target_id in iframe_targets]
+
+	await dom_service._attach_cross_origin_iframe_trees(
+		[(iframe, DOMRect(x=0.0, y=0.0, width=0.0, height=0.0)) for iframe in iframes],  # type: ignore[misc]
+		iframe_depth=0,
+	)
+
+	assert lost_sessions == [] and detached == []
+	assert all(iframe.content_document is not None for iframe in iframes)
+	assert set(browser_session._cdp_session_pool) == set(iframe_targets)  # trimmed again by the next session created
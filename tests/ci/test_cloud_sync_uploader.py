@@ -0,0 +1,126 @@
+"""
+Tests for the background, batched cloud sync uploader against a local stub HTTP server.
+"""
+
+import asyncio
+import gzip
+import json
+import time
+
+from pytest_httpserver import HTTPServer
+from werkzeug.wrappers import Request, Response
+
+from browser_use.agent.cloud_events import CreateAgentTaskEvent
+from browser_use.sync.auth import DeviceAuthClient
+from browser_use.sync.service import CloudSync
+from browser_use.sync.uploader import EventUploader
+
+
+def capture_batches(httpserver: HTTPServer, status: int = 200, delay: float = 0.0) -> list[dict]:
+	"""Stub /api/v1/events, recording each batch's headers and (decompressed) events."""
+	batches = []
+
+	def handler(request: Request) -> Response:
+		time.sleep(delay)
+		body = request.get_data()
+		if request.headers.get('Content-Encoding') == 'gzip':
+			body = gzip.decompress(body)
+		batches.append({'headers': dict(request.headers), 'events': json.loads(body)['events']})
+		return Response('{"processed": 1, "failed": 0}', status=status, mimetype='application/json')
+
+	httpserver.expect_request('/api/v1/events', method='POST').respond_with_handler(handler)
+	return batches
+
+
+async def test_events_are_uploaded_in_order_in_size_and_time_bounded_batches(httpserver: HTTPServer):
+	batches = capture_batches(httpserver)
+	token = {'Authorization': 'Bearer old'}
+	uploader = EventUploader(
+		httpserver.url_for('/api/v1/events'), get_headers=lambda: token, max_batch_events=50, flush_interval=0.1
+	)
+
+	for i in range(120):
+		uploader.enqueue({'event_type': 'Test', 'i': i})
+	token = {'Authorization': 'Bearer new'}  # headers are read when a batch is sent
+	await uploader.flush()
+	assert [len(batch['events']) for batch in batches] == [50, 50, 20]
+	assert [event['i'] for batch in batches for event in batch['events']] == list(range(120))
+	assert all(batch['headers']['Authorization'] == 'Bearer new' for batch in batches)
+	client = uploader._client
+
+	# Without a flush, the background task sends a partial batch after flush_interval, over the same connection pool
+	uploader.enqueue({'event_type': 'Test', 'i': 120})
+	uploader.enqueue({'event_type': 'Test', 'i': 121})
+	await asyncio.sleep(0.5)
+	assert [event['i'] for event in batches[-1]['events']] == [120, 121]
+	assert uploader._client is client and uploader.batches_sent == 4
+
+	# Large bodies (screenshots) are gzipped
+	uploader.enqueue({'event_type': 'Test', 'screenshot_url': 'data:image/png;base64,' + 'A' * 100_000})
+	await uploader.flush()
+	assert batches[-1]['headers']['Content-Encoding'] == 'gzip'
+	assert len(batches[-1]['events'][0]['screenshot_url']) > 100_000
+
+	await uploader.close()
+	assert uploader.events_sent == 123 and uploader.events_dropped == 0
+
+
+async def test_overflow_spills_to_disk_or_drops(httpserver: HTTPServer):
+	batches = capture_batches(httpserver)
+	uploader = EventUploader(httpserver.url_for('/api/v1/events'), max_queue_events=5, max_batch_events=4)
+	for i in range(20):
+		assert uploader.enqueue({'i': i})
+	spill_path = uploader._spill_path
+	assert uploader.pending_count == 5 and uploader.events_spilled == 15
+	assert spill_path is not None and len(spill_path.read_text().splitlines()) == 15
+
+	await uploader.flush()
+	assert [event['i'] for batch in batches for event in batch['events']] == list(range(20))
+	assert max(len(batch['events']) for batch in batches) == 4
+	assert not spill_path.exists()
+	await uploader.close()
+
+	dropping = EventUploader(httpserver.url_for('/api/v1/events'), max_queue_events=5, overflow='drop')
+	assert [dropping.enqueue({'i': i}) for i in range(7)] == [True] * 5 + [False] * 2
+	await dropping.close()
+	assert dropping.events_sent == 5 and dropping.events_dropped == 2
+
+
+async def test_unreachable_api_keeps_events_queued_and_close_drops_them(httpserver: HTTPServer):
+	batches = capture_batches(httpserver, status=503)
+	uploader = EventUploader(httpserver.url_for('/api/v1/events'), max_queue_events=2, max_retries=0)
+	for i in range(4):
+		uploader.enqueue({'i': i})
+
+	await uploader.flush()
+	assert len(batches) == 1  # retryable error: stopped after the first batch, nothing lost yet
+	assert uploader.pending_count == 2 and uploader._spill_path is not None and uploader._spill_path.exists()
+	spill_path = uploader._spill_path
+
+	await uploader.close(timeout=5)
+	assert uploader.events_dropped == 4 and uploader.events_sent == 0
+	assert not spill_path.exists()
+
+
+async def test_cloud_sync_handle_event_does_not_wait_for_the_upload(httpserver: HTTPServer, tmp_path, monkeypatch):
+	monkeypatch.setenv('BROWSER_USE_CONFIG_DIR', str(tmp_path))
+	batches = capture_batches(httpserver, delay=0.5)
+	auth = DeviceAuthClient(base_url=httpserver.url_for(''))
+	auth.auth_config.api_token = 'test-api-key'
+	auth.auth_config.user_id = 'test-user-123'
+	service = CloudSync(base_url=httpserver.url_for(''))
+	service.auth_client = auth
+
+	start = time.monotonic()
+	for i in range(3):
+		await service.handle_event(
+			CreateAgentTaskEvent(
+				agent_session_id='test-session', llm_model='test-model', task=f'Task {i}', user_id='test-user-123'
+			)
+		)
+	assert time.monotonic() - start < 0.5
+
+	await service.close()
+	assert len(batches) == 1
+	assert [event['task'] for event in batches[0]['events']] == ['Task 0', 'Task 1', 'Task 2']
+	assert batches[0]['headers']['Authorization'] == 'Bearer test-api-key'
@@ -0,0 +1,140 @@
+"""
+Tests for the token budget of the per-step state message (browser_use/agent/context_budget.py).
+
+Uses hand-written serialized DOM text and a synthetic browser state, no browser or LLM needed.
+"""
+
+from browser_use.agent.context_budget import (
+	ContextBudget,
+	drop_off_viewport_elements,
+	estimate_image_tokens,
+	estimate_tokens,
+	get_model_context_budget,
+)
+from browser_use.agent.message_manager.service import MessageManager
+from browser_use.agent.message_manager.views import HistoryItem
+from browser_use.agent.views import AgentStepInfo, MessageManagerState
+from browser_use.browser.views import BrowserStateSummary, PageInfo, TabInfo
+from browser_use.dom.views import DOMRect, EnhancedDOMTreeNode, NodeType, SerializedDOMState
+from browser_use.filesystem.file_system import FileSystem
+from browser_use.llm.messages import SystemMessage
+
+PAGE_INFO = PageInfo(
+	viewport_width=1280,
+	viewport_height=1000,
+	page_width=1280,
+	page_height=5000,
+	scroll_x=0,
+	scroll_y=1000,
+	pixels_above=1000,
+	pixels_below=3000,
+	pixels_left=0,
+	pixels_right=0,
+)
+
+
+def _element(index: int, y: float) -> EnhancedDOMTreeNode:
+	return EnhancedDOMTreeNode(
+		node_id=index,
+		backend_node_id=index,
+		node_type=NodeType.ELEMENT_NODE,
+		node_name='A',
+		node_value='',
+		attributes={},
+		is_scrollable=None,
+		is_visible=True,
+		absolute_position=DOMRect(x=0, y=y, width=100, height=20),
+		target_id='target-1',
+		frame_id=None,
+		session_id=None,
+		content_document=None,
+		shadow_root_type=None,
+		shadow_roots=None,
+		parent_node=None,
+		children_nodes=[],
+		ax_node=None,
+		snapshot_node=None,
+	)
+
+
+# [1] is above the viewport, [2] and [4] inside it, [3] below it; [5] is below but wraps the visible [6]
+SELECTOR_MAP = {1: _element(1, 100), 2: _element(2, 1200), 3: _element(3, 2500), 4: _element(4, 1900), 5: _element(5, 2100)}
+SELECTOR_MAP[6] = _element(6, 1500)
+ELEMENTS_TEXT = '\n'.join(
+	[
+		'Header text',
+		'[1]<a />',
+		'\tHome',
+		'*[2]<a />',
+		'\tPricing',
+		'[3]<a />',
+		'\tFooter link',
+		'[4]<a />',
+		'|SCROLL+5]<div />',
+		'\t[6]<a />',
+	]
+)
+
+
+def test_estimates_are_cheap_approximations():
+	assert estimate_tokens('') == 0
+	assert estimate_tokens('a' * 400) == 100
+	assert estimate_tokens('日本語') == 3
+	assert estimate_image_tokens(1280, 1100) > estimate_image_tokens(1280, 1100, 'low') == 85
+	assert get_model_context_budget('claude-sonnet-4-0') < get_model_context_budget('gemini-2.5-flash')
+	assert get_model_context_budget('some-unknown-model') > 0
+
+
+def test_off_viewport_elements_are_dropped_with_their_subtree():
+	text = drop_off_viewport_elements(ELEMENTS_TEXT, SELECTOR_MAP, PAGE_INFO)
+
+	assert text.split('\n') == ['Header text', '*[2]<a />', '\tPricing', '[4]<a />', '|SCROLL+5]<div />', '\t[6]<a />']
+	assert drop_off_viewport_elements(ELEMENTS_TEXT, SELECTOR_MAP, None) == ELEMENTS_TEXT
+
+
+def test_fit_trims_lowest_value_sections_first():
+	history = [f'<step_{i}>\n' + 'x' * 400 + f'\n</step_{i}>' for i in range(10)]
+	budget = ContextBudget(max_tokens=10_000, reserved_tokens={'system': 1000})
+
+	fitted = budget.fit(history, ELEMENTS_TEXT, 'read state', {'state': 500}, SELECTOR_MAP, PAGE_INFO)
+	assert fitted.history_items == history and fitted.elements_text == ELEMENTS_TEXT
+	assert not any(fitted.report.trimmed.values()) and not fitted.report.over_budget
+
+	# Off-viewport elements go first, then the history keeps its first and 3 most recent items
+	fitted = budget.fit(history, ELEMENTS_TEXT, 'read state', {'state': 7900, 'images': 550}, SELECTOR_MAP, PAGE_INFO)
+	assert '[1]<a />' not in fitted.elements_text and '[2]<a />' in fitted.elements_text
+	assert fitted.history_items[0] == history[0] and fitted.history_items[-3:] == history[-3:]
+	assert 'omitted to fit the context budget' in fitted.history_items[1]
+	assert fitted.read_state == 'read state'
+	assert not fitted.report.over_budget
+	assert fitted.report.sections['images'] == 550 and fitted.report.trimmed['history'] > 0
+
+
+def test_message_manager_fits_each_step_into_the_budget(tmp_path):
+	message_manager = MessageManager(
+		task='Compare prices',
+		system_message=SystemMessage(content='system prompt ' * 200),
+		file_system=FileSystem(tmp_path),
+		state=MessageManagerState(),
+		max_context_tokens=2_000,
+	)
+	browser_state = BrowserStateSummary(
+		dom_state=SerializedDOMState(_root=None, selector_map={}),
+		url='https://shop.example.com',
+		title='Shop',
+		tabs=[TabInfo(target_id='ABCD1234ABCD1234ABCD1234ABCD1234ABCD1234', url='https://shop.example.com', title='Shop')],
+	)
+	for step in range(12):
+		message_manager.state.agent_history_items.append(
+			HistoryItem(step_number=step, memory=f'Visited product {step}: ' + 'details ' * 60, action_results='Result:\nclicked')
+		)
+	message_manager.create_state_messages(
+		browser_state_summary=browser_state, step_info=AgentStepInfo(step_number=12, max_steps=20)
+	)
+
+	report = message_manager.last_context_budget_report
+	assert report is not None and not report.over_budget
+	assert report.sections['system'] == estimate_tokens('system prompt ' * 200)
+	state_text = message_manager.get_messages()[-1].text
+	assert 'previous history items omitted to fit the context budget' in state_text
+	assert 'Visited product 11' in state_text and 'Visited product 2:' not in state_text
@@ -0,0 +1,102 @@
+"""
+Tests for the page-wide DOM change counter that lets multi_act skip DOM rebuilds between actions.
+"""
+
+import asyncio
+
+import pytest
+
+from browser_use.browser.events import NavigateToUrlEvent
+from browser_use.browser.session import BrowserSession
+
+PAGE = """
+<html><body>
+	<div id="host"></div>
+	<iframe id="frame" src="/frame"></iframe>
+	<div id="menu">
+		<button id="trigger">Menu</button>
+		<a id="item" href="#">Hidden item</a>
+	</div>
+	<style>#item { visibility: hidden; } #menu:focus-within #item { visibility: visible; }</style>
+	<script>
+		const root = document.getElementById('host').attachShadow({mode: 'open'});
+		root.innerHTML = '<button id="inner">Inside shadow root</button>';
+	</script>
+</body></html>
+"""
+
+FRAME = '<html><body><button id="framed">Inside iframe</button></body></html>'
+
+
+async def evaluate(browser_session: BrowserSession, expression: str):
+	"""Run a script in the page's main world, like a page script would"""
+	cdp_session = await browser_session.get_or_create_cdp_session()
+	result = await cdp_session.cdp_client.send.Runtime.evaluate(
+		params={'expression': expression, 'returnByValue': True, 'awaitPromise': True},
+		session_id=cdp_session.session_id,
+	)
+	return result.get('result', {}).get('value')
+
+
+async def changes_after(browser_session: BrowserSession, expression: str) -> tuple[str, int]:
+	before = await browser_session.get_dom_change_counter()
+	assert before is not None
+	await evaluate(browser_session, expression)
+	await asyncio.sleep(0.05)  # let the MutationObserver callback run
+	after = await browser_session.get_dom_change_counter()
+	assert after is not None and after[0] == before[0], 'tracker was reinstalled, page navigated'
+	return after[0], after[1] - before[1]
+
+
+@pytest.fixture
+async def page(browser_session: BrowserSession, httpserver):
+	httpserver.expect_request('/page').respond_with_data(PAGE, content_type='text/html')
+	httpserver.expect_request('/frame').respond_with_data(FRAME, content_type='text/html')
+	await browser_session.event_bus.dispatch(NavigateToUrlEvent(url=httpserver.url_for('/page'), new_tab=False))
+	await evaluate(browser_session, "new Promise(r => document.readyState === 'complete' ? r() : addEventListener('load', r))")
+	return browser_session
+
+
+async def test_counter_ignores_reads_and_counts_page_mutations(page: BrowserSession):
+	_, changes = await changes_after(page, "document.querySelectorAll('button').length")
+	assert changes == 0
+
+	_, changes = await changes_after(page, "document.body.appendChild(document.createElement('p'))")
+	assert changes > 0
+
+
+async def test_counter_sees_shadow_root_mutations(page: BrowserSession):
+	_, changes = await changes_after(
+		page, "document.getElementById('host').shadowRoot.getElementById('inner').setAttribute('disabled', '')"
+	)
+	assert changes > 0
+
+	# Shadow roots attached after the tracker was installed are observed too
+	await changes_after(page, "document.body.appendChild(document.createElement('div')).attachShadow({mode: 'open'})")
+	_, changes = await changes_after(
+		page, "document.body.lastElementChild.shadowRoot.appendChild(document.createElement('button'))"
+	)
+	assert changes > 0
+
+
+async def test_counter_sees_same_origin_iframe_mutations(page: BrowserSession):
+	_, changes = await changes_after(page, "document.getElementById('frame').contentDocument.getElementById('framed').remove()")
+	assert changes > 0
+
+	# Reloading the iframe replaces its document, which is counted and observed as well
+	await changes_after(
+		page,
+		"new Promise(r => { const f = document.getElementById('frame'); f.addEventListener('load', r, {once: true}); f.src = '/frame?reloaded'; })",
+	)
+	_, changes = await changes_after(page, "document.getElementById('frame').contentDocument.body.innerHTML = ''")
+	assert changes > 0
+
+
+async def test_counter_sees_css_only_reveals(page: BrowserSession):
+	_, changes = await changes_after(page, "document.getElementById('trigger').focus()")
+	assert changes > 0
+
+
+async def test_tracker_is_not_visible_to_page_scripts(page: BrowserSession):
+	await page.get_dom_change_counter()
+	assert await evaluate(page, 'typeof window.__browserUseDomChanges') == 'undefined'
@@ -0,0 +1,151 @@
+"""
+Tests for DOMMutationTracker, the persistent DOM tree used by DomService(incremental_dom=True).
+
+Feeds synthetic CDP DOM.* events into the tracker and checks the patched tree, the dirty AX bookkeeping
+and the fallbacks to a full rebuild.
+"""
+
+from browser_use.dom.mutations import DOMMutationTracker
+
+
+def _node(node_id: int, name: str, children: list | None = None, node_type: int = 1, value: str = '', **extra) -> dict:
+	node = {
+		'nodeId': node_id,
+		'backendNodeId': node_id + 1000,
+		'nodeType': node_type,
+		'nodeName': name,
+		'localName': name.lower(),
+		'nodeValue': value,
+		'childNodeCount': len(children or []),
+		'children': children or [],
+		'attributes': [],
+		**extra,
+	}
+	for child in node['children']:
+		child['parentId'] = node_id
+	return node
+
+
+def _text(node_id: int, value: str) -> dict:
+	return _node(node_id, '#text', node_type=3, value=value)
+
+
+def _loaded_tracker(**kwargs) -> DOMMutationTracker:
+	document = _node(
+		1,
+		'#document',
+		node_type=9,
+		children=[
+			_node(
+				2,
+				'HTML',
+				children=[
+					_node(3, 'BODY', children=[_node(4, 'BUTTON', children=[_text(5, 'Open')]), _node(6, 'DIV')]),
+				],
+			)
+		],
+	)
+	tracker = DOMMutationTracker(target_id='target-1234', session_id='session-1', **kwargs)
+	tracker.reset()
+	tracker.load(document, [{'nodeId': '1', 'ignored': False, 'backendDOMNodeId': 1004}])
+	return tracker
+
+
+def _children_ids(node: dict) -> list[int]:
+	return [child['nodeId'] for child in node.get('children') or []]
+
+
+def test_insert_remove_and_attribute_mutations_are_patched():
+	tracker = _loaded_tracker()
+	assert tracker.is_valid
+
+	tracker.record('childNodeInserted', {'parentNodeId': 3, 'previousNodeId': 4, 'node': _node(7, 'INPUT')})
+	tracker.record('attributeModified', {'nodeId': 7, 'name': 'value', 'value': 'hello'})
+	tracker.record('characterDataModified', {'nodeId': 5, 'characterData': 'Close'})
+	tracker.record('childNodeRemoved', {'parentNodeId': 3, 'nodeId': 6})
+
+	assert tracker.apply_pending_mutations()
+	assert tracker.root is not None
+
+	body = tracker.root['children'][0]['children'][0]
+	assert _children_ids(body) == [4, 7]
+	assert body['childNodeCount'] == 2
+	assert body['children'][1]['parentId'] == 3
+	assert body['children'][1]['attributes'] == ['value', 'hello']
+	assert body['children'][0]['children'][0]['nodeValue'] == 'Close'
+
+	# the inserted node, the edited text and all of their ancestors need fresh AX data
+	dirty = tracker.take_dirty_backend_node_ids()
+	assert {1007, 1005, 1004, 1003, 1002, 1001} <= dirty
+	assert 1006 not in dirty
+	assert tracker.take_dirty_backend_node_ids() == set()
+
+
+def test_removed_subtree_drops_cached_ax_nodes():
+	tracker = _loaded_tracker()
+	assert 1004 in tracker.ax_lookup
+
+	tracker.record('childNodeRemoved', {'parentNodeId': 3, 'nodeId': 4})
+	assert tracker.apply_pending_mutations()
+
+	assert 1004 not in tracker.ax_lookup
+	assert 1005 not in tracker.take_dirty_backend_node_ids()
+
+
+def test_inserted_node_without_children_is_resolved_by_set_child_nodes():
+	tracker = _loaded_tracker()
+
+	shallow = _node(7, 'UL')
+	shallow['childNodeCount'] = 2
+	tracker.record('childNodeInserted', {'parentNodeId': 3, 'previousNodeId': 0, 'node': shallow})
+	assert tracker.apply_pending_mutations()
+	assert tracker.incomplete_node_ids == {7}
+
+	tracker.record('setChildNodes', {'parentId': 7, 'nodes': [_node(8, 'LI'), _node(9, 'LI')]})
+	assert tracker.apply_pending_mutations()
+	assert tracker.incomplete_node_ids == set()
+	assert _children_ids(tracker.root['children'][0]['children'][0]['children'][0]) == [8, 9]
+
+
+def test_unknown_node_ids_invalidate_the_tracker():
+	tracker = _loaded_tracker()
+
+	# ids we never saw mean somebody else rebound the document (e.g. another DOM.getDocument call)
+	tracker.record('attributeModified', {'nodeId': 9999, 'name': 'class', 'value': 'x'})
+	assert not tracker.apply_pending_mutations()
+	assert not tracker.is_valid
+	assert tracker.invalid_reason and 'unknown node' in tracker.invalid_reason
+
+
+def test_mutation_log_overflow_and_document_updates_force_a_full_rebuild():
+	tracker = _loaded_tracker(max_pending_mutations=3)
+	for i in range(4):
+		tracker.record('attributeModified', {'nodeId': 4, 'name': 'data-i', 'value': str(i)})
+	assert not tracker.is_valid
+	assert tracker.pending_mutation_count == 0
+	assert tracker.invalid_reason and 'overflow' in tracker.invalid_reason
+
+	tracker = _loaded_tracker()
+	tracker.record('documentUpdated', {})
+	assert not tracker.apply_pending_mutations()
+
+
+def test_inserted_iframes_are_left_to_a_full_rebuild():
+	tracker = _loaded_tracker()
+	tracker.record('childNodeInserted', {'parentNodeId': 6, 'previousNodeId': 0, 'node': _node(7, 'IFRAME')})
+	assert not tracker.apply_pending_mutations()
+
+
+def test_events_queued_while_loading_are_kept_and_invalidation_while_loading_sticks():
+	tracker = DOMMutationTracker(target_id='target-1234', session_id='session-1')
+	tracker.reset()
+	tracker.record('attributeModified', {'nodeId': 4, 'name': 'aria-expanded', 'value': 'true'})
+	tracker.load(_loaded_tracker().root, [])  # type: ignore[arg-type]
+	assert tracker.apply_pending_mutations()
+	assert tracker.root is not None
+	assert tracker.root['children'][0]['children'][0]['children'][0]['attributes'] == ['aria-expanded', 'true']
+
+	tracker.reset()
+	tracker.record('documentUpdated', {})
+	tracker.load(_loaded_tracker().root, [])  # type: ignore[arg-type]
+	assert not tracker.is_valid
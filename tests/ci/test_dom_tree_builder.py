@@ -0,0 +1,188 @@
+"""
+Tests for DomService._build_enhanced_tree, the synchronous explicit-stack builder behind get_dom_tree.
+
+Builds small synthetic CDP trees (no browser needed) and checks structure, frame offsets, visibility and
+which cross-origin iframes are left to be fetched from their own target.
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+from browser_use.dom.service import DomService
+from browser_use.dom.views import DOMRect, EnhancedSnapshotNode
+
+
+def _node(node_id: int, name: str, children: list | None = None, node_type: int = 1, **extra) -> dict:
+	node = {
+		'nodeId': node_id,
+		'backendNodeId': node_id + 100,
+		'nodeType': node_type,
+		'nodeName': name,
+		'nodeValue': '',
+		'attributes': ['id', f'n{node_id}'],
+		**extra,
+	}
+	if children:
+		node['children'] = children
+		for child in children:
+			child['parentId'] = node_id
+	return node
+
+
+def _snapshot(x: float, y: float, w: float = 100, h: float = 50, scroll: tuple | None = None) -> EnhancedSnapshotNode:
+	return EnhancedSnapshotNode(
+		is_clickable=None,
+		cursor_style=None,
+		bounds=DOMRect(x, y, w, h),
+		clientRects=DOMRect(0, 0, 1000, 800) if scroll else None,
+		scrollRects=DOMRect(scroll[0], scroll[1], 1000, 5000) if scroll else None,
+		computed_styles={'display': 'block', 'visibility': 'visible', 'opacity': '1'},
+		paint_order=None,
+		stacking_contexts=None,
+	)
+
+
+def _service(cross_origin_iframes: bool = False) -> DomService:
+	return DomService(
+		browser_session=SimpleNamespace(agent_focus=None),  # type: ignore[arg-type]
+		logger=logging.getLogger('test'),
+		cross_origin_iframes=cross_origin_iframes,
+	)
+
+
+def test_builds_tree_with_frame_offsets_and_shared_frame_context():
+	inner_document = _node(
+		20, '#document', node_type=9, children=[_node(21, 'HTML', frameId='f2', children=[_node(22, 'BUTTON')])]
+	)
+	iframe = _node(10, 'IFRAME', frameId='f2', contentDocument=inner_document)
+	inner_document['parentId'] = 10
+	shadow_root = _node(30, '#document-fragment', node_type=11, shadowRootType='open', children=[_node(31, 'INPUT')])
+	host = _node(3, 'DIV', shadowRoots=[shadow_root])
+	root = _node(1, '#document', node_type=9, children=[_node(2, 'HTML', frameId='f1', children=[host, iframe])])
+
+	snapshot_lookup = {
+		102: _snapshot(0, 0, 1000, 5000, scroll=(0, 100)),
+		103: _snapshot(10, 200),
+		110: _snapshot(50, 300, 400, 400),
+		121: _snapshot(0, 0, 400, 400, scroll=(0, 30)),
+		122: _snapshot(5, 60),
+		131: _snapshot(20, 210),
+	}
+
+	tree, cross_origin = _service()._build_enhanced_tree(root, 'target-1', {}, snapshot_lookup)  # type: ignore[arg-type]
+
+	assert cross_origin == []
+	html = tree.children_nodes[0]  # type: ignore[index]
+	div, iframe_node = html.children_nodes  # type: ignore[misc]
+	assert div.attributes == {'id': 'n3'}
+	assert div.shadow_roots and div.shadow_roots[0].parent_node is div
+	assert iframe_node.content_document and iframe_node.content_document.parent_node is iframe_node
+
+	# main document scrolled by 100px, iframe at (50, 300), iframe document scrolled by 30px
+	button = iframe_node.content_document.children_nodes[0].children_nodes[0]  # type: ignore[index]
+	assert button.absolute_position == DOMRect(5 + 50, 60 + 300 - 100 - 30, 100, 50)
+	assert div.absolute_position == DOMRect(10, 200 - 100, 100, 50)
+	assert all(node.is_visible for node in (div, iframe_node, button))
+
+
+def test_duplicate_node_ids_are_memoized_and_hidden_nodes_are_invisible():
+	shared = _node(5, 'SPAN')
+	root = _node(1, '#document', node_type=9, children=[_node(2, 'HTML', frameId='f1', children=[shared, dict(shared)])])
+	snapshot_lookup = {102: _snapshot(0, 0, 1000, 800, scroll=(0, 0)), 105: _snapshot(0, 0)}
+	snapshot_lookup[105].computed_styles = {'display': 'none'}
+
+	tree, _ = _service()._build_enhanced_tree(root, 'target-1', {}, snapshot_lookup)  # type: ignore[arg-type]
+
+	first, second = tree.children_nodes[0].children_nodes  # type: ignore[index,misc]
+	assert first is second
+	assert first.is_visible is False
+
+
+def test_visible_cross_origin_iframes_are_returned_for_awaiting():
+	big = _node(3, 'IFRAME', frameId='oopif-1')
+	small = _node(4, 'IFRAME', frameId='oopif-2')
+	root = _node(1, '#document', node_type=9, children=[_node(2, 'HTML', frameId='f1', children=[big, small])])
+	snapshot_lookup = {
+		102: _snapshot(0, 0, 1000, 800, scroll=(0, 0)),
+		103: _snapshot(100, 100, 300, 300),
+		104: _snapshot(100, 500, 100, 100),
+	}
+
+	tree, cross_origin = _service(cross_origin_iframes=True)._build_enhanced_tree(root, 'target-1', {}, snapshot_lookup)  # type: ignore[arg-type]
+
+	assert [(node.frame_id, offset) for node, offset in cross_origin] == [('oopif-1', DOMRect(100, 100, 0, 0))]
+
+
+async def test_cross_origin_iframes_are_fetched_concurrently_and_grafted_in_order():
+	frames = {f'oopif-{i}': {'frameTargetId': f'target-{i}'} for i in range(6)}
+	frames['oopif-gone'] = {'frameTargetId': 'target-gone'}
+
+	async def get_all_frames():
+		return frames, {}
+
+	async def get_all_targets():
+		return [{'targetId': f'target-{i}'} for i in range(6)]
+
+	leased: list[list[str]] = []
+
+	@contextmanager
+	def lease_cdp_sessions(target_ids):
+		leased.append(list(target_ids))
+		yield
+
+	service = DomService(
+		browser_session=SimpleNamespace(  # type: ignore[arg-type]
+			agent_focus=None,
+			get_all_frames=get_all_frames,
+			get_all_targets=get_all_targets,
+			lease_cdp_sessions=lease_cdp_sessions,
+		),
+		logger=logging.getLogger('test'),
+		cross_origin_iframes=True,
+		max_concurrent_iframe_fetches=2,
+	)
+
+	in_flight = 0
+	max_in_flight = 0
+
+	async def get_all_trees(target_id):
+		nonlocal in_flight, max_in_flight
+		in_flight += 1
+		max_in_flight = max(max_in_flight, in_flight)
+		await asyncio.sleep(0.05)
+		in_flight -= 1
+		if target_id == 'target-3':
+			raise TimeoutError('CDP requests failed or timed out: snapshot')
+		return SimpleNamespace(
+			dom_tree={'root': _node(1, '#document', node_type=9, attributes=['id', target_id])},
+			ax_tree={'nodes': []},
+			snapshot={'documents': [], 'strings': []},
+			device_pixel_ratio=1.0,
+		)
+
+	service._get_all_trees = get_all_trees  # type: ignore[method-assign]
+	iframes = [
+		(_service()._build_enhanced_tree(_node(3, 'IFRAME', frameId=frame_id), 't', {}, {})[0], DOMRect(0, 0, 0, 0))
+		for frame_id in frames
+	]
+
+	start = time.perf_counter()
+	await service._attach_cross_origin_iframe_trees(iframes, iframe_depth=0)
+	elapsed = time.perf_counter() - start
+
+	assert max_in_flight == 2
+	assert elapsed < 0.05 * 5  # 5 reachable targets, 2 at a time -> 3 rounds, not 5
+	assert [node.content_document.attributes['id'] if node.content_document else None for node, _ in iframes] == [
+		'target-0',
+		'target-1',
+		'target-2',
+		None,  # failed fetch doesn't fail the page
+		'target-4',
+		'target-5',
+		None,  # target no longer exists
+	]
+	assert leased == [[f'target-{i}' for i in range(6)]]  # every reachable iframe target held for the whole fetch
+	assert all(node.content_document.parent_node is node for node, _ in iframes if node.content_document)
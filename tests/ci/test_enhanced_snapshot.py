@@ -0,0 +1,84 @@
+"""
+Tests for build_snapshot_lookup and the columnar SnapshotLookup it returns.
+
+Feeds a hand-written DOMSnapshot.captureSnapshot result through it (no browser needed) and checks the decoded
+EnhancedSnapshotNodes field by field.
+"""
+
+from browser_use.dom.enhanced_snapshot import REQUIRED_COMPUTED_STYLES, SnapshotLookup, build_snapshot_lookup
+from browser_use.dom.views import DOMRect
+
+STRINGS = ['block', 'visible', '1', 'pointer', 'none']
+
+
+def _styles(**overrides: int) -> list[int]:
+	"""Style string indices in REQUIRED_COMPUTED_STYLES order."""
+	defaults = {'display': 0, 'visibility': 1, 'opacity': 2, 'cursor': 3}
+	defaults.update(overrides)
+	return [defaults.get(name, -1) for name in REQUIRED_COMPUTED_STYLES]
+
+
+def _snapshot() -> dict:
+	nodes = {'backendNodeId': [10, 11, 12, 13, 11], 'isClickable': {'index': [1, 3]}}
+	layout = {
+		# snapshot index 1 appears twice, the first layout row wins; index 2 and 4 (last backend id 11) have no layout
+		'nodeIndex': [0, 1, 3, 1],
+		'bounds': [[0, 0, 2000, 1600], [20, 40, 200, 100], [10, 10], [0, 0, 1, 1]],
+		'styles': [_styles(), _styles(cursor=-1), [], _styles()],
+		'paintOrders': [0, 5, 7, 9],
+		'clientRects': [[0, 0, 1000, 800], [], [], []],
+		'scrollRects': [[0, 300, 1000, 4000], [], [], []],
+		'stackingContexts': {'index': [4, 0, 0, 0]},
+	}
+	return {'documents': [{'nodes': nodes, 'layout': layout}], 'strings': STRINGS}
+
+
+def test_decodes_snapshot_nodes_from_columns():
+	lookup = build_snapshot_lookup(_snapshot(), device_pixel_ratio=2.0)  # type: ignore[arg-type]
+
+	assert isinstance(lookup, SnapshotLookup)
+	assert sorted(lookup) == [10, 11, 12, 13] and len(lookup) == 4
+	assert 12 in lookup and 99 not in lookup and lookup.get(99) is None
+
+	document = lookup[10]
+	assert document.bounds == DOMRect(0, 0, 1000, 800)  # device pixels -> CSS pixels
+	assert document.clientRects == DOMRect(0, 0, 1000, 800)  # client/scroll rects are left as reported
+	assert document.scrollRects == DOMRect(0, 300, 1000, 4000)
+	assert document.computed_styles == {'display': 'block', 'visibility': 'visible', 'opacity': '1', 'cursor': 'pointer'}
+	assert document.cursor_style == 'pointer'
+	assert document.paint_order == 0
+	assert document.stacking_contexts == 4
+	assert document.is_clickable is False
+
+	# duplicate backend id: the last snapshot index (4) wins, and it has no layout
+	duplicate = lookup[11]
+	assert duplicate.bounds is None and duplicate.computed_styles is None and duplicate.paint_order is None
+	assert duplicate.is_clickable is False
+
+	no_layout = lookup[12]
+	assert no_layout.bounds is None and no_layout.cursor_style is None and no_layout.stacking_contexts is None
+
+	# malformed bounds and empty styles still keep the paint order
+	clickable = lookup[13]
+	assert clickable.is_clickable is True
+	assert clickable.bounds is None and clickable.computed_styles is None
+	assert clickable.paint_order == 7
+
+
+def test_materialized_nodes_are_cached_so_in_place_changes_stick():
+	lookup = build_snapshot_lookup(_snapshot())  # type: ignore[arg-type]
+
+	node = lookup[10]
+	assert node.bounds is not None
+	node.bounds.y -= 300
+
+	assert lookup[10] is node
+	assert lookup[10].bounds == DOMRect(0, -300, 2000, 1600)
+
+
+def test_missing_clickable_data_and_empty_snapshots():
+	snapshot = _snapshot()
+	del snapshot['documents'][0]['nodes']['isClickable']
+	assert build_snapshot_lookup(snapshot)[10].is_clickable is None  # type: ignore[arg-type]
+
+	assert len(build_snapshot_lookup({'documents': [], 'strings': []})) == 0
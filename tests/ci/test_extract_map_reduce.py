@@ -0,0 +1,91 @@
+"""
+Tests for the map-reduce mode of extract_structured_data (Tools(parallel_extraction=True)).
+
+Uses a fake page_extraction_llm that records prompts and concurrency, no browser or real LLM needed.
+"""
+
+import asyncio
+import re
+from types import SimpleNamespace
+
+import pytest
+
+from browser_use.tools.markdown_cache import MarkdownDocument
+from browser_use.tools.service import Tools
+
+
+class FakeExtractionLLM:
+	def __init__(self, fail_parts: set[int] | None = None):
+		self.fail_parts = fail_parts or set()
+		self.map_prompts: list[str] = []
+		self.reduce_prompts: list[str] = []
+		self.running = 0
+		self.max_running = 0
+
+	async def ainvoke(self, messages):
+		prompt = messages[-1].content
+		if '<partial_results>' in prompt:
+			self.reduce_prompts.append(prompt)
+			return SimpleNamespace(completion='merged: ' + ','.join(re.findall(r'found (\d+)', prompt)))
+
+		self.map_prompts.append(prompt)
+		part = int(re.search(r'part (\d+)/', prompt).group(1))  # type: ignore[union-attr]
+		self.running += 1
+		self.max_running = max(self.max_running, self.running)
+		try:
+			await asyncio.sleep(0.01)
+			if part in self.fail_parts:
+				raise TimeoutError('llm timed out')
+			return SimpleNamespace(completion=f'found {part}')
+		finally:
+			self.running -= 1
+
+
+def _document(total_chars: int) -> MarkdownDocument:
+	sentence = 'Item with a price of 10 dollars. '
+	return MarkdownDocument(content=(sentence * (total_chars // len(sentence) + 1))[:total_chars], stats={})
+
+
+async def test_windows_are_extracted_concurrently_and_merged_in_order():
+	tools = Tools(parallel_extraction=True, extraction_concurrency=3)
+	llm = FakeExtractionLLM()
+
+	result = await tools._extract_map_reduce('prices', _document(9_500), 0, 1_000, 'system', 'stats', llm)  # type: ignore[arg-type]
+
+	assert len(llm.map_prompts) == 10
+	assert llm.max_running == 3
+	assert result == 'merged: ' + ','.join(str(part) for part in range(1, 11))
+	assert 'read in 10 parts' in llm.reduce_prompts[0]
+	assert 'start_from_char' not in llm.reduce_prompts[0]
+
+
+async def test_failed_parts_and_remaining_content_are_reported_to_the_reduce_pass():
+	tools = Tools(parallel_extraction=True, max_extraction_chunks=4)
+	llm = FakeExtractionLLM(fail_parts={2})
+
+	result = await tools._extract_map_reduce('prices', _document(10_000), 0, 1_000, 'system', 'stats', llm)  # type: ignore[arg-type]
+
+	assert len(llm.map_prompts) == 4
+	assert result == 'merged: 1,3,4'
+	assert 'part 2 (chars' in llm.reduce_prompts[0]
+	assert re.search(r'use start_from_char=\d+ to extract the rest', llm.reduce_prompts[0])
+
+
+async def test_all_parts_failing_raises():
+	tools = Tools(parallel_extraction=True, max_extraction_chunks=2)
+	llm = FakeExtractionLLM(fail_parts={1, 2})
+
+	with pytest.raises(TimeoutError):
+		await tools._extract_map_reduce('prices', _document(5_000), 0, 1_000, 'system', 'stats', llm)  # type: ignore[arg-type]
+	assert llm.reduce_prompts == []
+
+
+async def test_non_positive_limits_still_read_one_part():
+	tools = Tools(parallel_extraction=True, extraction_concurrency=0, max_extraction_chunks=0)
+	llm = FakeExtractionLLM()
+
+	result = await tools._extract_map_reduce('prices', _document(5_000), 0, 1_000, 'system', 'stats', llm)  # type: ignore[arg-type]
+
+	assert len(llm.map_prompts) == 1
+	assert result == 'found 1'
+	assert llm.reduce_prompts == []
@@ -0,0 +1,192 @@
+"""
+Tests for rolling history compaction: older agent history spans folded into background LLM summaries.
+
+The summarizing LLM is a fake that records its calls, no browser or real LLM needed.
+"""
+
+import asyncio
+import json
+
+from browser_use.agent.message_manager.compaction import HistoryCompactor
+from browser_use.agent.message_manager.service import MessageManager
+from browser_use.agent.message_manager.views import HistoryItem
+from browser_use.agent.service import Agent
+from browser_use.agent.views import ActionResult, AgentState, MessageManagerState
+from browser_use.browser import BrowserSession
+from browser_use.browser.profile import BrowserProfile
+from browser_use.browser.views import BrowserStateSummary, TabInfo
+from browser_use.dom.views import SerializedDOMState
+from browser_use.filesystem.file_system import FileSystem
+from browser_use.llm.messages import SystemMessage
+from browser_use.llm.views import ChatInvokeCompletion
+from tests.ci.conftest import create_mock_llm
+
+
+class FakeSummaryLLM:
+	model = 'fake-summarizer'
+	provider = 'fake'
+
+	def __init__(self, fail: bool = False):
+		self.calls: list[str] = []
+		self.fail = fail
+
+	async def ainvoke(self, messages, output_format=None):
+		self.calls.append(messages[-1].text)
+		if self.fail:
+			raise RuntimeError('rate limited')
+		steps = messages[-1].text.count('<step>')
+		return ChatInvokeCompletion(completion=f'summary {len(self.calls)} of {steps} steps', usage=None)
+
+
+def _browser_state() -> BrowserStateSummary:
+	return BrowserStateSummary(
+		dom_state=SerializedDOMState(_root=None, selector_map={}),
+		url='https://shop.example.com',
+		title='Shop',
+		tabs=[TabInfo(target_id='ABCD1234ABCD1234ABCD1234ABCD1234ABCD1234', url='https://shop.example.com', title='Shop')],
+	)
+
+
+def _message_manager(tmp_path, llm, state: MessageManagerState | None = None) -> MessageManager:
+	return MessageManager(
+		task='Collect prices',
+		system_message=SystemMessage(content='system prompt'),
+		file_system=FileSystem(tmp_path),
+		state=state or MessageManagerState(),
+		history_compactor=HistoryCompactor(llm=llm, keep_recent=4, chunk_size=3),  # type: ignore[arg-type]
+	)
+
+
+async def _step(message_manager: MessageManager, step: int) -> list[str]:
+	message_manager.state.agent_history_items.append(HistoryItem(step_number=step, memory=f'Visited page {step}'))
+	message_manager.create_state_messages(browser_state_summary=_browser_state())
+	assert message_manager.history_compactor is not None
+	await message_manager.history_compactor.wait()
+	return message_manager._get_agent_history_item_strings()
+
+
+async def test_old_spans_are_replaced_by_summaries_written_in_the_background(tmp_path):
+	llm = FakeSummaryLLM()
+	message_manager = _message_manager(tmp_path, llm)
+
+	history = []
+	for step in range(1, 4):
+		history = await _step(message_manager, step)
+	# The first span is summarized as soon as it is complete, but still shown verbatim while it is recent
+	assert len(llm.calls) == 1 and 'Visited page 1' in llm.calls[0]
+	assert [item.count('Visited page') for item in history] == [0, 1, 1, 1]
+
+	for step in range(4, 11):
+		history = await _step(message_manager, step)
+
+	assert len(llm.calls) == 3
+	assert history[0] == 'Agent initialized'
+	assert history[1] == '<summary steps="1-3">\nsummary 1 of 3 steps\n</summary>'
+	assert history[2] == '<summary steps="4-6">\nsummary 2 of 3 steps\n</summary>'
+	# Steps 7-9 are summarized already, but still among the 4 most recent items
+	assert [item.split('\n')[1] for item in history[3:]] == [f'Visited page {step}' for step in range(7, 11)]
+
+
+async def test_summaries_are_cached_in_the_agent_state(tmp_path):
+	llm = FakeSummaryLLM()
+	message_manager = _message_manager(tmp_path, llm)
+	for step in range(1, 9):
+		history = await _step(message_manager, step)
+
+	# Resume from a serialized agent state: the summaries come back with it and are not recomputed
+	agent_state = AgentState.model_validate_json(AgentState(message_manager_state=message_manager.state).model_dump_json())
+	resumed_llm = FakeSummaryLLM()
+	resumed = _message_manager(tmp_path, resumed_llm, state=agent_state.message_manager_state)
+
+	assert resumed._get_agent_history_item_strings() == history
+	await _step(resumed, 9)
+	assert resumed_llm.calls == ['\n'.join(item.to_string() for item in resumed.state.agent_history_items[7:10])]
+
+
+async def test_failed_summaries_keep_items_verbatim_and_closing_cancels(tmp_path):
+	message_manager = _message_manager(tmp_path, FakeSummaryLLM(fail=True))
+	for step in range(1, 10):
+		history = await _step(message_manager, step)
+	assert message_manager.state.history_summaries == []
+	assert len(history) == 10
+
+	slow = asyncio.Event()
+
+	class SlowLLM(FakeSummaryLLM):
+		async def ainvoke(self, messages, output_format=None):
+			await slow.wait()
+
+	compactor = HistoryCompactor(llm=SlowLLM(), keep_recent=4, chunk_size=3)  # type: ignore[arg-type]
+	compactor.schedule(message_manager.state)
+	await compactor.aclose()
+	assert message_manager.state.history_summaries == []
+
+
+def _agent(monkeypatch, summary_llm: FakeSummaryLLM, max_steps: int = 2) -> Agent:
+	"""Agent whose browser state, actions and LLMs are all faked, for running whole Agent.run() calls"""
+	monkeypatch.setenv('BROWSER_USE_CLOUD_SYNC', 'false')
+
+	async def start(self):
+		pass
+
+	async def get_browser_state_summary(self, include_screenshot=True, cached=False, include_recent_events=False):
+		return _browser_state()
+
+	monkeypatch.setattr(BrowserSession, 'start', start)
+	monkeypatch.setattr(BrowserSession, 'get_browser_state_summary', get_browser_state_summary)
+
+	def output(action: dict) -> str:
+		return json.dumps({'evaluation_previous_goal': '', 'memory': '', 'next_goal': '', 'action': [action]})
+
+	agent = Agent(
+		task='Collect prices',
+		llm=create_mock_llm(
+			[output({'wait': {'seconds': 1}})] * (max_steps - 1) + [output({'done': {'text': 'done', 'success': True}})]
+		),
+		browser_session=BrowserSession(browser_profile=BrowserProfile(keep_alive=True)),
+		history_compaction_keep_recent=1,
+		history_compaction_chunk_size=1,
+		history_compaction_llm=summary_llm,  # type: ignore[arg-type]
+	)
+
+	async def act(action, **kwargs):
+		await asyncio.sleep(0.01)
+		return ActionResult(extracted_content='waited')
+
+	monkeypatch.setattr(agent.tools, 'act', act)
+	return agent
+
+
+async def test_summary_still_being_written_when_the_run_ends_is_kept_in_agent_state(monkeypatch):
+	class SlowSummaryLLM(FakeSummaryLLM):
+		async def ainvoke(self, messages, output_format=None):
+			await asyncio.sleep(0.2)  # still summarizing step 1 when the run finishes
+			return await super().ainvoke(messages, output_format)
+
+	agent = _agent(monkeypatch, SlowSummaryLLM())
+	await agent.run(max_steps=2)
+
+	assert [summary.summary for summary in agent.state.message_manager_state.history_summaries] == ['summary 1 of 1 steps']
+	await agent.close()
+	await agent.eventbus.stop(timeout=1.0)
+
+
+async def test_cancelled_run_does_not_wait_for_the_summary(monkeypatch):
+	summarizing = asyncio.Event()
+
+	class StuckSummaryLLM(FakeSummaryLLM):
+		async def ainvoke(self, messages, output_format=None):
+			summarizing.set()
+			await asyncio.Event().wait()  # never answers, only the compactor's LLM timeout would end it
+
+	agent = _agent(monkeypatch, StuckSummaryLLM(), max_steps=5)
+	run = asyncio.create_task(agent.run(max_steps=5))
+	await asyncio.wait_for(summarizing.wait(), timeout=5)
+
+	run.cancel()
+	done, _ = await asyncio.wait([run], timeout=2)
+	assert done, 'cancelling the run waited for the summary'
+
+	await agent.close()  # cancels the stuck summary
+	assert agent.state.message_manager_state.history_summaries == []
+	await agent.eventbus.stop(timeout=1.0)
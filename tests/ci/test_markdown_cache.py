@@ -0,0 +1,78 @@
+"""
+Tests for the page markdown cache behind extract_structured_data: windowed reads, LRU eviction and the
+section-by-section html2text conversion.
+"""
+
+import random
+
+import html2text
+
+from browser_use.tools.markdown_cache import MarkdownCache, MarkdownDocument, html_to_markdown
+
+
+def _reference_window(content: str, start: int, limit: int) -> tuple[str, int | None]:
+	"""The truncation extract_structured_data did on a fresh copy of the page for every window."""
+	content = content[start:]
+	if len(content) <= limit:
+		return content, None
+	truncate_at = limit
+	paragraph_break = content.rfind('\n\n', limit - 500, limit)
+	if paragraph_break > 0:
+		truncate_at = paragraph_break
+	else:
+		sentence_break = content.rfind('.', limit - 200, limit)
+		if sentence_break > 0:
+			truncate_at = sentence_break + 1
+	return content[:truncate_at], start + truncate_at
+
+
+def test_windows_match_the_previous_truncation():
+	rng = random.Random(0)
+	pieces = ['Lorem ipsum dolor sit amet', '. ', '\n', '\n\n', '\n\n\n', 'consectetur', ' ' * 40]
+	content = ''.join(rng.choice(pieces) for _ in range(20_000))
+	document = MarkdownDocument(content=content, stats={})
+
+	for limit in (1_000, 3_000):
+		start: int | None = 0
+		while start is not None:
+			expected = _reference_window(content, start, limit)
+			assert document.window(start, limit) == expected
+			start = expected[1]
+		for start in rng.sample(range(len(content)), 200):
+			assert document.window(start, limit) == _reference_window(content, start, limit)
+
+
+def test_cache_evicts_least_recently_used_pages():
+	cache = MarkdownCache(max_entries=2)
+	first, second, third = (('target', f'https://example.com/{i}', 'v1', False) for i in range(3))
+	cache.put(first, MarkdownDocument(content='first', stats={}))
+	cache.put(second, MarkdownDocument(content='second', stats={}))
+
+	assert cache.get(first) is not None  # first is now the most recently used
+	cache.put(third, MarkdownDocument(content='third', stats={}))
+
+	assert cache.get(second) is None
+	assert cache.get(first) is not None and cache.get(third) is not None
+	assert cache.get(('target', 'https://example.com/0', 'v2', False)) is None  # DOM changed
+	assert len(cache) == 2
+
+
+async def test_sectioned_conversion_matches_html2text():
+	rows = ''.join(
+		f'<tr><td>{i}</td><td><a href="/item/{i}">Item {i} &amp; co</a></td></tr><p>Text {i} <b>bold</b> &#169;</p>'
+		for i in range(500)
+	)
+	html = f'<html><head><script>if (a < b) document.write("<p>");</script></head><body><table>{rows}</table></body></html>'
+
+	for extract_links in (False, True):
+		h = html2text.HTML2Text()
+		h.ignore_links = not extract_links
+		h.ignore_images = True
+		h.ignore_emphasis = False
+		h.body_width = 0
+		h.unicode_snob = True
+		h.skip_internal_links = True
+		expected = h.handle(html)
+
+		assert await html_to_markdown(html, extract_links, section_chars=500) == expected
+		assert await html_to_markdown(html, extract_links) == expected
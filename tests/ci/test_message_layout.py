@@ -0,0 +1,105 @@
+"""
+Tests for the 'stable_prefix' message layout: the agent history as its own cached message ahead of the volatile state.
+
+Builds the messages of a few steps with a synthetic browser state, no browser or LLM needed.
+"""
+
+from datetime import datetime
+
+from browser_use.agent.message_manager.service import MessageManager
+from browser_use.agent.views import ActionResult, AgentStepInfo, MessageManagerState
+from browser_use.browser.views import BrowserStateSummary, TabInfo
+from browser_use.dom.views import SerializedDOMState
+from browser_use.filesystem.file_system import FileSystem
+from browser_use.llm.anthropic.serializer import AnthropicMessageSerializer
+from browser_use.llm.messages import ContentPartTextParam, SystemMessage, UserMessage
+from browser_use.llm.views import ChatInvokeUsage
+from browser_use.tokens.service import TokenCost
+
+
+def _browser_state(url: str) -> BrowserStateSummary:
+	return BrowserStateSummary(
+		dom_state=SerializedDOMState(_root=None, selector_map={}),
+		url=url,
+		title='Page',
+		tabs=[TabInfo(target_id='ABCD1234ABCD1234ABCD1234ABCD1234ABCD1234', url=url, title='Page')],
+	)
+
+
+def _text(message: UserMessage) -> str:
+	return message.content if isinstance(message.content, str) else ''.join(part.text for part in message.content)  # type: ignore[union-attr]
+
+
+def _run_steps(tmp_path, message_layout) -> list[list]:
+	message_manager = MessageManager(
+		task='Find the cheapest flight',
+		system_message=SystemMessage(content='system prompt', cache=True),
+		file_system=FileSystem(tmp_path / message_layout),
+		state=MessageManagerState(),
+		message_layout=message_layout,
+	)
+	steps = []
+	for step in range(3):
+		message_manager.create_state_messages(
+			browser_state_summary=_browser_state(f'https://flights.example.com/page-{step}'),
+			result=[ActionResult(long_term_memory=f'Clicked result {step}')] if step else None,
+			step_info=AgentStepInfo(step_number=step, max_steps=10),
+		)
+		steps.append(message_manager.get_messages())
+	return steps
+
+
+def test_history_is_a_byte_stable_cached_prefix(tmp_path):
+	steps = _run_steps(tmp_path, 'stable_prefix')
+
+	for messages in steps:
+		system, history, state = messages
+		assert system.cache and history.cache and not state.cache
+		assert _text(history).startswith('<agent_history>\n') and _text(state).startswith('\n</agent_history>')
+
+	# Every step's history message starts with the exact text parts of the previous one
+	for previous, current in zip(steps, steps[1:]):
+		previous_parts, current_parts = previous[1].content, current[1].content
+		assert current_parts[: len(previous_parts)] == previous_parts
+		assert len(current_parts) > len(previous_parts)
+
+
+def test_split_layout_sends_the_same_text_as_the_single_message(tmp_path):
+	stable, single = _run_steps(tmp_path, 'stable_prefix')[-1], _run_steps(tmp_path, 'single')[-1]
+
+	assert len(single) == 2
+	assert _text(stable[1]) + _text(stable[2]) == _text(single[1])
+
+
+def test_anthropic_gets_one_breakpoint_per_cached_message(tmp_path):
+	messages = _run_steps(tmp_path, 'stable_prefix')[-1]
+	serialized, system = AnthropicMessageSerializer.serialize_messages(messages)
+
+	history_blocks, state_content = serialized[0]['content'], serialized[1]['content']
+	assert [bool(block.get('cache_control')) for block in history_blocks] == [False] * (len(history_blocks) - 1) + [True]  # type: ignore[union-attr]
+	assert isinstance(state_content, str)
+
+	many_parts = UserMessage(content=[ContentPartTextParam(text=f'part {i}') for i in range(10)], cache=True)
+	blocks = AnthropicMessageSerializer.serialize(many_parts)['content']
+	assert sum(1 for block in blocks if block.get('cache_control')) == 1  # type: ignore[union-attr]
+
+
+async def test_token_cost_reports_cached_ratios():
+	token_cost = TokenCost()
+	for cached in (0, 600, 900):
+		token_cost.add_usage(
+			'claude-sonnet-4-0',
+			ChatInvokeUsage(
+				prompt_tokens=1000,
+				prompt_cached_tokens=cached,
+				prompt_cache_creation_tokens=None,
+				prompt_image_tokens=None,
+				completion_tokens=50,
+				total_tokens=1050,
+			),
+		)
+
+	assert token_cost.get_prompt_cached_ratios() == [0.0, 0.6, 0.9]
+	summary = await token_cost.get_usage_summary(since=datetime(2000, 1, 1))
+	assert summary.total_prompt_cached_ratio == 0.5
+	assert summary.by_model['claude-sonnet-4-0'].prompt_cached_ratio == 0.5
@@ -0,0 +1,152 @@
+"""
+Tests for index revalidation between actions in Agent.multi_act.
+
+The browser session is never started: the DOM change counter, element probe and full state rebuild are patched,
+so the tests only check which revalidation path multi_act takes.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from browser_use.agent.service import Agent
+from browser_use.agent.views import ActionResult
+from browser_use.browser import BrowserSession
+from browser_use.browser.profile import BrowserProfile
+from browser_use.dom.views import EnhancedDOMTreeNode, NodeType
+from tests.ci.conftest import create_mock_llm
+
+
+def _button(backend_node_id: int, target_id: str = 'target-1') -> EnhancedDOMTreeNode:
+	return EnhancedDOMTreeNode(
+		node_id=backend_node_id,
+		backend_node_id=backend_node_id,
+		node_type=NodeType.ELEMENT_NODE,
+		node_name='BUTTON',
+		node_value='',
+		attributes={'id': f'button-{backend_node_id}'},
+		is_scrollable=None,
+		is_visible=True,
+		absolute_position=None,
+		target_id=target_id,
+		frame_id=None,
+		session_id=None,
+		content_document=None,
+		shadow_root_type=None,
+		shadow_roots=None,
+		parent_node=None,
+		children_nodes=[],
+		ax_node=None,
+		snapshot_node=None,
+	)
+
+
+class FakePage:
+	def __init__(self, selector_map: dict[int, EnhancedDOMTreeNode]):
+		self.selector_map = selector_map
+		self.change_count = 0
+		self.detached: set[int] = set()
+		self.mutating_clicks: set[int] = set()
+		self.full_rebuilds = 0
+
+	def state(self) -> SimpleNamespace:
+		"""Browser state summary, with the DOM change counter as read when the DOM build started"""
+		return SimpleNamespace(
+			dom_state=SimpleNamespace(selector_map=self.selector_map), dom_change_counter=('target-1:token', self.change_count)
+		)
+
+
+@pytest.fixture
+def page(monkeypatch):
+	page = FakePage({1: _button(101), 2: _button(102), 3: _button(103)})
+
+	async def get_dom_change_counter(self):
+		return ('target-1:token', page.change_count)
+
+	async def is_element_attached(self, node):
+		return node.backend_node_id not in page.detached
+
+	async def get_browser_state_summary(self, include_screenshot=True, **kwargs):
+		page.full_rebuilds += 1
+		return page.state()
+
+	monkeypatch.setattr(BrowserSession, 'get_dom_change_counter', get_dom_change_counter)
+	monkeypatch.setattr(BrowserSession, 'is_element_attached', is_element_attached)
+	monkeypatch.setattr(BrowserSession, 'get_browser_state_summary', get_browser_state_summary)
+	return page
+
+
+@pytest.fixture
+def agent(page, monkeypatch):
+	browser_session = BrowserSession(browser_profile=BrowserProfile(wait_between_actions=0))
+	agent = Agent(task='click buttons', llm=create_mock_llm(), browser_session=browser_session)
+	browser_session._cached_browser_state_summary = page.state()
+	object.__setattr__(browser_session, 'agent_focus', SimpleNamespace(target_id='target-1'))  # bypass CDPSession validation
+
+	async def act(action, **kwargs):
+		if action.get_index() in page.mutating_clicks:
+			page.change_count += 1
+		return ActionResult(extracted_content=f'clicked {action.get_index()}')
+
+	monkeypatch.setattr(agent.tools, 'act', act)
+	return agent
+
+
+def _clicks(agent: Agent, *indexes: int):
+	return [agent.ActionModel.model_validate({'click_element_by_index': {'index': index}}) for index in indexes]
+
+
+async def test_unchanged_page_skips_full_dom_rebuilds(agent, page):
+	results = await agent.multi_act(_clicks(agent, 1, 2, 3))
+
+	assert [result.extracted_content for result in results] == ['clicked 1', 'clicked 2', 'clicked 3']
+	assert page.full_rebuilds == 0
+
+
+async def test_dom_changes_fall_back_to_full_rebuild(agent, page):
+	page.mutating_clicks.add(1)  # e.g. the first click toggles a class, but no new interactive elements appear
+
+	results = await agent.multi_act(_clicks(agent, 1, 2, 3))
+
+	assert len(results) == 3
+	assert page.full_rebuilds == 1  # counter re-read before the rebuild, the third click only needs the probe
+
+
+async def test_changes_while_the_llm_was_thinking_are_caught(agent, page):
+	# The cached DOM was built at the start of the step, the page changed before the actions run
+	page.change_count += 1
+	dialog = _button(104)
+	dialog.node_name = 'DIALOG'  # hashes are by tag path, another button would look like one already known
+	page.selector_map = {**page.selector_map, 4: dialog}
+
+	results = await agent.multi_act(_clicks(agent, 1, 2, 3))
+
+	assert page.full_rebuilds == 1
+	assert 'Something new appeared' in (results[1].extracted_content or '')
+
+
+async def test_detached_target_stops_the_batch(agent, page):
+	page.detached.add(102)
+	page.selector_map = {1: _button(101), 3: _button(103)}
+
+	results = await agent.multi_act(_clicks(agent, 1, 2, 3))
+
+	assert page.full_rebuilds == 1
+	assert results[0].extracted_content == 'clicked 1'
+	assert 'Page changed after action' in (results[1].extracted_content or '')
+
+
+async def test_elements_the_counter_cannot_observe_always_get_a_full_rebuild(agent, page):
+	# A button in a cross-origin iframe (another target): its DOM changes are invisible to the counter
+	page.selector_map[2] = _button(102, target_id='cross-origin-iframe-target')
+	await agent.multi_act(_clicks(agent, 1, 3))
+	assert page.full_rebuilds == 1
+
+	# A button inside a closed shadow root
+	page.selector_map[2] = _button(102)
+	shadow_root = _button(200)
+	shadow_root.node_type, shadow_root.shadow_root_type = NodeType.DOCUMENT_FRAGMENT_NODE, 'closed'
+	page.selector_map[2].parent_node = shadow_root
+	page.full_rebuilds = 0
+	await agent.multi_act(_clicks(agent, 1, 3))
+	assert page.full_rebuilds == 1
@@ -0,0 +1,171 @@
+"""
+Tests for PageStabilityMonitor, the event-driven replacement for the fixed page load sleeps in DOMWatchdog.
+
+Uses a fake CDP client so we can fire Network/Page/DOM events at exact times without a browser.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+from browser_use.browser.cdp_events import add_cdp_event_handler, remove_cdp_event_handler
+from browser_use.browser.page_stability import PageStabilityMonitor
+
+
+class FakeCDPClient:
+	"""Just enough of cdp_use.CDPClient: one callback per event method, and the few commands the monitor sends."""
+
+	def __init__(self, ready_state: str = 'complete'):
+		self.handlers = {}
+		self.ready_state = ready_state
+
+		def registrar(domain: str):
+			def make(event_name: str):
+				def register(callback):
+					self.handlers[f'{domain}.{event_name}'] = callback
+
+				return register
+
+			return SimpleNamespace(**{name: make(name) for name in self.EVENTS[domain]})
+
+		self.register = SimpleNamespace(**{domain: registrar(domain) for domain in self.EVENTS})
+
+		async def noop(**kwargs):
+			return {}
+
+		async def evaluate(**kwargs):
+			return {'result': {'value': self.ready_state}}
+
+		self.send = SimpleNamespace(
+			Network=SimpleNamespace(enable=noop),
+			Page=SimpleNamespace(setLifecycleEventsEnabled=noop),
+			Runtime=SimpleNamespace(evaluate=evaluate),
+		)
+
+	EVENTS = {
+		'Network': ['requestWillBeSent', 'loadingFinished', 'loadingFailed'],
+		'Page': ['lifecycleEvent'],
+		'DOM': [
+			'childNodeInserted',
+			'childNodeRemoved',
+			'attributeModified',
+			'attributeRemoved',
+			'characterDataModified',
+			'documentUpdated',
+		],
+	}
+
+	def emit(self, method: str, params: dict, session_id: str = 'session-1') -> None:
+		self.handlers[method](params, session_id)
+
+
+async def _started_monitor(ready_state: str = 'complete') -> tuple[PageStabilityMonitor, FakeCDPClient]:
+	client = FakeCDPClient(ready_state)
+	cdp_session = SimpleNamespace(cdp_client=client, target_id='target-1', session_id='session-1')
+	monitor = PageStabilityMonitor(cdp_session)  # type: ignore[arg-type]
+	await monitor.start()
+	return monitor, client
+
+
+def _request(request_id: str, resource_type: str = 'XHR', url: str = 'https://example.com/api/items') -> dict:
+	return {'requestId': request_id, 'type': resource_type, 'request': {'url': url}}
+
+
+async def test_idle_page_returns_well_before_the_upper_bound():
+	monitor, _ = await _started_monitor()
+
+	result = await monitor.wait_until_stable(max_wait=2.0, quiet_period=0.05)
+
+	assert result.stable
+	assert result.waited < 0.5
+
+
+async def test_waits_for_inflight_requests_and_ignores_background_traffic():
+	monitor, client = await _started_monitor()
+	client.emit('Network.requestWillBeSent', _request('1'))
+	client.emit('Network.requestWillBeSent', _request('2', resource_type='WebSocket'))
+	client.emit('Network.requestWillBeSent', _request('3', url='https://www.google-analytics.com/collect'))
+	client.emit('Network.requestWillBeSent', _request('4'), session_id='other-session')
+	assert set(monitor.inflight_requests) == {'1'}
+
+	async def finish_later():
+		await asyncio.sleep(0.2)
+		client.emit('Network.loadingFinished', {'requestId': '1'})
+
+	finisher = asyncio.create_task(finish_later())
+	result = await monitor.wait_until_stable(max_wait=2.0, quiet_period=0.05)
+	await finisher
+
+	assert result.stable
+	assert 0.2 <= result.waited < 1.0
+
+
+async def test_busy_pages_are_bounded_by_max_wait():
+	monitor, client = await _started_monitor(ready_state='loading')
+	assert not monitor.is_loaded
+
+	result = await monitor.wait_until_stable(max_wait=0.2, quiet_period=0.05)
+	assert not result.stable
+	assert 'still loading' in result.reason
+	assert result.waited < 0.5
+
+	client.emit('Page.lifecycleEvent', {'frameId': 'target-1', 'name': 'DOMContentLoaded'})
+	assert monitor.is_loaded
+
+	async def keep_mutating():
+		for i in range(20):
+			client.emit('DOM.attributeModified', {'nodeId': 1, 'name': 'data-tick', 'value': str(i)})
+			await asyncio.sleep(0.02)
+
+	mutator = asyncio.create_task(keep_mutating())
+	result = await monitor.wait_until_stable(max_wait=0.2, quiet_period=0.05)
+	mutator.cancel()
+
+	assert not result.stable
+	assert 'DOM busy' in result.reason
+	assert result.dom_mutations > 0
+
+
+async def test_long_running_requests_stop_blocking_stability():
+	monitor, client = await _started_monitor()
+	monitor.long_running_request_timeout = 0.1
+	client.emit('Network.requestWillBeSent', _request('long-poll'))
+
+	result = await monitor.wait_until_stable(max_wait=2.0, quiet_period=0.05)
+
+	assert result.stable
+	assert result.waited < 0.5
+
+
+async def test_cdp_event_handlers_fan_out_and_stop_unsubscribes():
+	monitor, client = await _started_monitor()
+	seen = []
+
+	def other_handler(event, session_id=None):
+		seen.append(event['nodeId'])
+
+	add_cdp_event_handler(client, 'DOM.childNodeInserted', other_handler)  # type: ignore[arg-type]
+	client.emit('DOM.childNodeInserted', {'nodeId': 7})
+	assert seen == [7]
+	assert monitor.dom_mutation_count == 1
+
+	monitor.stop()
+	remove_cdp_event_handler(client, 'DOM.childNodeInserted', other_handler)  # type: ignore[arg-type]
+	client.emit('DOM.childNodeInserted', {'nodeId': 8})
+	assert seen == [7]
+	assert monitor.dom_mutation_count == 1
+
+
+async def test_async_cdp_event_handlers_are_scheduled():
+	client = FakeCDPClient()
+	seen = []
+
+	async def async_handler(event, session_id=None):
+		seen.append((event['nodeId'], session_id))
+
+	# Adding the same handler twice (e.g. once per tab on a shared flat-session client) still runs it once per event
+	add_cdp_event_handler(client, 'DOM.childNodeInserted', async_handler)  # type: ignore[arg-type]
+	add_cdp_event_handler(client, 'DOM.childNodeInserted', async_handler)  # type: ignore[arg-type]
+	client.emit('DOM.childNodeInserted', {'nodeId': 7})
+	assert seen == []
+	await asyncio.sleep(0)
+	assert seen == [(7, 'session-1')]
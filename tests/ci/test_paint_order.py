@@ -0,0 +1,44 @@
+"""
+Tests for the grid-indexed RectUnionGrid used by PaintOrderRemover: it must make exactly the same decisions
+as the linear RectUnionPure it replaces.
+"""
+
+import random
+
+import pytest
+
+from browser_use.dom.serializer.paint_order import Rect, RectUnionGrid, RectUnionPure
+
+
+def _random_rect(rng: random.Random) -> Rect:
+	x = rng.choice([rng.uniform(-300, 3000), rng.randrange(-2, 12) * 256.0])  # some exactly on cell boundaries
+	y = rng.choice([rng.uniform(-300, 3000), rng.randrange(-2, 12) * 256.0])
+	w, h = rng.choice([(0, rng.uniform(0, 50)), (rng.uniform(0, 80), rng.uniform(0, 80)), (rng.uniform(0, 4000), 30)])
+	return Rect(x, y, x + w, y + h)
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_grid_union_matches_linear_union(seed: int):
+	rng = random.Random(seed)
+	linear, grid = RectUnionPure(), RectUnionGrid(cell_size=256.0, max_cells_per_rect=16)
+
+	for _ in range(400):
+		rect = _random_rect(rng)
+		assert grid.contains(rect) == linear.contains(rect)
+		if rng.random() < 0.7:
+			assert grid.add(rect) == linear.add(rect)
+
+	# not just the answers, the stored disjoint pieces are the same too
+	assert grid._rects == linear._rects
+
+
+def test_grid_union_covers_with_large_and_small_rects():
+	grid = RectUnionGrid(cell_size=100.0, max_cells_per_rect=4)
+	assert not grid.contains(Rect(10, 10, 20, 20))
+
+	grid.add(Rect(0, 0, 1000, 1000))  # large -> checked for every query
+	grid.add(Rect(1000, 0, 1050, 50))
+	assert grid.contains(Rect(10, 10, 20, 20))
+	assert grid.contains(Rect(990, 10, 1040, 40))
+	assert not grid.contains(Rect(990, 10, 1060, 40))
+	assert not grid.add(Rect(100, 100, 200, 200))
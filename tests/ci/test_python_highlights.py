@@ -0,0 +1,84 @@
+"""
+Tests for the Python screenshot highlighting: cached index labels, off-loop rendering and output formats.
+
+Uses synthetic screenshots and lightweight stand-ins for selector map entries, no browser needed.
+"""
+
+import base64
+import io
+import threading
+from types import SimpleNamespace
+
+from PIL import Image, ImageDraw
+
+from browser_use.browser.python_highlights import (
+	create_highlighted_screenshot,
+	draw_enhanced_bounding_box_with_text,
+	get_cross_platform_font,
+)
+from browser_use.dom.views import DOMRect
+from browser_use.utils import get_base64_image_media_type
+
+
+def _screenshot_b64(size: tuple[int, int] = (1280, 720)) -> str:
+	image = Image.new('RGB', size)
+	ImageDraw.Draw(image).rectangle([100, 100, 600, 400], fill=(30, 120, 200))
+	buffer = io.BytesIO()
+	image.save(buffer, format='PNG')
+	return base64.b64encode(buffer.getvalue()).decode()
+
+
+def _element(index: int, x: float, y: float, width: float, height: float, tag_name: str = 'button'):
+	return SimpleNamespace(
+		absolute_position=DOMRect(x, y, width, height),
+		tag_name=tag_name,
+		attributes={},
+		element_index=index,
+		get_meaningful_text_for_llm=lambda: '',
+	)
+
+
+def test_cached_labels_match_direct_drawing():
+	boxes = [
+		((100, 100, 400, 200), '#FF6B6B', '1'),
+		((10, 5, 40, 20), '#4ECDC4', '23'),  # small element, label above and clamped to the top
+		((1250, 700, 1280, 720), '#45B7D1', '456'),  # clamped to the bottom right corner
+		((-5, 300, 800, 600), '#FF6B6B', '7890'),
+	]
+	font = get_cross_platform_font(12)
+
+	for size in ((1280, 720), (2560, 1440)):
+		expected = Image.new('RGBA', size, (200, 200, 200, 255))
+		actual = expected.copy()
+		for bbox, color, text in boxes:
+			draw_enhanced_bounding_box_with_text(ImageDraw.Draw(expected), bbox, color, text, font, 'button', size)
+			for _ in range(2):  # second round is served from the label cache
+				draw_enhanced_bounding_box_with_text(ImageDraw.Draw(actual), bbox, color, text, font, 'button', size, 1.0, actual)
+
+		assert actual.tobytes() == expected.tobytes()
+
+
+async def test_highlighting_runs_in_worker_thread_and_encodes_requested_format(monkeypatch):
+	import browser_use.browser.python_highlights as python_highlights
+
+	render_threads: list[str] = []
+	render = python_highlights.render_highlighted_screenshot
+
+	def tracking_render(*args, **kwargs):
+		render_threads.append(threading.current_thread().name)
+		return render(*args, **kwargs)
+
+	monkeypatch.setattr(python_highlights, 'render_highlighted_screenshot', tracking_render)
+	selector_map = {i: _element(i, 50 + i * 60, 50 + i * 30, 50, 25) for i in range(1, 10)}
+	screenshot = _screenshot_b64()
+
+	png = await create_highlighted_screenshot(screenshot, selector_map)  # type: ignore[arg-type]
+	jpeg = await create_highlighted_screenshot(screenshot, selector_map, image_format='jpeg', image_quality=70)  # type: ignore[arg-type]
+	webp = await create_highlighted_screenshot(screenshot, selector_map, image_format='webp')  # type: ignore[arg-type]
+
+	assert render_threads and all(name.startswith('highlight') for name in render_threads)
+	assert png != screenshot
+	assert [get_base64_image_media_type(image) for image in (png, jpeg, webp)] == ['image/png', 'image/jpeg', 'image/webp']
+	for image_b64 in (png, jpeg, webp):
+		with Image.open(io.BytesIO(base64.b64decode(image_b64))) as image:
+			assert image.size == (1280, 720)
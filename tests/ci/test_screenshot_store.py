@@ -0,0 +1,113 @@
+"""
+Tests for the content-addressed screenshot store and lazy screenshot handles in agent history.
+"""
+
+import base64
+import io
+
+from PIL import Image
+
+from browser_use.agent.gif import create_history_gif
+from browser_use.agent.service import Agent
+from browser_use.agent.views import AgentHistory, AgentHistoryList
+from browser_use.browser.views import PLACEHOLDER_4PX_SCREENSHOT, BrowserStateHistory
+from browser_use.screenshots.service import ScreenshotService
+from tests.ci.conftest import create_mock_llm
+
+
+def make_png(color: tuple[int, int, int], size: tuple[int, int] = (320, 200)) -> str:
+	buffer = io.BytesIO()
+	Image.new('RGB', size, color).save(buffer, format='PNG')
+	return base64.b64encode(buffer.getvalue()).decode()
+
+
+def make_history(screenshot_paths: list[str | None]) -> AgentHistoryList:
+	return AgentHistoryList(
+		history=[
+			AgentHistory(
+				model_output=None,
+				result=[],
+				state=BrowserStateHistory(
+					url='https://example.com', title='Example', tabs=[], interacted_element=[None], screenshot_path=path
+				),
+			)
+			for path in screenshot_paths
+		]
+	)
+
+
+async def test_identical_frames_are_stored_once_with_optional_thumbnails(tmp_path):
+	service = ScreenshotService(tmp_path, thumbnail_size=(80, 80))
+	red, blue = make_png((255, 0, 0)), make_png((0, 0, 255))
+
+	paths = [await service.store_screenshot(screenshot, step) for step, screenshot in enumerate([red, red, blue, red], 1)]
+	assert paths[0] == paths[1] == paths[3] != paths[2]
+	assert service.stored_count == 2 and service.deduplicated_count == 2
+	assert sorted(path.name for path in service.screenshots_dir.iterdir() if path.is_file()) == sorted(
+		{path.split('/')[-1] for path in paths}
+	)
+	assert await service.get_screenshot(paths[2]) == blue
+
+	thumbnails = sorted(service.thumbnails_dir.iterdir())
+	assert len(thumbnails) == 2
+	with Image.open(thumbnails[0]) as thumbnail:
+		assert thumbnail.size == (80, 50)
+
+	# Without thumbnail_size, none are kept
+	plain = ScreenshotService(tmp_path / 'plain')
+	await plain.store_screenshot(red, 1)
+	assert not plain.thumbnails_dir.exists()
+
+
+async def test_history_returns_lazy_handles_and_encodes_shared_frames_once(tmp_path):
+	service = ScreenshotService(tmp_path)
+	red, blue = make_png((255, 0, 0)), make_png((0, 0, 255))
+	red_path, blue_path = await service.store_screenshot(red, 1), await service.store_screenshot(blue, 2)
+	history = make_history([red_path, None, red_path, blue_path])
+
+	refs = history.screenshot_refs()
+	assert [ref.digest if ref else None for ref in refs] == [refs[0].digest, None, refs[0].digest, refs[3].digest]  # type: ignore[union-attr]
+	assert len(history.screenshot_refs(return_none_if_not_screenshot=False)) == 3
+	assert refs[0].thumbnail_path is None  # type: ignore[union-attr]
+
+	view = refs[3].memoryview()  # type: ignore[union-attr]
+	assert view is not None and view.readonly and bytes(view) == base64.b64decode(blue)
+
+	screenshots = history.screenshots()
+	assert screenshots == [red, None, red, blue]
+	assert screenshots[0] is screenshots[2]
+	assert history.screenshots(n_last=1) == [blue]
+	assert history.history[0].state.get_screenshot() == red
+
+	# Handles don't touch the disk until read: a missing file only shows up then
+	missing = make_history([str(tmp_path / 'screenshots' / 'gone.png')])
+	ref = missing.screenshot_refs()[0]
+	assert ref is not None and ref.read_bytes() is None and ref.memoryview() is None
+	assert missing.screenshots() == [None]
+
+
+async def test_gif_is_built_from_lazy_handles(tmp_path):
+	service = ScreenshotService(tmp_path)
+	placeholder = await service.store_screenshot(PLACEHOLDER_4PX_SCREENSHOT, 1)
+	red = await service.store_screenshot(make_png((255, 0, 0)), 2)
+	blue = await service.store_screenshot(make_png((0, 0, 255)), 3)
+	history = make_history([placeholder, red, red, None, blue])
+
+	output_path = tmp_path / 'history.gif'
+	create_history_gif(task='Test task', history=history, output_path=str(output_path), show_goals=False)
+	with Image.open(output_path) as gif:
+		# task frame, red (twice, merged by Pillow), blue: the placeholder and the missing screenshot are skipped
+		assert gif.n_frames == 3
+		assert gif.size == (320, 200)
+
+	placeholder_only = tmp_path / 'placeholder.gif'
+	create_history_gif(task='Test task', history=make_history([placeholder]), output_path=str(placeholder_only))
+	assert not placeholder_only.exists()
+
+
+async def test_agent_passes_thumbnail_size_to_its_screenshot_store(monkeypatch):
+	monkeypatch.setenv('BROWSER_USE_CLOUD_SYNC', 'false')
+	agent = Agent(task='Test task', llm=create_mock_llm(), screenshot_thumbnail_size=(160, 100))
+	assert agent.screenshot_service.thumbnail_size == (160, 100)
+	await agent.close()
+	await agent.eventbus.stop(timeout=1.0)
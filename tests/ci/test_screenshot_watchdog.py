@@ -0,0 +1,156 @@
+"""
+Tests for ScreenshotWatchdog capture options: format/quality, downscaling via clip.scale and reuse of unchanged frames.
+
+Drives the watchdog handler with a fake CDP client that renders a synthetic page, no browser needed.
+"""
+
+import base64
+import io
+import logging
+from types import SimpleNamespace
+
+from PIL import Image, ImageDraw
+
+from browser_use.browser.events import ScreenshotEvent, SendKeysEvent
+from browser_use.browser.profile import BrowserProfile
+from browser_use.browser.watchdogs.screenshot_watchdog import ScreenshotWatchdog, get_perceptual_hash, get_screenshot_scale
+
+
+class FakePage:
+	"""Page.getLayoutMetrics / Page.captureScreenshot for a 1280x720 viewport at device pixel ratio 2."""
+
+	def __init__(self):
+		self.text = 'Hello'
+		self.captures: list[dict] = []
+		self.dom_changes: tuple[str, int] | None = ('token', 0)
+
+	async def getLayoutMetrics(self, session_id):
+		return {
+			'cssVisualViewport': {'clientWidth': 1280, 'clientHeight': 720, 'pageX': 0, 'pageY': 300},
+			'visualViewport': {'clientWidth': 2560, 'clientHeight': 1440},
+		}
+
+	async def captureScreenshot(self, params, session_id):
+		self.captures.append(params)
+		scale = params.get('clip', {}).get('scale', 1.0)
+		image = Image.new('RGB', (int(2560 * scale), int(1440 * scale)), 'white')
+		ImageDraw.Draw(image).text((10, 10), self.text, fill='black', font_size=int(200 * scale))
+		buffer = io.BytesIO()
+		image.save(buffer, format='JPEG' if params['format'] == 'jpeg' else params['format'].upper())
+		return {'data': base64.b64encode(buffer.getvalue()).decode()}
+
+
+def _watchdog(page: FakePage, **profile_kwargs) -> ScreenshotWatchdog:
+	cdp_session = SimpleNamespace(
+		cdp_client=SimpleNamespace(send=SimpleNamespace(Page=page)),
+		session_id='session-1',
+		target_id='target-1',
+		url='https://a.com',
+	)
+
+	async def get_or_create_cdp_session():
+		return cdp_session
+
+	async def remove_highlights():
+		pass
+
+	async def get_dom_change_counter():
+		return page.dom_changes
+
+	browser_session = SimpleNamespace(
+		browser_profile=BrowserProfile(**profile_kwargs),
+		logger=logging.getLogger('test'),
+		get_or_create_cdp_session=get_or_create_cdp_session,
+		remove_highlights=remove_highlights,
+		get_dom_change_counter=get_dom_change_counter,
+	)
+	return ScreenshotWatchdog.model_construct(event_bus=None, browser_session=browser_session)
+
+
+def _size(screenshot_b64: str) -> tuple[int, int]:
+	with Image.open(io.BytesIO(base64.b64decode(screenshot_b64))) as image:
+		return image.size
+
+
+def test_screenshot_scale_keeps_longest_side_within_limit():
+	assert get_screenshot_scale(1280, 720, 2.0, None) == 1.0
+	assert get_screenshot_scale(1280, 720, 1.0, 1568) == 1.0
+	assert get_screenshot_scale(1280, 720, 2.0, 1280) == 0.5
+	assert get_screenshot_scale(720, 1280, 2.0, 640) == 0.25
+
+
+async def test_default_capture_is_native_png():
+	page = FakePage()
+	watchdog = _watchdog(page)
+
+	screenshot = await watchdog.on_ScreenshotEvent(ScreenshotEvent())
+
+	assert page.captures == [{'format': 'png', 'captureBeyondViewport': False}]
+	assert _size(screenshot) == (2560, 1440)
+	assert watchdog.capture_scale == 1.0
+
+
+async def test_downscaled_jpeg_capture():
+	page = FakePage()
+	watchdog = _watchdog(page, screenshot_format='jpeg', screenshot_quality=60, screenshot_max_dimension=1280)
+
+	screenshot = await watchdog.on_ScreenshotEvent(ScreenshotEvent())
+
+	assert page.captures[0]['quality'] == 60
+	assert page.captures[0]['clip'] == {'x': 0, 'y': 300, 'width': 1280, 'height': 720, 'scale': 0.5}
+	assert _size(screenshot) == (1280, 720)
+	assert watchdog.capture_scale == 0.5
+
+
+async def test_unchanged_page_reuses_previous_frame():
+	page = FakePage()
+	watchdog = _watchdog(page, screenshot_reuse_unchanged=True)
+
+	first = await watchdog.on_ScreenshotEvent(ScreenshotEvent())
+	second = await watchdog.on_ScreenshotEvent(ScreenshotEvent())
+	assert second == first
+	assert len(page.captures) == 3  # thumbnail + full frame, then just a thumbnail
+
+	page.text = 'Hello world'
+	third = await watchdog.on_ScreenshotEvent(ScreenshotEvent())
+	assert third != first
+	assert len(page.captures) == 5
+
+
+async def test_changes_too_small_for_the_thumbnail_still_get_a_fresh_frame():
+	page = FakePage()
+	watchdog = _watchdog(page, screenshot_reuse_unchanged=True)
+	await watchdog.on_ScreenshotEvent(ScreenshotEvent())
+
+	# The DOM changed but the thumbnail looks the same (e.g. a caret or a one character edit)
+	page.dom_changes = ('token', 1)
+	await watchdog.on_ScreenshotEvent(ScreenshotEvent())
+	assert len(page.captures) == 4
+
+	# Typing doesn't mutate the DOM (only the input's value), any interaction forgets the last frame
+	await watchdog.on_SendKeysEvent(SendKeysEvent(keys='a'))
+	await watchdog.on_ScreenshotEvent(ScreenshotEvent())
+	assert len(page.captures) == 6
+
+	# Without a DOM change counter frames are never reused
+	page.dom_changes = None
+	await watchdog.on_ScreenshotEvent(ScreenshotEvent())
+	await watchdog.on_ScreenshotEvent(ScreenshotEvent())
+	assert len(page.captures) == 8
+	assert all('clip' not in capture for capture in page.captures[-2:])
+
+
+def test_perceptual_hash_ignores_encoder_noise():
+	image = Image.new('RGB', (320, 180), 'white')
+	ImageDraw.Draw(image).rectangle([20, 20, 200, 100], fill=(40, 80, 160))
+	noisy = image.copy()
+	noisy.putpixel((5, 5), (254, 254, 254))
+
+	def encode(img: Image.Image) -> bytes:
+		buffer = io.BytesIO()
+		img.save(buffer, format='PNG')
+		return buffer.getvalue()
+
+	assert get_perceptual_hash(encode(image)) == get_perceptual_hash(encode(noisy))
+	ImageDraw.Draw(noisy).rectangle([20, 120, 60, 140], fill='black')
+	assert get_perceptual_hash(encode(image)) != get_perceptual_hash(encode(noisy))
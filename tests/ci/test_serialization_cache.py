@@ -0,0 +1,122 @@
+"""
+Tests for the cross-step SerializationCache used by DOMTreeSerializer.
+
+Builds synthetic enhanced DOM trees (no browser needed), serializes them the way consecutive agent steps do and checks
+that cached results are reused for unchanged elements, recomputed for changed ones, and never change the output.
+"""
+
+import logging
+from types import SimpleNamespace
+
+from browser_use.dom.serializer.cache import SerializationCache, element_fingerprint
+from browser_use.dom.serializer.serializer import DOMTreeSerializer
+from browser_use.dom.service import DomService
+from browser_use.dom.views import DOMRect, EnhancedDOMTreeNode, EnhancedSnapshotNode
+
+
+def _element(node_id: int, name: str, attributes: dict[str, str], children: list | None = None) -> dict:
+	node = {
+		'nodeId': node_id,
+		'backendNodeId': node_id + 100,
+		'nodeType': 1,
+		'nodeName': name,
+		'nodeValue': '',
+		'attributes': [item for pair in attributes.items() for item in pair],
+		'children': children or [],
+	}
+	for child in node['children']:
+		child['parentId'] = node_id
+	return node
+
+
+def _text(node_id: int, text: str) -> dict:
+	return {'nodeId': node_id, 'backendNodeId': node_id + 100, 'nodeType': 3, 'nodeName': '#text', 'nodeValue': text}
+
+
+def _build_tree(card_attributes: dict[str, str]) -> EnhancedDOMTreeNode:
+	"""A fresh enhanced tree, like the one DomService rebuilds on every step."""
+	card = _element(5, 'DIV', card_attributes, [_text(6, 'Card title')])
+	body = _element(3, 'BODY', {}, [_element(4, 'BUTTON', {'aria-label': 'Save'}, [_text(7, 'Save')]), card])
+	root = {
+		'nodeId': 1,
+		'backendNodeId': 101,
+		'nodeType': 9,
+		'nodeName': '#document',
+		'nodeValue': '',
+		'children': [_element(2, 'HTML', {}, [body])],
+	}
+	root['children'][0]['frameId'] = 'main-frame'
+	snapshot_lookup = {
+		backend_node_id: EnhancedSnapshotNode(
+			is_clickable=None,
+			cursor_style=None,
+			bounds=DOMRect(0, index * 40, 300, 30),
+			clientRects=DOMRect(0, 0, 1280, 720) if backend_node_id == 102 else None,
+			scrollRects=DOMRect(0, 0, 1280, 720) if backend_node_id == 102 else None,
+			computed_styles={'display': 'block', 'visibility': 'visible', 'opacity': '1'},
+			paint_order=None,
+			stacking_contexts=None,
+		)
+		for index, backend_node_id in enumerate(range(102, 108))
+	}
+	service = DomService(browser_session=SimpleNamespace(agent_focus=None), logger=logging.getLogger('test'))  # type: ignore[arg-type]
+	tree, _ = service._build_enhanced_tree(root, 'target-1', {}, snapshot_lookup)  # type: ignore[arg-type]
+	return tree
+
+
+def _serialize(tree: EnhancedDOMTreeNode, cache: SerializationCache | None) -> str:
+	state, _ = DOMTreeSerializer(tree, cache=cache).serialize_accessible_elements()
+	return state.llm_representation()
+
+
+def test_unchanged_elements_hit_the_cache_across_steps():
+	cache = SerializationCache()
+	expected = _serialize(_build_tree({'class': 'card'}), cache=None)
+
+	assert _serialize(_build_tree({'class': 'card'}), cache) == expected
+	assert cache.misses > 0
+
+	assert _serialize(_build_tree({'class': 'card'}), cache) == expected
+	assert cache.hits > 0 and cache.misses == 0
+
+
+def test_changed_elements_are_recomputed():
+	cache = SerializationCache()
+	before = _serialize(_build_tree({'class': 'card'}), cache)
+	assert '<div' not in before
+
+	after = _serialize(_build_tree({'class': 'card', 'onclick': 'open()', 'title': 'Open card'}), cache)
+
+	assert after == _serialize(_build_tree({'class': 'card', 'onclick': 'open()', 'title': 'Open card'}), cache=None)
+	assert '<div title=Open card />' in after
+	assert cache.misses > 0
+
+
+def test_entries_unused_for_a_whole_step_are_dropped():
+	cache = SerializationCache()
+	cache.start_step()
+	cache.get_or_compute('a', lambda: 1)
+	cache.get_or_compute('b', lambda: 2)
+
+	cache.start_step()
+	assert cache.get_or_compute('a', lambda: 10) == 1  # carried over
+	cache.start_step()
+	assert cache.get_or_compute('b', lambda: 20) == 20  # not used last step, recomputed
+	assert len(cache) == 2
+
+
+def test_fingerprint_ignores_position_but_not_size_or_attributes():
+	tree = _build_tree({'class': 'card'})
+	card = tree.children_nodes[0].children_nodes[0].children_nodes[1]  # type: ignore[index]
+	fingerprint = element_fingerprint(card)
+
+	assert card.snapshot_node and card.snapshot_node.bounds
+	card.snapshot_node.bounds.y += 500
+	assert element_fingerprint(card) == fingerprint
+
+	card.snapshot_node.bounds.width = 40
+	assert element_fingerprint(card) != fingerprint
+
+	card.snapshot_node.bounds.width = 300
+	card.attributes['role'] = 'button'
+	assert element_fingerprint(card) != fingerprint
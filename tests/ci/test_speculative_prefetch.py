@@ -0,0 +1,147 @@
+"""
+Tests for Agent(speculative_prefetch=True): the next browser state is fetched while the step finishes, and the page's
+markdown is converted while the LLM is thinking.
+
+The browser session is never started: the browser state, page URL and markdown conversion are patched.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from browser_use.agent.service import Agent
+from browser_use.agent.views import ActionResult
+from browser_use.browser import BrowserSession
+from browser_use.browser.profile import BrowserProfile
+from browser_use.browser.views import BrowserStateSummary, TabInfo
+from browser_use.dom.views import SerializedDOMState
+from browser_use.tools.service import Tools
+from tests.ci.conftest import create_mock_llm
+
+
+def _output(action: dict) -> str:
+	return json.dumps({'evaluation_previous_goal': '', 'memory': '', 'next_goal': '', 'action': [action]})
+
+
+class FakeBrowser:
+	def __init__(self):
+		self.url = 'https://shop.example.com/'
+		self.state_fetches: list[str] = []
+		self.markdown_conversions = 0
+
+
+@pytest.fixture
+def browser(monkeypatch):
+	monkeypatch.setenv('BROWSER_USE_CLOUD_SYNC', 'false')
+	browser = FakeBrowser()
+
+	async def get_browser_state_summary(self, include_screenshot=True, cached=False, include_recent_events=False):
+		browser.state_fetches.append(browser.url)
+		await asyncio.sleep(0.05)  # network idle wait + screenshot + DOM build
+		return BrowserStateSummary(
+			dom_state=SerializedDOMState(_root=None, selector_map={}),
+			url=browser.url,
+			title='Shop',
+			tabs=[TabInfo(target_id='ABCD1234ABCD1234ABCD1234ABCD1234ABCD1234', url=browser.url, title='Shop')],
+			page_load_wait=0.05,
+			page_load_wait_reason='stable',
+		)
+
+	async def get_current_page_url(self):
+		return browser.url
+
+	async def extract_clean_markdown(self, browser_session, extract_links=False):
+		await asyncio.sleep(0.05)
+		browser.markdown_conversions += 1
+		return '# Shop', {}
+
+	monkeypatch.setattr(BrowserSession, 'get_browser_state_summary', get_browser_state_summary)
+	monkeypatch.setattr(BrowserSession, 'get_current_page_url', get_current_page_url)
+	monkeypatch.setattr(Tools, 'extract_clean_markdown', extract_clean_markdown)
+	return browser
+
+
+def _agent(browser: FakeBrowser, monkeypatch, actions: list[dict]) -> Agent:
+	agent = Agent(
+		task='find the price',
+		llm=create_mock_llm([_output(action) for action in actions]),
+		browser_session=BrowserSession(browser_profile=BrowserProfile(wait_between_actions=0)),
+		speculative_prefetch=True,
+	)
+
+	async def act(action, **kwargs):
+		return ActionResult(extracted_content=f'ran {next(iter(action.model_dump(exclude_unset=True)))}')
+
+	async def check_and_update_downloads(context=''):
+		await asyncio.sleep(0.03)  # post-processing the speculative fetch can overlap with
+
+	monkeypatch.setattr(agent.tools, 'act', act)
+	monkeypatch.setattr(agent, '_check_and_update_downloads', check_and_update_downloads)
+	return agent
+
+
+async def test_next_state_is_prefetched_during_post_processing(browser, monkeypatch):
+	agent = _agent(browser, monkeypatch, [{'wait': {'seconds': 1}}, {'wait': {'seconds': 1}}])
+
+	await agent.step()
+	await agent.step()
+	# One fetch for the first step, then each step prefetches the state of the next one
+	assert len(browser.state_fetches) == 3
+
+	metadata = [item.metadata for item in agent.history.history]
+	assert metadata[0] is not None and metadata[0].prefetch_overlap_seconds == 0
+	assert metadata[1] is not None and metadata[1].prefetch_overlap_seconds and metadata[1].prefetch_overlap_seconds > 0
+	await agent.close()
+	await agent.eventbus.stop(timeout=1.0)
+
+
+async def test_page_load_wait_is_recorded_per_step(browser, monkeypatch):
+	agent = _agent(browser, monkeypatch, [{'wait': {'seconds': 1}}, {'wait': {'seconds': 1}}])
+
+	await agent.step()
+	await agent.step()
+
+	for item in agent.history.history:
+		assert item.state.url == 'https://shop.example.com/'
+		assert item.metadata is not None
+		assert item.metadata.page_load_wait_seconds == 0.05
+		assert item.metadata.page_load_wait_reason == 'stable'
+	await agent.close()
+	await agent.eventbus.stop(timeout=1.0)
+
+
+async def test_prefetched_state_is_dropped_after_navigation(browser, monkeypatch):
+	agent = _agent(browser, monkeypatch, [{'wait': {'seconds': 1}}])
+
+	await agent.step()
+	browser.url = 'https://shop.example.com/checkout'  # e.g. an on_step_end hook navigated
+	await agent.step()
+
+	assert browser.state_fetches[-1] == 'https://shop.example.com/checkout'
+	assert agent.history.history[-1].state.url == 'https://shop.example.com/checkout'
+	await agent.close()
+	await agent.eventbus.stop(timeout=1.0)
+
+
+async def test_markdown_warmup_is_kept_only_for_extraction(browser, monkeypatch):
+	agent = _agent(
+		browser, monkeypatch, [{'wait': {'seconds': 1}}, {'extract_structured_data': {'query': 'price', 'extract_links': False}}]
+	)
+
+	await agent.step()
+	assert browser.markdown_conversions == 0  # cancelled, the model did not extract
+
+	await agent.step()
+	assert browser.markdown_conversions == 1
+	await agent.close()
+	await agent.eventbus.stop(timeout=1.0)
+
+
+async def test_markdown_warmup_is_not_awaited_for_extraction_with_links(browser, monkeypatch):
+	agent = _agent(browser, monkeypatch, [{'extract_structured_data': {'query': 'product links', 'extract_links': True}}])
+
+	await agent.step()
+	assert browser.markdown_conversions == 0  # warmed up without links, which the extraction can't reuse
+	await agent.close()
+	await agent.eventbus.stop(timeout=1.0)
@@ -365,6 +365,9 @@ class TestCloudSync:
 			)
 		)
 
+		# Events are uploaded in the background, flush to send them now
+		await service.flush()
+
 		# Check request was made
 		assert len(requests) == 1
 		request_data = requests[0]
@@ -379,6 +382,7 @@ class TestCloudSync:
 		assert event['event_type'] == 'CreateAgentTaskEvent'
 		assert event['user_id'] == 'test-user-123'
 		assert event['task'] == 'Test task'
+		await service.close()
 
 	async def test_send_event_pre_auth(self, httpserver: HTTPServer, temp_config_dir):
 		"""Test that non-session events are not sent when auth is not in progress."""
@@ -421,6 +425,7 @@ class TestCloudSync:
 		)
 
 		# Check that no requests were made
+		await service.flush()
 		assert len(requests) == 0
 
 	async def test_block_events_during_auth_progress(self, httpserver: HTTPServer, temp_config_dir):
@@ -499,6 +504,7 @@ class TestCloudSync:
 		)
 
 		# Check that the task event was NOT sent (blocked for security during auth)
+		await service.flush()
 		assert len(requests) == 0
 
 		# Clean up the background task to avoid test flakiness
@@ -550,6 +556,7 @@ class TestCloudSync:
 		)
 
 		# No requests should have been made yet
+		await service.flush()
 		assert len(requests) == 0
 
 		# Now authenticate the auth client
@@ -572,10 +579,12 @@ class TestCloudSync:
 		)
 
 		# Now exactly one request should have been made (the post-auth event)
+		await service.flush()
 		assert len(requests) == 1
 		assert requests[0]['headers']['Authorization'] == 'Bearer test-api-key'
 		assert requests[0]['json']['events'][0]['user_id'] == 'test-user-123'
 		assert requests[0]['json']['events'][0]['task'] == 'Post-auth task'
+		await service.close()
 
 	async def test_error_handling(self, httpserver: HTTPServer, temp_config_dir):
 		"""Test error handling during event sending."""
@@ -607,6 +616,8 @@ class TestCloudSync:
 		)
 
 		# Should handle error gracefully without crashing
+		await service.close()
+		assert service.uploader.events_sent == 0 and service.uploader.events_dropped == 1
 
 	# async def test_update_wal_events(self, temp_config_dir):
 	# 	"""Test updating WAL events with real user ID."""
@@ -781,6 +792,7 @@ class TestIntegration:
 		saved_auth = json.loads(content)
 		assert saved_auth['api_token'] == 'test-api-key'
 		assert saved_auth['user_id'] == 'test-user-123'
+		await service.close()
 
 
 class TestAuthResilience:
@@ -849,6 +861,7 @@ class TestAuthResilience:
 
 		# Agent should continue functioning despite sync failure
 		assert True  # No exception raised
+		await service.close()
 
 	async def test_auth_failure_resilience(self, httpserver: HTTPServer, http_client, temp_config_dir):
 		"""Test that auth failures don't break the agent."""
@@ -890,6 +903,7 @@ class TestAuthResilience:
 				device_id='test-device-id',
 			)
 		)
+		await service.close()
 
 	async def test_server_downtime_resilience(self, httpserver: HTTPServer, http_client, temp_config_dir):
 		"""Test that server downtime doesn't break the agent."""
@@ -921,6 +935,7 @@ class TestAuthResilience:
 				device_id='test-device-id',
 			)
 		)
+		await service.close()
 
 	async def test_excessive_event_queue_handling(self, httpserver: HTTPServer, http_client, temp_config_dir):
 		"""Test that excessive event queuing doesn't break the agent."""
@@ -949,6 +964,7 @@ class TestAuthResilience:
 
 		# Agent should still be functioning
 		assert True  # No memory issues or crashes
+		await service.close()
 
 	async def test_malformed_server_responses(self, httpserver: HTTPServer, http_client, temp_config_dir):
 		"""Test that malformed server responses don't break the agent."""
@@ -991,3 +1007,4 @@ class TestAuthResilience:
 				device_id='test-device-id',
 			)
 		)
+		await service.close()
@@ -0,0 +1,145 @@
+"""
+Tests for the live target / frame tree registry behind BrowserSession.get_all_frames and get_tabs.
+
+Uses a fake CDP client that records round-trips and lets the test fire CDP events, no browser needed.
+"""
+
+from types import SimpleNamespace
+
+from browser_use.browser.target_registry import TargetRegistry
+
+
+class FakeDomain:
+	def __init__(self, client: 'FakeCDPClient', domain: str):
+		self._client = client
+		self._domain = domain
+
+	def __getattr__(self, name: str):
+		method = f'{self._domain}.{name}'
+
+		async def send(params=None, session_id=None):
+			self._client.calls.append(method)
+			return self._client.responses[method](params, session_id)
+
+		def register(callback):
+			self._client.handlers[method] = callback
+
+		return send if self._client.mode == 'send' else register
+
+
+class FakeCDPClient:
+	def __init__(self):
+		self.calls: list[str] = []
+		self.handlers: dict = {}
+		self.targets = [
+			{'targetId': 'page-1', 'type': 'page', 'url': 'https://a.com', 'title': 'A'},
+			{'targetId': 'iframe-1', 'type': 'iframe', 'url': 'https://ads.com', 'title': ''},
+		]
+		self.responses = {
+			'Target.setDiscoverTargets': lambda params, session_id: {},
+			'Target.getTargets': lambda params, session_id: {'targetInfos': list(self.targets)},
+			'Page.getFrameTree': lambda params, session_id: {'frameTree': {'frame': {'id': f'frame-of-{session_id}'}}},
+			'DOM.enable': lambda params, session_id: {},
+			'DOM.getFrameOwner': lambda params, session_id: {'backendNodeId': 42, 'nodeId': 7},
+		}
+
+	@property
+	def send(self):
+		return SimpleNamespace(**{domain: self._domain('send', domain) for domain in ('Target', 'Page', 'DOM')})
+
+	@property
+	def register(self):
+		return SimpleNamespace(**{domain: self._domain('register', domain) for domain in ('Target', 'Page')})
+
+	def _domain(self, mode: str, domain: str) -> FakeDomain:
+		self.mode = mode
+		return FakeDomain(self, domain)
+
+	def fire(self, method: str, event: dict, session_id: str | None = None) -> None:
+		self.handlers[method](event, session_id)
+
+
+def _session(client: FakeCDPClient, target_id: str, session_id: str):
+	return SimpleNamespace(cdp_client=client, target_id=target_id, session_id=session_id)
+
+
+async def test_targets_follow_target_events():
+	client = FakeCDPClient()
+	registry = TargetRegistry()
+	await registry.start(client)  # type: ignore[arg-type]
+	assert [target['targetId'] for target in registry.get_targets()] == ['page-1', 'iframe-1']
+
+	client.fire('Target.targetCreated', {'targetInfo': {'targetId': 'page-2', 'type': 'page', 'url': 'about:blank', 'title': ''}})
+	client.fire(
+		'Target.targetInfoChanged', {'targetInfo': {'targetId': 'page-1', 'type': 'page', 'url': 'https://a.com/x', 'title': 'X'}}
+	)
+	client.fire('Target.targetDestroyed', {'targetId': 'iframe-1'})
+
+	assert {target['targetId']: target['title'] for target in registry.get_targets()} == {'page-1': 'X', 'page-2': ''}
+	assert client.calls.count('Target.getTargets') == 1
+
+
+async def test_frame_trees_are_cached_until_a_frame_event():
+	client = FakeCDPClient()
+	registry = TargetRegistry()
+	await registry.start(client)  # type: ignore[arg-type]
+	page = _session(client, 'page-1', 'session-1')
+	iframe = _session(client, 'iframe-1', 'session-2')
+
+	for _ in range(3):
+		assert await registry.get_frame_tree(page) == {'frame': {'id': 'frame-of-session-1'}}  # type: ignore[arg-type]
+		await registry.get_frame_tree(iframe)  # type: ignore[arg-type]
+		assert await registry.get_frame_owner(client, 'page-1', 'session-1', 'frame-x') == {'backendNodeId': 42, 'nodeId': 7}  # type: ignore[arg-type]
+	assert client.calls.count('Page.getFrameTree') == 2
+	assert client.calls.count('DOM.getFrameOwner') == 1
+
+	# An iframe in the page navigated: only the page's tree and frame owners are refetched
+	client.fire('Page.frameNavigated', {'frame': {'id': 'frame-x'}}, session_id='session-1')
+	await registry.get_frame_tree(page)  # type: ignore[arg-type]
+	await registry.get_frame_tree(iframe)  # type: ignore[arg-type]
+	await registry.get_frame_owner(client, 'page-1', 'session-1', 'frame-x')  # type: ignore[arg-type]
+	assert client.calls.count('Page.getFrameTree') == 3
+	assert client.calls.count('DOM.getFrameOwner') == 2
+
+	# Destroyed targets drop their cached tree
+	client.fire('Target.targetDestroyed', {'targetId': 'iframe-1'})
+	await registry.get_frame_tree(iframe)  # type: ignore[arg-type]
+	assert client.calls.count('Page.getFrameTree') == 4
+
+
+async def test_execute_action_reads_the_page_url_from_the_registry():
+	from pydantic import BaseModel
+
+	from browser_use.browser import BrowserSession
+	from browser_use.browser.session import CDPSession
+	from browser_use.tools.registry.service import Registry
+
+	client = FakeCDPClient()
+	browser_session = BrowserSession(cdp_url='ws://127.0.0.1:9222/devtools/browser/fake')
+	browser_session._cdp_client_root = client  # type: ignore[assignment]
+	browser_session.agent_focus = CDPSession.model_construct(cdp_client=client, target_id='page-1', session_id='session-1')
+	browser_session._target_registry = TargetRegistry()
+	await browser_session._target_registry.start(client)  # type: ignore[arg-type]
+	client.fire('Target.targetInfoChanged', {'targetInfo': {**client.targets[0], 'url': 'https://login.example.com/'}})
+
+	class TypeParams(BaseModel):
+		text: str
+
+	registry = Registry()
+	seen = {}
+
+	@registry.action('Type text', param_model=TypeParams)
+	async def type_text(params: TypeParams, page_url: str):
+		seen['text'], seen['page_url'] = params.text, page_url
+
+	calls_before = len(client.calls)
+	await registry.execute_action(
+		'type_text',
+		{'text': '<secret>password</secret>'},
+		browser_session=browser_session,
+		sensitive_data={'https://*.example.com': {'password': 'hunter2'}},
+	)
+
+	assert seen == {'text': 'hunter2', 'page_url': 'https://login.example.com/'}
+	assert client.calls[calls_before:] == []
+	assert registry.last_action_round_trips_saved == 2
@@ -0,0 +1,84 @@
+"""
+Tests for VideoRecorderService: frames are queued without blocking and piped into one long-lived encoder process.
+
+The encoder is a small Python process reading stdin instead of ffmpeg, so the tests don't need the [video] extra.
+"""
+
+import base64
+import sys
+import time
+from pathlib import Path
+
+from browser_use.browser import video_recorder
+from browser_use.browser.profile import ViewportSize
+from browser_use.browser.video_recorder import VideoRecorderService
+
+# Copies stdin to the output file, optionally sleeping first to simulate a slow encoder, then exits with the given code
+ENCODER = 'import shutil, sys, time; time.sleep(float(sys.argv[2])); shutil.copyfileobj(sys.stdin.buffer, open(sys.argv[1], "wb")); sys.exit(int(sys.argv[3]))'
+
+
+def _recorder(monkeypatch, tmp_path: Path, delay: float = 0.0, exit_code: int = 0, **kwargs) -> VideoRecorderService:
+	monkeypatch.setattr(video_recorder, 'IMAGEIO_AVAILABLE', True)
+	recorder = VideoRecorderService(
+		output_path=tmp_path / 'videos' / 'session.mp4', size=ViewportSize(width=100, height=50), framerate=30, **kwargs
+	)
+	monkeypatch.setattr(
+		recorder,
+		'_get_encoder_command',
+		lambda: [sys.executable, '-c', ENCODER, str(recorder.output_path), str(delay), str(exit_code)],
+	)
+	return recorder
+
+
+def _frame(i: int) -> str:
+	return base64.b64encode(f'<frame {i}>'.encode()).decode()
+
+
+def test_frames_are_piped_into_a_single_encoder_process(monkeypatch, tmp_path):
+	recorder = _recorder(monkeypatch, tmp_path)
+	recorder.start()
+	assert recorder._is_active and recorder.padded_size == ViewportSize(width=112, height=64)
+
+	for i in range(20):
+		assert recorder.add_frame(_frame(i))
+		time.sleep(0.001)
+	recorder.stop_and_save()
+
+	assert recorder.output_path.read_bytes() == b''.join(f'<frame {i}>'.encode() for i in range(20))
+	assert recorder.frames_written == 20 and recorder.frames_dropped == 0
+	assert not recorder._is_active
+	assert not recorder.add_frame(_frame(20))
+
+
+def test_frames_are_dropped_instead_of_blocking_when_the_encoder_is_behind(monkeypatch, tmp_path):
+	recorder = _recorder(monkeypatch, tmp_path, delay=0.5, max_pending_frames=5)
+	recorder.start()
+
+	started = time.perf_counter()
+	queued = [recorder.add_frame(_frame(i)) for i in range(200)]
+	assert time.perf_counter() - started < 0.2  # never waits for the encoder
+
+	recorder.stop_and_save()
+	written = recorder.output_path.read_bytes()
+	assert recorder.frames_dropped == queued.count(False) > 0
+	assert recorder.frames_written == queued.count(True) == written.count(b'<frame ')
+	assert written.startswith(b'<frame 0>')
+
+
+def test_encoder_failure_is_logged_and_does_not_block(monkeypatch, tmp_path, caplog):
+	recorder = _recorder(monkeypatch, tmp_path, exit_code=1)
+	recorder.start()
+	for i in range(10):
+		recorder.add_frame(_frame(i))
+	recorder.stop_and_save()
+
+	assert 'ffmpeg exited with code 1' in caplog.text
+	assert recorder._process is None and not recorder._is_active
+
+
+def test_missing_dependencies_disable_recording(monkeypatch, tmp_path):
+	monkeypatch.setattr(video_recorder, 'IMAGEIO_AVAILABLE', False)
+	recorder = VideoRecorderService(output_path=tmp_path / 'session.mp4', size=ViewportSize(width=100, height=50), framerate=30)
+	recorder.start()
+	assert not recorder._is_active
+	assert not recorder.add_frame(_frame(0))
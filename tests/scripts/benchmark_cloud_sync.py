@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Benchmark: time CloudSync.handle_event spends on the agent's path, one new HTTP client and POST per event (previous
+behavior) vs. the batched background uploader, against a local stub API that answers after --latency seconds.
+
+Usage:
+	python tests/scripts/benchmark_cloud_sync.py [--events 50] [--latency 0.05] [--screenshot-kb 300]
+"""
+
+import argparse
+import asyncio
+import base64
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import httpx
+
+from browser_use.agent.cloud_events import CreateAgentStepEvent
+from browser_use.sync.service import CloudSync
+
+
+def start_stub_server(latency: float) -> tuple[ThreadingHTTPServer, dict]:
+	stats = {'requests': 0, 'bytes': 0}
+
+	class Handler(BaseHTTPRequestHandler):
+		protocol_version = 'HTTP/1.1'  # keep-alive, like the real API
+
+		def do_POST(self):
+			body = self.rfile.read(int(self.headers['Content-Length']))
+			stats['requests'] += 1
+			stats['bytes'] += len(body)
+			time.sleep(latency)
+			self.send_response(200)
+			self.send_header('Content-Length', '2')
+			self.end_headers()
+			self.wfile.write(b'{}')
+
+		def log_message(self, *args):
+			pass
+
+	server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+	threading.Thread(target=server.serve_forever, daemon=True).start()
+	return server, stats
+
+
+def make_events(count: int, screenshot_kb: int) -> list[CreateAgentStepEvent]:
+	screenshot = base64.b64encode(os.urandom(screenshot_kb * 256) * 3).decode()  # compressible-ish, like a PNG page
+	return [
+		CreateAgentStepEvent(
+			user_id='bench-user',
+			agent_task_id='bench-task',
+			step=i,
+			actions=[{'click': {'index': i}}],
+			next_goal='next',
+			evaluation_previous_goal='ok',
+			memory='memory',
+			screenshot_url=f'data:image/png;base64,{screenshot}',
+			url=f'https://example.com/{i}',
+		)
+		for i in range(count)
+	]
+
+
+async def legacy_send(base_url: str, event: CreateAgentStepEvent) -> None:
+	"""The previous CloudSync._send_event: a new client and one POST per event, awaited inline."""
+	async with httpx.AsyncClient() as client:
+		await client.post(f'{base_url}/api/v1/events', json={'events': [event.model_dump(mode='json')]}, timeout=10.0)
+
+
+async def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument('--events', type=int, default=50)
+	parser.add_argument('--latency', type=float, default=0.05, help='stub API response delay in seconds')
+	parser.add_argument('--screenshot-kb', type=int, default=300)
+	args = parser.parse_args()
+
+	server, stats = start_stub_server(args.latency)
+	base_url = f'http://127.0.0.1:{server.server_port}'
+	events = make_events(args.events, args.screenshot_kb)
+	print(
+		f'{args.events} step events with ~{args.screenshot_kb * 1024 * 4 // 3 // 1024} KB screenshots, {args.latency}s API latency'
+	)
+
+	start = time.perf_counter()
+	for event in events:
+		await legacy_send(base_url, event)
+	legacy_seconds = time.perf_counter() - start
+	legacy_requests, legacy_bytes = stats['requests'], stats['bytes']
+	print(
+		f'per-event POST : {legacy_seconds / args.events * 1000:7.1f} ms/event inline, '
+		f'{legacy_requests} requests, {legacy_bytes / 1e6:.1f} MB'
+	)
+
+	sync = CloudSync(base_url=base_url)
+	sync.enabled = True
+	sync.allow_session_events_for_auth = True  # send without credentials
+	start = time.perf_counter()
+	for event in events:
+		await sync.handle_event(event)
+	inline_seconds = time.perf_counter() - start
+	await sync.close()
+	total_seconds = time.perf_counter() - start
+	print(
+		f'batched upload : {inline_seconds / args.events * 1000:7.1f} ms/event inline, '
+		f'{stats["requests"] - legacy_requests} requests, {(stats["bytes"] - legacy_bytes) / 1e6:.1f} MB, '
+		f'all uploaded after {total_seconds:.2f}s ({sync.uploader.events_sent} sent, {sync.uploader.events_dropped} dropped)'
+	)
+	server.shutdown()
+
+
+if __name__ == '__main__':
+	asyncio.run(main())
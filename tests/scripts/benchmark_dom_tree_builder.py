@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: synchronous explicit-stack enhanced DOM tree builder vs. the previous recursive async builder.
+
+Builds a synthetic page (nested elements, text nodes, shadow roots and same-origin iframes with scrolled documents)
+and times DomService._build_enhanced_tree against a copy of the old per-node coroutine builder, then checks that
+both produce identical trees (structure, visibility, absolute positions and the in-place adjusted snapshot bounds).
+
+Usage:
+	python tests/scripts/benchmark_dom_tree_builder.py [--nodes 30000] [--repeat 5]
+"""
+
+import argparse
+import asyncio
+import gc
+import logging
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from browser_use.dom.service import DomService
+from browser_use.dom.views import DOMRect, EnhancedDOMTreeNode, EnhancedSnapshotNode, NodeType
+
+
+def make_page(total_nodes: int, seed: int = 0) -> tuple[dict, dict[int, dict]]:
+	"""Return a raw CDP-like DOM tree and the snapshot specs (backendNodeId -> bounds/scroll/styles) for it."""
+	rng = random.Random(seed)
+	next_id = [1]
+	snapshots: dict[int, dict] = {}
+
+	def new_node(name: str, node_type: int = 1, parent_id: int | None = None, **extra) -> dict:
+		node_id = next_id[0]
+		next_id[0] += 1
+		node = {
+			'nodeId': node_id,
+			'backendNodeId': node_id + 100_000,
+			'nodeType': node_type,
+			'nodeName': name,
+			'nodeValue': '' if node_type == 1 else 'some text',
+			'attributes': ['class', f'c{node_id}', 'id', f'n{node_id}'] if node_type == 1 else [],
+			**extra,
+		}
+		if parent_id is not None:
+			node['parentId'] = parent_id
+		snapshots[node['backendNodeId']] = {
+			'bounds': (rng.uniform(0, 1200), rng.uniform(0, 6000), rng.uniform(10, 400), rng.uniform(10, 300)),
+			'display': 'none' if rng.random() < 0.05 else 'block',
+		}
+		return node
+
+	def new_document(parent_id: int | None, budget: int, depth: int) -> dict:
+		document = new_node('#document', node_type=9, parent_id=parent_id)
+		html = new_node('HTML', parent_id=document['nodeId'], frameId=f'frame-{document["nodeId"]}')
+		snapshots[html['backendNodeId']].update(scroll=(0.0, rng.uniform(0, 800)), client=(1280.0, 720.0))
+		body = new_node('BODY', parent_id=html['nodeId'])
+		html['children'] = [body]
+		document['children'] = [html]
+		fill(body, budget, depth)
+		return document
+
+	def fill(parent: dict, budget: int, depth: int) -> None:
+		parent['children'] = []
+		while budget > 0:
+			roll = rng.random()
+			if roll < 0.01 and depth < 3 and budget > 200:
+				iframe = new_node('IFRAME', parent_id=parent['nodeId'], frameId=f'frame-owner-{next_id[0]}')
+				iframe['contentDocument'] = new_document(iframe['nodeId'], budget // 4, depth + 1)
+				budget -= budget // 4
+				parent['children'].append(iframe)
+			elif roll < 0.02 and budget > 20:
+				host = new_node('DIV', parent_id=parent['nodeId'])
+				shadow_root = new_node('#document-fragment', node_type=11, parent_id=host['nodeId'], shadowRootType='open')
+				fill(shadow_root, 10, depth + 1)
+				host['shadowRoots'] = [shadow_root]
+				budget -= 12
+				parent['children'].append(host)
+			elif roll < 0.3:
+				parent['children'].append(new_node('#text', node_type=3, parent_id=parent['nodeId']))
+				budget -= 1
+			else:
+				element = new_node(rng.choice(['DIV', 'SPAN', 'A', 'BUTTON', 'INPUT', 'LI']), parent_id=parent['nodeId'])
+				parent['children'].append(element)
+				budget -= 1
+				if depth < 40 and rng.random() < 0.6:
+					child_budget = min(budget, rng.randint(1, 30))
+					fill(element, child_budget, depth + 1)
+					budget -= child_budget
+
+	return new_document(None, total_nodes, 0), snapshots
+
+
+def make_snapshot_lookup(snapshots: dict[int, dict]) -> dict[int, EnhancedSnapshotNode]:
+	"""Fresh snapshot nodes for every run, visibility checks shift the bounds in place."""
+	lookup = {}
+	for backend_node_id, spec in snapshots.items():
+		scroll = spec.get('scroll')
+		client = spec.get('client')
+		lookup[backend_node_id] = EnhancedSnapshotNode(
+			is_clickable=None,
+			cursor_style=None,
+			bounds=DOMRect(*spec['bounds']),
+			clientRects=DOMRect(0.0, 0.0, *client) if client else None,
+			scrollRects=DOMRect(*scroll, 1280.0, 8000.0) if scroll else None,
+			computed_styles={'display': spec['display'], 'visibility': 'visible', 'opacity': '1'},
+			paint_order=None,
+			stacking_contexts=None,
+		)
+	return lookup
+
+
+async def legacy_build(service: DomService, root: dict, snapshot_lookup: dict[int, EnhancedSnapshotNode]) -> EnhancedDOMTreeNode:
+	"""The previous recursive async builder (same-target part), kept here as the baseline."""
+	enhanced_dom_tree_node_lookup: dict[int, EnhancedDOMTreeNode] = {}
+
+	async def _construct_enhanced_node(node, html_frames, total_frame_offset) -> EnhancedDOMTreeNode:
+		if html_frames is None:
+			html_frames = []
+		if total_frame_offset is None:
+			total_frame_offset = DOMRect(x=0.0, y=0.0, width=0.0, height=0.0)
+		else:
+			total_frame_offset = DOMRect(
+				total_frame_offset.x, total_frame_offset.y, total_frame_offset.width, total_frame_offset.height
+			)
+		if node['nodeId'] in enhanced_dom_tree_node_lookup:
+			return enhanced_dom_tree_node_lookup[node['nodeId']]
+
+		attributes: dict[str, str] | None = None
+		if 'attributes' in node and node['attributes']:
+			attributes = {}
+			for i in range(0, len(node['attributes']), 2):
+				attributes[node['attributes'][i]] = node['attributes'][i + 1]
+
+		snapshot_data = snapshot_lookup.get(node['backendNodeId'], None)
+		absolute_position = None
+		if snapshot_data and snapshot_data.bounds:
+			absolute_position = DOMRect(
+				x=snapshot_data.bounds.x + total_frame_offset.x,
+				y=snapshot_data.bounds.y + total_frame_offset.y,
+				width=snapshot_data.bounds.width,
+				height=snapshot_data.bounds.height,
+			)
+
+		dom_tree_node = EnhancedDOMTreeNode(
+			node_id=node['nodeId'],
+			backend_node_id=node['backendNodeId'],
+			node_type=NodeType(node['nodeType']),
+			node_name=node['nodeName'],
+			node_value=node['nodeValue'],
+			attributes=attributes or {},
+			is_scrollable=node.get('isScrollable', None),
+			frame_id=node.get('frameId', None),
+			session_id=None,
+			target_id='benchmark-target',
+			content_document=None,
+			shadow_root_type=node.get('shadowRootType') or None,
+			shadow_roots=None,
+			parent_node=None,
+			children_nodes=None,
+			ax_node=None,
+			snapshot_node=snapshot_data,
+			is_visible=None,
+			absolute_position=absolute_position,
+			element_index=None,
+		)
+		enhanced_dom_tree_node_lookup[node['nodeId']] = dom_tree_node
+		if 'parentId' in node and node['parentId']:
+			dom_tree_node.parent_node = enhanced_dom_tree_node_lookup[node['parentId']]
+
+		updated_html_frames = html_frames.copy()
+		if node['nodeType'] == NodeType.ELEMENT_NODE.value and node['nodeName'] == 'HTML' and node.get('frameId') is not None:
+			updated_html_frames.append(dom_tree_node)
+			if snapshot_data and snapshot_data.scrollRects:
+				total_frame_offset.x -= snapshot_data.scrollRects.x
+				total_frame_offset.y -= snapshot_data.scrollRects.y
+
+		if (
+			(node['nodeName'].upper() == 'IFRAME' or node['nodeName'].upper() == 'FRAME')
+			and snapshot_data
+			and snapshot_data.bounds
+		):
+			updated_html_frames.append(dom_tree_node)
+			total_frame_offset.x += snapshot_data.bounds.x
+			total_frame_offset.y += snapshot_data.bounds.y
+
+		if 'contentDocument' in node and node['contentDocument']:
+			dom_tree_node.content_document = await _construct_enhanced_node(
+				node['contentDocument'], updated_html_frames, total_frame_offset
+			)
+			dom_tree_node.content_document.parent_node = dom_tree_node
+
+		if 'shadowRoots' in node and node['shadowRoots']:
+			dom_tree_node.shadow_roots = []
+			for shadow_root in node['shadowRoots']:
+				shadow_root_node = await _construct_enhanced_node(shadow_root, updated_html_frames, total_frame_offset)
+				shadow_root_node.parent_node = dom_tree_node
+				dom_tree_node.shadow_roots.append(shadow_root_node)
+
+		if 'children' in node and node['children']:
+			dom_tree_node.children_nodes = []
+			for child in node['children']:
+				dom_tree_node.children_nodes.append(
+					await _construct_enhanced_node(child, updated_html_frames, total_frame_offset)
+				)
+
+		dom_tree_node.is_visible = service.is_element_visible_according_to_all_parents(dom_tree_node, updated_html_frames)
+		return dom_tree_node
+
+	return await _construct_enhanced_node(root, None, None)
+
+
+def flatten(root: EnhancedDOMTreeNode) -> list[tuple]:
+	"""Everything the rest of the pipeline reads from the tree, in traversal order."""
+	rows = []
+	stack = [root]
+	while stack:
+		node = stack.pop()
+		bounds = node.snapshot_node.bounds if node.snapshot_node else None
+		rows.append(
+			(
+				node.node_id,
+				node.parent_node.node_id if node.parent_node else None,
+				node.is_visible,
+				node.absolute_position.to_dict() if node.absolute_position else None,
+				bounds.to_dict() if bounds else None,
+				tuple(node.attributes.items()),
+			)
+		)
+		stack.extend(reversed(node.children_nodes or []))
+		stack.extend(reversed(node.shadow_roots or []))
+		if node.content_document:
+			stack.append(node.content_document)
+	return rows
+
+
+async def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument('--nodes', type=int, default=30_000)
+	parser.add_argument('--repeat', type=int, default=5)
+	args = parser.parse_args()
+
+	root, snapshots = make_page(args.nodes)
+	service = DomService(browser_session=SimpleNamespace(agent_focus=None), logger=logging.getLogger('benchmark'))  # type: ignore[arg-type]
+	print(f'Synthetic page: {len(snapshots)} nodes')
+
+	legacy_times, new_times = [], []
+	for _ in range(args.repeat):
+		lookup = make_snapshot_lookup(snapshots)
+		gc.collect()
+		start = time.perf_counter()
+		legacy_tree = await legacy_build(service, root, lookup)
+		legacy_times.append(time.perf_counter() - start)
+		legacy_rows = flatten(legacy_tree)
+		del legacy_tree, lookup
+
+		lookup = make_snapshot_lookup(snapshots)
+		gc.collect()
+		start = time.perf_counter()
+		new_tree, _ = service._build_enhanced_tree(root, 'benchmark-target', {}, lookup)  # type: ignore[arg-type]
+		new_times.append(time.perf_counter() - start)
+		new_rows = flatten(new_tree)
+		del new_tree, lookup
+
+		assert legacy_rows == new_rows, 'builders produced different trees'
+
+	legacy_ms = statistics.median(legacy_times) * 1000
+	new_ms = statistics.median(new_times) * 1000
+	print(f'recursive async builder : {legacy_ms:8.1f} ms (median of {args.repeat})')
+	print(f'explicit-stack builder  : {new_ms:8.1f} ms (median of {args.repeat})')
+	print(f'speedup                 : {legacy_ms / new_ms:8.2f}x, identical output ✅')
+
+
+if __name__ == '__main__':
+	asyncio.run(main())
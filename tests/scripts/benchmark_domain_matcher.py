@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Benchmark: compiled DomainMatcher vs. checking every pattern in turn, for a large prohibited_domains list and for
+action `domains` filters.
+
+Generates a synthetic block list (mostly bare domains, some *.domain patterns, a few full URLs and globs), then times
+SecurityWatchdog._is_url_allowed and ActionRegistry._match_domains against the previous linear loops on a mix of
+blocked and allowed URLs, and checks that both give the same answers.
+
+Usage:
+	python tests/scripts/benchmark_domain_matcher.py [--patterns 100000] [--urls 2000]
+"""
+
+import argparse
+import random
+import string
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from bubus import EventBus
+
+from browser_use.browser import BrowserProfile, BrowserSession
+from browser_use.browser.watchdogs.security_watchdog import SecurityWatchdog
+from browser_use.domain_matcher import compile_domain_patterns
+from browser_use.tools.registry.views import ActionRegistry
+from browser_use.utils import match_url_with_domain_pattern
+
+TLDS = ['com', 'org', 'net', 'io', 'co.uk', 'de', 'ru', 'info']
+
+
+def make_patterns(count: int, seed: int = 0) -> list[str]:
+	rng = random.Random(seed)
+	patterns = []
+	for _ in range(count):
+		name = ''.join(rng.choices(string.ascii_lowercase, k=rng.randint(5, 14)))
+		domain = f'{name}.{rng.choice(TLDS)}'
+		kind = rng.random()
+		if kind < 0.75:
+			patterns.append(domain)
+		elif kind < 0.97:
+			patterns.append(f'*.{domain}')
+		elif kind < 0.995:
+			patterns.append(f'https://{domain}')
+		else:
+			patterns.append(f'http*://{domain}')
+	return patterns
+
+
+def make_urls(patterns: list[str], count: int, seed: int = 1) -> list[str]:
+	rng = random.Random(seed)
+	urls = []
+	for i in range(count):
+		if i % 2:
+			domain = rng.choice(patterns).split('://')[-1].removeprefix('*.')
+			urls.append(f'https://{rng.choice(["", "www.", "cdn.static."])}{domain}/page?id={i}')
+		else:
+			urls.append(f'https://{"".join(rng.choices(string.ascii_lowercase, k=10))}.com/page?id={i}')
+	return urls
+
+
+def legacy_is_url_allowed(watchdog: SecurityWatchdog, url: str) -> bool:
+	"""The previous prohibited_domains check: every pattern in turn."""
+	from urllib.parse import urlparse
+
+	parsed = urlparse(url)
+	host = parsed.hostname
+	if not host:
+		return False
+	for pattern in watchdog.browser_session.browser_profile.prohibited_domains or []:
+		if watchdog._is_url_match(url, host, parsed.scheme, pattern):
+			return False
+	return True
+
+
+def timed(check, urls: list[str]) -> tuple[list[bool], float]:
+	start = time.perf_counter()
+	results = [check(url) for url in urls]
+	return results, time.perf_counter() - start
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument('--patterns', type=int, default=100_000)
+	parser.add_argument('--urls', type=int, default=2_000)
+	parser.add_argument('--legacy-urls', type=int, default=20, help='the linear loops are slow, time them on fewer URLs')
+	args = parser.parse_args()
+
+	patterns = make_patterns(args.patterns)
+	urls = make_urls(patterns, args.urls)
+	legacy_urls = urls[: args.legacy_urls]
+	print(f'{args.patterns} patterns, {args.urls} URLs ({args.legacy_urls} for the linear baselines)')
+
+	# SecurityWatchdog prohibited_domains
+	session = BrowserSession(browser_profile=BrowserProfile(headless=True, user_data_dir=None, prohibited_domains=patterns))
+	watchdog = SecurityWatchdog(browser_session=session, event_bus=EventBus())
+	start = time.perf_counter()
+	watchdog._is_url_allowed(urls[0])
+	compile_seconds = time.perf_counter() - start
+	compiled, compiled_seconds = timed(watchdog._is_url_allowed, urls)
+	legacy, legacy_seconds = timed(lambda url: legacy_is_url_allowed(watchdog, url), legacy_urls)
+	assert compiled[: len(legacy)] == legacy, 'security checks differ'
+	print(f'prohibited_domains compile : {compile_seconds * 1000:9.1f} ms (once per list)')
+	print(f'prohibited_domains linear  : {legacy_seconds / len(legacy_urls) * 1e6:9.1f} µs/URL')
+	print(
+		f'prohibited_domains compiled: {compiled_seconds / len(urls) * 1e6:9.1f} µs/URL, '
+		f'{sum(not allowed for allowed in compiled)} blocked'
+	)
+
+	# Action domain filters (ActionRegistry._match_domains)
+	matcher = compile_domain_patterns(patterns)
+	ActionRegistry._match_domains(patterns, urls[0])  # fill the compile cache
+	compiled, compiled_seconds = timed(lambda url: ActionRegistry._match_domains(patterns, url), urls)
+	legacy, legacy_seconds = timed(lambda url: any(match_url_with_domain_pattern(url, p) for p in patterns), legacy_urls)
+	assert compiled[: len(legacy)] == legacy, 'action domain filters differ'
+	print(f'action domains linear      : {legacy_seconds / len(legacy_urls) * 1e6:9.1f} µs/URL')
+	print(
+		f'action domains compiled    : {compiled_seconds / len(urls) * 1e6:9.1f} µs/URL '
+		f'({len(matcher.fallback_patterns)} patterns left in the fallback bucket)'
+	)
+	print('identical results ✅')
+
+
+if __name__ == '__main__':
+	main()
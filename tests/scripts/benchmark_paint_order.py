@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark: paint order occlusion with the grid-indexed RectUnionGrid vs. the linear RectUnionPure.
+
+Generates synthetic dense layouts (data table, map tiles with markers, random overlapping cards) with 5k and 20k
+painted rects, runs PaintOrderRemover.calculate_paint_order with and without the spatial index, asserts that the
+ignored_by_paint_order decisions are identical and prints the timings.
+
+Usage:
+	python tests/scripts/benchmark_paint_order.py [--sizes 5000 20000] [--layouts table tiles random]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from browser_use.dom.serializer.paint_order import PaintOrderRemover
+from browser_use.dom.views import DOMRect
+
+OPAQUE = {'background-color': 'rgb(255, 255, 255)', 'opacity': '1'}
+TRANSPARENT = {'background-color': 'rgba(0, 0, 0, 0)', 'opacity': '1'}
+
+
+def table_layout(n: int, rng: random.Random) -> list[tuple[int, DOMRect, dict]]:
+	"""Data table: row backgrounds, opaque cells and text spans on top, plus a sticky header covering the first rows."""
+	cols = 12
+	rows = max(1, n // (cols * 2 + 1))
+	items = []
+	for row in range(rows):
+		y = row * 32.0
+		items.append((1, DOMRect(0, y, cols * 100.0, 32), OPAQUE))
+		for col in range(cols):
+			items.append((2 + rng.randint(0, 1), DOMRect(col * 100.0, y, 100, 32), OPAQUE))
+			items.append((4, DOMRect(col * 100.0 + 4, y + 8, rng.uniform(20, 90), 16), TRANSPARENT))
+	items.append((10, DOMRect(0, 0, cols * 100.0, 96), OPAQUE))
+	return items
+
+
+def tiles_layout(n: int, rng: random.Random) -> list[tuple[int, DOMRect, dict]]:
+	"""Map: 256px tiles, markers painted above them and a couple of opaque control panels on top."""
+	tiles = n // 2
+	side = max(1, int(tiles**0.5))
+	items = []
+	for i in range(tiles):
+		items.append((1, DOMRect((i % side) * 256.0, (i // side) * 256.0, 256, 256), OPAQUE))
+	for _ in range(n - tiles - 2):
+		items.append((5, DOMRect(rng.uniform(0, side * 256), rng.uniform(0, side * 256), 24, 24), OPAQUE))
+	items.append((9, DOMRect(0, 0, 300, side * 256.0), OPAQUE))
+	items.append((9, DOMRect(side * 128.0, side * 128.0, 400, 400), OPAQUE))
+	return items
+
+
+def random_layout(n: int, rng: random.Random) -> list[tuple[int, DOMRect, dict]]:
+	"""Overlapping cards of all sizes with random paint orders, some transparent, some fractional coordinates."""
+	items = []
+	for _ in range(n):
+		w, h = rng.choice([(40, 20), (120, 80), (300, 200), (rng.uniform(1, 600), rng.uniform(1, 400))])
+		rect = DOMRect(rng.uniform(-50, 1920), rng.uniform(-50, 8000), w, h)
+		items.append((rng.randint(0, n // 10), rect, TRANSPARENT if rng.random() < 0.3 else OPAQUE))
+	return items
+
+
+LAYOUTS = {'table': table_layout, 'tiles': tiles_layout, 'random': random_layout}
+
+
+def make_tree(items: list[tuple[int, DOMRect, dict]]) -> tuple[SimpleNamespace, list[SimpleNamespace]]:
+	"""Just the parts of SimplifiedNode/EnhancedDOMTreeNode that PaintOrderRemover reads."""
+	nodes = []
+	for paint_order, bounds, styles in items:
+		snapshot_node = SimpleNamespace(
+			paint_order=paint_order, bounds=DOMRect(bounds.x, bounds.y, bounds.width, bounds.height), computed_styles=styles
+		)
+		nodes.append(
+			SimpleNamespace(original_node=SimpleNamespace(snapshot_node=snapshot_node), children=[], ignored_by_paint_order=False)
+		)
+	root = SimpleNamespace(original_node=SimpleNamespace(snapshot_node=None), children=nodes, ignored_by_paint_order=False)
+	return root, nodes
+
+
+def run(items: list[tuple[int, DOMRect, dict]], use_spatial_index: bool) -> tuple[float, list[bool]]:
+	root, nodes = make_tree(items)
+	start = time.perf_counter()
+	PaintOrderRemover(root, use_spatial_index=use_spatial_index).calculate_paint_order()  # type: ignore[arg-type]
+	return time.perf_counter() - start, [node.ignored_by_paint_order for node in nodes]
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument('--sizes', type=int, nargs='+', default=[5_000, 20_000])
+	parser.add_argument('--layouts', nargs='+', default=list(LAYOUTS), choices=list(LAYOUTS))
+	args = parser.parse_args()
+
+	print(f'{"layout":<8} {"rects":>7} {"ignored":>8} {"linear":>10} {"grid":>10} {"speedup":>8}')
+	for layout in args.layouts:
+		for size in args.sizes:
+			items = LAYOUTS[layout](size, random.Random(size))
+			linear_time, linear_decisions = run(items, use_spatial_index=False)
+			grid_time, grid_decisions = run(items, use_spatial_index=True)
+			assert linear_decisions == grid_decisions, f'{layout}/{size}: ignore decisions differ'
+			print(
+				f'{layout:<8} {len(items):>7} {sum(grid_decisions):>8} {linear_time * 1000:>8.0f}ms {grid_time * 1000:>8.0f}ms '
+				f'{linear_time / grid_time:>7.1f}x'
+			)
+	print('identical ignore decisions ✅')
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark: screenshot storage and history access for a long run that keeps seeing the same pages.
+
+Compares the previous step_N.png store + eager base64 `AgentHistoryList.screenshots()` with the content-addressed
+store, lazy `screenshot_refs()` and the deduplicated `screenshots()`: files and bytes on disk, time, and peak memory.
+
+Usage:
+	python tests/scripts/benchmark_screenshot_store.py [--steps 300] [--unique 20]
+"""
+
+import argparse
+import asyncio
+import base64
+import io
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from PIL import Image
+
+from browser_use.agent.views import AgentHistory, AgentHistoryList
+from browser_use.browser.views import BrowserStateHistory
+from browser_use.screenshots.service import ScreenshotService
+
+
+def make_frames(unique: int) -> list[str]:
+	frames = []
+	for i in range(unique):
+		buffer = io.BytesIO()
+		Image.frombytes('RGB', (1280, 800), os.urandom(1280 * 800 * 3 // 16) * 16).save(buffer, format='PNG')
+		frames.append(base64.b64encode(buffer.getvalue()).decode())
+	return frames
+
+
+def make_history(paths: list[str]) -> AgentHistoryList:
+	return AgentHistoryList(
+		history=[
+			AgentHistory(
+				model_output=None,
+				result=[],
+				state=BrowserStateHistory(
+					url='https://example.com', title='', tabs=[], interacted_element=[None], screenshot_path=p
+				),
+			)
+			for p in paths
+		]
+	)
+
+
+def legacy_store(directory: Path, screenshot_b64: str, step: int) -> str:
+	path = directory / f'step_{step}.png'
+	path.write_bytes(base64.b64decode(screenshot_b64))
+	return str(path)
+
+
+def legacy_screenshots(history: AgentHistoryList) -> list[str | None]:
+	return [item.state.get_screenshot() for item in history.history]
+
+
+def measure(label: str, func) -> None:
+	tracemalloc.start()
+	start = time.perf_counter()
+	result = func()
+	elapsed = time.perf_counter() - start
+	_, peak = tracemalloc.get_traced_memory()
+	tracemalloc.stop()
+	print(f'{label:32}: {elapsed * 1000:8.1f} ms, peak {peak / 1e6:7.1f} MB ({len(result)} items)')
+
+
+def disk_usage(directory: Path) -> str:
+	files = [path for path in directory.rglob('*') if path.is_file()]
+	return f'{len(files)} files, {sum(path.stat().st_size for path in files) / 1e6:.1f} MB'
+
+
+async def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument('--steps', type=int, default=300)
+	parser.add_argument('--unique', type=int, default=20, help='distinct pages seen during the run')
+	args = parser.parse_args()
+
+	frames = make_frames(args.unique)
+	steps = [frames[i * args.unique // args.steps] for i in range(args.steps)]  # runs of identical frames
+	print(f'{args.steps} steps, {args.unique} distinct frames of ~{len(frames[0]) * 3 // 4 / 1e6:.1f} MB')
+
+	with tempfile.TemporaryDirectory() as tmp:
+		legacy_dir = Path(tmp) / 'legacy'
+		legacy_dir.mkdir()
+		start = time.perf_counter()
+		legacy_paths = [legacy_store(legacy_dir, frame, step) for step, frame in enumerate(steps, 1)]
+		print(f'{"store step_N.png":32}: {(time.perf_counter() - start) * 1000:8.1f} ms, {disk_usage(legacy_dir)}')
+
+		service = ScreenshotService(Path(tmp) / 'store')
+		start = time.perf_counter()
+		paths = [await service.store_screenshot(frame, step) for step, frame in enumerate(steps, 1)]
+		print(
+			f'{"store content-addressed":32}: {(time.perf_counter() - start) * 1000:8.1f} ms, {disk_usage(service.screenshots_dir)}'
+		)
+
+		legacy_history, history = make_history(legacy_paths), make_history(paths)
+		measure('eager screenshots() (before)', lambda: legacy_screenshots(legacy_history))
+		measure('screenshots() (deduplicated)', history.screenshots)
+		measure('screenshot_refs() (lazy)', history.screenshot_refs)
+
+
+if __name__ == '__main__':
+	asyncio.run(main())
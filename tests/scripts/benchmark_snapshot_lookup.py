@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Benchmark: columnar SnapshotLookup vs. the previous eager dict[int, EnhancedSnapshotNode] snapshot lookup.
+
+Generates a synthetic DOMSnapshot.captureSnapshot result (layout for ~80% of the nodes, rare isClickable data,
+a few scroll containers), times build_snapshot_lookup against a copy of the old eager builder, reports the memory
+held by each lookup and checks that every entry decodes to exactly the same EnhancedSnapshotNode.
+
+Usage:
+	python tests/scripts/benchmark_snapshot_lookup.py [--nodes 30000] [--device-pixel-ratio 2]
+"""
+
+import argparse
+import gc
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from browser_use.dom.enhanced_snapshot import REQUIRED_COMPUTED_STYLES, _parse_computed_styles, build_snapshot_lookup
+from browser_use.dom.views import DOMRect, EnhancedSnapshotNode
+
+
+def make_snapshot(total_nodes: int, seed: int = 0) -> dict:
+	rng = random.Random(seed)
+	strings = ['block', 'none', 'visible', 'hidden', '1', '0.5', 'auto', 'pointer', 'static', 'rgba(0, 0, 0, 0)', 'default']
+	layout_nodes = [i for i in range(total_nodes) if rng.random() < 0.8]
+	layout = {
+		'nodeIndex': layout_nodes,
+		'bounds': [[rng.uniform(0, 2000), rng.uniform(0, 9000), rng.uniform(0, 600), rng.uniform(0, 200)] for _ in layout_nodes],
+		'styles': [[rng.randrange(len(strings)) for _ in REQUIRED_COMPUTED_STYLES] for _ in layout_nodes],
+		'text': [-1 for _ in layout_nodes],
+		'paintOrders': [rng.randrange(total_nodes) for _ in layout_nodes],
+		'offsetRects': [[] for _ in layout_nodes],
+		'scrollRects': [[0, rng.uniform(0, 500), 1000, 5000] if rng.random() < 0.01 else [] for _ in layout_nodes],
+		'clientRects': [[0, 0, 1000, 800] if rng.random() < 0.01 else [] for _ in layout_nodes],
+		'stackingContexts': {'index': [i for i in range(len(layout_nodes)) if rng.random() < 0.05]},
+	}
+	nodes = {
+		'backendNodeId': list(range(1000, 1000 + total_nodes)),
+		'isClickable': {'index': [i for i in range(total_nodes) if rng.random() < 0.1]},
+	}
+	return {'documents': [{'nodes': nodes, 'layout': layout}], 'strings': strings}
+
+
+def legacy_build_snapshot_lookup(snapshot: dict, device_pixel_ratio: float = 1.0) -> dict[int, EnhancedSnapshotNode]:
+	"""The previous eager builder, kept here as the baseline."""
+	snapshot_lookup: dict[int, EnhancedSnapshotNode] = {}
+	if not snapshot['documents']:
+		return snapshot_lookup
+	strings = snapshot['strings']
+	for document in snapshot['documents']:
+		nodes = document['nodes']
+		layout = document['layout']
+		backend_node_to_snapshot_index = {}
+		if 'backendNodeId' in nodes:
+			for i, backend_node_id in enumerate(nodes['backendNodeId']):
+				backend_node_to_snapshot_index[backend_node_id] = i
+		layout_index_map = {}
+		if layout and 'nodeIndex' in layout:
+			for layout_idx, node_index in enumerate(layout['nodeIndex']):
+				if node_index not in layout_index_map:
+					layout_index_map[node_index] = layout_idx
+		for backend_node_id, snapshot_index in backend_node_to_snapshot_index.items():
+			is_clickable = None
+			if 'isClickable' in nodes:
+				is_clickable = snapshot_index in nodes['isClickable']['index']
+			cursor_style = None
+			bounding_box = None
+			computed_styles = {}
+			paint_order = None
+			client_rects = None
+			scroll_rects = None
+			stacking_contexts = None
+			if snapshot_index in layout_index_map:
+				layout_idx = layout_index_map[snapshot_index]
+				if layout_idx < len(layout.get('bounds', [])):
+					bounds = layout['bounds'][layout_idx]
+					if len(bounds) >= 4:
+						bounding_box = DOMRect(
+							x=bounds[0] / device_pixel_ratio,
+							y=bounds[1] / device_pixel_ratio,
+							width=bounds[2] / device_pixel_ratio,
+							height=bounds[3] / device_pixel_ratio,
+						)
+					if layout_idx < len(layout.get('styles', [])):
+						computed_styles = _parse_computed_styles(strings, layout['styles'][layout_idx])
+						cursor_style = computed_styles.get('cursor')
+					if layout_idx < len(layout.get('paintOrders', [])):
+						paint_order = layout.get('paintOrders', [])[layout_idx]
+					client_rects_data = layout.get('clientRects', [])
+					if layout_idx < len(client_rects_data):
+						client_rect_data = client_rects_data[layout_idx]
+						if client_rect_data and len(client_rect_data) >= 4:
+							client_rects = DOMRect(*client_rect_data[:4])
+					scroll_rects_data = layout.get('scrollRects', [])
+					if layout_idx < len(scroll_rects_data):
+						scroll_rect_data = scroll_rects_data[layout_idx]
+						if scroll_rect_data and len(scroll_rect_data) >= 4:
+							scroll_rects = DOMRect(*scroll_rect_data[:4])
+					if layout_idx < len(layout.get('stackingContexts', [])):
+						stacking_contexts = layout.get('stackingContexts', {}).get('index', [])[layout_idx]
+			snapshot_lookup[backend_node_id] = EnhancedSnapshotNode(
+				is_clickable=is_clickable,
+				cursor_style=cursor_style,
+				bounds=bounding_box,
+				clientRects=client_rects,
+				scrollRects=scroll_rects,
+				computed_styles=computed_styles if computed_styles else None,
+				paint_order=paint_order,
+				stacking_contexts=stacking_contexts,
+			)
+	return snapshot_lookup
+
+
+def measure(build, snapshot: dict, device_pixel_ratio: float) -> tuple[float, float]:
+	"""Return (build seconds, MB still held by the lookup)."""
+	gc.collect()
+	gc.disable()  # get_dom_tree builds with GC paused as well
+	start = time.perf_counter()
+	lookup = build(snapshot, device_pixel_ratio)
+	elapsed = time.perf_counter() - start
+	gc.enable()
+	del lookup
+	gc.collect()
+	tracemalloc.start()
+	lookup = build(snapshot, device_pixel_ratio)
+	held, _ = tracemalloc.get_traced_memory()
+	tracemalloc.stop()
+	return elapsed, held / 1e6
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument('--nodes', type=int, default=30_000)
+	parser.add_argument('--device-pixel-ratio', type=float, default=2.0)
+	args = parser.parse_args()
+
+	snapshot = make_snapshot(args.nodes)
+	dpr = args.device_pixel_ratio
+
+	legacy_time, legacy_mb = measure(legacy_build_snapshot_lookup, snapshot, dpr)
+	columnar_time, columnar_mb = measure(build_snapshot_lookup, snapshot, dpr)
+	print(f'Synthetic snapshot: {args.nodes} nodes')
+	print(f'eager dict lookup : {legacy_time * 1000:8.1f} ms build, {legacy_mb:6.1f} MB held')
+	print(f'columnar lookup   : {columnar_time * 1000:8.1f} ms build, {columnar_mb:6.1f} MB held (before any lookups)')
+
+	legacy = legacy_build_snapshot_lookup(snapshot, dpr)
+	columnar = build_snapshot_lookup(snapshot, dpr)
+	gc.collect()
+	gc.disable()
+	start = time.perf_counter()
+	for backend_node_id in legacy:
+		columnar[backend_node_id]
+	gc.enable()
+	print(f'+ decoding all    : {(time.perf_counter() - start) * 1000:8.1f} ms (the tree builder looks up every DOM node)')
+	assert dict(columnar) == legacy, 'snapshot lookups differ'
+	print('identical snapshot nodes ✅')
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Benchmark: VideoRecorderService (one long-lived ffmpeg process) vs. the previous recorder that spawned an ffmpeg process
+per screencast frame to resize it before handing it to an imageio writer.
+
+Feeds synthetic PNG frames (a moving gradient, roughly like a scrolling page) at the screencast rate and reports how long
+each add_frame call blocks its caller (the event loop in RecordingWatchdog), how many frames were dropped and how long
+the video takes to finish. Requires the [video] extra: pip install "browser-use[video]"
+
+Usage:
+	python tests/scripts/benchmark_video_recorder.py [--frames 150] [--fps 30] [--width 1280] [--height 720] [--skip-legacy]
+"""
+
+import argparse
+import base64
+import io
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from PIL import Image
+
+from browser_use.browser.profile import ViewportSize
+from browser_use.browser.video_recorder import IMAGEIO_AVAILABLE, VideoRecorderService, _get_padded_size
+
+
+def make_frames(count: int, width: int, height: int) -> list[str]:
+	frames = []
+	for i in range(count):
+		image = Image.linear_gradient('L').resize((width, height)).convert('RGB')
+		image = image.rotate(i * 360 / count)
+		buffer = io.BytesIO()
+		image.save(buffer, format='PNG')
+		frames.append(base64.b64encode(buffer.getvalue()).decode())
+	return frames
+
+
+class LegacyVideoRecorder:
+	"""The previous add_frame: one ffmpeg process per frame to scale and pad it, then imageio encodes it."""
+
+	def __init__(self, output_path: Path, size: ViewportSize, framerate: int):
+		import imageio.v2 as iio  # type: ignore[import-not-found]
+
+		self.size = size
+		self.padded_size = _get_padded_size(size)
+		self.writer = iio.get_writer(
+			str(output_path), fps=framerate, codec='libx264', quality=8, pixelformat='yuv420p', macro_block_size=None
+		)
+
+	def add_frame(self, frame_data_b64: str) -> None:
+		import imageio_ffmpeg  # type: ignore[import-not-found]
+		import numpy as np  # type: ignore[import-not-found]
+
+		vf_chain = (
+			f'scale={self.size["width"]}:{self.size["height"]},'
+			f'pad={self.padded_size["width"]}:{self.padded_size["height"]}:(ow-iw)/2:(oh-ih)/2:color=black'
+		)
+		command = [imageio_ffmpeg.get_ffmpeg_exe(), '-f', 'image2pipe', '-c:v', 'png', '-i', '-', '-vf', vf_chain]
+		command += ['-f', 'rawvideo', '-pix_fmt', 'rgb24', '-']
+		proc = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+		out, _ = proc.communicate(input=base64.b64decode(frame_data_b64))
+		self.writer.append_data(
+			np.frombuffer(out, dtype=np.uint8).reshape((self.padded_size['height'], self.padded_size['width'], 3))
+		)
+
+	def stop_and_save(self) -> None:
+		self.writer.close()
+
+
+def run(recorder, frames: list[str], fps: int) -> tuple[list[float], float]:
+	"""Feed frames at the screencast rate, return the per-frame blocking times and the time to finish the video."""
+	blocking = []
+	interval = 1 / fps
+	next_frame = time.perf_counter()
+	for frame in frames:
+		start = time.perf_counter()
+		recorder.add_frame(frame)
+		blocking.append(time.perf_counter() - start)
+		next_frame += interval
+		time.sleep(max(0.0, next_frame - time.perf_counter()))
+	start = time.perf_counter()
+	recorder.stop_and_save()
+	return blocking, time.perf_counter() - start
+
+
+def report(name: str, blocking: list[float], finish: float, frames: int, dropped: int = 0) -> None:
+	blocking_ms = sorted(b * 1000 for b in blocking)
+	p99 = blocking_ms[min(len(blocking_ms) - 1, int(len(blocking_ms) * 0.99))]
+	print(
+		f'{name:<24}: add_frame median {statistics.median(blocking_ms):7.2f} ms, p99 {p99:7.2f} ms, '
+		f'total {sum(blocking_ms) / 1000:6.2f} s blocked for {frames} frames, {dropped} dropped, finish {finish:5.2f} s'
+	)
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument('--frames', type=int, default=150)
+	parser.add_argument('--fps', type=int, default=30)
+	parser.add_argument('--width', type=int, default=1280)
+	parser.add_argument('--height', type=int, default=720)
+	parser.add_argument('--skip-legacy', action='store_true', help='only benchmark the current recorder')
+	args = parser.parse_args()
+
+	if not IMAGEIO_AVAILABLE:
+		sys.exit('imageio-ffmpeg is not installed: pip install "browser-use[video]"')
+
+	frames = make_frames(args.frames, args.width, args.height)
+	size = ViewportSize(width=args.width, height=args.height)
+	print(f'{args.frames} synthetic {args.width}x{args.height} PNG frames at {args.fps} fps')
+
+	with tempfile.TemporaryDirectory() as tmp:
+		recorder = VideoRecorderService(Path(tmp) / 'pipeline.mp4', size=size, framerate=args.fps)
+		recorder.start()
+		blocking, finish = run(recorder, frames, args.fps)
+		report('persistent ffmpeg', blocking, finish, args.frames, recorder.frames_dropped)
+		assert (Path(tmp) / 'pipeline.mp4').stat().st_size > 0, 'no video written'
+
+		if not args.skip_legacy:
+			legacy = LegacyVideoRecorder(Path(tmp) / 'legacy.mp4', size=size, framerate=args.fps)
+			blocking, finish = run(legacy, frames, args.fps)
+			report('ffmpeg process per frame', blocking, finish, args.frames)
+
+
+if __name__ == '__main__':
+	main()